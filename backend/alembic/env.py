@@ -28,6 +28,13 @@ from app.database.session import Base  # noqa: E402
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names):
+    """Keep autogenerate away from the FTS5 index, which is managed by raw DDL."""
+    if type_ == "table" and name and name.startswith("transactions_fts"):
+        return False
+    return True
+
+
 # Override sqlalchemy.url from settings if not already set via command line
 def get_url():
     # Check if DATABASE_URL env var is set (for production/docker)
@@ -63,6 +70,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,  # Required for SQLite migrations
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -90,6 +98,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             render_as_batch=True,  # Required for SQLite migrations
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,70 @@
+"""add_statement_import_jobs
+
+Revision ID: b1c2d3e4f5a6
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b1c2d3e4f5a6"
+down_revision: Union[str, Sequence[str], None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create import_jobs table and add transactions.import_key."""
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("file_format", sa.Enum("CSV", "OFX", "QIF", name="importformat"), nullable=False),
+        sa.Column("file_sha256", sa.String(length=64), nullable=False),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "COMPLETED", "FAILED", name="importstatus"),
+            nullable=False,
+        ),
+        sa.Column("total_bytes", sa.Integer(), nullable=False),
+        sa.Column("bytes_processed", sa.Integer(), nullable=False),
+        sa.Column("rows_processed", sa.Integer(), nullable=False),
+        sa.Column("rows_imported", sa.Integer(), nullable=False),
+        sa.Column("rows_skipped", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON(), nullable=True),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_import_jobs_id"), "import_jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_import_jobs_file_sha256"), "import_jobs", ["file_sha256"], unique=True)
+
+    with op.batch_alter_table("transactions", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("import_key", sa.String(), nullable=True))
+        batch_op.create_unique_constraint("uq_transactions_import_key", ["import_key"])
+
+
+def downgrade() -> None:
+    """Drop import_jobs table and transactions.import_key."""
+    with op.batch_alter_table("transactions", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_transactions_import_key", type_="unique")
+        batch_op.drop_column("import_key")
+
+    op.drop_index(op.f("ix_import_jobs_file_sha256"), table_name="import_jobs")
+    op.drop_index(op.f("ix_import_jobs_id"), table_name="import_jobs")
+    op.drop_table("import_jobs")
+
+    # Enum types only exist as such on PostgreSQL; SQLite rejects DROP TYPE
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS importstatus")
+        op.execute("DROP TYPE IF EXISTS importformat")
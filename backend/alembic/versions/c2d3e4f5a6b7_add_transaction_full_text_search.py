@@ -0,0 +1,52 @@
+"""add_transaction_full_text_search
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2d3e4f5a6b7"
+down_revision: Union[str, Sequence[str], None] = "b1c2d3e4f5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TAGS = "(SELECT group_concat(value, ' ') FROM json_each(coalesce({row}.tags, '[]')))"
+INSERT_NEW = (
+    "INSERT INTO transactions_fts(rowid, description, notes, tags) "
+    f"VALUES (new.id, new.description, new.notes, {TAGS.format(row='new')});"
+)
+
+
+def upgrade() -> None:
+    """Create the transactions_fts index, its sync triggers, and index existing transactions."""
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+        "description, notes, tags, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    op.execute(f"CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN {INSERT_NEW} END")
+    op.execute(
+        "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+        "DELETE FROM transactions_fts WHERE rowid = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF description, notes, tags ON transactions BEGIN "
+        f"DELETE FROM transactions_fts WHERE rowid = old.id; {INSERT_NEW} END"
+    )
+    op.execute(
+        "INSERT INTO transactions_fts(rowid, description, notes, tags) "
+        f"SELECT t.id, t.description, t.notes, {TAGS.format(row='t')} FROM transactions AS t"
+    )
+
+
+def downgrade() -> None:
+    """Drop the full-text index and its triggers."""
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_ai")
+    op.execute("DROP TABLE IF EXISTS transactions_fts")
@@ -0,0 +1,59 @@
+"""add_transaction_tags_index
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3e4f5a6b7c8"
+down_revision: Union[str, Sequence[str], None] = "c2d3e4f5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INSERT_NEW = (
+    "INSERT OR IGNORE INTO transaction_tags (transaction_id, tag) "
+    "SELECT new.id, value FROM json_each(coalesce(new.tags, '[]')) WHERE type = 'text';"
+)
+
+
+def upgrade() -> None:
+    """Create transaction_tags with its sync triggers and backfill it from transactions.tags."""
+    op.create_table(
+        "transaction_tags",
+        sa.Column("transaction_id", sa.Integer(), nullable=False),
+        sa.Column("tag", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("transaction_id", "tag"),
+    )
+    op.create_index("ix_transaction_tags_tag_transaction_id", "transaction_tags", ["tag", "transaction_id"])
+
+    op.execute(f"CREATE TRIGGER transaction_tags_ai AFTER INSERT ON transactions BEGIN {INSERT_NEW} END")
+    op.execute(
+        "CREATE TRIGGER transaction_tags_ad AFTER DELETE ON transactions BEGIN "
+        "DELETE FROM transaction_tags WHERE transaction_id = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER transaction_tags_au AFTER UPDATE OF tags ON transactions BEGIN "
+        f"DELETE FROM transaction_tags WHERE transaction_id = old.id; {INSERT_NEW} END"
+    )
+
+    op.execute(
+        "INSERT OR IGNORE INTO transaction_tags (transaction_id, tag) "
+        "SELECT t.id, j.value FROM transactions AS t, json_each(coalesce(t.tags, '[]')) AS j WHERE j.type = 'text'"
+    )
+
+
+def downgrade() -> None:
+    """Drop transaction_tags and its triggers."""
+    op.execute("DROP TRIGGER IF EXISTS transaction_tags_au")
+    op.execute("DROP TRIGGER IF EXISTS transaction_tags_ad")
+    op.execute("DROP TRIGGER IF EXISTS transaction_tags_ai")
+    op.drop_index("ix_transaction_tags_tag_transaction_id", table_name="transaction_tags")
+    op.drop_table("transaction_tags")
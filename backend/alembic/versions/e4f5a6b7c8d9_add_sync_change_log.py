@@ -0,0 +1,100 @@
+"""add_sync_change_log
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4f5a6b7c8d9"
+down_revision: Union[str, Sequence[str], None] = "d3e4f5a6b7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = (
+    "categories",
+    "beneficiaries",
+    "transactions",
+    "gift_occasions",
+    "gift_entries",
+    "gift_purchases",
+)
+TABLES_WITH_CREATED_AT = ("transactions", "gift_occasions", "gift_entries", "gift_purchases")
+
+
+def _triggers(table: str) -> tuple[str, ...]:
+    record = (
+        "INSERT OR REPLACE INTO change_log (entity, entity_id, deleted, changed_at) "
+        f"VALUES ('{table}', {{row}}.id, {{deleted}}, CURRENT_TIMESTAMP);"
+    )
+    return (
+        f"CREATE TRIGGER change_log_{table}_ai AFTER INSERT ON {table} BEGIN {record.format(row='new', deleted=0)} END",
+        f"CREATE TRIGGER change_log_{table}_au AFTER UPDATE ON {table} BEGIN {record.format(row='new', deleted=0)} END",
+        f"CREATE TRIGGER change_log_{table}_ad AFTER DELETE ON {table} BEGIN {record.format(row='old', deleted=1)} END",
+    )
+
+
+def _set_not_null(table: str, column: sa.Column) -> None:
+    """Make a column NOT NULL. SQLite needs a table rebuild for that, which drops the table's triggers (FTS and
+    tag index sync on transactions), so they are recreated from their stored SQL."""
+    triggers = (
+        op.get_bind()
+        .execute(
+            sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"), {"table": table}
+        )
+        .scalars()
+        .all()
+    )
+    with op.batch_alter_table(table, schema=None, recreate="always") as batch_op:
+        batch_op.alter_column(column.name, existing_type=column.type, nullable=False)
+    for statement in triggers:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Add updated_at columns, the change_log table and its triggers, and log every existing row."""
+    for table in SYNCED_TABLES:
+        # SQLite cannot add a NOT NULL column without a constant default, so existing rows are backfilled first
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+        source = "created_at" if table in TABLES_WITH_CREATED_AT else "CURRENT_TIMESTAMP"
+        op.execute(f"UPDATE {table} SET updated_at = {source}")
+        _set_not_null(table, sa.Column("updated_at", sa.DateTime()))
+
+    op.create_table(
+        "change_log",
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("deleted", sa.Boolean(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("seq"),
+        sa.UniqueConstraint("entity", "entity_id", name="uq_change_log_entity_entity_id"),
+        sqlite_autoincrement=True,
+    )
+
+    for table in SYNCED_TABLES:
+        for statement in _triggers(table):
+            op.execute(statement)
+        op.execute(
+            "INSERT INTO change_log (entity, entity_id, deleted, changed_at) "
+            f"SELECT '{table}', id, 0, CURRENT_TIMESTAMP FROM {table} ORDER BY id"
+        )
+
+
+def downgrade() -> None:
+    """Drop the change log, its triggers and the updated_at columns."""
+    for table in SYNCED_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS change_log_{table}_{suffix}")
+    op.drop_table("change_log")
+
+    # Plain ALTER TABLE ... DROP COLUMN (SQLite 3.35+); a batch table rebuild would drop the FTS and tag triggers
+    for table in SYNCED_TABLES:
+        op.drop_column(table, "updated_at")
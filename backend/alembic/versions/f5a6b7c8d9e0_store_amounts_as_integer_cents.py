@@ -0,0 +1,60 @@
+"""store_amounts_as_integer_cents
+
+Revision ID: f5a6b7c8d9e0
+Revises: e4f5a6b7c8d9
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f5a6b7c8d9e0"
+down_revision: Union[str, Sequence[str], None] = "e4f5a6b7c8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY_TABLES = ("transactions", "gift_entries", "gift_purchases")
+
+
+def _set_not_null(table: str, column: sa.Column) -> None:
+    """Make a column NOT NULL. SQLite needs a table rebuild for that, which drops the table's triggers (FTS, tag
+    index and change_log sync), so they are recreated from their stored SQL."""
+    triggers = (
+        op.get_bind()
+        .execute(
+            sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"), {"table": table}
+        )
+        .scalars()
+        .all()
+    )
+    with op.batch_alter_table(table, schema=None, recreate="always") as batch_op:
+        batch_op.alter_column(column.name, existing_type=column.type, nullable=False)
+    for statement in triggers:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Replace the REAL amount columns with INTEGER amount_cents.
+
+    ROUND(amount, 2) rounds the shortest decimal form of the float (1.005 -> 1.01), matching models.money.to_cents.
+    """
+    # Plain ALTER TABLE ADD/DROP COLUMN (SQLite 3.35+), then one rebuild for NOT NULL once the column is filled.
+    # The backfill fires the change_log triggers, so sync clients refetch these rows once.
+    for table in MONEY_TABLES:
+        op.add_column(table, sa.Column("amount_cents", sa.Integer(), nullable=True))
+        op.execute(f"UPDATE {table} SET amount_cents = CAST(ROUND(ROUND(amount, 2) * 100) AS INTEGER)")
+        op.drop_column(table, "amount")
+        _set_not_null(table, sa.Column("amount_cents", sa.Integer()))
+
+
+def downgrade() -> None:
+    """Restore the REAL amount columns."""
+    for table in MONEY_TABLES:
+        op.add_column(table, sa.Column("amount", sa.Float(), nullable=True))
+        op.execute(f"UPDATE {table} SET amount = amount_cents / 100.0")
+        op.drop_column(table, "amount_cents")
+        _set_not_null(table, sa.Column("amount", sa.Float()))
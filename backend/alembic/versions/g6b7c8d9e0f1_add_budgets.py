@@ -0,0 +1,63 @@
+"""add_budgets
+
+Revision ID: g6b7c8d9e0f1
+Revises: f5a6b7c8d9e0
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "g6b7c8d9e0f1"
+down_revision: Union[str, Sequence[str], None] = "f5a6b7c8d9e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _triggers(table: str) -> tuple[str, ...]:
+    record = (
+        "INSERT OR REPLACE INTO change_log (entity, entity_id, deleted, changed_at) "
+        f"VALUES ('{table}', {{row}}.id, {{deleted}}, CURRENT_TIMESTAMP);"
+    )
+    return (
+        f"CREATE TRIGGER change_log_{table}_ai AFTER INSERT ON {table} BEGIN {record.format(row='new', deleted=0)} END",
+        f"CREATE TRIGGER change_log_{table}_au AFTER UPDATE ON {table} BEGIN {record.format(row='new', deleted=0)} END",
+        f"CREATE TRIGGER change_log_{table}_ad AFTER DELETE ON {table} BEGIN {record.format(row='old', deleted=1)} END",
+    )
+
+
+def upgrade() -> None:
+    """Create the budgets table and its change_log triggers."""
+    op.create_table(
+        "budgets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("beneficiary_id", sa.Integer(), nullable=True),
+        sa.Column("amount_cents", sa.Integer(), nullable=False),
+        sa.Column("rollover", sa.Boolean(), nullable=False),
+        sa.Column("start_month", sa.Date(), nullable=False),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["beneficiary_id"], ["beneficiaries.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_budgets_id"), "budgets", ["id"], unique=False)
+    for statement in _triggers("budgets"):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Drop the budgets table, its triggers and its change_log rows."""
+    for suffix in ("ai", "au", "ad"):
+        op.execute(f"DROP TRIGGER IF EXISTS change_log_budgets_{suffix}")
+    op.execute("DELETE FROM change_log WHERE entity = 'budgets'")
+    op.drop_index(op.f("ix_budgets_id"), table_name="budgets")
+    op.drop_table("budgets")
@@ -0,0 +1,64 @@
+"""add_recurring_rules
+
+Revision ID: h7c8d9e0f1a2
+Revises: g6b7c8d9e0f1
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "h7c8d9e0f1a2"
+down_revision: Union[str, Sequence[str], None] = "g6b7c8d9e0f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the recurring_rules table."""
+    op.create_table(
+        "recurring_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.Enum("EXPENSE", "INCOME", name="transactiontype"), nullable=False),
+        sa.Column("amount_cents", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("beneficiary_id", sa.Integer(), nullable=False),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "frequency",
+            sa.Enum("DAILY", "WEEKLY", "MONTHLY", "YEARLY", name="recurrencefrequency"),
+            nullable=False,
+        ),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("day_of_month", sa.Integer(), nullable=True),
+        sa.Column("weekday", sa.Integer(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("materialized_through", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["beneficiary_id"], ["beneficiaries.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(op.f("ix_recurring_rules_id"), "recurring_rules", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the recurring_rules table; transactions it created are kept."""
+    op.drop_index(op.f("ix_recurring_rules_id"), table_name="recurring_rules")
+    op.drop_table("recurring_rules")
+
+    # Enum types only exist as such on PostgreSQL; SQLite rejects DROP TYPE
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS recurrencefrequency")
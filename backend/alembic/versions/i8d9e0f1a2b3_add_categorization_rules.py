@@ -0,0 +1,52 @@
+"""add_categorization_rules
+
+Revision ID: i8d9e0f1a2b3
+Revises: h7c8d9e0f1a2
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "i8d9e0f1a2b3"
+down_revision: Union[str, Sequence[str], None] = "h7c8d9e0f1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the categorization_rules table."""
+    op.create_table(
+        "categorization_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("match_type", sa.Enum("SUBSTRING", "REGEX", name="rulematchtype"), nullable=False),
+        sa.Column("pattern", sa.String(length=500), nullable=True),
+        sa.Column("transaction_type", sa.Enum("EXPENSE", "INCOME", name="transactiontype"), nullable=True),
+        sa.Column("min_amount_cents", sa.Integer(), nullable=True),
+        sa.Column("max_amount_cents", sa.Integer(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("beneficiary_id", sa.Integer(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["beneficiary_id"], ["beneficiaries.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_categorization_rules_id"), "categorization_rules", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the categorization_rules table; transactions it categorized keep their category."""
+    op.drop_index(op.f("ix_categorization_rules_id"), table_name="categorization_rules")
+    op.drop_table("categorization_rules")
+
+    # Enum types only exist as such on PostgreSQL; SQLite rejects DROP TYPE
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS rulematchtype")
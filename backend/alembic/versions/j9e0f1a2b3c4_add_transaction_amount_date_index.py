@@ -0,0 +1,32 @@
+"""add_transaction_amount_date_index
+
+Revision ID: j9e0f1a2b3c4
+Revises: i8d9e0f1a2b3
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "j9e0f1a2b3c4"
+down_revision: Union[str, Sequence[str], None] = "i8d9e0f1a2b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index transactions by amount and date for duplicate detection, and count duplicates skipped by imports."""
+    op.create_index(
+        "ix_transactions_amount_cents_transaction_date", "transactions", ["amount_cents", "transaction_date"]
+    )
+    op.add_column("import_jobs", sa.Column("rows_duplicate", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    """Drop the duplicate detection index and the import duplicate counter."""
+    op.drop_column("import_jobs", "rows_duplicate")
+    op.drop_index("ix_transactions_amount_cents_transaction_date", table_name="transactions")
@@ -0,0 +1,59 @@
+"""add_currencies
+
+Revision ID: k0f1a2b3c4d5
+Revises: j9e0f1a2b3c4
+Create Date: 2026-10-21 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.config.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "k0f1a2b3c4d5"
+down_revision: Union[str, Sequence[str], None] = "j9e0f1a2b3c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_not_null(table: str, column: sa.Column, server_default: str) -> None:
+    """Make a column NOT NULL. SQLite needs a table rebuild for that, which drops the table's triggers (FTS, tag
+    index and change log sync on transactions), so they are recreated from their stored SQL."""
+    triggers = (
+        op.get_bind()
+        .execute(
+            sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"), {"table": table}
+        )
+        .scalars()
+        .all()
+    )
+    with op.batch_alter_table(table, schema=None, recreate="always") as batch_op:
+        batch_op.alter_column(column.name, existing_type=column.type, nullable=False, server_default=server_default)
+    for statement in triggers:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Add a currency to transactions (existing ones are in the base currency) and the daily exchange rate table."""
+    # Existing amounts are in whatever base currency this installation is configured with
+    op.add_column("transactions", sa.Column("currency", sa.String(length=3), nullable=True))
+    transactions = sa.table("transactions", sa.column("currency", sa.String(length=3)))
+    op.execute(transactions.update().values(currency=settings.BASE_CURRENCY))
+    _set_not_null("transactions", sa.Column("currency", sa.String(length=3)), settings.BASE_CURRENCY)
+    op.create_table(
+        "fx_rates",
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("rate_date", sa.Date(), nullable=False),
+        sa.Column("rate", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("currency", "rate_date"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the exchange rate table and transaction currencies."""
+    op.drop_table("fx_rates")
+    op.drop_column("transactions", "currency")
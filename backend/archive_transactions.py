@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Move the transactions of closed years out of the SQLite database into
+compressed Parquet files, or bring them back.
+
+Each archived year becomes one zstd-compressed segment file plus a file of
+monthly totals per type, category and beneficiary, in ARCHIVE_DIR (default
+data/archive). Archiving a year archives every earlier year too; restoring a
+year restores every later archived year too. Totals, budgets, the forecast
+and transaction lists keep including archived years; full-text search,
+exports and duplicate detection only see the transactions in the table.
+Transactions linked to a gift stay in the table.
+
+A running server picks up the change on its next request.
+
+Requires pyarrow: uv sync --extra analytics
+
+Usage:
+    uv run python archive_transactions.py --through 2022
+    uv run python archive_transactions.py --restore 2021
+    uv run python archive_transactions.py --list
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.services import archive  # noqa: E402
+
+
+def get_db_path() -> str:
+    """Extract the database file path from the DATABASE_URL."""
+    url = settings.DATABASE_URL
+    for prefix in ["sqlite+aiosqlite:///", "sqlite:///"]:
+        if url.startswith(prefix):
+            return url[len(prefix) :]
+    return url
+
+
+async def run(db_path: str, args) -> list:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+            if args.through is not None:
+                return await archive.archive_years(db, args.through)
+            return await archive.restore_years(db, args.restore)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archive closed years of transactions to Parquet files, or restore them",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--through", type=int, metavar="YEAR", help="Archive every year up to and including YEAR")
+    action.add_argument("--restore", type=int, metavar="YEAR", help="Restore YEAR and every later archived year")
+    action.add_argument("--list", action="store_true", help="List the archived years")
+    parser.add_argument("--db", type=str, default=None, help="Path to the SQLite database (default: DATABASE_URL)")
+
+    args = parser.parse_args()
+
+    if args.list:
+        years = archive.read_manifest(settings.ARCHIVE_DIR)["years"]
+        for year, entry in sorted(years.items()):
+            print(f"{year}: {entry['rows']} transactions, archived {entry['archived_at']}")
+        if not years:
+            print(f"No archived years in {settings.ARCHIVE_DIR}")
+        return
+
+    if not archive.is_available():
+        print("Error: Archiving requires pyarrow (uv sync --extra analytics)")
+        sys.exit(1)
+    db_path = args.db or get_db_path()
+    if not os.path.exists(db_path):
+        print(f"Error: Database file not found: {db_path}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        entries = asyncio.run(run(db_path, args))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    verb = "Archived" if args.through is not None else "Restored"
+    for entry in entries:
+        print(f"{verb} {entry['year']}: {entry['rows']} transactions")
+    if not entries:
+        print("Nothing to archive")
+    print(f"Done in {elapsed:.2f}s ({settings.ARCHIVE_DIR})")
+
+
+if __name__ == "__main__":
+    main()
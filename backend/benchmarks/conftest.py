@@ -0,0 +1,274 @@
+"""
+Timing harness and seeded databases for the benchmark suite (``uv run pytest benchmarks``).
+
+Every benchmark runs once per dataset size (``--bench-sizes``, default 10k; add
+100k and 1M before a release). Datasets come from
+test_data/generate_synthetic_data.py and are cached under ``--bench-data-dir``,
+keyed by size, schema and generator, so only the first run pays for seeding
+(a million transactions take about a minute).
+
+The ``bench`` fixture times an async callable: a few warm-up calls, then rounds
+until ``min_time`` has passed (at least 5, at most ``max_rounds``). Results are
+compared with the baseline JSON (``--bench-baseline``): a test fails when both
+its median and its fastest round are more than ``--bench-tolerance`` slower
+(and the median at least ``--bench-min-delta-ms`` slower), twice in a row.
+Baseline numbers are first scaled by a calibration workload timed around each
+benchmark, so a machine that is busier or throttled than when the baseline was
+saved does not fail everything. ``--bench-save`` writes this run's numbers into
+the baseline instead. Baselines are still machine specific: save one on the
+machine that will compare against it.
+"""
+
+import gc
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "src"))
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "test_data"))
+
+import generate_synthetic_data as synthetic  # noqa: E402
+
+from app.auth.security import create_access_token  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+from app.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+YEARS = 10
+SEED = 42
+SIZE_IDS = {10_000: "10k", 100_000: "100k", 1_000_000: "1M"}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-sizes", default="10000", help="Comma-separated transaction counts (default: 10000)")
+    group.addoption("--bench-baseline", type=Path, default=BENCHMARKS_DIR / "baseline.json", help="Baseline JSON")
+    group.addoption("--bench-save", action="store_true", help="Write this run's numbers into the baseline")
+    group.addoption("--bench-tolerance", type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)")
+    group.addoption("--bench-min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this")
+    group.addoption("--bench-data-dir", type=Path, default=BENCHMARKS_DIR / ".data", help="Seeded database cache")
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--bench-sizes").split(",")]
+        ids = [SIZE_IDS.get(size, str(size)) for size in sizes]
+        metafunc.parametrize("dataset", sizes, ids=ids, indirect=True, scope="session")
+
+
+@dataclass
+class Dataset:
+    path: Path
+    size: int
+    transactions: int
+    occasion_ids: List[int]
+    email: str = synthetic.DEFAULT_EMAIL
+
+
+def _cache_key(size: int) -> str:
+    """Changes whenever the schema or the generator changes, so stale databases are never reused"""
+    digest = hashlib.sha256(Path(synthetic.__file__).read_bytes())
+    dialect = create_engine("sqlite://").dialect
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+    return f"{size}-{SEED}-{digest.hexdigest()[:12]}"
+
+
+@pytest.fixture(scope="session")
+def dataset(request) -> Dataset:
+    size = request.param
+    directory = request.config.getoption("--bench-data-dir")
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"bench-{_cache_key(size)}.db"
+    meta_path = path.with_suffix(".json")
+    if not meta_path.exists():
+        path.unlink(missing_ok=True)
+        end = date(2025, 12, 31)
+        start = date(end.year - YEARS, end.month, end.day) + timedelta(days=1)
+        generator = synthetic.Generator(SEED, start, end, synthetic.scale_for(size, YEARS))
+        generator.generate()
+        counts = synthetic.load(path, generator, synthetic.DEFAULT_EMAIL, synthetic.DEFAULT_PASSWORD)
+        meta = {"transactions": counts["transactions"], "occasion_ids": [row[0] for row in generator.occasions]}
+        # Written last: a seeding run that was interrupted is redone next time
+        meta_path.write_text(json.dumps(meta))
+    meta = json.loads(meta_path.read_text())
+    return Dataset(path=path, size=size, transactions=meta["transactions"], occasion_ids=meta["occasion_ids"])
+
+
+@pytest_asyncio.fixture
+async def session_factory(dataset):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{dataset.path}")
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(dataset, session_factory):
+    """Client for the app on the seeded database, logged in as the generated user"""
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': dataset.email})}"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", headers=headers) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", tmp_path)
+    return tmp_path
+
+
+def calibrate() -> float:
+    """Milliseconds for a fixed pure-Python workload; tracks how fast this machine is running right now"""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        sum(i * i for i in range(100_000))
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 4)
+
+
+@dataclass
+class Result:
+    median_ms: float
+    min_ms: float
+    p95_ms: float
+    rounds: int
+    transactions: int
+    calibration_ms: float
+
+    @classmethod
+    def from_timings(cls, timings: List[float], transactions: int, calibration_ms: float) -> "Result":
+        ordered = sorted(timings)
+        return cls(
+            median_ms=round(statistics.median(ordered) * 1000, 4),
+            min_ms=round(ordered[0] * 1000, 4),
+            p95_ms=round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+            rounds=len(ordered),
+            transactions=transactions,
+            calibration_ms=calibration_ms,
+        )
+
+
+@dataclass
+class Session:
+    baseline: Dict[str, dict]
+    results: Dict[str, Result] = field(default_factory=dict)
+
+
+_results_key = pytest.StashKey[Session]()
+
+
+def pytest_configure(config):
+    path = config.getoption("--bench-baseline", default=None)
+    baseline = json.loads(path.read_text())["benchmarks"] if path and path.exists() else {}
+    config.stash[_results_key] = Session(baseline=baseline)
+
+
+@pytest.fixture
+def bench(request, dataset):
+    """``await bench(lambda: some_coroutine())`` times the call and checks it against the baseline"""
+    config = request.config
+    session = config.stash[_results_key]
+    name = request.node.name
+
+    async def run(call: Callable[[], Awaitable], warmup: int, min_time: float, max_rounds: int) -> Result:
+        for _ in range(warmup):
+            await call()
+        gc.collect()
+        calibration_ms = calibrate()
+        timings = []
+        deadline = time.perf_counter() + min_time
+        while len(timings) < 5 or (len(timings) < max_rounds and time.perf_counter() < deadline):
+            start = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - start)
+        return Result.from_timings(timings, dataset.transactions, (calibration_ms + calibrate()) / 2)
+
+    def regression(result: Result, previous: dict) -> Optional[str]:
+        """
+        Both the median and the fastest round must be slower than the baseline, scaled by how fast the machine
+        runs the calibration workload now compared to when the baseline was saved
+        """
+        tolerance = config.getoption("--bench-tolerance")
+        speed = result.calibration_ms / previous["calibration_ms"]
+        expected_median = previous["median_ms"] * speed
+        slower_by = result.median_ms - expected_median
+        if (
+            result.median_ms > expected_median * (1 + tolerance)
+            and result.min_ms > previous["min_ms"] * speed * (1 + tolerance)
+            and slower_by >= config.getoption("--bench-min-delta-ms")
+        ):
+            return (
+                f"{name} regressed: median {result.median_ms:.3f} ms vs {expected_median:.3f} ms expected "
+                f"(baseline {previous['median_ms']:.3f} ms x machine speed {speed:.2f}), "
+                f"+{slower_by / expected_median:.0%} with tolerance {tolerance:.0%}"
+            )
+        return None
+
+    async def measure(
+        call: Callable[[], Awaitable], warmup: int = 3, min_time: float = 1.0, max_rounds: int = 200
+    ) -> Result:
+        result = await run(call, warmup, min_time, max_rounds)
+        previous = session.baseline.get(name)
+        if previous and not config.getoption("--bench-save") and regression(result, previous):
+            # Measure once more before failing; only a slowdown that repeats is reported
+            result = await run(call, warmup, min_time, max_rounds)
+            failure = regression(result, previous)
+            if failure:
+                session.results[name] = result
+                pytest.fail(failure)
+        session.results[name] = result
+        return result
+
+    return measure
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    session = config.stash.get(_results_key, None)
+    if not session or not session.results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'benchmark':<52}{'median ms':>11}{'p95 ms':>10}{'baseline':>10}{'rounds':>8}")
+    for name, result in sorted(session.results.items()):
+        previous = session.baseline.get(name, {}).get("median_ms")
+        baseline = f"{previous:.3f}" if previous is not None else "-"
+        terminalreporter.write_line(
+            f"{name:<52}{result.median_ms:>11.3f}{result.p95_ms:>10.3f}{baseline:>10}{result.rounds:>8}"
+        )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    state = config.stash.get(_results_key, None)
+    if not state or not state.results or not config.getoption("--bench-save"):
+        return
+    path = config.getoption("--bench-baseline")
+    # Merge, so saving one size does not drop the others
+    benchmarks = {**state.baseline, **{name: vars(result) for name, result in state.results.items()}}
+    baseline = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compare the full and compact (side-loaded) transaction list responses.
+
+Loads synthetic data into a throwaway SQLite database, then requests a page of
+transactions through the ASGI app in both modes and reports response size,
+end-to-end request time, and the time spent serializing the page alone.
+
+Usage:
+    uv run python benchmarks/list_payload_benchmark.py
+    uv run python benchmarks/list_payload_benchmark.py --page-size 500 --repeat 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.auth.dependencies import get_current_active_user  # noqa: E402
+from app.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Beneficiary, Category, CategoryType, Transaction, TransactionType, User  # noqa: E402
+from app.schemas import Transaction as TransactionSchema  # noqa: E402
+from app.services.transactions import build_compact_page  # noqa: E402
+
+
+def build_database(path: str, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"name": f"User {i}", "created_at": datetime(2024, 1, 1)} for i in range(2)])
+        conn.execute(insert(Category), [{"name": f"Category {i}", "type": CategoryType.EXPENSE} for i in range(15)])
+        conn.execute(insert(Beneficiary), [{"name": f"Beneficiary {i}"} for i in range(30)])
+        start = datetime(2020, 1, 1)
+        conn.execute(
+            insert(Transaction),
+            [
+                {
+                    "amount": round(rng.uniform(1, 500), 2),
+                    "transaction_date": start + timedelta(hours=i),
+                    "description": f"Purchase {i}",
+                    "type": TransactionType.EXPENSE,
+                    "tags": [],
+                    "category_id": rng.randint(1, 15),
+                    "beneficiary_id": rng.randint(1, 30),
+                    "created_by_user_id": rng.randint(1, 2),
+                }
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+
+
+async def run(path: str, page_size: int, repeat: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: None
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{'mode':<10}{'bytes':>12}{'request ms':>13}{'serialize ms':>15}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for compact in (False, True):
+            params = {"limit": page_size, "compact": str(compact).lower()}
+            await client.get("/api/transactions", params=params)  # warm up caches
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = await client.get("/api/transactions", params=params)
+                timings.append((time.perf_counter() - start) * 1000)
+            size = len(response.content)
+            serialize_ms = await time_serialization(session_factory, page_size, compact, repeat)
+            mode = "compact" if compact else "full"
+            print(f"{mode:<10}{size:>12}{statistics.median(timings):>13.1f}{serialize_ms:>15.1f}")
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def time_serialization(session_factory, page_size: int, compact: bool, repeat: int) -> float:
+    """Median time to turn an already loaded page into JSON bytes"""
+    async with session_factory() as db:
+        query = select(Transaction).order_by(Transaction.transaction_date.desc()).limit(page_size)
+        if not compact:
+            query = query.options(
+                selectinload(Transaction.category),
+                selectinload(Transaction.beneficiary),
+                selectinload(Transaction.created_by_user),
+            )
+        transactions = (await db.execute(query)).scalars().all()
+        adapter = TypeAdapter(List[TransactionSchema])
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if compact:
+                (await build_compact_page(db, transactions)).model_dump_json()
+            else:
+                adapter.dump_json(adapter.validate_python(transactions, from_attributes=True))
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and compact transaction list responses")
+    parser.add_argument("--rows", type=int, default=5000, help="Number of transactions to generate")
+    parser.add_argument("--page-size", type=int, default=1000, help="Transactions per page (max 1000)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per mode (median is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.rows)
+        asyncio.run(run(path, args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
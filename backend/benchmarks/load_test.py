@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Replay a realistic endpoint mix against a running server and report latency percentiles as JSON.
+
+A fixed number of concurrent clients (async httpx, one shared connection pool)
+each pick a weighted random operation until the duration is up: mostly list
+pages, filtered lists, searches and summaries, with some detail views, gift
+occasion views and creates. Every request's latency is recorded; the report has
+throughput, error counts and p50/p95/p99 overall and per operation. Pass
+--compare with an earlier report to print the change per operation.
+
+Point it at a server running on a synthetic database, since the mix creates
+transactions (described "Load test ..."):
+
+    cd backend
+    uv run python test_data/generate_synthetic_data.py --database data/synthetic.db --years 10
+    DATABASE_URL=sqlite:///./data/synthetic.db uv run uvicorn app.main:app --app-dir src --port 8000
+    uv run python benchmarks/load_test.py --duration 30 --concurrency 10 --output before.json
+    uv run python benchmarks/load_test.py --duration 30 --concurrency 10 --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+# The user created by test_data/generate_synthetic_data.py
+DEFAULT_EMAIL = "loadtest@example.com"
+DEFAULT_PASSWORD = "LoadTest123"
+SEARCH_TERMS = ("groceries", "dentist", "birthday", "fuel", "coffee", "holiday", "sup", "school")
+
+
+class Workload:
+    """Reference ids fetched once, and one request builder per operation"""
+
+    def __init__(self, rng: random.Random, reference: dict, latest: datetime):
+        self.rng = rng
+        self.category_ids = [c["id"] for c in reference["categories"]]
+        self.beneficiary_ids = [b["id"] for b in reference["beneficiaries"]]
+        self.user_ids = [u["id"] for u in reference["users"]]
+        self.occasion_ids = reference["occasion_ids"]
+        self.transaction_ids = reference["transaction_ids"]
+        self.latest = latest
+
+    def date_range(self) -> dict:
+        end = self.latest - timedelta(days=self.rng.randrange(0, 3 * 365))
+        start = end - timedelta(days=self.rng.choice((30, 90, 365)))
+        return {"start_date": start.isoformat(), "end_date": end.isoformat()}
+
+    # Each operation returns (method, url, params, json)
+    def list_page(self):
+        return "GET", "/api/transactions", {"skip": self.rng.choice((0, 0, 0, 100, 200)), "limit": 100}, None
+
+    def list_compact(self):
+        return "GET", "/api/transactions", {"limit": 500, "compact": "true"}, None
+
+    def list_filtered(self):
+        params = {"category_id": self.rng.choice(self.category_ids), **self.date_range()}
+        return "GET", "/api/transactions", params, None
+
+    def search(self):
+        return "GET", "/api/transactions", {"q": self.rng.choice(SEARCH_TERMS), "limit": 50}, None
+
+    def detail(self):
+        return "GET", f"/api/transactions/{self.rng.choice(self.transaction_ids)}", None, None
+
+    def summary(self):
+        params = self.date_range()
+        if self.rng.random() < 0.5:
+            params["beneficiary_id"] = self.rng.choice(self.beneficiary_ids)
+        return "GET", "/api/aggregations/summary", params, None
+
+    def by_tag(self):
+        return "GET", "/api/aggregations/by-tag", self.date_range(), None
+
+    def occasions(self):
+        return "GET", "/api/gift-occasions", None, None
+
+    def occasion_summary(self):
+        return "GET", f"/api/gift-occasions/{self.rng.choice(self.occasion_ids)}/summary", None, None
+
+    def bootstrap(self):
+        return "GET", "/api/bootstrap", None, None
+
+    def create(self):
+        body = {
+            "type": "expense",
+            "amount": max(0.01, round(self.rng.lognormvariate(3.3, 0.7), 2)),
+            "description": f"Load test {self.rng.randrange(1_000_000)}",
+            "transaction_date": (self.latest - timedelta(minutes=self.rng.randrange(60 * 24 * 30))).isoformat(),
+            "category_id": self.rng.choice(self.category_ids),
+            "beneficiary_id": self.rng.choice(self.beneficiary_ids),
+            "created_by_user_id": self.rng.choice(self.user_ids),
+            "tags": self.rng.sample(["home", "kids", "work"], self.rng.randint(0, 2)),
+        }
+        return "POST", "/api/transactions", None, body
+
+
+# Operation name: relative weight; roughly what the frontend issues while people browse and add expenses
+MIX = {
+    "list_page": 25,
+    "list_compact": 5,
+    "list_filtered": 15,
+    "search": 10,
+    "detail": 10,
+    "summary": 12,
+    "by_tag": 5,
+    "occasions": 5,
+    "occasion_summary": 5,
+    "bootstrap": 3,
+    "create": 5,
+}
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> None:
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def fetch_reference(client: httpx.AsyncClient) -> tuple[dict, datetime]:
+    bootstrap = (await client.get("/api/bootstrap")).raise_for_status().json()
+    occasions = (await client.get("/api/gift-occasions")).raise_for_status().json()
+    recent = (await client.get("/api/transactions", params={"limit": 1000})).raise_for_status().json()
+    if not recent or not occasions:
+        raise SystemExit("The server has no transactions or gift occasions; load a synthetic database first")
+    reference = {
+        **bootstrap,
+        "occasion_ids": [o["id"] for o in occasions],
+        "transaction_ids": [t["id"] for t in recent],
+    }
+    return reference, datetime.fromisoformat(recent[0]["transaction_date"])
+
+
+def percentiles(latencies: list[float]) -> dict:
+    """Milliseconds, rounded to 0.01"""
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(latencies)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        key: round(value * 1000, 2)
+        for key, value in (("p50", at(0.5)), ("p95", at(0.95)), ("p99", at(0.99)), ("max", ordered[-1]))
+    }
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        await login(client, args.email, args.password)
+        reference, latest = await fetch_reference(client)
+        workload = Workload(rng, reference, latest)
+        operations = list(MIX)
+        weights = [MIX[name] for name in operations]
+
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        statuses = defaultdict(int)
+
+        async def worker(deadline: float):
+            while time.perf_counter() < deadline:
+                name = rng.choices(operations, weights)[0]
+                method, url, params, body = getattr(workload, name)()
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, url, params=params, json=body)
+                    await response.aread()
+                except httpx.HTTPError:
+                    errors[name] += 1
+                    statuses["error"] += 1
+                    continue
+                latencies[name].append(time.perf_counter() - start)
+                statuses[str(response.status_code)] += 1
+                if response.status_code >= 400:
+                    errors[name] += 1
+
+        # Warm up caches and connections, then measure
+        await asyncio.gather(*(worker(time.perf_counter() + args.warmup) for _ in range(args.concurrency)))
+        latencies.clear()
+        errors.clear()
+        statuses.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(started + args.duration) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "seed": args.seed,
+            "mix": MIX,
+        },
+        "requests": len(every) + statuses.get("error", 0),
+        "errors": sum(errors.values()),
+        "statuses": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(every) / elapsed, 1),
+        "latency_ms": {**percentiles(every), "mean": round(statistics.fmean(every) * 1000, 2) if every else None},
+        "operations": {
+            name: {"requests": len(latencies[name]), "errors": errors[name], "latency_ms": percentiles(latencies[name])}
+            for name in operations
+        },
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    def change(new, old):
+        return f"{(new - old) / old * 100:+.0f}%" if new is not None and old else "n/a"
+
+    print(
+        f"throughput {baseline['throughput_rps']} -> {report['throughput_rps']} rps "
+        f"({change(report['throughput_rps'], baseline['throughput_rps'])})",
+        file=sys.stderr,
+    )
+    print(f"{'operation':<18}{'p50 ms':>16}{'p95 ms':>16}{'p99 ms':>16}", file=sys.stderr)
+    rows = {"overall": (report["latency_ms"], baseline["latency_ms"])}
+    for name, stats in report["operations"].items():
+        if name in baseline["operations"]:
+            rows[name] = (stats["latency_ms"], baseline["operations"][name]["latency_ms"])
+    for name, (new, old) in rows.items():
+        cells = "".join(f"{change(new[p], old[p]):>16}" for p in ("p50", "p95", "p99"))
+        print(f"{name:<18}{cells}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a realistic endpoint mix and report latency percentiles")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server to load")
+    parser.add_argument("--email", default=DEFAULT_EMAIL, help="Login (default: the synthetic data user)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the operation sequence")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+    if baseline:
+        compare(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
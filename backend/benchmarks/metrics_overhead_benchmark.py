@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request overhead of the metrics middleware and the cost of a scrape.
+
+Requests are driven straight through the ASGI interface (no HTTP client or
+server), against a minimal endpoint that returns an empty 200, once bare and
+once wrapped in MetricsMiddleware. The difference is what instrumentation adds
+to every request. A scrape is then rendered with the requested number of route
+templates having been hit.
+
+Usage:
+    uv run python benchmarks/metrics_overhead_benchmark.py
+    uv run python benchmarks/metrics_overhead_benchmark.py --requests 200000 --routes 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from app.services.metrics import MetricsMiddleware, registry  # noqa: E402
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def time_requests(app, requests: int, routes: int) -> float:
+    """Seconds per request"""
+    scopes = [
+        {"type": "http", "method": "GET", "path": f"/r{i}", "route": SimpleNamespace(path=f"/api/r{i}/{{id}}")}
+        for i in range(routes)
+    ]
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scopes[i % routes], receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def run(requests: int, routes: int, repeat: int) -> None:
+    bare, wrapped = [], []
+    instrumented = MetricsMiddleware(endpoint)
+    for _ in range(repeat):
+        bare.append(await time_requests(endpoint, requests, routes))
+        wrapped.append(await time_requests(instrumented, requests, routes))
+    bare_us = statistics.median(bare) * 1e6
+    wrapped_us = statistics.median(wrapped) * 1e6
+    print(f"{'':<22}{'us/request':>12}")
+    print(f"{'bare endpoint':<22}{bare_us:>12.2f}")
+    print(f"{'with metrics':<22}{wrapped_us:>12.2f}")
+    print(f"{'overhead':<22}{wrapped_us - bare_us:>12.2f}")
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = registry.render()
+        timings.append(time.perf_counter() - start)
+    print(
+        f"scrape: {statistics.median(timings) * 1000:.2f} ms for {len(body.encode()) / 1024:.1f} KB ({routes} routes)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure metrics middleware overhead")
+    parser.add_argument("--requests", type=int, default=100_000, help="Requests per timed run")
+    parser.add_argument("--routes", type=int, default=30, help="Distinct route templates to spread requests over")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs (median is reported)")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.routes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark transaction full-text search (FTS5) against LIKE '%...%' scans.
+
+Builds a throwaway SQLite database with the application schema (including the FTS
+triggers), loads synthetic transactions and times both search strategies for a
+few terms, mirroring the list endpoint (filter, order, limit 100).
+
+Usage:
+    uv run python benchmarks/search_benchmark.py
+    uv run python benchmarks/search_benchmark.py --rows 100000 --repeat 10
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app import models  # noqa: E402, F401
+from app.database.session import Base  # noqa: E402
+from app.services.transactions import FTS_WEIGHTS, build_fts_query  # noqa: E402
+
+WORDS = (
+    "groceries supermarket bakery butcher fuel parking train bus taxi pharmacy dentist doctor school books "
+    "cinema concert restaurant coffee lunch dinner rent insurance electricity water internet phone gym "
+    "birthday present holiday hotel flight museum zoo shoes clothes haircut vet garden hardware repair"
+).split()
+TAGS = ("kids", "work", "holiday", "health", "car", "home", "gift")
+SYLLABLES = ("ka", "lo", "mi", "ren", "tor", "va", "zu", "bel", "dor", "fin", "gra", "hul")
+# Long tail of merchant names, so searches range from very common words to rare names
+MERCHANTS = sorted({a.capitalize() + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES})
+# (label, term): common word, prefix, two words, rare merchant, no match
+TERMS = (
+    ("common word", "dentist"),
+    ("prefix", "hol"),
+    ("two words", "birthday present"),
+    ("rare merchant", MERCHANTS[100]),
+    ("no match", "zzz"),
+)
+
+LIKE_SQL = (
+    "SELECT id FROM transactions WHERE description LIKE :p OR notes LIKE :p OR tags LIKE :p "
+    "ORDER BY transaction_date DESC LIMIT 100"
+)
+FTS_SQL = (
+    "SELECT t.id FROM transactions AS t JOIN transactions_fts ON transactions_fts.rowid = t.id "
+    "WHERE transactions_fts MATCH :q ORDER BY bm25(transactions_fts, {weights}), t.transaction_date DESC LIMIT 100"
+).format(weights=", ".join(str(w) for w in FTS_WEIGHTS))
+
+COUNT_SQL = "SELECT count(*) FROM transactions_fts WHERE transactions_fts MATCH :q"
+
+
+def build_database(path: str, rows: int) -> float:
+    """Create the schema and load synthetic rows; returns the load time in seconds"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (name, is_active, created_at) VALUES ('Bench', 1, '2024-01-01')")
+    conn.execute("INSERT INTO categories (name, type, updated_at) VALUES ('Bench', 'BOTH', '2024-01-01')")
+    conn.execute("INSERT INTO beneficiaries (name, updated_at) VALUES ('Bench', '2024-01-01')")
+    start_date = datetime(2015, 1, 1)
+
+    def generate():
+        for _ in range(rows):
+            description = f"{rng.choice(WORDS).capitalize()} {rng.choice(MERCHANTS)}"
+            notes = " ".join(rng.sample(WORDS, 8)) if rng.random() < 0.3 else None
+            tags = '["' + '","'.join(rng.sample(TAGS, rng.randint(0, 2))) + '"]'
+            date = (start_date + timedelta(minutes=rng.randrange(10 * 365 * 24 * 60))).isoformat(" ")
+            yield (rng.randint(100, 50_000), date, description, "EXPENSE", notes, tags, date, date, 1, 1, 1)
+
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO transactions (amount_cents, transaction_date, description, type, notes, tags, created_at, "
+        "updated_at, category_id, beneficiary_id, created_by_user_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        generate(),
+    )
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def time_query(conn: sqlite3.Connection, sql: str, params: dict, repeat: int) -> tuple[float, int]:
+    """Median wall time in milliseconds and the number of rows returned"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(conn.execute(sql, params).fetchall())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 search against LIKE scans")
+    parser.add_argument("--rows", type=int, default=500_000, help="Number of transactions to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        load_seconds = build_database(path, args.rows)
+        print(f"Loaded {args.rows} transactions (with FTS triggers) in {load_seconds:.1f}s")
+
+        conn = sqlite3.connect(path)
+        print(f"{'search':<16}{'term':<18}{'LIKE ms':>10}{'FTS ms':>10}{'speedup':>10}{'matches':>9}")
+        for label, term in TERMS:
+            # LIKE can only do a single substring; use the first word so both return matches
+            like_ms, _ = time_query(conn, LIKE_SQL, {"p": f"%{term.split()[0]}%"}, args.repeat)
+            fts_query = build_fts_query(term)
+            fts_ms, _ = time_query(conn, FTS_SQL, {"q": fts_query}, args.repeat)
+            matches = conn.execute(COUNT_SQL, {"q": fts_query}).fetchone()[0]
+            print(f"{label:<16}{term:<18}{like_ms:>10.1f}{fts_ms:>10.2f}{like_ms / fts_ms:>9.1f}x{matches:>9}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compare FastAPI's default response serialization with the fast JSON path.
+
+Loads a page of transactions (with category, beneficiary and user) from a
+throwaway SQLite database and serializes it repeatedly in two ways:
+
+  fastapi   validate against the response model, dump to Python objects and
+            encode with the stdlib json module (what FastAPI does when a route
+            returns ORM objects)
+  fast      validate and encode straight to bytes with a cached TypeAdapter
+            (app.services.json_response.json_list_response)
+
+Both paths validate every row from ORM attributes, which dominates the total;
+the encode column isolates the part the fast path replaces. The garbage
+collector is paused while timing so its pauses do not swamp the difference.
+
+Usage:
+    uv run python benchmarks/serialization_benchmark.py
+    uv run python benchmarks/serialization_benchmark.py --page-size 500 --repeat 50
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi.utils import create_model_field  # noqa: E402
+from list_payload_benchmark import build_database  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.models import Transaction  # noqa: E402
+from app.schemas import Transaction as TransactionSchema  # noqa: E402
+from app.services.json_response import json_list_response  # noqa: E402
+
+
+async def load_page(path: str, page_size: int) -> list:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        query = (
+            select(Transaction)
+            .options(
+                selectinload(Transaction.category),
+                selectinload(Transaction.beneficiary),
+                selectinload(Transaction.created_by_user),
+            )
+            .order_by(Transaction.transaction_date.desc())
+            .limit(page_size)
+        )
+        transactions = (await db.execute(query)).scalars().all()
+    await engine.dispose()
+    return transactions
+
+
+def stdlib_encode(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def median_seconds(fn, repeat: int) -> float:
+    fn()  # warm up schema caches
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return statistics.median(timings)
+
+
+def run(path: str, page_size: int, repeat: int) -> None:
+    rows = asyncio.run(load_page(path, page_size))
+    field = create_model_field(name="Response", type_=list[TransactionSchema], mode="serialization")
+    adapter = TypeAdapter(list[TransactionSchema])
+    models = adapter.validate_python(rows, from_attributes=True)
+
+    def fastapi_path() -> bytes:
+        # The synchronous core of fastapi.routing.serialize_response followed by its JSONResponse encoding
+        value, errors = field.validate(rows, {}, loc=("response",))
+        assert not errors
+        return stdlib_encode(field.serialize(value, by_alias=True))
+
+    paths = {
+        "fastapi": (fastapi_path, lambda: stdlib_encode(adapter.dump_python(models, mode="json"))),
+        "fast": (lambda: json_list_response(TransactionSchema, rows).body, lambda: adapter.dump_json(models)),
+    }
+    assert json.loads(fastapi_path()) == json.loads(paths["fast"][0]())
+
+    print(f"{'path':<10}{'bytes':>10}{'total ms':>11}{'rows/s':>10}{'encode ms':>12}{'encode rows/s':>15}")
+    results = {}
+    for name, (total, encode) in paths.items():
+        total_s = median_seconds(total, repeat)
+        encode_s = median_seconds(encode, repeat)
+        results[name] = (total_s, encode_s)
+        print(
+            f"{name:<10}{len(total()):>10}{total_s * 1000:>11.2f}{len(rows) / total_s:>10.0f}"
+            f"{encode_s * 1000:>12.2f}{len(rows) / encode_s:>15.0f}"
+        )
+    total_speedup = results["fastapi"][0] / results["fast"][0]
+    encode_speedup = results["fastapi"][1] / results["fast"][1]
+    print(f"speedup: {total_speedup:.2f}x overall, {encode_speedup:.2f}x encoding")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare default and fast JSON list serialization")
+    parser.add_argument("--rows", type=int, default=2000, help="Number of transactions to generate")
+    parser.add_argument("--page-size", type=int, default=1000, help="Transactions per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per path (median is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.rows)
+        run(path, args.page_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
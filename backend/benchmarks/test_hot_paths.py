@@ -0,0 +1,148 @@
+import itertools
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import distinct, select
+from starlette.requests import Request
+
+from app.auth.dependencies import get_current_active_user, get_current_user
+from app.auth.security import create_access_token
+from app.models import Transaction
+from app.schemas import AggregationFilters, RuleMatchType, TransactionType
+from app.services.aggregation import get_aggregation_summary
+from app.services.categorization import RuleMatcher
+from app.services.descriptions import DescriptionIndex
+from app.services.duplicates import scan_duplicates
+from app.services.forecast import build_forecast
+
+
+async def test_aggregation_summary(bench, session_factory):
+    """All-time totals, the dashboard's first number"""
+    async with session_factory() as db:
+        await bench(lambda: get_aggregation_summary(db, AggregationFilters()))
+
+
+async def test_aggregation_summary_filtered(bench, session_factory):
+    """One year of expenses for one beneficiary"""
+    filters = AggregationFilters(
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 12, 31),
+        transaction_type=TransactionType.EXPENSE,
+        beneficiary_id=4,
+    )
+    async with session_factory() as db:
+        await bench(lambda: get_aggregation_summary(db, filters))
+
+
+async def _get_ok(client, url, **params):
+    response = await client.get(url, params=params)
+    assert response.status_code == 200, response.text
+
+
+async def test_list_transactions_first_page(bench, client):
+    await bench(lambda: _get_ok(client, "/api/transactions", limit=100))
+
+
+async def test_list_transactions_deep_page(bench, client, dataset):
+    """The last page: OFFSET has to walk past every other row"""
+    await bench(lambda: _get_ok(client, "/api/transactions", skip=dataset.transactions - 100, limit=100))
+
+
+async def test_list_gift_occasions(bench, client):
+    await bench(lambda: _get_ok(client, "/api/gift-occasions"))
+
+
+async def test_auth_dependency(bench, session_factory, dataset):
+    """Token decoding, blocklist lookup and user load, as every protected endpoint runs them"""
+    token = create_access_token(data={"sub": dataset.email})
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"authorization", f"Bearer {token}".encode())]}
+
+    async def authenticate():
+        user = await get_current_active_user(await get_current_user(Request(scope), db))
+        assert user.email == dataset.email
+
+    async with session_factory() as db:
+        await bench(authenticate)
+
+
+async def test_serve_image(bench, client, upload_dir):
+    """A 256 KB receipt photo, authenticated and streamed from the upload directory"""
+    (upload_dir / "receipt.jpg").write_bytes(b"\xff\xd8\xff" + bytes(256 * 1024))
+    await bench(lambda: _get_ok(client, "/api/images/receipt.jpg"))
+
+
+async def test_forecast(bench, session_factory):
+    """Twelve months projected from three years of history, bucketed in one query"""
+    pytest.importorskip("numpy")
+    async with session_factory() as db:
+        await bench(lambda: build_forecast(db, months=12, history_months=36, today=date(2026, 1, 15)))
+
+
+async def test_categorize_descriptions(bench, session_factory):
+    """100k statement lines through a matcher with a substring rule per distinct description plus regex rules"""
+    async with session_factory() as db:
+        descriptions = (await db.scalars(select(distinct(Transaction.description)))).all()
+        rows = (await db.execute(select(Transaction.description, Transaction.amount).limit(100_000))).all()
+    rules = [
+        SimpleNamespace(
+            id=index,
+            pattern=description.split()[-1] if index % 2 else description,
+            match_type=RuleMatchType.SUBSTRING,
+            priority=index % 7,
+            category_id=index,
+            beneficiary_id=None if index % 3 else index,
+            transaction_type=None,
+            min_amount=None,
+            max_amount=None,
+        )
+        for index, description in enumerate(descriptions, 1)
+    ]
+    rules += [
+        SimpleNamespace(
+            id=1000 + index,
+            pattern=pattern,
+            match_type=RuleMatchType.REGEX,
+            priority=50,
+            category_id=None,
+            beneficiary_id=index,
+            transaction_type=TransactionType.EXPENSE,
+            min_amount=None,
+            max_amount=None,
+        )
+        for index, pattern in enumerate((r"^(super|farmers)", r"\bpizza\b", r"tickets?$", r"\d{4}"))
+    ]
+    matcher = RuleMatcher(rules)
+    lines = list(itertools.islice(itertools.cycle(rows), 100_000))
+
+    async def categorize():
+        for description, amount in lines:
+            matcher.suggest(description, amount, TransactionType.EXPENSE)
+
+    await bench(categorize, warmup=1, max_rounds=10)
+
+
+async def test_suggest_descriptions(bench, session_factory):
+    """Typing a description: one suggestion per keystroke, with a write between descriptions"""
+    index = DescriptionIndex()
+    async with session_factory() as db:
+        await index.load(db)
+        descriptions = (await db.scalars(select(distinct(Transaction.description)).limit(20))).all()
+
+        async def type_descriptions():
+            for description in descriptions:
+                for length in range(1, len(description) + 1):
+                    await index.suggest(db, description[:length])
+                index.record(description, date.today())
+
+        await bench(type_descriptions, warmup=1, max_rounds=20)
+
+
+async def test_scan_duplicates(bench, session_factory):
+    """Full duplicate scan: one pass over every transaction in (amount, date) order"""
+
+    async def scan():
+        async with session_factory() as db:
+            await scan_duplicates(db)
+
+    await bench(scan, warmup=1, max_rounds=5)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Export transactions from the SQLite database file to Parquet, Arrow IPC or CSV.
+
+Reads the database directly (no running API needed) and writes record batches,
+so memory stays bounded for large histories. Parquet and Arrow need the optional
+analytics extra: uv sync --extra analytics
+
+Usage:
+    # Export everything to Parquet
+    uv run python export_transactions.py --output transactions.parquet
+
+    # Export a date range from a specific database file as an Arrow IPC stream
+    uv run python export_transactions.py --db data/budget_tracker.db --format arrow \\
+        --start-date 2024-01-01 --end-date 2024-12-31 --output 2024.arrow
+
+    # Compare file size and throughput of CSV, Arrow and Parquet
+    uv run python export_transactions.py --compare
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from sqlalchemy import Engine, create_engine  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.schemas import ExportFormat, TransactionFilters  # noqa: E402
+from app.services import columnar_export  # noqa: E402
+from app.services.export import EXPORT_BATCH_SIZE, build_export_query, encode_csv  # noqa: E402
+
+FORMAT_BY_EXTENSION = {".parquet": ExportFormat.PARQUET, ".arrow": ExportFormat.ARROW, ".csv": ExportFormat.CSV}
+
+
+def get_db_path() -> str:
+    """Extract the database file path from the DATABASE_URL."""
+    url = settings.DATABASE_URL
+    for prefix in ["sqlite+aiosqlite:///", "sqlite:///"]:
+        if url.startswith(prefix):
+            return url[len(prefix) :]
+    return url
+
+
+def write_csv_export(engine: Engine, output, filters: TransactionFilters) -> int:
+    """Write a CSV export using the same encoder as the streaming API endpoint."""
+    rows_written = 0
+    output.write(encode_csv((), header=True))
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(build_export_query(filters))
+        for partition in result.partitions():
+            output.write(encode_csv(partition))
+            rows_written += len(partition)
+    return rows_written
+
+
+def export(engine: Engine, path: Path, export_format: ExportFormat, filters: TransactionFilters) -> int:
+    """Export to a file and return the number of rows written."""
+    with open(path, "wb") as output:
+        if export_format == ExportFormat.CSV:
+            return write_csv_export(engine, output, filters)
+        return columnar_export.write_columnar_export(engine, output, export_format, filters)
+
+
+def compare_formats(engine: Engine, filters: TransactionFilters) -> None:
+    """Export in every format and print size and throughput relative to CSV."""
+    print(f"{'format':<10}{'rows':>10}{'size (KB)':>12}{'vs csv':>9}{'seconds':>10}{'rows/s':>12}")
+    csv_size = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for export_format in (ExportFormat.CSV, ExportFormat.ARROW, ExportFormat.PARQUET):
+            path = Path(tmp) / f"transactions.{export_format.value}"
+            start = time.perf_counter()
+            rows = export(engine, path, export_format, filters)
+            elapsed = time.perf_counter() - start
+            size = path.stat().st_size
+            csv_size = csv_size or size
+            print(
+                f"{export_format.value:<10}{rows:>10}{size / 1024:>12.1f}{size / csv_size:>9.2f}"
+                f"{elapsed:>10.3f}{rows / elapsed if elapsed else 0:>12.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export transactions to Parquet, Arrow IPC or CSV",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--db", type=str, default=None, help="Path to the SQLite database (default: DATABASE_URL)")
+    parser.add_argument("--output", type=Path, help="Output file (format inferred from extension)")
+    parser.add_argument("--format", choices=[f.value for f in FORMAT_BY_EXTENSION.values()], help="Output format")
+    parser.add_argument("--start-date", type=datetime.fromisoformat, help="Only export transactions on/after date")
+    parser.add_argument("--end-date", type=datetime.fromisoformat, help="Only export transactions on/before date")
+    parser.add_argument("--compare", action="store_true", help="Compare size and throughput of all formats")
+
+    args = parser.parse_args()
+
+    db_path = args.db or get_db_path()
+    if not os.path.exists(db_path):
+        print(f"Error: Database file not found: {db_path}")
+        sys.exit(1)
+
+    export_format = None
+    if not args.compare:
+        if not args.output:
+            parser.error("--output is required unless --compare is given")
+        export_format = ExportFormat(args.format) if args.format else FORMAT_BY_EXTENSION.get(args.output.suffix)
+        if export_format is None:
+            parser.error("Could not infer format from output extension; pass --format")
+
+    if not columnar_export.is_available() and export_format != ExportFormat.CSV:
+        print("Error: pyarrow is not installed. Run: uv sync --extra analytics")
+        sys.exit(1)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    filters = TransactionFilters(start_date=args.start_date, end_date=args.end_date)
+
+    try:
+        if args.compare:
+            compare_formats(engine, filters)
+            return
+
+        start = time.perf_counter()
+        rows = export(engine, args.output, export_format, filters)
+        elapsed = time.perf_counter() - start
+        print(f"Exported {rows} transactions to {args.output} ({export_format.value}) in {elapsed:.2f}s")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
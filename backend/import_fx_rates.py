@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Import daily exchange rates from a local CSV file into the SQLite database.
+
+Accepts the same files as POST /api/fx-rates/import: either date,currency,rate
+columns (rates in base currency units per unit), or a date column followed by
+one column per currency quoting units per base currency unit, like the ECB's
+eurofxref-hist.csv. Days missing between a currency's first and last rate
+repeat the previous rate.
+
+A running server keeps its cached rates and budget reports until it restarts;
+import through the API to refresh them immediately.
+
+Usage:
+    uv run python import_fx_rates.py eurofxref-hist.csv
+    uv run python import_fx_rates.py --db data/budget_tracker.db rates.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.services.fx import STORE_BATCH_SIZE, daily_rows, parse_rates_csv, upsert_statement  # noqa: E402
+
+
+def get_db_path() -> str:
+    """Extract the database file path from the DATABASE_URL."""
+    url = settings.DATABASE_URL
+    for prefix in ["sqlite+aiosqlite:///", "sqlite:///"]:
+        if url.startswith(prefix):
+            return url[len(prefix) :]
+    return url
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import daily exchange rates from a CSV file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("file", type=Path, help="CSV file with exchange rates")
+    parser.add_argument("--db", type=str, default=None, help="Path to the SQLite database (default: DATABASE_URL)")
+
+    args = parser.parse_args()
+
+    db_path = args.db or get_db_path()
+    if not os.path.exists(db_path):
+        print(f"Error: Database file not found: {db_path}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        with open(args.file, newline="", encoding="utf-8-sig") as stream:
+            rates = parse_rates_csv(stream)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        print(f"Error: Could not read {args.file}: {e}")
+        sys.exit(1)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    rows = 0
+    batch = []
+    try:
+        with engine.begin() as conn:
+            for row in daily_rows(rates):
+                batch.append(row)
+                if len(batch) >= STORE_BATCH_SIZE:
+                    conn.execute(upsert_statement(), batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                conn.execute(upsert_statement(), batch)
+                rows += len(batch)
+    finally:
+        engine.dispose()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Stored {rows} daily rates for {', '.join(sorted(rates))} "
+        f"(base currency {settings.BASE_CURRENCY}) in {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
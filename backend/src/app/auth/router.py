@@ -26,6 +26,7 @@ from app.auth.service import (
 )
 from app.database.session import get_db
 from app.models.user import User
+from app.services.events import publish_change
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     try:
         user = await register_user(db, user_data)
+        await publish_change("users", "created", user.id)
         return user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -15,6 +15,66 @@ class Settings(BaseSettings):
     upload_dir: Path = Path("data/uploads")
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
 
+    # Statement imports
+    IMPORT_BATCH_SIZE: int = 500  # Rows inserted per commit
+    BULK_CREATE_MAX: int = 1000  # Transactions accepted by one POST /transactions/bulk
+    IMPORT_MAX_FILE_SIZE: int = 200 * 1024 * 1024  # 200MB
+    IMPORT_STALE_SECONDS: int = 600  # A running job without a committed batch for this long is taken as crashed
+
+    # Currencies
+    BASE_CURRENCY: str = "EUR"  # Totals, budgets and forecasts are converted to this currency
+    FX_RATE_CACHE_SIZE: int = 4096  # (currency, day) exchange rate lookups kept in memory
+
+    # Archive
+    ARCHIVE_DIR: Path = Path("data/archive")  # Parquet segments and monthly rollups of archived years
+
+    # Budgets
+    BUDGET_NEAR_PERCENT: float = 90.0  # Spending at least this share of a budget reports "near"
+    BUDGET_STATUS_CACHE_MONTHS: int = 24  # Months of /budgets/status results kept in memory
+
+    # Recurring transactions
+    RECURRING_SCHEDULER_ENABLED: bool = True  # Materialize due occurrences in the background
+    RECURRING_INTERVAL_SECONDS: float = 3600.0  # Seconds between scheduler runs (it also runs at startup)
+    RECURRING_BATCH_SIZE: int = 500  # Occurrences inserted per commit
+
+    # Cash-flow forecast
+    FORECAST_HISTORY_MONTHS: int = 36  # Complete months of history the projection is based on by default
+    FORECAST_MAX_MONTHS: int = 60  # Longest projection /forecast accepts
+    FORECAST_RECURRING_MONTHS: int = 3  # An exact amount seen once in each of this many last months is recurring
+
+    # Description autocomplete
+    DESCRIPTION_INDEX_MAX_ENTRIES: int = 20_000  # Distinct descriptions kept in memory; the least used are dropped
+    DESCRIPTION_RECENCY_HALF_LIFE_DAYS: float = 90.0  # A description's use count counts half after this many days
+
+    # Duplicate detection
+    DUPLICATE_DATE_WINDOW_DAYS: int = 3  # Same-amount transactions at most this many days apart can be duplicates
+    DUPLICATE_SIMILARITY_THRESHOLD: float = 0.5  # Minimum description similarity (0-1) for a duplicate
+
+    # Server-Sent Events
+    EVENT_BACKEND: str = "local"  # or "package.module:ClassName" for cross-worker fan-out
+    EVENT_QUEUE_SIZE: int = 100  # Pending events per connection before it is told to resync
+    EVENT_HEARTBEAT_SECONDS: float = 15.0
+    EVENT_RETRY_MS: int = 3000  # Client reconnect delay
+
+    # Query instrumentation
+    SLOW_QUERY_MS: float = 100.0  # Statements at least this slow are logged and kept for /api/debug/queries
+    QUERY_COUNT_WARN: int = 30  # Log a warning for requests issuing more statements than this
+    REQUEST_DB_TIME_WARN_MS: float = 500.0  # ... or spending longer than this in the database
+    QUERY_LOG_SIZE: int = 100  # Recent requests and slow statements kept in memory
+
+    # Prometheus metrics
+    # With several workers, point this at a directory shared by them (emptied on deploy) so /metrics merges all
+    METRICS_DIR: Path | None = None
+    METRICS_FLUSH_SECONDS: float = 5.0
+
+    # Health checks
+    HEALTH_CACHE_SECONDS: float = 5.0  # Probe results are reused for this long
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0  # A single check taking longer fails
+    HEALTH_DB_SLOW_MS: float = 250.0  # Database query slower than this reports "warn"
+    HEALTH_WAL_WARN_BYTES: int = 64 * 1024 * 1024  # WAL file larger than this reports "warn"
+    HEALTH_MIN_FREE_MB: int = 100  # Less free space next to the uploads fails readiness
+    HEALTH_MISSED_BEATS: int = 3  # Background loops silent for this many intervals fail liveness
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production-use-openssl-rand-hex-32"
     ALGORITHM: str = "HS256"
@@ -1,9 +1,11 @@
+from .instrumentation import QueryStats, instrument_engine, query_log, track_queries
 from .session import (
     AsyncSessionLocal,
     Base,
     SessionLocal,
     async_engine,
     get_db,
+    get_session_factory,
     init_db,
     sync_engine,
 )
@@ -13,7 +15,12 @@ __all__ = [
     "SessionLocal",
     "AsyncSessionLocal",
     "get_db",
+    "get_session_factory",
     "init_db",
     "sync_engine",
     "async_engine",
+    "QueryStats",
+    "instrument_engine",
+    "query_log",
+    "track_queries",
 ]
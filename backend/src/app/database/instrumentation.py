@@ -0,0 +1,202 @@
+"""SQL statement counting and slow-query capture.
+
+``instrument_engine`` hooks an engine's cursor events. Every statement is timed and recorded into the
+:class:`QueryStats` of the innermost active :func:`track_queries` block (and the blocks enclosing it), which is
+found through a contextvar, so concurrent requests never see each other's numbers. The HTTP middleware opens one
+block per request; tests open their own to assert query budgets.
+
+SQL is normalized (literals and placeholder lists collapsed) so the same statement groups together regardless
+of its parameters. Statements slower than ``SLOW_QUERY_MS`` are logged, and a small in-process
+:class:`QueryLog` keeps recent requests, recent slow statements and per-statement totals for the debug endpoint.
+"""
+
+import logging
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Distinct normalized statements tracked for the per-statement totals
+MAX_TRACKED_STATEMENTS = 500
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, literals and ``IN (?, ?, ...)`` lists so equivalent statements compare equal"""
+    sql = _STRING_RE.sub("?", statement)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PLACEHOLDER_LIST_RE.sub("(?, ...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+@dataclass
+class SlowQuery:
+    sql: str
+    duration_ms: float
+    path: Optional[str] = None
+    at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed inside one :func:`track_queries` block"""
+
+    count: int = 0
+    total_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    slow: List[SlowQuery] = field(default_factory=list)
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+    def record(self, sql: str, duration_ms: float, slow: bool) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.statements[sql] += 1
+            if slow:
+                stats.slow.append(SlowQuery(sql=sql, duration_ms=duration_ms))
+            stats = stats.parent
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value, e.g. ``db;dur=3.2;desc="4 queries"``"""
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Record the statements executed in this block; blocks nest, outer ones see inner statements too"""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@dataclass
+class RequestQueries:
+    method: str
+    path: str
+    status_code: int
+    count: int
+    total_ms: float
+    slow_count: int
+    at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class StatementTotals:
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class QueryLog:
+    """Recent per-request numbers, recent slow statements and running per-statement totals"""
+
+    def __init__(self, size: int):
+        self.requests: deque[RequestQueries] = deque(maxlen=size)
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=size)
+        self.statements: Dict[str, StatementTotals] = {}
+        # Process-wide totals, never reset; exported by /metrics
+        self.statement_count = 0
+        self.statement_seconds = 0.0
+        self.slow_count = 0
+
+    def record_statement(self, sql: str, duration_ms: float, slow: bool = False) -> None:
+        self.statement_count += 1
+        self.statement_seconds += duration_ms / 1000
+        self.slow_count += slow
+        totals = self.statements.get(sql)
+        if totals is None:
+            if len(self.statements) >= MAX_TRACKED_STATEMENTS:
+                return
+            totals = self.statements[sql] = StatementTotals(sql=sql)
+        totals.count += 1
+        totals.total_ms += duration_ms
+        totals.max_ms = max(totals.max_ms, duration_ms)
+
+    def record_request(self, method: str, path: str, status_code: int, stats: QueryStats) -> None:
+        """Keep the request's numbers and log a warning when it exceeds the configured budgets"""
+        self.requests.append(
+            RequestQueries(
+                method=method,
+                path=path,
+                status_code=status_code,
+                count=stats.count,
+                total_ms=round(stats.total_ms, 2),
+                slow_count=len(stats.slow),
+            )
+        )
+        for slow in stats.slow:
+            slow.path = path
+            self.slow_queries.append(slow)
+
+        if stats.count > settings.QUERY_COUNT_WARN or stats.total_ms > settings.REQUEST_DB_TIME_WARN_MS:
+            sql, repeats = stats.statements.most_common(1)[0]
+            logger.warning(
+                f"{method} {path} issued {stats.count} queries in {stats.total_ms:.1f} ms; "
+                f"most repeated ({repeats}x): {sql[:200]}"
+            )
+
+    def top_statements(self, limit: int = 20) -> List[StatementTotals]:
+        return sorted(self.statements.values(), key=lambda s: s.total_ms, reverse=True)[:limit]
+
+    def clear(self) -> None:
+        self.requests.clear()
+        self.slow_queries.clear()
+        self.statements.clear()
+
+
+query_log = QueryLog(settings.QUERY_LOG_SIZE)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - context._query_started) * 1000
+    sql = normalize_sql(statement)
+    slow = duration_ms >= settings.SLOW_QUERY_MS
+    if slow:
+        logger.warning(f"Slow query ({duration_ms:.1f} ms): {sql[:500]}")
+    query_log.record_statement(sql, duration_ms, slow)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(sql, duration_ms, slow)
+
+
+def instrument_engine(engine: Engine | AsyncEngine) -> None:
+    """Time and record every statement executed on ``engine``"""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -4,6 +4,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config.settings import settings
+from app.database.instrumentation import instrument_engine
 
 Base = declarative_base()
 
@@ -21,6 +22,7 @@ async_database_url = (
 )
 
 async_engine = create_async_engine(async_database_url, future=True)
+instrument_engine(async_engine)
 AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -30,6 +32,11 @@ async def get_db():
         yield session
 
 
+def get_session_factory() -> async_sessionmaker:
+    """Session factory dependency for work that outlives the request (e.g. background jobs)"""
+    return AsyncSessionLocal
+
+
 async def init_db():
     """Initialize database tables
 
@@ -12,7 +12,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.auth.router import router as auth_router
 from app.config.settings import settings
-from app.database import AsyncSessionLocal, init_db
+from app.database import AsyncSessionLocal, init_db, query_log, track_queries
 from app.models import (
     Beneficiary,
     Category,
@@ -24,12 +24,27 @@ from app.models import (
 from app.routers import (
     aggregations,
     beneficiaries,
+    bootstrap,
+    budgets,
     categories,
+    categorization_rules,
+    debug,
+    events,
+    forecast,
+    fx_rates,
     gift_occasions,
+    health,
     images,
+    imports,
+    metrics,
+    recurring,
+    sync,
     transactions,
     users,
 )
+from app.services.events import event_bus
+from app.services.metrics import MetricsMiddleware, registry
+from app.services.recurring import recurring_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -155,11 +170,18 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing database...")
     await init_db()
     # await seed_data()
+    await event_bus.start()
+    await registry.start()
+    if settings.RECURRING_SCHEDULER_ENABLED:
+        await recurring_scheduler.start(AsyncSessionLocal, settings.RECURRING_INTERVAL_SECONDS)
     logger.info("Application startup complete!")
 
     yield
 
     # Shutdown
+    await recurring_scheduler.stop()
+    await registry.stop()
+    await event_bus.stop()
     logger.info("Application shutdown")
 
 
@@ -207,6 +229,21 @@ async def log_exceptions_middleware(request: Request, call_next):
         return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    """Count and time the SQL statements each request issues and report them in a Server-Timing header."""
+    with track_queries() as stats:
+        response = await call_next(request)
+    response.headers.append("Server-Timing", stats.server_timing())
+    route = request.scope.get("route")
+    query_log.record_request(request.method, getattr(route, "path", request.url.path), response.status_code, stats)
+    return response
+
+
+# Outermost, so request counts and latency include the other middleware
+app.add_middleware(MetricsMiddleware)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler to log all unhandled exceptions"""
@@ -227,8 +264,20 @@ app.include_router(categories.router, prefix=settings.api_prefix)
 app.include_router(beneficiaries.router, prefix=settings.api_prefix)
 app.include_router(transactions.router, prefix=settings.api_prefix)
 app.include_router(aggregations.router, prefix=settings.api_prefix)
+app.include_router(budgets.router, prefix=settings.api_prefix)
+app.include_router(recurring.router, prefix=settings.api_prefix)
+app.include_router(forecast.router, prefix=settings.api_prefix)
+app.include_router(fx_rates.router, prefix=settings.api_prefix)
+app.include_router(categorization_rules.router, prefix=settings.api_prefix)
 app.include_router(images.router, prefix=settings.api_prefix)
 app.include_router(gift_occasions.router, prefix=settings.api_prefix)
+app.include_router(imports.router, prefix=settings.api_prefix)
+app.include_router(sync.router, prefix=settings.api_prefix)
+app.include_router(events.router, prefix=settings.api_prefix)
+app.include_router(bootstrap.router, prefix=settings.api_prefix)
+app.include_router(debug.router, prefix=settings.api_prefix)
+app.include_router(metrics.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -237,12 +286,6 @@ async def root():
     return {"message": "Budget Tracker Lite API", "version": "0.1.0", "docs": "/docs"}
 
 
-@app.get("/health")
-async def health():
-    """Health check endpoint"""
-    return {"status": "healthy"}
-
-
 if __name__ == "__main__":
     import uvicorn
 
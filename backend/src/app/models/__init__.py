@@ -1,29 +1,57 @@
-from app.schemas import CategoryType, GiftDirection, OccasionType, TransactionType
+from app.schemas import (
+    CategoryType,
+    GiftDirection,
+    ImportFormat,
+    ImportStatus,
+    OccasionType,
+    RecurrenceFrequency,
+    RuleMatchType,
+    TransactionType,
+)
 
 from .beneficiary import Beneficiary
+from .budget import Budget
+from .categorization_rule import CategorizationRule
 from .category import Category
+from .change_log import SYNCED_TABLES, ChangeLog
+from .fx_rate import FxRate
 from .gift_entry import GiftEntry
 from .gift_occasion import GiftOccasion
 from .gift_purchase import GiftPurchase
+from .import_job import ImportJob
 from .password_reset_token import PasswordResetToken
+from .recurring_rule import RecurringRule
 from .token_blocklist import TokenBlocklist
 from .transaction import Transaction
+from .transaction_tag import TransactionTag
 
 # Import all models - SQLAlchemy resolves relationships lazily by string name
 from .user import User
 
 __all__ = [
     "Beneficiary",
+    "Budget",
+    "CategorizationRule",
     "Category",
     "CategoryType",
+    "ChangeLog",
+    "FxRate",
     "GiftDirection",
     "GiftEntry",
     "GiftOccasion",
     "GiftPurchase",
+    "ImportFormat",
+    "ImportJob",
+    "ImportStatus",
     "OccasionType",
     "PasswordResetToken",
+    "RecurrenceFrequency",
+    "RecurringRule",
+    "RuleMatchType",
+    "SYNCED_TABLES",
     "TokenBlocklist",
     "Transaction",
+    "TransactionTag",
     "TransactionType",
     "User",
 ]
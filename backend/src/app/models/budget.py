@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String
+
+from app.database.session import Base
+from app.models.money import Cents
+
+
+class Budget(Base):
+    """Monthly spending limit for a category and/or beneficiary; a missing one matches every value."""
+
+    __tablename__ = "budgets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    beneficiary_id = Column(Integer, ForeignKey("beneficiaries.id"), nullable=True)
+    amount = Column("amount_cents", Cents, key="amount", nullable=False)  # Per month, exact integer cents
+    rollover = Column(Boolean, default=False, nullable=False)  # Unused amounts carry over to the next month
+    start_month = Column(Date, nullable=False)  # First day of the first month the budget applies to
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String
+
+from app.database.session import Base
+from app.models.money import Cents
+from app.schemas import RuleMatchType, TransactionType
+
+
+class CategorizationRule(Base):
+    """Picks a category and/or beneficiary for matching descriptions, see services.categorization."""
+
+    __tablename__ = "categorization_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)
+    match_type = Column(Enum(RuleMatchType), default=RuleMatchType.SUBSTRING, nullable=False)
+    pattern = Column(String(500), nullable=True)  # Case-insensitive; a missing pattern matches any description
+    transaction_type = Column(Enum(TransactionType), nullable=True)
+    min_amount = Column("min_amount_cents", Cents, key="min_amount", nullable=True)
+    max_amount = Column("max_amount_cents", Cents, key="max_amount", nullable=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    beneficiary_id = Column(Integer, ForeignKey("beneficiaries.id"), nullable=True)
+    priority = Column(Integer, default=100, nullable=False)  # Lower wins
+    active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Enum, Integer, String
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.session import Base
@@ -13,5 +15,6 @@ class Category(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
     type = Column(Enum(CategoryType), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     transactions = relationship("Transaction", back_populates="category")
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, UniqueConstraint, event
+
+from app.database.session import Base
+
+# Tables exposed through /sync; the table name is also the entity name in the change log and the sync response
+SYNCED_TABLES = (
+    "categories",
+    "beneficiaries",
+    "transactions",
+    "gift_occasions",
+    "gift_entries",
+    "gift_purchases",
+    "budgets",
+)
+
+
+class ChangeLog(Base):
+    """Change feed for delta sync: one row per synced entity, holding the sequence number of its last change.
+
+    Rows are written by triggers, so every write path is captured. A change replaces the entity's previous
+    row and gets a fresh ``seq`` (AUTOINCREMENT never reuses values), which keeps the log compact and
+    ``seq`` strictly increasing. Deletes leave a tombstone (``deleted``). SQLite has a single writer, so
+    sequence numbers become visible in order and a client cursor never skips a change.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id", name="uq_change_log_entity_entity_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+def change_log_trigger_ddl(table: str) -> tuple[str, ...]:
+    """Triggers recording inserts, updates and deletes on ``table``; also used by the e4f5a6b7c8d9 migration"""
+    record = (
+        "INSERT OR REPLACE INTO change_log (entity, entity_id, deleted, changed_at) "
+        f"VALUES ('{table}', {{row}}.id, {{deleted}}, CURRENT_TIMESTAMP);"
+    )
+    return (
+        f"CREATE TRIGGER change_log_{table}_ai AFTER INSERT ON {table} BEGIN {record.format(row='new', deleted=0)} END",
+        f"CREATE TRIGGER change_log_{table}_au AFTER UPDATE ON {table} BEGIN {record.format(row='new', deleted=0)} END",
+        f"CREATE TRIGGER change_log_{table}_ad AFTER DELETE ON {table} BEGIN {record.format(row='old', deleted=1)} END",
+    )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_log_triggers(target, connection, tables=None, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    created = {table.name for table in tables} if tables is not None else set(target.tables)
+    for table in SYNCED_TABLES:
+        if table in created:
+            for statement in change_log_trigger_ddl(table):
+                connection.exec_driver_sql(statement)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Date, Float, String
+
+from app.database.session import Base
+
+
+class FxRate(Base):
+    """Exchange rate of a currency on one day, as base currency units per unit of ``currency``.
+
+    Imports store a row for every day between the first and last rate of a file (weekends and holidays repeat
+    the previous rate), so aggregations can join on the exact day.
+    """
+
+    __tablename__ = "fx_rates"
+
+    currency = Column(String(3), primary_key=True)
+    rate_date = Column(Date, primary_key=True)
+    rate = Column(Float, nullable=False)
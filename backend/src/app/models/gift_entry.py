@@ -5,7 +5,6 @@ from sqlalchemy import (
     Date,
     DateTime,
     Enum,
-    Float,
     ForeignKey,
     Integer,
     String,
@@ -14,6 +13,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 
 from app.database.session import Base
+from app.models.money import Cents
 from app.schemas import GiftDirection
 
 
@@ -26,13 +26,14 @@ class GiftEntry(Base):
     occasion_id = Column(Integer, ForeignKey("gift_occasions.id"), nullable=False)
     direction = Column(Enum(GiftDirection), nullable=False)
     person_id = Column(Integer, ForeignKey("beneficiaries.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column("amount_cents", Cents, key="amount", nullable=False)  # Exact integer cents, see models.money
     gift_date = Column(Date, nullable=False)
     description = Column(String(200), nullable=True)
     notes = Column(Text, nullable=True)
     transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=True)
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     occasion = relationship("GiftOccasion", back_populates="gift_entries")
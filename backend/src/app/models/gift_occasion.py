@@ -31,6 +31,7 @@ class GiftOccasion(Base):
     is_pool_account = Column(Boolean, default=False, nullable=False)
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     person = relationship("Beneficiary", back_populates="gift_occasions")
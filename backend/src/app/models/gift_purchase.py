@@ -1,9 +1,10 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database.session import Base
+from app.models.money import Cents
 
 
 class GiftPurchase(Base):
@@ -13,13 +14,14 @@ class GiftPurchase(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     occasion_id = Column(Integer, ForeignKey("gift_occasions.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column("amount_cents", Cents, key="amount", nullable=False)  # Exact integer cents, see models.money
     purchase_date = Column(Date, nullable=False)
     description = Column(String(200), nullable=False)
     notes = Column(Text, nullable=True)
     transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=True)
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     occasion = relationship("GiftOccasion", back_populates="gift_purchases")
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, String
+
+from app.database.session import Base
+from app.schemas import ImportFormat, ImportStatus
+
+
+class ImportJob(Base):
+    """Bank statement import job.
+
+    The uploaded file is kept on disk under its SHA-256 digest so an interrupted import can be
+    resumed from ``rows_processed`` without re-uploading or duplicating rows.
+    """
+
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, nullable=False)
+    file_format = Column(Enum(ImportFormat), nullable=False)
+    file_sha256 = Column(String(64), nullable=False, unique=True, index=True)
+    file_path = Column(String, nullable=False)
+    options = Column(JSON, nullable=True, default=dict)  # Column mapping, date format, defaults
+    status = Column(Enum(ImportStatus), nullable=False, default=ImportStatus.PENDING)
+    total_bytes = Column(Integer, nullable=False, default=0)
+    bytes_processed = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)
+    rows_duplicate = Column(Integer, nullable=False, default=0)  # Left out as copies of existing transactions
+    errors = Column(JSON, nullable=True, default=list)  # First few row-level error messages
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
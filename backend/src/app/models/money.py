@@ -0,0 +1,35 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value) -> int:
+    """Convert an amount (Decimal, int, str or float) to integer minor units, rounding half up"""
+    if isinstance(value, float):
+        # repr() gives the shortest decimal that round-trips, so 0.1 becomes 10 cents, not 10.000000000000000555
+        value = repr(value)
+    return int(Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2).quantize(CENT)
+
+
+class Cents(TypeDecorator):
+    """Money stored as an INTEGER number of cents and exposed as a two-place ``Decimal``.
+
+    SQL aggregates (``SUM``, ``TOTAL``, comparisons) run on exact integers; values bound in expressions such as
+    ``Transaction.amount > 100`` are converted to cents as well.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else from_cents(int(value))
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Enum, ForeignKey, Integer, String, Text
+
+from app.database.session import Base
+from app.models.money import Cents
+from app.schemas import RecurrenceFrequency, TransactionType
+
+
+class RecurringRule(Base):
+    """Template for a transaction that repeats (rent, salary, allowances), materialized by services.recurring."""
+
+    __tablename__ = "recurring_rules"
+    # Ids are part of each occurrence's import_key, so a deleted rule's id must never be handed out again
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    type = Column(Enum(TransactionType), nullable=False)
+    amount = Column("amount_cents", Cents, key="amount", nullable=False)  # Exact integer cents, see models.money
+    description = Column(String, nullable=False)
+    notes = Column(Text, nullable=True)
+    tags = Column(JSON, nullable=True, default=list)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    beneficiary_id = Column(Integer, ForeignKey("beneficiaries.id"), nullable=False)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Schedule: every `interval` days/weeks/months/years from start_date, optionally until end_date
+    frequency = Column(Enum(RecurrenceFrequency), nullable=False)
+    interval = Column(Integer, default=1, nullable=False)
+    day_of_month = Column(Integer, nullable=True)  # Monthly/yearly; clamped to the last day of shorter months
+    weekday = Column(Integer, nullable=True)  # Weekly; 0 = Monday
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    active = Column(Boolean, default=True, nullable=False)
+    # Every occurrence up to and including this date has been materialized
+    materialized_through = Column(Date, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,19 +1,23 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Column,
     DateTime,
     Enum,
-    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    event,
 )
 from sqlalchemy.orm import relationship
 
+from app.config.settings import settings
 from app.database.session import Base
+from app.models.money import Cents
 from app.schemas import TransactionType
 
 
@@ -21,9 +25,15 @@ class Transaction(Base):
     """Transaction model for budget tracking."""
 
     __tablename__ = "transactions"
+    # Duplicate detection looks up same-amount transactions around a date, and scans them in this order
+    __table_args__ = (Index("ix_transactions_amount_cents_transaction_date", "amount", "transaction_date"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float, nullable=False)
+    amount = Column("amount_cents", Cents, key="amount", nullable=False)  # Exact integer cents, see models.money
+    # ISO 4217 code of amount; rows written outside the ORM get the base currency as well
+    currency = Column(
+        String(3), nullable=False, default=lambda: settings.BASE_CURRENCY, server_default=settings.BASE_CURRENCY
+    )
     transaction_date = Column(DateTime, nullable=False, index=True)
     description = Column(String, nullable=False)
     type = Column(Enum(TransactionType), nullable=False, index=True)
@@ -31,6 +41,10 @@ class Transaction(Base):
     notes = Column(Text, nullable=True)  # Free text field for large notes
     tags = Column(JSON, nullable=True, default=list)  # List of strings
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Stable per-row key for imported and recurring transactions; makes re-running an import or the recurring
+    # scheduler idempotent
+    import_key = Column(String, nullable=True, unique=True)
 
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     beneficiary_id = Column(Integer, ForeignKey("beneficiaries.id"), nullable=False)
@@ -41,3 +55,28 @@ class Transaction(Base):
     created_by_user = relationship("User", back_populates="transactions")
     gift_entries = relationship("GiftEntry", back_populates="transaction")
     gift_purchases = relationship("GiftPurchase", back_populates="transaction")
+
+
+# Full-text index over description, notes and tags. The FTS table keeps its own copy of the text (needed for
+# highlight/snippet) keyed by transaction id, and is kept in sync by triggers. The same statements are
+# applied to existing databases by the c2d3e4f5a6b7 migration.
+TRANSACTION_FTS_TAGS = "(SELECT group_concat(value, ' ') FROM json_each(coalesce({row}.tags, '[]')))"
+TRANSACTION_FTS_INSERT = (
+    "INSERT INTO transactions_fts(rowid, description, notes, tags) "
+    f"VALUES (new.id, new.description, new.notes, {TRANSACTION_FTS_TAGS.format(row='new')});"
+)
+TRANSACTION_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, notes, tags, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    f"CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN {TRANSACTION_FTS_INSERT} END",
+    "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    "DELETE FROM transactions_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF description, notes, tags ON transactions BEGIN "
+    f"DELETE FROM transactions_fts WHERE rowid = old.id; {TRANSACTION_FTS_INSERT} END",
+)
+
+for statement in TRANSACTION_FTS_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Transaction.__table__, "after_drop", DDL("DROP TABLE IF EXISTS transactions_fts").execute_if(dialect="sqlite")
+)
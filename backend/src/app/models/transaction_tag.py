@@ -0,0 +1,34 @@
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, String, event
+
+from app.database.session import Base
+
+
+class TransactionTag(Base):
+    """One row per (transaction, tag), derived from ``Transaction.tags`` for indexed tag filters and rollups.
+
+    The JSON column stays the source of truth; this table is maintained by triggers on ``transactions``
+    so every write path (ORM, bulk inserts, imports) keeps it in sync.
+    """
+
+    __tablename__ = "transaction_tags"
+    __table_args__ = (Index("ix_transaction_tags_tag_transaction_id", "tag", "transaction_id"),)
+
+    transaction_id = Column(Integer, ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True)
+
+
+# The same statements are applied to existing databases by the d3e4f5a6b7c8 migration
+TRANSACTION_TAGS_INSERT = (
+    "INSERT OR IGNORE INTO transaction_tags (transaction_id, tag) "
+    "SELECT new.id, value FROM json_each(coalesce(new.tags, '[]')) WHERE type = 'text';"
+)
+TRANSACTION_TAGS_DDL = (
+    f"CREATE TRIGGER transaction_tags_ai AFTER INSERT ON transactions BEGIN {TRANSACTION_TAGS_INSERT} END",
+    "CREATE TRIGGER transaction_tags_ad AFTER DELETE ON transactions BEGIN "
+    "DELETE FROM transaction_tags WHERE transaction_id = old.id; END",
+    "CREATE TRIGGER transaction_tags_au AFTER UPDATE OF tags ON transactions BEGIN "
+    f"DELETE FROM transaction_tags WHERE transaction_id = old.id; {TRANSACTION_TAGS_INSERT} END",
+)
+
+for statement in TRANSACTION_TAGS_DDL:
+    event.listen(TransactionTag.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -1,11 +1,13 @@
+from typing import List
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth.dependencies import get_current_active_user
 from ..database import get_db
 from ..models import User
-from ..schemas import AggregationFilters, AggregationSummary
-from ..services.aggregation import get_aggregation_summary
+from ..schemas import AggregationFilters, AggregationSummary, TagAggregation
+from ..services.aggregation import get_aggregation_summary, get_tag_aggregations
 
 router = APIRouter(prefix="/aggregations", tags=["aggregations"])
 
@@ -27,3 +29,18 @@ async def aggregation_summary(
     - Set end_date to today
     """
     return await get_aggregation_summary(db, filters)
+
+
+@router.get("/by-tag", response_model=List[TagAggregation])
+async def aggregation_by_tag(
+    filters: AggregationFilters = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get income and expense totals per tag, largest expenses first
+
+    Accepts the same filters as the summary. Untagged transactions are not included, and a transaction
+    with several tags counts towards each of them.
+    """
+    return await get_tag_aggregations(db, filters)
@@ -9,6 +9,7 @@ from ..database import get_db
 from ..models import Beneficiary as BeneficiaryModel
 from ..models import User
 from ..schemas import Beneficiary, BeneficiaryCreate, BeneficiaryUpdate
+from ..services.events import publish_change
 
 router = APIRouter(prefix="/beneficiaries", tags=["beneficiaries"])
 
@@ -34,6 +35,7 @@ async def create_beneficiary(
     db_beneficiary = BeneficiaryModel(**beneficiary.model_dump())
     db.add(db_beneficiary)
     await db.commit()
+    await publish_change("beneficiaries", "created", db_beneficiary.id)
     await db.refresh(db_beneficiary)
     return db_beneficiary
 
@@ -69,6 +71,7 @@ async def update_beneficiary(
         setattr(db_beneficiary, key, value)
 
     await db.commit()
+    await publish_change("beneficiaries", "updated", beneficiary_id)
     await db.refresh(db_beneficiary)
     return db_beneficiary
 
@@ -87,3 +90,4 @@ async def delete_beneficiary(
 
     await db.delete(db_beneficiary)
     await db.commit()
+    await publish_change("beneficiaries", "deleted", beneficiary_id)
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..database import get_db
+from ..models import User
+from ..schemas import Bootstrap
+from ..services.reference_cache import reference_cache
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+
+def _etag(version: str, user: User) -> str:
+    # The payload embeds the current user, so the tag is per user as well as per reference version
+    return f'"{version}-{user.id}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+@router.get("", response_model=Bootstrap, responses={304: {"description": "Reference data has not changed"}})
+async def bootstrap(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get the current user together with all users, categories and beneficiaries
+
+    Served from an in-process cache. Send the returned `ETag` back as `If-None-Match` to get a `304 Not Modified`
+    without any reference data being read while nothing has changed.
+    """
+    etag = _etag(reference_cache.version, current_user)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    version, data = await reference_cache.get(db)
+    response.headers["ETag"] = _etag(version, current_user)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return Bootstrap(
+        version=version,
+        user=current_user,
+        users=data.users,
+        categories=data.categories,
+        beneficiaries=data.beneficiaries,
+    )
@@ -0,0 +1,112 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..database import get_db
+from ..models import Budget as BudgetModel
+from ..models import User
+from ..schemas import Budget, BudgetCreate, BudgetStatusReport, BudgetUpdate
+from ..services.budgets import budget_status_cache, parse_month
+from ..services.events import publish_change
+
+router = APIRouter(prefix="/budgets", tags=["budgets"])
+
+
+@router.get("", response_model=List[Budget])
+async def list_budgets(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List all budgets"""
+    result = await db.execute(select(BudgetModel).order_by(BudgetModel.name, BudgetModel.id))
+    return result.scalars().all()
+
+
+@router.post("", response_model=Budget, status_code=status.HTTP_201_CREATED)
+async def create_budget(
+    budget: BudgetCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Create a new budget"""
+    db_budget = BudgetModel(**budget.model_dump())
+    db.add(db_budget)
+    await db.commit()
+    await publish_change("budgets", "created", db_budget.id)
+    await db.refresh(db_budget)
+    return db_budget
+
+
+@router.get("/status", response_model=BudgetStatusReport)
+async def get_budget_status(
+    month: Optional[str] = Query(
+        None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM; defaults to the current month"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Spending against every budget that applies to a month
+
+    Each budget reports what it has available (its amount plus, for rollover budgets, what was left of
+    earlier months), what was spent, and whether that is `under`, `near` or `over` budget.
+    """
+    period = parse_month(month) if month else date.today().replace(day=1)
+    return await budget_status_cache.get(db, period)
+
+
+@router.get("/{budget_id}", response_model=Budget)
+async def get_budget(
+    budget_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get a budget by ID"""
+    result = await db.execute(select(BudgetModel).where(BudgetModel.id == budget_id))
+    budget = result.scalar_one_or_none()
+    if not budget:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return budget
+
+
+@router.put("/{budget_id}", response_model=Budget)
+async def update_budget(
+    budget_id: int,
+    budget: BudgetUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Update a budget"""
+    result = await db.execute(select(BudgetModel).where(BudgetModel.id == budget_id))
+    db_budget = result.scalar_one_or_none()
+    if not db_budget:
+        raise HTTPException(status_code=404, detail="Budget not found")
+
+    for key, value in budget.model_dump(exclude_unset=True).items():
+        setattr(db_budget, key, value)
+
+    await db.commit()
+    await publish_change("budgets", "updated", budget_id)
+    await db.refresh(db_budget)
+    return db_budget
+
+
+@router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_budget(
+    budget_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Delete a budget"""
+    result = await db.execute(select(BudgetModel).where(BudgetModel.id == budget_id))
+    db_budget = result.scalar_one_or_none()
+    if not db_budget:
+        raise HTTPException(status_code=404, detail="Budget not found")
+
+    await db.delete(db_budget)
+    await db.commit()
+    await publish_change("budgets", "deleted", budget_id)
@@ -10,6 +10,7 @@ from ..models import Category as CategoryModel
 from ..models import Transaction as TransactionModel
 from ..models import User
 from ..schemas import Category, CategoryCreate, CategoryUpdate
+from ..services.events import publish_change
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -35,6 +36,7 @@ async def create_category(
     db_category = CategoryModel(**category.model_dump())
     db.add(db_category)
     await db.commit()
+    await publish_change("categories", "created", db_category.id)
     await db.refresh(db_category)
     return db_category
 
@@ -70,6 +72,7 @@ async def update_category(
         setattr(db_category, key, value)
 
     await db.commit()
+    await publish_change("categories", "updated", category_id)
     await db.refresh(db_category)
     return db_category
 
@@ -97,3 +100,4 @@ async def delete_category(
 
     await db.delete(db_category)
     await db.commit()
+    await publish_change("categories", "deleted", category_id)
@@ -0,0 +1,122 @@
+import re
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..database import get_db
+from ..models import CategorizationRule as CategorizationRuleModel
+from ..models import RuleMatchType, User
+from ..schemas import CategorizationRule, CategorizationRuleCreate, CategorizationRuleUpdate
+from ..schemas.categorization import check_rule_fields
+from ..services.categorization import RULE_ENTITY, combine_patterns
+from ..services.events import publish_change
+
+router = APIRouter(prefix="/categorization-rules", tags=["categorization"])
+
+
+async def _get_rule(db: AsyncSession, rule_id: int) -> CategorizationRuleModel:
+    result = await db.execute(select(CategorizationRuleModel).where(CategorizationRuleModel.id == rule_id))
+    rule = result.scalar_one_or_none()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Categorization rule not found")
+    return rule
+
+
+async def _check_combined_pattern(db: AsyncSession, fields: dict, rule_id: Optional[int] = None) -> None:
+    """Raise 400 if an active regex rule's pattern cannot be joined with those of the other active rules"""
+    if not fields.get("active") or fields.get("match_type") != RuleMatchType.REGEX or not fields.get("pattern"):
+        return
+    query = select(CategorizationRuleModel.pattern).where(
+        CategorizationRuleModel.active.is_(True),
+        CategorizationRuleModel.match_type == RuleMatchType.REGEX,
+        CategorizationRuleModel.pattern.is_not(None),
+    )
+    if rule_id is not None:
+        query = query.where(CategorizationRuleModel.id != rule_id)
+    patterns = [pattern for pattern in (await db.scalars(query)).all() if pattern]
+    try:
+        combine_patterns([*patterns, fields["pattern"]])
+    except re.error as exc:
+        raise HTTPException(
+            status_code=400, detail=f"Pattern cannot be combined with the other regex rules: {exc}"
+        ) from None
+
+
+@router.get("", response_model=List[CategorizationRule])
+async def list_categorization_rules(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List all categorization rules, best first"""
+    result = await db.execute(
+        select(CategorizationRuleModel).order_by(CategorizationRuleModel.priority, CategorizationRuleModel.id)
+    )
+    return result.scalars().all()
+
+
+@router.post("", response_model=CategorizationRule, status_code=status.HTTP_201_CREATED)
+async def create_categorization_rule(
+    rule: CategorizationRuleCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Create a categorization rule; it applies from the next suggestion or import batch"""
+    await _check_combined_pattern(db, rule.model_dump())
+    db_rule = CategorizationRuleModel(**rule.model_dump())
+    db.add(db_rule)
+    await db.commit()
+    await publish_change(RULE_ENTITY, "created", db_rule.id)
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.get("/{rule_id}", response_model=CategorizationRule)
+async def get_categorization_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get a categorization rule by ID"""
+    return await _get_rule(db, rule_id)
+
+
+@router.put("/{rule_id}", response_model=CategorizationRule)
+async def update_categorization_rule(
+    rule_id: int,
+    rule: CategorizationRuleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Update a categorization rule; transactions it categorized earlier are left as they are"""
+    db_rule = await _get_rule(db, rule_id)
+    changes = rule.model_dump(exclude_unset=True)
+    current = CategorizationRule.model_validate(db_rule).model_dump()
+    try:
+        check_rule_fields({**current, **changes})
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    await _check_combined_pattern(db, {**current, **changes}, rule_id)
+
+    for key, value in changes.items():
+        setattr(db_rule, key, value)
+
+    await db.commit()
+    await publish_change(RULE_ENTITY, "updated", rule_id)
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_categorization_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Delete a categorization rule"""
+    db_rule = await _get_rule(db, rule_id)
+    await db.delete(db_rule)
+    await db.commit()
+    await publish_change(RULE_ENTITY, "deleted", rule_id)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+
+from ..auth.dependencies import get_current_active_user
+from ..config.settings import settings
+from ..database import query_log
+from ..models import User
+from ..schemas import QueryReport
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/queries", response_model=QueryReport)
+async def get_query_report(
+    limit: int = Query(20, ge=1, le=100, description="Number of top statements to return"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Recent per-request statement counts, slow statements and the statements with the most total time
+
+    Numbers are kept in memory per worker process and reset on restart.
+    """
+    return QueryReport(
+        slow_query_ms=settings.SLOW_QUERY_MS,
+        requests=list(reversed(query_log.requests)),
+        slow_queries=list(reversed(query_log.slow_queries)),
+        top_statements=query_log.top_statements(limit),
+    )
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..config.settings import settings
+from ..database import get_db
+from ..models import User
+from ..services.events import event_bus, stream_events
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("", response_class=StreamingResponse, responses={200: {"content": {"text/event-stream": {}}}})
+async def subscribe_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream data changes as Server-Sent Events
+
+    `change` events carry `{entity, action, id}`; fetch the data itself through `/sync`. A `resync` event
+    means events were dropped because the client fell behind: refresh through `/sync` with the last cursor.
+    Idle streams receive a comment heartbeat. Uses the normal Bearer token, so browsers need a fetch-based
+    EventSource.
+    """
+    # The stream can stay open for hours; don't hold the authentication session's connection meanwhile
+    await db.close()
+
+    subscription = event_bus.subscribe()
+    return StreamingResponse(
+        stream_events(event_bus, subscription, request.is_disconnected, settings.EVENT_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
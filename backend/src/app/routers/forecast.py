@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..config.settings import settings
+from ..database import get_db
+from ..models import User
+from ..schemas import Forecast
+from ..services import forecast as forecast_service
+
+router = APIRouter(prefix="/forecast", tags=["forecast"])
+
+
+@router.get("", response_model=Forecast)
+async def get_forecast(
+    months: int = Query(12, ge=1, le=settings.FORECAST_MAX_MONTHS, description="Months to project"),
+    history_months: int = Query(
+        settings.FORECAST_HISTORY_MONTHS, ge=1, le=240, description="Complete months of history to learn from"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Project income, expenses and balance over the next `months` months
+
+    Fixed monthly amounts seen in each of the last few months (rent, salary) are projected unchanged; all other
+    transactions are projected as per-category averages for the same calendar month. The projection starts
+    with next month, from the current all-time balance.
+    """
+    if not forecast_service.is_available():
+        raise HTTPException(status_code=501, detail="Forecasting requires numpy (install the analytics extra)")
+    return await forecast_service.build_forecast(db, months, history_months)
@@ -0,0 +1,78 @@
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..config.settings import settings
+from ..database import get_db
+from ..models import User
+from ..models.money import from_cents, to_cents
+from ..schemas import CurrencyCode, FxConversion, FxCurrency, FxRateImportResult
+from ..services.events import publish_change
+from ..services.fx import FX_RATE_ENTITY, fx_rate_cache, list_currencies, read_rates_file, store_rates, to_base_cents
+
+router = APIRouter(prefix="/fx-rates", tags=["fx-rates"])
+
+
+@router.get("", response_model=List[FxCurrency])
+async def list_fx_rates(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List the currencies with exchange rates, with the range of days they cover"""
+    return [
+        FxCurrency(currency=currency, first_date=first_date, last_date=last_date, latest_rate=rate)
+        for currency, first_date, last_date, rate in await list_currencies(db)
+    ]
+
+
+@router.post("/import", response_model=FxRateImportResult)
+async def import_fx_rates(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Import daily exchange rates from a CSV file
+
+    Either `date,currency,rate` columns, with rates in base currency units per unit, or a date column followed by
+    one column per currency quoting units per base currency unit (the layout of the ECB's historical rates).
+    Rates replace stored ones for the same day; days missing between a currency's first and last rate repeat the
+    previous rate.
+    """
+    contents = await file.read()
+    if len(contents) > settings.max_upload_size:
+        raise HTTPException(status_code=400, detail="File too large")
+    try:
+        rates = read_rates_file(contents)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid exchange rate file: {e}")
+
+    rows = await store_rates(db, rates)
+    await publish_change(FX_RATE_ENTITY, "updated", 0)
+    return FxRateImportResult(rows=rows, currencies=sorted(rates))
+
+
+@router.get("/convert", response_model=FxConversion)
+async def convert_amount(
+    amount: Decimal = Query(..., ge=0, max_digits=15, decimal_places=2),
+    currency: CurrencyCode = Query(...),
+    on: date = Query(default_factory=date.today, description="Day whose rate to use; defaults to today"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Convert an amount to the base currency, as aggregations do for transactions on that day"""
+    rate = await fx_rate_cache.rate(db, currency, on)
+    if rate is None:
+        raise HTTPException(status_code=400, detail=f"No exchange rates for {currency}")
+    return FxConversion(
+        amount=amount,
+        currency=currency,
+        on=on,
+        rate=rate,
+        base_amount=from_cents(to_base_cents(to_cents(amount), rate)),
+        base_currency=settings.BASE_CURRENCY,
+    )
@@ -26,6 +26,8 @@ from ..schemas import (
     GiftPurchaseCreate,
     GiftPurchaseUpdate,
 )
+from ..services.events import publish_change
+from ..services.json_response import json_list_response
 
 router = APIRouter(prefix="/gift-occasions", tags=["gift-occasions"])
 
@@ -94,7 +96,7 @@ async def list_gift_occasions(
     occasions = result.scalars().all()
 
     # Convert to response with summaries
-    return [
+    occasions = [
         GiftOccasionWithSummary(
             id=occ.id,
             name=occ.name,
@@ -105,12 +107,14 @@ async def list_gift_occasions(
             is_pool_account=occ.is_pool_account,
             created_by_user_id=occ.created_by_user_id,
             created_at=occ.created_at,
+            updated_at=occ.updated_at,
             person=occ.person,
             created_by_user=occ.created_by_user,
             summary=calculate_occasion_summary(occ),
         )
         for occ in occasions
     ]
+    return json_list_response(GiftOccasionWithSummary, occasions)
 
 
 @router.post("", response_model=GiftOccasion, status_code=status.HTTP_201_CREATED)
@@ -132,6 +136,7 @@ async def create_gift_occasion(
     )
     db.add(db_occasion)
     await db.commit()
+    await publish_change("gift_occasions", "created", db_occasion.id)
     await db.refresh(db_occasion)
 
     # Load relationships
@@ -190,6 +195,7 @@ async def update_gift_occasion(
         setattr(db_occasion, key, value)
 
     await db.commit()
+    await publish_change("gift_occasions", "updated", occasion_id)
     await db.refresh(db_occasion)
 
     # Load relationships
@@ -218,6 +224,7 @@ async def delete_gift_occasion(
 
     await db.delete(db_occasion)
     await db.commit()
+    await publish_change("gift_occasions", "deleted", occasion_id)
 
 
 # ============== Gift Entry Endpoints ==============
@@ -245,7 +252,7 @@ async def list_gift_entries(
         )
         .order_by(GiftEntryModel.gift_date.desc())
     )
-    return result.scalars().all()
+    return json_list_response(GiftEntry, result.scalars().all())
 
 
 @router.post("/{occasion_id}/entries", response_model=GiftEntry, status_code=status.HTTP_201_CREATED)
@@ -275,6 +282,7 @@ async def create_gift_entry(
     )
     db.add(db_entry)
     await db.commit()
+    await publish_change("gift_entries", "created", db_entry.id)
     await db.refresh(db_entry)
 
     # Load relationships
@@ -308,6 +316,7 @@ async def update_gift_entry(
         setattr(db_entry, key, value)
 
     await db.commit()
+    await publish_change("gift_entries", "updated", entry_id)
     await db.refresh(db_entry)
 
     # Load relationships
@@ -337,6 +346,7 @@ async def delete_gift_entry(
 
     await db.delete(db_entry)
     await db.commit()
+    await publish_change("gift_entries", "deleted", entry_id)
 
 
 # ============== Gift Purchase Endpoints ==============
@@ -363,7 +373,7 @@ async def list_gift_purchases(
         )
         .order_by(GiftPurchaseModel.purchase_date.desc())
     )
-    return result.scalars().all()
+    return json_list_response(GiftPurchase, result.scalars().all())
 
 
 @router.post("/{occasion_id}/purchases", response_model=GiftPurchase, status_code=status.HTTP_201_CREATED)
@@ -391,6 +401,7 @@ async def create_gift_purchase(
     )
     db.add(db_purchase)
     await db.commit()
+    await publish_change("gift_purchases", "created", db_purchase.id)
     await db.refresh(db_purchase)
 
     # Load relationships
@@ -423,6 +434,7 @@ async def update_gift_purchase(
         setattr(db_purchase, key, value)
 
     await db.commit()
+    await publish_change("gift_purchases", "updated", purchase_id)
     await db.refresh(db_purchase)
 
     # Load relationships
@@ -451,3 +463,4 @@ async def delete_gift_purchase(
 
     await db.delete(db_purchase)
     await db.commit()
+    await publish_change("gift_purchases", "deleted", purchase_id)
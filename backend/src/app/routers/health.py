@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..database import get_session_factory
+from ..schemas import HealthReport, HealthStatus
+from ..services.health import check_live, check_ready, live_probe, ready_probe
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+FAILED = {503: {"model": HealthReport, "description": "At least one check failed"}}
+
+
+def _respond(report: HealthReport) -> JSONResponse:
+    status_code = 503 if report.status == HealthStatus.FAIL else 200
+    return JSONResponse(report.model_dump(mode="json"), status_code=status_code)
+
+
+@router.get("")
+async def health():
+    """Health check endpoint"""
+    return {"status": "healthy"}
+
+
+@router.get("/live", response_model=HealthReport, responses=FAILED)
+async def liveness():
+    """
+    Liveness probe: the process answers and no background task has crashed or stalled
+
+    Does not touch the database, so a slow database never gets the process restarted.
+    """
+    return _respond(await live_probe.get(check_live))
+
+
+@router.get("/ready", response_model=HealthReport, responses=FAILED)
+async def readiness(session_factory: async_sessionmaker = Depends(get_session_factory)):
+    """
+    Readiness probe: database reachable and fast enough, uploads writable with free space, background tasks alive
+
+    Results are cached for a few seconds; returns 503 when any check fails.
+    """
+    return _respond(await ready_probe.get(lambda: check_ready(session_factory)))
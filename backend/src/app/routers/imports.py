@@ -0,0 +1,174 @@
+import json
+from typing import List, Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..auth.dependencies import get_current_active_user
+from ..database import get_db, get_session_factory
+from ..models import ImportJob as ImportJobModel
+from ..models import User
+from ..schemas import ImportColumnMapping, ImportFormat, ImportJob, ImportStatus
+from ..services.statement_import import detect_format, is_job_running, run_import_job, store_upload
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+async def _job_for_file(db: AsyncSession, sha256: str) -> Optional[ImportJobModel]:
+    result = await db.execute(select(ImportJobModel).where(ImportJobModel.file_sha256 == sha256))
+    return result.scalar_one_or_none()
+
+
+@router.post("", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_import(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    file_format: Optional[ImportFormat] = Form(None),
+    mapping: Optional[str] = Form(None, description="JSON object mapping transaction fields to CSV column names"),
+    date_format: Optional[str] = Form(None, description="strptime format for dates, e.g. %d/%m/%Y"),
+    day_first: bool = Form(False),
+    default_category_id: Optional[int] = Form(None),
+    default_beneficiary_id: Optional[int] = Form(None),
+    skip_duplicates: bool = Form(True, description="Leave out rows matching an existing transaction"),
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Upload a CSV, OFX/QFX or QIF bank statement for import
+
+    The file is imported in the background; poll `GET /imports/{id}` for progress.
+    Uploading the same file again resumes the existing job instead of importing it twice. New options replace
+    the job's if it failed, was left running by a crashed worker or has not imported any rows yet; otherwise they
+    are rejected with 409.
+    Rows that look like an existing transaction (same amount and type, a few days apart, similar description)
+    are left out and counted in `rows_duplicate`, unless `skip_duplicates` is false.
+    """
+    file_format = file_format or detect_format(file.filename)
+    if file_format is None:
+        raise HTTPException(status_code=400, detail="Could not detect file format; pass file_format explicitly")
+
+    try:
+        column_mapping = ImportColumnMapping(**json.loads(mapping)) if mapping else ImportColumnMapping()
+    except (json.JSONDecodeError, TypeError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid column mapping: {e}")
+
+    try:
+        path, sha256, size = await store_upload(file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    options = {
+        "mapping": column_mapping.model_dump(exclude_none=True),
+        "date_format": date_format,
+        "day_first": day_first,
+        "default_category_id": default_category_id,
+        "default_beneficiary_id": default_beneficiary_id,
+        "skip_duplicates": skip_duplicates,
+    }
+    job = await _job_for_file(db, sha256)
+    running = False
+    if job is None:
+        job = ImportJobModel(
+            filename=file.filename or path.name,
+            file_format=file_format,
+            file_sha256=sha256,
+            file_path=str(path),
+            total_bytes=size,
+            options=options,
+            errors=[],
+            created_by_user_id=current_user.id,
+        )
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent upload of the same file created the job first, and runs it
+            await db.rollback()
+            return await _job_for_file(db, sha256)
+        await db.refresh(job)
+    elif (job.options or {}) != options or job.file_format != file_format:
+        # New options only apply where they cannot mix with rows already imported under the old ones. A job
+        # still marked running that is_job_running() no longer counts was left behind by a crashed worker.
+        interrupted = job.status in (ImportStatus.FAILED, ImportStatus.RUNNING)
+        if is_job_running(job) or (not interrupted and job.rows_processed):
+            raise HTTPException(
+                status_code=409, detail=f"File already imported with other options (import job {job.id})"
+            )
+        job.options = options
+        job.file_format = file_format
+        if not job.rows_processed:
+            job.errors = []
+        await db.commit()
+        await db.refresh(job)
+    else:
+        # Already being imported, by this worker or another one
+        running = is_job_running(job)
+
+    if job.status != ImportStatus.COMPLETED and not running:
+        background_tasks.add_task(run_import_job, session_factory, job.id)
+    return job
+
+
+@router.get("", response_model=List[ImportJob])
+async def list_imports(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List statement import jobs, most recent first"""
+    result = await db.execute(
+        select(ImportJobModel).order_by(ImportJobModel.created_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.get("/{job_id}", response_model=ImportJob)
+async def get_import(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get the status and progress of an import job"""
+    job = await db.get(ImportJobModel, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.post("/{job_id}/resume", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def resume_import(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Resume an interrupted or failed import job from its last committed row
+
+    A job still marked running is taken over once it has not committed a batch for `IMPORT_STALE_SECONDS`.
+    """
+    job = await db.get(ImportJobModel, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if job.status == ImportStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail="Import job already completed")
+    if is_job_running(job):
+        raise HTTPException(status_code=409, detail="Import job is already running")
+
+    background_tasks.add_task(run_import_job, session_factory, job.id)
+    return job
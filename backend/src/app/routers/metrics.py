@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from ..services.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (text exposition format)"""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
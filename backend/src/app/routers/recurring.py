@@ -0,0 +1,154 @@
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..database import get_db
+from ..models import RecurringRule as RecurringRuleModel
+from ..models import User
+from ..schemas import (
+    RecurringOccurrence,
+    RecurringRule,
+    RecurringRuleCreate,
+    RecurringRuleUpdate,
+    RecurringRunResult,
+)
+from ..services.archive import archive_catalog
+from ..services.events import publish_change
+from ..services.recurring import materialize_due, pending_occurrences, to_occurrence
+
+router = APIRouter(prefix="/recurring-rules", tags=["recurring"])
+
+
+async def _get_rule(db: AsyncSession, rule_id: int) -> RecurringRuleModel:
+    result = await db.execute(select(RecurringRuleModel).where(RecurringRuleModel.id == rule_id))
+    rule = result.scalar_one_or_none()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Recurring rule not found")
+    return rule
+
+
+def _check_start_date(start_date: date) -> None:
+    """Raise 400 if a rule would start in an archived year"""
+    if archive_catalog.is_archived(datetime.combine(start_date, time())):
+        raise HTTPException(status_code=400, detail=f"{start_date.year} is archived; restore it first")
+
+
+@router.get("", response_model=List[RecurringRule])
+async def list_recurring_rules(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List all recurring transaction rules"""
+    result = await db.execute(
+        select(RecurringRuleModel).order_by(RecurringRuleModel.description, RecurringRuleModel.id)
+    )
+    return result.scalars().all()
+
+
+@router.post("", response_model=RecurringRule, status_code=status.HTTP_201_CREATED)
+async def create_recurring_rule(
+    rule: RecurringRuleCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Create a recurring transaction rule
+
+    Occurrences up to today, including past ones from an earlier `start_date`, are created on the
+    scheduler's next run. The rule cannot start in an archived year.
+    """
+    _check_start_date(rule.start_date)
+    db_rule = RecurringRuleModel(**rule.model_dump())
+    db.add(db_rule)
+    await db.commit()
+    await publish_change("recurring_rules", "created", db_rule.id)
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.get("/upcoming", response_model=List[RecurringOccurrence])
+async def list_upcoming_occurrences(
+    days: int = Query(30, ge=1, le=366, description="Look this many days ahead"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Transactions the active rules will create in the coming days, plus any that are due; nothing is written"""
+    result = await db.execute(select(RecurringRuleModel).where(RecurringRuleModel.active.is_(True)))
+    through = date.today() + timedelta(days=days)
+    occurrences = [to_occurrence(rule, day) for rule in result.scalars() for day in pending_occurrences(rule, through)]
+    return sorted(occurrences, key=lambda occurrence: (occurrence.occurrence_date, occurrence.rule_id))
+
+
+@router.post("/materialize", response_model=RecurringRunResult)
+async def materialize_recurring_rules(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Create every due occurrence now instead of waiting for the scheduler"""
+    return await materialize_due(db)
+
+
+@router.get("/{rule_id}", response_model=RecurringRule)
+async def get_recurring_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get a recurring transaction rule by ID"""
+    return await _get_rule(db, rule_id)
+
+
+@router.get("/{rule_id}/preview", response_model=List[RecurringOccurrence])
+async def preview_recurring_rule(
+    rule_id: int,
+    count: int = Query(12, ge=1, le=366),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """The next `count` occurrences the rule has not created yet, whether or not they are due; nothing is written"""
+    rule = await _get_rule(db, rule_id)
+    through = rule.end_date or date.max
+    return [to_occurrence(rule, day) for day in pending_occurrences(rule, through, limit=count)]
+
+
+@router.put("/{rule_id}", response_model=RecurringRule)
+async def update_recurring_rule(
+    rule_id: int,
+    rule: RecurringRuleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Update a recurring transaction rule; transactions it already created are left as they are"""
+    db_rule = await _get_rule(db, rule_id)
+    changes = rule.model_dump(exclude_unset=True)
+    start_date = changes.get("start_date", db_rule.start_date)
+    end_date = changes.get("end_date", db_rule.end_date)
+    if start_date is not None and end_date is not None and end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if changes.get("start_date") is not None:
+        _check_start_date(changes["start_date"])
+
+    for key, value in changes.items():
+        setattr(db_rule, key, value)
+
+    await db.commit()
+    await publish_change("recurring_rules", "updated", rule_id)
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Delete a recurring transaction rule; transactions it already created are kept"""
+    db_rule = await _get_rule(db, rule_id)
+    await db.delete(db_rule)
+    await db.commit()
+    await publish_change("recurring_rules", "deleted", rule_id)
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_current_active_user
+from ..database import get_db
+from ..models import User
+from ..schemas import SyncChanges
+from ..services.sync import get_changes
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncChanges)
+async def sync_changes(
+    since: int = Query(0, ge=0, description="Cursor from the previous sync; 0 for a full sync"),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get categories, beneficiaries, transactions and gift records changed since a cursor
+
+    Start with `since=0`, store the returned `cursor`, and pass it on the next call. Deleted records are
+    listed by id under `deleted`. While `has_more` is true, call again immediately with the new cursor.
+    """
+    return await get_changes(db, since, limit)
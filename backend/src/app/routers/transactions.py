@@ -1,63 +1,112 @@
 from datetime import datetime
-from typing import List, Optional
+from decimal import Decimal
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
 from ..auth.dependencies import get_current_active_user
-from ..database import get_db
+from ..config.settings import settings
+from ..database import get_db, get_session_factory
 from ..models import Transaction as TransactionModel
 from ..models import User
-from ..schemas import Transaction, TransactionCreate, TransactionType, TransactionUpdate
+from ..schemas import (
+    CategorizationSuggestion,
+    CompactTransactionPage,
+    DescriptionSuggestion,
+    DuplicateGroup,
+    ExportFormat,
+    Transaction,
+    TransactionBulkCreate,
+    TransactionBulkResult,
+    TransactionCreate,
+    TransactionFilters,
+    TransactionType,
+    TransactionUpdate,
+)
+from ..services import columnar_export
+from ..services.archive import archive_catalog, page_with_archive
+from ..services.categorization import rule_matcher_cache
+from ..services.descriptions import MAX_SUGGESTIONS, description_index
+from ..services.duplicates import find_duplicates, scan_duplicates
+from ..services.events import publish_change, publish_created
+from ..services.export import EXPORT_MEDIA_TYPES, iter_transaction_export
+from ..services.fx import fx_rate_cache
+from ..services.json_response import json_list_response, json_model_response
+from ..services.transactions import (
+    apply_transaction_filters,
+    apply_transaction_search,
+    build_compact_page,
+    build_fts_query,
+    mark_hits,
+)
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
-@router.get("", response_model=List[Transaction])
+@router.get("", response_model=Union[List[Transaction], CompactTransactionPage])
 async def list_transactions(
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    transaction_type: Optional[TransactionType] = None,
-    category_id: Optional[int] = None,
-    beneficiary_id: Optional[int] = None,
-    created_by_user_id: Optional[int] = None,
+    filters: TransactionFilters = Depends(),
+    q: Optional[str] = Query(None, description="Full-text search over description, notes and tags"),
+    compact: bool = Query(False, description="Return id-only transactions plus a deduplicated `included` map"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """List transactions with optional filters"""
-    query = select(TransactionModel).options(
-        selectinload(TransactionModel.category),
-        selectinload(TransactionModel.beneficiary),
-        selectinload(TransactionModel.created_by_user),
-    )
+    """
+    List transactions with optional filters
+
+    With `q`, only transactions matching every search word (prefix match) are returned, best matches first,
+    each with a highlighted `highlight` snippet.
+
+    With `compact=true`, transactions only carry `category_id`, `beneficiary_id` and `created_by_user_id`; each
+    referenced category, beneficiary and user appears once under `included`, served from the reference cache.
+
+    Transactions of archived years are included when the date range reaches them; search only covers the
+    transactions in the table.
+    """
+    query = select(TransactionModel)
+    if not compact:
+        query = query.options(
+            selectinload(TransactionModel.category),
+            selectinload(TransactionModel.beneficiary),
+            selectinload(TransactionModel.created_by_user),
+        )
 
     # Apply filters
-    if start_date:
-        query = query.where(TransactionModel.transaction_date >= start_date)
-    if end_date:
-        query = query.where(TransactionModel.transaction_date <= end_date)
-    if transaction_type:
-        query = query.where(TransactionModel.type == transaction_type)
-    if category_id:
-        query = query.where(TransactionModel.category_id == category_id)
-    if beneficiary_id:
-        query = query.where(TransactionModel.beneficiary_id == beneficiary_id)
-    if created_by_user_id:
-        query = query.where(TransactionModel.created_by_user_id == created_by_user_id)
-
-    # Order by transaction date descending
+    query = apply_transaction_filters(query, filters)
+
+    fts_query = build_fts_query(q) if q else None
+    if fts_query:
+        query = apply_transaction_search(query, fts_query)
+    elif archive_catalog.reaches(filters.start_date):
+        transactions = await page_with_archive(db, query, filters, skip, limit)
+        if compact:
+            return json_model_response(await build_compact_page(db, transactions))
+        return json_list_response(Transaction, transactions)
+
+    # Order by transaction date descending (after search rank, if searching)
     query = query.order_by(TransactionModel.transaction_date.desc())
 
     # Pagination
     query = query.offset(skip).limit(limit)
 
     result = await db.execute(query)
-    transactions = result.scalars().all()
-    return transactions
+    if not fts_query:
+        transactions = result.scalars().all()
+    else:
+        transactions = []
+        for transaction, highlight in result.all():
+            transaction.highlight = mark_hits(highlight)
+            transactions.append(transaction)
+
+    if compact:
+        return json_model_response(await build_compact_page(db, transactions))
+    return json_list_response(Transaction, transactions)
 
 
 # Accept trailing slash for list endpoint without redirect
@@ -65,21 +114,137 @@ router.add_api_route(
     "/",
     list_transactions,
     methods=["GET"],
-    response_model=List[Transaction],
+    response_model=Union[List[Transaction], CompactTransactionPage],
     include_in_schema=False,
 )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_transactions(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    filters: TransactionFilters = Depends(),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Export all transactions matching the filters as CSV, NDJSON, Arrow IPC stream or Parquet
+
+    Rows are streamed in cursor batches, so memory use does not grow with the size of the export.
+    Arrow and Parquet exports require the optional `analytics` extra (pyarrow).
+    """
+    if export_format in columnar_export.COLUMNAR_FORMATS:
+        if not columnar_export.is_available():
+            raise HTTPException(
+                status_code=501, detail="Columnar export requires pyarrow (install the analytics extra)"
+            )
+        body = columnar_export.iter_columnar_export(session_factory, filters, export_format)
+    else:
+        body = iter_transaction_export(session_factory, filters, export_format)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{export_format.value}"'},
+    )
+
+
+@router.get("/suggest", response_model=CategorizationSuggestion)
+async def suggest_categorization(
+    description: str = Query(..., min_length=1, max_length=500),
+    amount: Optional[Decimal] = Query(None, ge=0),
+    transaction_type: Optional[TransactionType] = Query(None, alias="type"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Category and beneficiary the categorization rules pick for a transaction being entered
+
+    Rules with an amount range or a type only apply once `amount` or `type` is given. Fields no rule sets are
+    `null`.
+    """
+    matcher = await rule_matcher_cache.get(db)
+    return matcher.suggest(description, amount, transaction_type)
+
+
+@router.get("/descriptions/suggest", response_model=List[DescriptionSuggestion])
+async def suggest_descriptions(
+    prefix: str = Query("", max_length=200),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Descriptions used before that start with `prefix` (case-insensitive), for autocompleting the transaction form
+
+    Frequently and recently used descriptions come first. Served from an in-memory index, without a query once
+    it is loaded.
+    """
+    return await description_index.suggest(db, prefix, limit)
+
+
+@router.get("/duplicates", response_model=List[DuplicateGroup])
+async def list_duplicates(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Groups of transactions that look like copies of each other, most recent first
+
+    Grouped transactions have the same amount and type, are at most `DUPLICATE_DATE_WINDOW_DAYS` apart and have
+    similar descriptions. Rows imported from the same statement or generated by the same recurring rule are not
+    grouped with each other. One pass over the transactions in (amount, date) order.
+    """
+    return json_list_response(DuplicateGroup, await scan_duplicates(db, start_date, end_date))
+
+
+def _check_open(rows: List[dict]) -> None:
+    """Reject transactions dated in an archived year"""
+    for row in rows:
+        if archive_catalog.is_archived(row["transaction_date"]):
+            raise HTTPException(status_code=400, detail=f"{row['transaction_date'].year} is archived; restore it first")
+
+
+async def _resolve_currencies(db: AsyncSession, rows: List[dict]) -> None:
+    """Default each row's currency to the base currency; reject currencies without exchange rates"""
+    checked = {settings.BASE_CURRENCY}
+    for row in rows:
+        if row.get("currency") is None:
+            row["currency"] = settings.BASE_CURRENCY
+        if row["currency"] not in checked:
+            if await fx_rate_cache.rate(db, row["currency"], row["transaction_date"].date()) is None:
+                raise HTTPException(
+                    status_code=400, detail=f"No exchange rates for {row['currency']}; import them first"
+                )
+            checked.add(row["currency"])
+
+
 @router.post("", response_model=Transaction, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction: TransactionCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Create a new transaction"""
-    db_transaction = TransactionModel(**transaction.model_dump())
+    """
+    Create a new transaction
+
+    The response lists existing transactions the new one may duplicate under `possible_duplicates`; the
+    transaction is created either way.
+    """
+    values = transaction.model_dump()
+    _check_open([values])
+    await _resolve_currencies(db, [values])
+    (duplicates,) = await find_duplicates(db, [values])
+    db_transaction = TransactionModel(**values)
     db.add(db_transaction)
     await db.commit()
+    await publish_change("transactions", "created", db_transaction.id)
+    description_index.record(transaction.description, transaction.transaction_date)
     await db.refresh(db_transaction)
 
     # Load relationships
@@ -92,7 +257,48 @@ async def create_transaction(
             selectinload(TransactionModel.created_by_user),
         )
     )
-    return result.scalar_one()
+    db_transaction = result.scalar_one()
+    db_transaction.possible_duplicates = duplicates
+    return db_transaction
+
+
+@router.post("/bulk", response_model=TransactionBulkResult, status_code=status.HTTP_201_CREATED)
+async def create_transactions_bulk(
+    bulk: TransactionBulkCreate,
+    skip_duplicates: bool = Query(False, description="Leave out rows matching an existing transaction"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Create up to `BULK_CREATE_MAX` transactions in one multi-row insert and one commit
+
+    All or nothing: if any row fails, none are created. Only the new ids are returned, so loading large batches
+    does not pay for reading every row back.
+
+    With `skip_duplicates=true`, rows that look like an existing transaction are not created; their positions
+    in the request are returned under `skipped_duplicates`.
+    """
+    if len(bulk.transactions) > settings.BULK_CREATE_MAX:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.BULK_CREATE_MAX} transactions can be created at once"
+        )
+    rows = [transaction.model_dump() for transaction in bulk.transactions]
+    _check_open(rows)
+    await _resolve_currencies(db, rows)
+    skipped = []
+    if skip_duplicates:
+        duplicates = await find_duplicates(db, rows)
+        skipped = [position for position, matches in enumerate(duplicates) if matches]
+        rows = [row for row, matches in zip(rows, duplicates) if not matches]
+    ids = []
+    if rows:
+        # SQLite's RETURNING order is unspecified, but rowids are handed out in VALUES order within the transaction
+        ids = sorted(await db.scalars(insert(TransactionModel).returning(TransactionModel.id), rows))
+        await db.commit()
+    await publish_created("transactions", ids)
+    for row in rows:
+        description_index.record(row["description"], row["transaction_date"])
+    return TransactionBulkResult(created=len(ids), ids=ids, skipped_duplicates=skipped)
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
@@ -130,11 +336,23 @@ async def update_transaction(
     if not db_transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
+    previous = (db_transaction.description, db_transaction.transaction_date)
+    updates = transaction.model_dump(exclude_unset=True)
+    if updates.get("transaction_date") is not None:
+        _check_open([updates])
+    if "currency" in updates:
+        row = {"transaction_date": db_transaction.transaction_date, **updates}
+        await _resolve_currencies(db, [row])
+        updates["currency"] = row["currency"]
     # Update only provided fields
-    for key, value in transaction.model_dump(exclude_unset=True).items():
+    for key, value in updates.items():
         setattr(db_transaction, key, value)
 
     await db.commit()
+    await publish_change("transactions", "updated", transaction_id)
+    if (db_transaction.description, db_transaction.transaction_date) != previous:
+        description_index.forget(previous[0])
+        description_index.record(db_transaction.description, db_transaction.transaction_date)
     await db.refresh(db_transaction)
 
     # Load relationships
@@ -164,3 +382,5 @@ async def delete_transaction(
 
     await db.delete(db_transaction)
     await db.commit()
+    await publish_change("transactions", "deleted", transaction_id)
+    description_index.forget(db_transaction.description)
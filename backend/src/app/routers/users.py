@@ -8,6 +8,7 @@ from ..auth.dependencies import get_current_active_user
 from ..database import get_db
 from ..models import User as UserModel
 from ..schemas import User, UserCreate, UserUpdate
+from ..services.events import publish_change
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -33,6 +34,7 @@ async def create_user(
     db_user = UserModel(**user.model_dump())
     db.add(db_user)
     await db.commit()
+    await publish_change("users", "created", db_user.id)
     await db.refresh(db_user)
     return db_user
 
@@ -68,6 +70,7 @@ async def update_user(
         setattr(db_user, key, value)
 
     await db.commit()
+    await publish_change("users", "updated", user_id)
     await db.refresh(db_user)
     return db_user
 
@@ -86,3 +89,4 @@ async def delete_user(
 
     await db.delete(db_user)
     await db.commit()
+    await publish_change("users", "deleted", user_id)
@@ -1,8 +1,20 @@
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Annotated, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, StringConstraints
+
+# Money is an exact two-place Decimal (stored as integer cents, see models.money). It is still written to JSON as
+# a number, so clients keep receiving 150.5 rather than "150.50".
+Amount = Annotated[
+    Decimal,
+    Field(max_digits=15, decimal_places=2),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+
+# ISO 4217 code, e.g. "EUR"
+CurrencyCode = Annotated[str, StringConstraints(pattern=r"^[A-Z]{3}$")]
 
 
 class TransactionType(str, Enum):
@@ -36,6 +48,63 @@ class GiftDirection(str, Enum):
     RECEIVED = "received"
 
 
+class ImportFormat(str, Enum):
+    """Bank statement file format enumeration"""
+
+    CSV = "csv"
+    OFX = "ofx"
+    QIF = "qif"
+
+
+class ExportFormat(str, Enum):
+    """Transaction export format enumeration"""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+class ImportStatus(str, Enum):
+    """Statement import job status enumeration"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TagMatch(str, Enum):
+    """How a multi-tag filter matches transactions"""
+
+    ANY = "any"
+    ALL = "all"
+
+
+class RecurrenceFrequency(str, Enum):
+    """Unit of a recurring transaction rule's interval"""
+
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+class RuleMatchType(str, Enum):
+    """How a categorization rule's pattern is matched against a description (always case-insensitive)"""
+
+    SUBSTRING = "substring"
+    REGEX = "regex"
+
+
+class BudgetState(str, Enum):
+    """Spending against a budget's available amount for one month"""
+
+    UNDER = "under"
+    NEAR = "near"
+    OVER = "over"
+
+
 # User Schemas
 class UserBase(BaseModel):
     """Base user schema"""
@@ -124,7 +193,9 @@ class TransactionBase(BaseModel):
     """Base transaction schema"""
 
     type: TransactionType
-    amount: float = Field(..., gt=0)
+    amount: Amount = Field(..., gt=0)
+    # In the transaction's own currency; left out means the base currency
+    currency: Optional[CurrencyCode] = None
     description: str = Field(..., min_length=1)
     transaction_date: datetime
     category_id: int
@@ -141,11 +212,26 @@ class TransactionCreate(TransactionBase):
     pass
 
 
+class TransactionBulkCreate(BaseModel):
+    """Several transactions created in one request and one commit"""
+
+    transactions: List[TransactionCreate] = Field(..., min_length=1)
+
+
+class TransactionBulkResult(BaseModel):
+    created: int
+    ids: List[int] = Field(..., description="Ids of the new transactions, in request order")
+    skipped_duplicates: List[int] = Field(
+        default_factory=list, description="Request positions of rows skipped as duplicates (?skip_duplicates=true)"
+    )
+
+
 class TransactionUpdate(BaseModel):
     """Schema for updating a transaction"""
 
     type: Optional[TransactionType] = None
-    amount: Optional[float] = Field(None, gt=0)
+    amount: Optional[Amount] = Field(None, gt=0)
+    currency: Optional[CurrencyCode] = None
     description: Optional[str] = Field(None, min_length=1)
     transaction_date: Optional[datetime] = None
     category_id: Optional[int] = None
@@ -156,6 +242,15 @@ class TransactionUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
+class DuplicateMatch(BaseModel):
+    """An existing transaction that may be a duplicate of another one"""
+
+    id: int
+    description: str
+    transaction_date: datetime
+    similarity: float = Field(..., description="Description similarity, 0 to 1")
+
+
 class Transaction(TransactionBase):
     """Schema for transaction response"""
 
@@ -163,13 +258,83 @@ class Transaction(TransactionBase):
 
     id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     category: Category
     beneficiary: Beneficiary
     created_by_user: User
+    # HTML-escaped matching text with hits wrapped in <mark> tags; only set for full-text searches (?q=)
+    highlight: Optional[str] = None
+    # Existing transactions this one may duplicate; only set in the response to creating it
+    possible_duplicates: Optional[List[DuplicateMatch]] = None
+
+
+class CompactTransaction(TransactionBase):
+    """Transaction without embedded references; they are side-loaded in CompactTransactionPage.included"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    highlight: Optional[str] = None
+
+
+class IncludedReferences(BaseModel):
+    """Entities referenced by a page of compact transactions, keyed by id"""
+
+    categories: Dict[int, Category] = {}
+    beneficiaries: Dict[int, Beneficiary] = {}
+    users: Dict[int, User] = {}
+
+
+class CompactTransactionPage(BaseModel):
+    """Transaction list in compact mode: id-only transactions plus each referenced entity once"""
+
+    transactions: List[CompactTransaction]
+    included: IncludedReferences
+
+
+class DescriptionSuggestion(BaseModel):
+    """A description used before that starts with the typed prefix"""
+
+    description: str
+    count: int = Field(..., description="Transactions with this description")
+    last_used: date
+
+
+class DuplicateGroup(BaseModel):
+    """Transactions that look like copies of each other; similarity is to the earliest one"""
+
+    amount: Amount
+    type: TransactionType
+    transactions: List[DuplicateMatch]
+
+
+class TagFilters(BaseModel):
+    """Tag filter shared by list, export and aggregation queries"""
+
+    # Comma-separated so the filter models can keep being used as plain query dependencies
+    tags: Optional[str] = Field(None, description="Comma-separated tags, e.g. kids,holiday")
+    tag_match: TagMatch = TagMatch.ANY
+
+    @property
+    def tag_list(self) -> List[str]:
+        return [tag.strip() for tag in (self.tags or "").split(",") if tag.strip()]
+
+
+class TransactionFilters(TagFilters):
+    """Filters for transaction list and export queries"""
+
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    transaction_type: Optional[TransactionType] = None
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    created_by_user_id: Optional[int] = None
 
 
 # Aggregation Schemas
-class AggregationFilters(BaseModel):
+class AggregationFilters(TagFilters):
     """Filters for aggregation queries"""
 
     start_date: Optional[datetime] = None
@@ -180,12 +345,27 @@ class AggregationFilters(BaseModel):
 
 
 class AggregationSummary(BaseModel):
-    """Summary aggregation result"""
+    """Summary aggregation result, in the base currency"""
+
+    total_income: Amount = Decimal("0")
+    total_expenses: Amount = Decimal("0")
+    net_total: Amount = Decimal("0")
+    net_balance: Amount = Decimal("0")
+    transaction_count: int = 0
+    currency: Optional[CurrencyCode] = None
+    unconverted_currencies: List[CurrencyCode] = Field(
+        default_factory=list,
+        description="Currencies without exchange rates; their transactions are counted but not in the totals",
+    )
 
-    total_income: float = 0.0
-    total_expenses: float = 0.0
-    net_total: float = 0.0
-    net_balance: float = 0.0
+
+class TagAggregation(BaseModel):
+    """Totals for a single tag; a transaction with several tags counts towards each of them"""
+
+    tag: str
+    total_income: Amount = Decimal("0")
+    total_expenses: Amount = Decimal("0")
+    net_total: Amount = Decimal("0")
     transaction_count: int = 0
 
 
@@ -207,3 +387,50 @@ from .gift import (  # noqa: E402, I001
     TransactionRef,  # noqa: F401
     UserRef,  # noqa: F401
 )
+
+# Budget Schemas
+from .budget import (  # noqa: E402, I001
+    Budget,  # noqa: F401
+    BudgetCreate,  # noqa: F401
+    BudgetStatus,  # noqa: F401
+    BudgetStatusReport,  # noqa: F401
+    BudgetUpdate,  # noqa: F401
+)
+
+# Recurring Transaction Schemas
+from .recurring import (  # noqa: E402, I001
+    RecurringOccurrence,  # noqa: F401
+    RecurringRule,  # noqa: F401
+    RecurringRuleCreate,  # noqa: F401
+    RecurringRuleUpdate,  # noqa: F401
+    RecurringRunResult,  # noqa: F401
+)
+
+# Categorization Schemas
+from .categorization import (  # noqa: E402, I001
+    CategorizationRule,  # noqa: F401
+    CategorizationRuleCreate,  # noqa: F401
+    CategorizationRuleUpdate,  # noqa: F401
+    CategorizationSuggestion,  # noqa: F401
+)
+
+# Exchange Rate Schemas
+from .fx import FxConversion, FxCurrency, FxRateImportResult  # noqa: E402, F401, I001
+
+# Forecast Schemas
+from .forecast import Forecast, ForecastCategory, ForecastMonth, ForecastRecurring  # noqa: E402, F401, I001
+
+# Import Schemas
+from .imports import (  # noqa: E402, I001
+    ImportColumnMapping,  # noqa: F401
+    ImportJob,  # noqa: F401
+)
+
+# Sync Schemas
+from .sync import SyncChanges  # noqa: E402, F401, I001
+
+# Bootstrap Schemas
+from .bootstrap import Bootstrap  # noqa: E402, F401, I001
+
+# Diagnostics Schemas
+from .diagnostics import HealthCheck, HealthReport, HealthStatus, QueryReport  # noqa: E402, F401, I001
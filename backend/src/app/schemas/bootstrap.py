@@ -0,0 +1,16 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from ..auth.schemas import UserResponse
+from . import Beneficiary, Category, User
+
+
+class Bootstrap(BaseModel):
+    """Everything the frontend needs at startup, in one response"""
+
+    version: str
+    user: UserResponse
+    users: List[User]
+    categories: List[Category]
+    beneficiaries: List[Beneficiary]
@@ -0,0 +1,83 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from . import Amount, BudgetState
+
+
+def _first_of_month(value: Optional[date]) -> Optional[date]:
+    return value.replace(day=1) if value is not None else None
+
+
+class BudgetBase(BaseModel):
+    """Base budget schema; leave category_id or beneficiary_id empty to match every category or beneficiary"""
+
+    name: str = Field(..., min_length=1, max_length=200)
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    amount: Amount = Field(..., gt=0, description="Monthly limit")
+    rollover: bool = Field(False, description="Carry unused amounts over to the next month")
+    start_month: date = Field(
+        default_factory=lambda: date.today().replace(day=1),
+        description="First month the budget applies to; any day of the month may be given",
+    )
+
+    _normalize_start_month = field_validator("start_month")(_first_of_month)
+
+
+class BudgetCreate(BudgetBase):
+    """Schema for creating a budget"""
+
+    created_by_user_id: int
+
+
+class BudgetUpdate(BaseModel):
+    """Schema for updating a budget"""
+
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    amount: Optional[Amount] = Field(None, gt=0)
+    rollover: Optional[bool] = None
+    start_month: Optional[date] = None
+
+    _normalize_start_month = field_validator("start_month")(_first_of_month)
+
+
+class Budget(BudgetBase):
+    """Schema for budget response"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_by_user_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class BudgetStatus(BaseModel):
+    """Actual spending against one budget for one month"""
+
+    budget_id: int
+    name: str
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    amount: Amount
+    carried_over: Amount = Field(Decimal("0"), description="Unused amount rolled over from earlier months")
+    available: Amount = Field(..., description="amount + carried_over")
+    spent: Amount = Decimal("0")
+    remaining: Amount = Field(..., description="available - spent; negative when over budget")
+    percent_used: float
+    state: BudgetState
+
+
+class BudgetStatusReport(BaseModel):
+    """Every budget that applies to a month, with its actual spending"""
+
+    month: str = Field(..., description="YYYY-MM")
+    start_date: date
+    end_date: date
+    over_budget: int = Field(0, description="Number of budgets in the OVER state")
+    budgets: List[BudgetStatus] = []
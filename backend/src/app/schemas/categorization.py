@@ -0,0 +1,100 @@
+import re
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from . import Amount, RuleMatchType, TransactionType
+
+# Rules are combined into one alternation, where a numbered backreference or conditional would point at another
+# rule's group, and two rules naming a group alike would not compile
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def check_rule_pattern(match_type: RuleMatchType, pattern: Optional[str]) -> None:
+    """Raise ``ValueError`` for a regex the combined matcher cannot use"""
+    if match_type != RuleMatchType.REGEX or pattern is None:
+        return
+    if _BACKREFERENCE_RE.search(pattern):
+        raise ValueError("Backreferences and conditionals are not supported in rule patterns")
+    try:
+        # Wrapped as it will be in the combined regex; this also rejects global flags such as (?i) mid-pattern
+        compiled = re.compile(f"(?:{pattern})", re.IGNORECASE)
+    except re.error as exc:
+        raise ValueError(f"Invalid regular expression: {exc}") from None
+    if compiled.groupindex:
+        raise ValueError("Named groups are not supported in rule patterns; use (?:...)")
+
+
+def check_rule_fields(fields: dict) -> None:
+    """Raise ``ValueError`` if a rule would match nothing useful or set nothing"""
+    if fields.get("category_id") is None and fields.get("beneficiary_id") is None:
+        raise ValueError("A rule must set a category_id, a beneficiary_id or both")
+    if not fields.get("pattern") and fields.get("min_amount") is None and fields.get("max_amount") is None:
+        raise ValueError("A rule needs a pattern or an amount range")
+    low, high = fields.get("min_amount"), fields.get("max_amount")
+    if low is not None and high is not None and high < low:
+        raise ValueError("max_amount must not be below min_amount")
+    check_rule_pattern(fields.get("match_type", RuleMatchType.SUBSTRING), fields.get("pattern"))
+
+
+class CategorizationRuleBase(BaseModel):
+    """Base categorization rule schema"""
+
+    name: str = Field(..., min_length=1, max_length=200)
+    match_type: RuleMatchType = RuleMatchType.SUBSTRING
+    pattern: Optional[str] = Field(
+        None, min_length=1, max_length=500, description="Matched case-insensitively; empty matches any description"
+    )
+    transaction_type: Optional[TransactionType] = Field(None, description="Only match income or expenses")
+    min_amount: Optional[Amount] = Field(None, ge=0)
+    max_amount: Optional[Amount] = Field(None, ge=0)
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    priority: int = Field(100, ge=0, description="Lower priorities win when several rules match")
+    active: bool = True
+
+    @model_validator(mode="after")
+    def _check_rule(self):
+        check_rule_fields(self.model_dump())
+        return self
+
+
+class CategorizationRuleCreate(CategorizationRuleBase):
+    """Schema for creating a categorization rule"""
+
+    pass
+
+
+class CategorizationRuleUpdate(BaseModel):
+    """Schema for updating a categorization rule"""
+
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    match_type: Optional[RuleMatchType] = None
+    pattern: Optional[str] = Field(None, min_length=1, max_length=500)
+    transaction_type: Optional[TransactionType] = None
+    min_amount: Optional[Amount] = Field(None, ge=0)
+    max_amount: Optional[Amount] = Field(None, ge=0)
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    priority: Optional[int] = Field(None, ge=0)
+    active: Optional[bool] = None
+
+
+class CategorizationRule(CategorizationRuleBase):
+    """Schema for categorization rule response"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class CategorizationSuggestion(BaseModel):
+    """Category and beneficiary the rules pick for a description; each comes from the best rule that sets it"""
+
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    category_rule_id: Optional[int] = None
+    beneficiary_rule_id: Optional[int] = None
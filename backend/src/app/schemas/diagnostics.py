@@ -0,0 +1,66 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RequestQueries(BaseModel):
+    """SQL statements issued while serving one request"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    method: str
+    path: str = Field(..., description="Route template, e.g. /api/transactions/{transaction_id}")
+    status_code: int
+    count: int
+    total_ms: float
+    slow_count: int
+    at: datetime
+
+
+class SlowQuery(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    sql: str = Field(..., description="Normalized SQL with literals replaced by ?")
+    duration_ms: float
+    path: Optional[str] = None
+    at: datetime
+
+
+class StatementTotals(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    sql: str
+    count: int
+    total_ms: float
+    max_ms: float
+
+
+class QueryReport(BaseModel):
+    """Recent query numbers kept in memory by this worker"""
+
+    slow_query_ms: float
+    requests: List[RequestQueries] = []
+    slow_queries: List[SlowQuery] = []
+    top_statements: List[StatementTotals] = Field(default_factory=list, description="By total time, descending")
+
+
+class HealthStatus(str, Enum):
+    PASS = "pass"
+    WARN = "warn"
+    FAIL = "fail"
+
+
+class HealthCheck(BaseModel):
+    name: str
+    status: HealthStatus
+    latency_ms: float = 0.0
+    detail: Optional[str] = None
+
+
+class HealthReport(BaseModel):
+    """Overall status is the worst check's; only "fail" makes the probe return 503"""
+
+    status: HealthStatus
+    checks: List[HealthCheck] = []
@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from . import Amount, TransactionType
+
+
+class ForecastMonth(BaseModel):
+    """Projected totals for one future month"""
+
+    month: str = Field(..., description="YYYY-MM")
+    income: Amount = Decimal("0")
+    expenses: Amount = Decimal("0")
+    net: Amount = Decimal("0")
+    balance: Amount = Field(Decimal("0"), description="Projected balance at the end of the month")
+
+
+class ForecastCategory(BaseModel):
+    """Projected income and expenses of one category, one value per forecast month"""
+
+    category_id: int
+    income: List[Amount] = []
+    expenses: List[Amount] = []
+
+
+class ForecastRecurring(BaseModel):
+    """A fixed monthly amount detected in the history and projected unchanged"""
+
+    category_id: int
+    type: TransactionType
+    amount: Amount
+
+
+class Forecast(BaseModel):
+    """Cash-flow projection from recurring patterns and seasonal per-category averages"""
+
+    start_balance: Amount = Field(..., description="All-time net total, the balance the projection starts from")
+    history_start: str = Field(..., description="First month of history used, YYYY-MM")
+    history_end: str = Field(..., description="Last month of history used, YYYY-MM")
+    transactions_analyzed: int = 0
+    months: List[ForecastMonth] = []
+    categories: List[ForecastCategory] = []
+    recurring: List[ForecastRecurring] = []
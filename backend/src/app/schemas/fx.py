@@ -0,0 +1,31 @@
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from . import Amount, CurrencyCode
+
+
+class FxCurrency(BaseModel):
+    """A currency with imported exchange rates"""
+
+    currency: CurrencyCode
+    first_date: date
+    last_date: date
+    latest_rate: float = Field(..., description="Base currency units per unit on last_date")
+
+
+class FxRateImportResult(BaseModel):
+    rows: int = Field(..., description="Daily rates stored, including days filled in from the previous rate")
+    currencies: List[CurrencyCode]
+
+
+class FxConversion(BaseModel):
+    """An amount converted to the base currency with the rate of its day"""
+
+    amount: Amount
+    currency: CurrencyCode
+    on: date
+    rate: float
+    base_amount: Amount
+    base_currency: CurrencyCode
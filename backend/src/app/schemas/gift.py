@@ -1,10 +1,11 @@
 from datetime import date, datetime
+from decimal import Decimal
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 # Import enums from parent module (they're defined in __init__.py)
-from . import GiftDirection, OccasionType
+from . import Amount, GiftDirection, OccasionType
 
 # ============== Gift Occasion Schemas ==============
 
@@ -62,7 +63,7 @@ class TransactionRef(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
-    amount: float
+    amount: Amount
     description: str
     transaction_date: datetime
 
@@ -75,7 +76,7 @@ class GiftEntryBase(BaseModel):
 
     direction: GiftDirection
     person_id: int
-    amount: float = Field(..., gt=0)
+    amount: Amount = Field(..., gt=0)
     gift_date: date
     description: Optional[str] = Field(None, max_length=200)
     notes: Optional[str] = None
@@ -93,7 +94,7 @@ class GiftEntryUpdate(BaseModel):
 
     direction: Optional[GiftDirection] = None
     person_id: Optional[int] = None
-    amount: Optional[float] = Field(None, gt=0)
+    amount: Optional[Amount] = Field(None, gt=0)
     gift_date: Optional[date] = None
     description: Optional[str] = Field(None, max_length=200)
     notes: Optional[str] = None
@@ -109,6 +110,7 @@ class GiftEntry(GiftEntryBase):
     occasion_id: int
     created_by_user_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     person: Optional[BeneficiaryRef] = None
     transaction: Optional[TransactionRef] = None
     created_by_user: Optional[UserRef] = None
@@ -120,7 +122,7 @@ class GiftEntry(GiftEntryBase):
 class GiftPurchaseBase(BaseModel):
     """Base gift purchase schema"""
 
-    amount: float = Field(..., gt=0)
+    amount: Amount = Field(..., gt=0)
     purchase_date: date
     description: str = Field(..., min_length=1, max_length=200)
     notes: Optional[str] = None
@@ -136,7 +138,7 @@ class GiftPurchaseCreate(GiftPurchaseBase):
 class GiftPurchaseUpdate(BaseModel):
     """Schema for updating a gift purchase"""
 
-    amount: Optional[float] = Field(None, gt=0)
+    amount: Optional[Amount] = Field(None, gt=0)
     purchase_date: Optional[date] = None
     description: Optional[str] = Field(None, min_length=1, max_length=200)
     notes: Optional[str] = None
@@ -152,6 +154,7 @@ class GiftPurchase(GiftPurchaseBase):
     occasion_id: int
     created_by_user_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     transaction: Optional[TransactionRef] = None
     created_by_user: Optional[UserRef] = None
 
@@ -167,6 +170,7 @@ class GiftOccasion(GiftOccasionBase):
     id: int
     created_by_user_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     person: Optional[BeneficiaryRef] = None
     created_by_user: Optional[UserRef] = None
 
@@ -185,10 +189,10 @@ class GiftOccasionSummary(BaseModel):
     """Summary statistics for a gift occasion"""
 
     occasion_id: int
-    total_received: float = 0.0
-    total_given: float = 0.0
-    total_purchases: float = 0.0
-    balance: float = 0.0  # For pool accounts: received - purchases
+    total_received: Amount = Decimal("0")
+    total_given: Amount = Decimal("0")
+    total_purchases: Amount = Decimal("0")
+    balance: Amount = Decimal("0")  # For pool accounts: received - purchases
     entry_count: int = 0
     purchase_count: int = 0
 
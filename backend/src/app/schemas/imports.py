@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+# Import enums from parent module (they're defined in __init__.py)
+from . import ImportFormat, ImportStatus
+
+
+class ImportColumnMapping(BaseModel):
+    """Maps CSV header names to transaction fields.
+
+    Fields left unset are detected from common header names (e.g. "Date", "Amount", "Payee").
+    """
+
+    transaction_date: Optional[str] = None
+    amount: Optional[str] = None
+    debit: Optional[str] = None
+    credit: Optional[str] = None
+    description: Optional[str] = None
+    type: Optional[str] = None
+    category: Optional[str] = None
+    beneficiary: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class ImportJob(BaseModel):
+    """Schema for statement import job response"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    filename: str
+    file_format: ImportFormat
+    status: ImportStatus
+    total_bytes: int
+    bytes_processed: int
+    rows_processed: int
+    rows_imported: int
+    rows_skipped: int
+    rows_duplicate: int = 0
+    errors: List[str] = []
+    created_by_user_id: int
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Fraction of the file that has been processed (0.0 - 1.0)."""
+        if self.status == ImportStatus.COMPLETED:
+            return 1.0
+        if not self.total_bytes:
+            return 0.0
+        return round(min(self.bytes_processed / self.total_bytes, 1.0), 4)
@@ -0,0 +1,91 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from . import Amount, RecurrenceFrequency, TransactionType
+
+
+class RecurringRuleBase(BaseModel):
+    """Base recurring transaction rule schema"""
+
+    type: TransactionType
+    amount: Amount = Field(..., gt=0)
+    description: str = Field(..., min_length=1)
+    notes: Optional[str] = None
+    tags: Optional[List[str]] = Field(default_factory=list)
+    category_id: int
+    beneficiary_id: int
+    frequency: RecurrenceFrequency
+    interval: int = Field(1, ge=1, le=366, description="Every N days, weeks, months or years")
+    day_of_month: Optional[int] = Field(
+        None, ge=1, le=31, description="Monthly and yearly rules; defaults to the start date's day"
+    )
+    weekday: Optional[int] = Field(
+        None, ge=0, le=6, description="Weekly rules, 0 = Monday; defaults to the start date's"
+    )
+    start_date: date
+    end_date: Optional[date] = None
+    active: bool = True
+
+    @model_validator(mode="after")
+    def _check_dates(self):
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurringRuleCreate(RecurringRuleBase):
+    """Schema for creating a recurring transaction rule"""
+
+    created_by_user_id: int
+
+
+class RecurringRuleUpdate(BaseModel):
+    """Schema for updating a recurring transaction rule; schedule changes apply to occurrences not yet created"""
+
+    type: Optional[TransactionType] = None
+    amount: Optional[Amount] = Field(None, gt=0)
+    description: Optional[str] = Field(None, min_length=1)
+    notes: Optional[str] = None
+    tags: Optional[List[str]] = None
+    category_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    frequency: Optional[RecurrenceFrequency] = None
+    interval: Optional[int] = Field(None, ge=1, le=366)
+    day_of_month: Optional[int] = Field(None, ge=1, le=31)
+    weekday: Optional[int] = Field(None, ge=0, le=6)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    active: Optional[bool] = None
+
+
+class RecurringRule(RecurringRuleBase):
+    """Schema for recurring transaction rule response"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_by_user_id: int
+    materialized_through: Optional[date] = Field(None, description="Occurrences up to this date have been created")
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class RecurringOccurrence(BaseModel):
+    """A transaction a rule will create; previews are never written"""
+
+    rule_id: int
+    occurrence_date: date
+    type: TransactionType
+    amount: Amount
+    description: str
+    category_id: int
+    beneficiary_id: int
+
+
+class RecurringRunResult(BaseModel):
+    """Outcome of materializing every due occurrence"""
+
+    rules: int = Field(0, description="Active rules that were checked")
+    created: int = Field(0, description="Transactions created; occurrences that already existed are skipped")
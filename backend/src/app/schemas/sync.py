@@ -0,0 +1,23 @@
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from . import Beneficiary, Category, Transaction
+from .budget import Budget
+from .gift import GiftEntry, GiftOccasion, GiftPurchase
+
+
+class SyncChanges(BaseModel):
+    """Entities changed after a sync cursor, plus ids deleted since then"""
+
+    cursor: int = Field(..., description="Pass as `since` on the next call")
+    has_more: bool = Field(False, description="More changes are pending; call again with the new cursor")
+    reset: bool = Field(False, description="The cursor is unknown to the server; drop the local cache and resync")
+    categories: List[Category] = []
+    beneficiaries: List[Beneficiary] = []
+    transactions: List[Transaction] = []
+    gift_occasions: List[GiftOccasion] = []
+    gift_entries: List[GiftEntry] = []
+    gift_purchases: List[GiftPurchase] = []
+    budgets: List[Budget] = []
+    deleted: Dict[str, List[int]] = Field(default_factory=dict, description="Deleted ids by entity")
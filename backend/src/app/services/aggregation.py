@@ -1,17 +1,18 @@
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
 
-from ..models import Transaction, TransactionType
-from ..schemas import AggregationFilters, AggregationSummary
+from sqlalchemy import Select, case, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config.settings import settings
+from ..models import Transaction, TransactionTag, TransactionType
+from ..models.money import from_cents, to_cents
+from ..schemas import AggregationFilters, AggregationSummary, TagAggregation
+from .archive import archive_catalog
+from .fx import base_amount, without_rate
+from .transactions import apply_tag_filter
 
-async def get_aggregation_summary(db: AsyncSession, filters: AggregationFilters) -> AggregationSummary:
-    """
-    Calculate aggregation summary based on filters
-    """
-    query = select(Transaction)
 
-    # Apply filters
+def _apply_aggregation_filters(query: Select, filters: AggregationFilters) -> Select:
     if filters.start_date:
         query = query.where(Transaction.transaction_date >= filters.start_date)
     if filters.end_date:
@@ -22,16 +23,35 @@ async def get_aggregation_summary(db: AsyncSession, filters: AggregationFilters)
         query = query.where(Transaction.category_id == filters.category_id)
     if filters.beneficiary_id:
         query = query.where(Transaction.beneficiary_id == filters.beneficiary_id)
+    return apply_tag_filter(query, filters)
 
-    # Execute query
-    result = await db.execute(query)
-    transactions = result.scalars().all()
 
-    # Calculate aggregates
-    total_income = sum(float(t.amount) for t in transactions if t.type == TransactionType.INCOME)
-    total_expenses = sum(float(t.amount) for t in transactions if t.type == TransactionType.EXPENSE)
+def _totals():
+    """Income and expense sums in the base currency; amounts are converted to integer cents per transaction, so
+    SQLite sums them exactly"""
+    amount = base_amount()
+    income = func.coalesce(func.sum(case((Transaction.type == TransactionType.INCOME, amount))), 0)
+    expenses = func.coalesce(func.sum(case((Transaction.type == TransactionType.EXPENSE, amount))), 0)
+    return income, expenses
+
+
+async def get_aggregation_summary(db: AsyncSession, filters: AggregationFilters) -> AggregationSummary:
+    """
+    Calculate aggregation summary based on filters
+    """
+    income, expenses = _totals()
+    # Same pass: currencies whose transactions the totals leave out for lack of a rate
+    unconverted = func.group_concat(distinct(case((without_rate(), Transaction.currency))))
+    query = _apply_aggregation_filters(select(income, expenses, func.count(Transaction.id), unconverted), filters)
+
+    result = await db.execute(query)
+    total_income, total_expenses, transaction_count, unconverted_currencies = result.one()
+    if archive_catalog.reaches(filters.start_date):
+        income_cents, expense_cents, archived_count = archive_catalog.totals(filters)
+        total_income = from_cents(to_cents(total_income) + income_cents)
+        total_expenses = from_cents(to_cents(total_expenses) + expense_cents)
+        transaction_count += archived_count
     net_total = total_income - total_expenses
-    transaction_count = len(transactions)
 
     return AggregationSummary(
         total_income=total_income,
@@ -39,4 +59,47 @@ async def get_aggregation_summary(db: AsyncSession, filters: AggregationFilters)
         net_total=net_total,
         net_balance=net_total,
         transaction_count=transaction_count,
+        currency=settings.BASE_CURRENCY,
+        unconverted_currencies=sorted(unconverted_currencies.split(",")) if unconverted_currencies else [],
     )
+
+
+async def get_tag_aggregations(db: AsyncSession, filters: AggregationFilters) -> List[TagAggregation]:
+    """
+    Income/expense totals per tag, computed in SQL over the transaction_tags index (and from the segments of
+    archived years the date range reaches)
+    """
+    income, expenses = _totals()
+    query = (
+        select(TransactionTag.tag, income, expenses, func.count())
+        .join(Transaction, Transaction.id == TransactionTag.transaction_id)
+        .group_by(TransactionTag.tag)
+        .order_by(expenses.desc(), TransactionTag.tag)
+    )
+    query = _apply_aggregation_filters(query, filters)
+
+    result = await db.execute(query)
+    rows = result.all()
+    if archive_catalog.reaches(filters.start_date):
+        totals = {tag: [to_cents(income), to_cents(expenses), count] for tag, income, expenses, count in rows}
+        for tag, archived in archive_catalog.tag_totals(filters).items():
+            entry = totals.setdefault(tag, [0, 0, 0])
+            for position, value in enumerate(archived):
+                entry[position] += value
+        rows = sorted(
+            (
+                (tag, from_cents(income), from_cents(expenses), count)
+                for tag, (income, expenses, count) in totals.items()
+            ),
+            key=lambda row: (-row[2], row[0]),
+        )
+    return [
+        TagAggregation(
+            tag=tag,
+            total_income=total_income,
+            total_expenses=total_expenses,
+            net_total=total_income - total_expenses,
+            transaction_count=transaction_count,
+        )
+        for tag, total_income, total_expenses, transaction_count in rows
+    ]
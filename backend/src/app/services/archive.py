@@ -0,0 +1,631 @@
+"""Cold storage for closed years: their transactions move out of the table into compressed Parquet segments.
+
+``archive_transactions.py --through YEAR`` moves the transactions of every year up to YEAR (which must be over)
+into ``ARCHIVE_DIR``: one segment file per year (zstd), next to it a rollup file with the year's totals per
+month, type, category and beneficiary, and ``manifest.json`` listing the archived years. ``--restore YEAR``
+moves YEAR and every later archived year back. Archived years are always the oldest ones, so everything before
+the cutoff (January 1st after the last archived year) is archived, and transactions can no longer be created
+or moved before it. Transactions linked to a gift record stay in the table, so the link keeps working.
+Archiving and restoring leave the sync change log as it was: archived transactions are still transactions, so
+clients keep their copies.
+
+Queries whose date range starts before the cutoff add the archive to what they read from the table:
+
+* aggregation totals take whole months from the rollups, and only read segments for a partly covered first or
+  last month, or for a tag filter;
+* budget spending and the forecast history add the rollups of the months they cover;
+* tag totals and transaction lists read the segments, with the filters pushed down to the Parquet reader.
+
+Amounts are converted to the base currency when they are archived; exchange rates imported later do not change
+archived totals. The manifest is checked for changes on every use, so a running server picks up an archive or
+restore made with the command.
+
+pyarrow is optional; install it with ``uv sync --extra analytics``.
+"""
+
+import heapq
+import json
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import reduce
+from itertools import islice
+from operator import and_
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, delete, exists, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models import ChangeLog, GiftEntry, GiftPurchase, Transaction
+from ..models.money import from_cents, to_cents
+from ..schemas import TagMatch, TransactionFilters, TransactionType
+from .fx import base_amount
+from .reference_cache import reference_cache
+from .transactions import apply_transaction_filters
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+    ds = None
+    pq = None
+
+MANIFEST = "manifest.json"
+COMPRESSION = "zstd"
+BATCH_SIZE = 5000
+ONE_MICROSECOND = timedelta(microseconds=1)
+TOTAL_COLUMNS = ["type", "base_amount"]
+
+
+def is_available() -> bool:
+    """Whether pyarrow is installed"""
+    return pa is not None
+
+
+def segment_schema() -> "pa.Schema":
+    """Every ``transactions`` column, so a restore is exact, plus the amount in the base currency"""
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("transaction_date", pa.timestamp("us")),
+            ("type", pa.string()),
+            ("amount", pa.decimal128(15, 2)),
+            ("currency", pa.string()),
+            ("base_amount", pa.decimal128(15, 2)),
+            ("description", pa.string()),
+            ("category_id", pa.int32()),
+            ("beneficiary_id", pa.int32()),
+            ("created_by_user_id", pa.int32()),
+            ("image_path", pa.string()),
+            ("notes", pa.string()),
+            ("tags", pa.list_(pa.string())),
+            ("import_key", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+        ]
+    )
+
+
+def rollup_schema() -> "pa.Schema":
+    return pa.schema(
+        [
+            ("month", pa.string()),
+            ("type", pa.string()),
+            ("category_id", pa.int32()),
+            ("beneficiary_id", pa.int32()),
+            ("base_amount", pa.decimal128(18, 2)),
+            ("count", pa.int64()),
+        ]
+    )
+
+
+class RollupRow(NamedTuple):
+    month: str  # "YYYY-MM"
+    type: TransactionType
+    category_id: int
+    beneficiary_id: int
+    cents: int  # Base currency
+    count: int
+
+
+def _year_start(year: int) -> datetime:
+    return datetime(year, 1, 1)
+
+
+def _month_bounds(month: str) -> Tuple[datetime, datetime]:
+    """First and last instant of a "YYYY-MM" month"""
+    year, number = int(month[:4]), int(month[5:])
+    start = datetime(year, number, 1)
+    end = datetime(year + number // 12, number % 12 + 1, 1)
+    return start, end - ONE_MICROSECOND
+
+
+def _matches(row: RollupRow, filters) -> bool:
+    return (
+        (not filters.transaction_type or row.type == filters.transaction_type)
+        and (not filters.category_id or row.category_id == filters.category_id)
+        and (not filters.beneficiary_id or row.beneficiary_id == filters.beneficiary_id)
+    )
+
+
+def _condition(filters, start: Optional[datetime], end: Optional[datetime]):
+    """The filters as a Parquet reader expression, or ``None``; tags are matched after reading"""
+    date = ds.field("transaction_date")
+    parts = []
+    if start is not None:
+        parts.append(date >= pa.scalar(start, pa.timestamp("us")))
+    if end is not None:
+        parts.append(date <= pa.scalar(end, pa.timestamp("us")))
+    if filters.transaction_type:
+        parts.append(ds.field("type") == filters.transaction_type.value)
+    for name in ("category_id", "beneficiary_id", "created_by_user_id"):
+        # Aggregation filters have no created_by_user_id
+        value = getattr(filters, name, None)
+        if value:
+            parts.append(ds.field(name) == value)
+    return reduce(and_, parts) if parts else None
+
+
+def _with_tags(table: "pa.Table", filters) -> "pa.Table":
+    wanted = set(filters.tag_list)
+    if not wanted:
+        return table
+    if filters.tag_match == TagMatch.ALL:
+        mask = [wanted <= set(tags or ()) for tags in table.column("tags").to_pylist()]
+    else:
+        mask = [not wanted.isdisjoint(tags or ()) for tags in table.column("tags").to_pylist()]
+    return table.filter(pa.array(mask, pa.bool_()))
+
+
+def _later(a: Optional[datetime], b: Optional[datetime]) -> Optional[datetime]:
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _earlier(a: Optional[datetime], b: Optional[datetime]) -> Optional[datetime]:
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _cents(value) -> int:
+    return to_cents(value) if value is not None else 0
+
+
+def _totals(table: "pa.Table") -> Tuple[int, int, int]:
+    """(income, expenses, count) of a table with ``TOTAL_COLUMNS``, in base currency cents"""
+    is_income = pc.equal(table.column("type"), TransactionType.INCOME.value)
+    income = pc.sum(pc.filter(table.column("base_amount"), is_income)).as_py()
+    expenses = pc.sum(pc.filter(table.column("base_amount"), pc.invert(is_income))).as_py()
+    return _cents(income), _cents(expenses), table.num_rows
+
+
+class ArchiveCatalog:
+    """The archived years and their rollups, reloaded whenever ``manifest.json`` changes"""
+
+    def __init__(self):
+        self._key: object = None
+        self._years: Dict[int, dict] = {}
+        self._rollups: List[RollupRow] = []
+
+    def invalidate(self) -> None:
+        self._key = None
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.ARCHIVE_DIR)
+
+    def _refresh(self) -> None:
+        path = self.directory / MANIFEST
+        try:
+            stat = path.stat()
+            key = (str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = (str(path),)
+        if key == self._key:
+            return
+        years = {int(year): entry for year, entry in read_manifest(self.directory)["years"].items()}
+        if years and not is_available():
+            raise RuntimeError("Archived years require pyarrow (install the analytics extra)")
+        rollups = []
+        for entry in years.values():
+            for row in pq.read_table(self.directory / entry["rollup"]).to_pylist():
+                rollups.append(
+                    RollupRow(
+                        row["month"],
+                        TransactionType(row["type"]),
+                        row["category_id"],
+                        row["beneficiary_id"],
+                        to_cents(row["base_amount"]),
+                        row["count"],
+                    )
+                )
+        self._years, self._rollups, self._key = years, rollups, key
+
+    @property
+    def years(self) -> List[int]:
+        self._refresh()
+        return sorted(self._years)
+
+    @property
+    def cutoff(self) -> Optional[datetime]:
+        """Everything dated before this is archived"""
+        self._refresh()
+        return _year_start(max(self._years) + 1) if self._years else None
+
+    def is_archived(self, when: datetime) -> bool:
+        cutoff = self.cutoff
+        return cutoff is not None and when.replace(tzinfo=None) < cutoff
+
+    def reaches(self, start: Optional[datetime]) -> bool:
+        """Whether a date range starting at ``start`` (``None``: the beginning) includes archived years"""
+        cutoff = self.cutoff
+        return cutoff is not None and (start is None or start < cutoff)
+
+    def _read(self, year: int, columns: List[str], filters, start, end) -> "pa.Table":
+        if filters.tag_list and "tags" not in columns:
+            columns = [*columns, "tags"]
+        table = pq.read_table(
+            self.directory / self._years[year]["segment"], columns=columns, filters=_condition(filters, start, end)
+        )
+        return _with_tags(table, filters)
+
+    def _overlapping(self, start: Optional[datetime], end: Optional[datetime]) -> List[int]:
+        return [
+            year
+            for year in sorted(self._years)
+            if (start is None or start < _year_start(year + 1)) and (end is None or end >= _year_start(year))
+        ]
+
+    def scan(
+        self, filters, columns: List[str], start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> "pa.Table":
+        """Archived transactions matching ``filters``, narrowed to ``start``-``end``, oldest year first"""
+        self._refresh()
+        start, end = _later(filters.start_date, start), _earlier(filters.end_date, end)
+        tables = [self._read(year, columns, filters, start, end) for year in self._overlapping(start, end)]
+        if not tables:
+            schema = segment_schema()
+            return schema.empty_table().select(columns)
+        return pa.concat_tables(tables)
+
+    def totals(self, filters) -> Tuple[int, int, int]:
+        """Archived (income, expenses, count) for aggregation ``filters``, in base currency cents"""
+        self._refresh()
+        if not self._years:
+            return 0, 0, 0
+        if filters.tag_list:
+            return _totals(self.scan(filters, TOTAL_COLUMNS))
+
+        start, end = filters.start_date, filters.end_date
+        full, partial = set(), []
+        for month in {row.month for row in self._rollups}:
+            first, last = _month_bounds(month)
+            if (start is not None and start > last) or (end is not None and end < first):
+                continue
+            if (start is None or start <= first) and (end is None or end >= last):
+                full.add(month)
+            else:
+                partial.append((first, last))
+
+        income = expenses = count = 0
+        for row in self._rollups:
+            if row.month in full and _matches(row, filters):
+                if row.type == TransactionType.INCOME:
+                    income += row.cents
+                else:
+                    expenses += row.cents
+                count += row.count
+        for first, last in partial:
+            month_income, month_expenses, month_count = _totals(self.scan(filters, TOTAL_COLUMNS, first, last))
+            income, expenses, count = income + month_income, expenses + month_expenses, count + month_count
+        return income, expenses, count
+
+    def tag_totals(self, filters) -> Dict[str, List[int]]:
+        """Archived tag -> [income, expenses, count] for aggregation ``filters``, in base currency cents"""
+        self._refresh()
+        totals: Dict[str, List[int]] = {}
+        if not self._years:
+            return totals
+        table = self.scan(filters, [*TOTAL_COLUMNS, "tags"])
+        for transaction_type, amount, tags in zip(
+            table.column("type").to_pylist(), table.column("base_amount").to_pylist(), table.column("tags").to_pylist()
+        ):
+            position = 0 if transaction_type == TransactionType.INCOME.value else 1
+            for tag in set(tags or ()):
+                entry = totals.setdefault(tag, [0, 0, 0])
+                entry[position] += to_cents(amount)
+                entry[2] += 1
+        return totals
+
+    def monthly_expenses(self, start: date, end: date) -> Dict[Tuple[int, int, str], Decimal]:
+        """Archived expenses per category, beneficiary and month, for the months ``start`` to ``end``"""
+        self._refresh()
+        first, last = start.strftime("%Y-%m"), end.strftime("%Y-%m")
+        spend: Dict[Tuple[int, int, str], int] = {}
+        for row in self._rollups:
+            if row.type == TransactionType.EXPENSE and first <= row.month <= last:
+                key = (row.category_id, row.beneficiary_id, row.month)
+                spend[key] = spend.get(key, 0) + row.cents
+        return {key: from_cents(cents) for key, cents in spend.items()}
+
+    def history_rows(self, first: int, last: int) -> List[Tuple[int, int, int, int, int, int, int]]:
+        """Forecast history rows (see ``forecast.load_history``) for archived months ``first`` to ``last``"""
+        self._refresh()
+        buckets: Dict[Tuple[int, int, int], List[int]] = {}
+        for row in self._rollups:
+            bucket = int(row.month[:4]) * 12 + int(row.month[5:]) - 1
+            if first <= bucket <= last:
+                is_income = int(row.type == TransactionType.INCOME)
+                entry = buckets.setdefault((bucket, row.category_id, is_income), [0, 0])
+                entry[0] += row.cents if is_income else -row.cents
+                entry[1] += row.count
+        return [
+            (bucket, category_id, is_income, 0, 0, total, count)
+            for (bucket, category_id, is_income), (total, count) in buckets.items()
+        ]
+
+    def newest(self, filters, limit: int) -> List[dict]:
+        """Up to ``limit`` archived transactions matching ``filters``, newest first"""
+        self._refresh()
+        rows: List[dict] = []
+        start, end = filters.start_date, filters.end_date
+        for year in reversed(self._overlapping(start, end)):
+            table = self._read(year, segment_schema().names, filters, start, end)
+            table = table.sort_by([("transaction_date", "descending"), ("id", "descending")])
+            rows.extend(table.slice(0, limit - len(rows)).to_pylist())
+            if len(rows) >= limit:
+                break
+        return rows
+
+
+archive_catalog = ArchiveCatalog()
+
+
+async def _archived_transactions(db: AsyncSession, rows: List[dict]) -> List[SimpleNamespace]:
+    """Segment rows as objects the transaction schemas validate, with references from the reference cache"""
+    _, references = await reference_cache.get(db)
+    if not references.covers(
+        (row["category_id"] for row in rows),
+        (row["beneficiary_id"] for row in rows),
+        (row["created_by_user_id"] for row in rows),
+    ):
+        reference_cache.invalidate()
+        _, references = await reference_cache.get(db)
+    transactions = []
+    for row in rows:
+        row["type"] = TransactionType(row["type"])
+        transactions.append(
+            SimpleNamespace(
+                **row,
+                category=references.categories_by_id.get(row["category_id"]),
+                beneficiary=references.beneficiaries_by_id.get(row["beneficiary_id"]),
+                created_by_user=references.users_by_id.get(row["created_by_user_id"]),
+            )
+        )
+    return transactions
+
+
+async def page_with_archive(
+    db: AsyncSession, query: Select, filters: TransactionFilters, skip: int, limit: int
+) -> Sequence:
+    """One page of a transaction list whose date range reaches archived years, newest first.
+
+    ``query`` selects the filtered transactions. Pages after the cutoff cost the same single query as without an
+    archive; older pages merge the table's rows before the cutoff (pinned ones) with the newest archived rows.
+    """
+    cutoff = archive_catalog.cutoff
+    order = (Transaction.transaction_date.desc(), Transaction.id.desc())
+    result = await db.execute(
+        query.where(Transaction.transaction_date >= cutoff).order_by(*order).offset(skip).limit(limit)
+    )
+    recent = list(result.scalars().all())
+    if len(recent) == limit:
+        return recent
+    if recent or not skip:
+        newer = skip + len(recent)
+    else:
+        newer = await db.scalar(
+            apply_transaction_filters(select(func.count(Transaction.id)), filters).where(
+                Transaction.transaction_date >= cutoff
+            )
+        )
+
+    older_skip = max(0, skip - newer)
+    wanted = older_skip + limit - len(recent)
+    result = await db.execute(query.where(Transaction.transaction_date < cutoff).order_by(*order).limit(wanted))
+    live = result.scalars().all()
+    archived = await _archived_transactions(db, archive_catalog.newest(filters, wanted))
+    merged = heapq.merge(live, archived, key=lambda t: (t.transaction_date, t.id), reverse=True)
+    return recent + list(islice(merged, older_skip, wanted))
+
+
+def read_manifest(directory: Path) -> dict:
+    try:
+        return json.loads((directory / MANIFEST).read_text())
+    except FileNotFoundError:
+        return {"years": {}}
+
+
+def _write_manifest(directory: Path, manifest: dict) -> None:
+    """Replace the manifest atomically, so readers see the old or the new list of years"""
+    temporary = directory / f"{MANIFEST}.tmp"
+    temporary.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(temporary, directory / MANIFEST)
+    archive_catalog.invalidate()
+
+
+def _write_parquet(table: "pa.Table", path: Path) -> None:
+    temporary = path.with_name(path.name + ".tmp")
+    pq.write_table(table, temporary, compression=COMPRESSION)
+    os.replace(temporary, path)
+
+
+def _pinned():
+    """Transactions a gift record links to; they are never archived"""
+    return or_(
+        exists().where(GiftEntry.transaction_id == Transaction.id),
+        exists().where(GiftPurchase.transaction_id == Transaction.id),
+    )
+
+
+async def _change_log_entries(db: AsyncSession, ids: List[int]) -> List[dict]:
+    """The change log rows of the transactions ``ids``"""
+    table = ChangeLog.__table__
+    entries = []
+    for offset in range(0, len(ids), BATCH_SIZE):
+        result = await db.execute(
+            select(table).where(
+                table.c.entity == Transaction.__tablename__, table.c.entity_id.in_(ids[offset : offset + BATCH_SIZE])
+            )
+        )
+        entries.extend(result.mappings())
+    return [dict(entry) for entry in entries]
+
+
+async def _put_back_change_log(db: AsyncSession, ids: List[int], entries: List[dict]) -> None:
+    """Replace what the triggers logged for the transactions ``ids`` with their earlier ``entries``"""
+    table = ChangeLog.__table__
+    for offset in range(0, len(ids), BATCH_SIZE):
+        await db.execute(
+            delete(table).where(
+                table.c.entity == Transaction.__tablename__, table.c.entity_id.in_(ids[offset : offset + BATCH_SIZE])
+            )
+        )
+    for offset in range(0, len(entries), BATCH_SIZE):
+        await db.execute(insert(table), entries[offset : offset + BATCH_SIZE])
+
+
+async def archive_years(db: AsyncSession, through_year: int, today: Optional[date] = None) -> List[dict]:
+    """Archive every year up to and including ``through_year``, one commit per year; returns the new manifest
+    entries. Raises ``ValueError`` for years that are not over."""
+    if not is_available():
+        raise RuntimeError("Archiving requires pyarrow (install the analytics extra)")
+    today = today or date.today()
+    if through_year >= today.year:
+        raise ValueError(f"{through_year} is not over yet; only closed years can be archived")
+
+    directory = Path(settings.ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(directory)
+    archived = {int(year) for year in manifest["years"]}
+    result = await db.execute(
+        select(func.substr(Transaction.transaction_date, 1, 4))
+        .where(Transaction.transaction_date < _year_start(through_year + 1), ~_pinned())
+        .distinct()
+    )
+    years = sorted(int(year) for (year,) in result.all())
+    reopened = [year for year in years if archived and year <= max(archived)]
+    if reopened:
+        raise ValueError(f"Archived years {reopened} have transactions in the table again; restore them first")
+
+    entries = []
+    for year in years:
+        entry = await _archive_year(db, directory, manifest, year)
+        entries.append(entry)
+    return entries
+
+
+async def _archive_year(db: AsyncSession, directory: Path, manifest: dict, year: int) -> dict:
+    table = Transaction.__table__
+    result = await db.execute(
+        select(table, base_amount().label("base_amount"))
+        .where(
+            Transaction.transaction_date >= _year_start(year),
+            Transaction.transaction_date < _year_start(year + 1),
+            ~_pinned(),
+        )
+        .order_by(Transaction.transaction_date, Transaction.id)
+    )
+    names = segment_schema().names
+    rows = []
+    rollups: Dict[Tuple[str, str, int, int], List] = {}
+    for row in result.mappings():
+        values = {name: row[name] for name in names}
+        values["type"] = row["type"].value
+        rows.append(values)
+        key = (row["transaction_date"].strftime("%Y-%m"), values["type"], row["category_id"], row["beneficiary_id"])
+        entry = rollups.setdefault(key, [Decimal(0), 0])
+        entry[0] += row["base_amount"]
+        entry[1] += 1
+
+    entry = {
+        "segment": f"transactions-{year}.parquet",
+        "rollup": f"rollups-{year}.parquet",
+        "rows": len(rows),
+        "archived_at": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+    segment, rollup = directory / entry["segment"], directory / entry["rollup"]
+    previous = json.loads(json.dumps(manifest))
+    try:
+        _write_parquet(pa.Table.from_pylist(rows, schema=segment_schema()), segment)
+        _write_parquet(
+            pa.Table.from_pylist(
+                [
+                    dict(zip(rollup_schema().names, (*key, total, count)))
+                    for key, (total, count) in sorted(rollups.items())
+                ],
+                schema=rollup_schema(),
+            ),
+            rollup,
+        )
+        ids = [row["id"] for row in rows]
+        logged = await _change_log_entries(db, ids)
+        for offset in range(0, len(ids), BATCH_SIZE):
+            await db.execute(delete(table).where(table.c.id.in_(ids[offset : offset + BATCH_SIZE])))
+        # No tombstones: sync clients keep the archived transactions
+        await _put_back_change_log(db, ids, logged)
+        manifest["years"][str(year)] = entry
+        _write_manifest(directory, manifest)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        manifest.clear()
+        manifest.update(previous)
+        _write_manifest(directory, manifest)
+        segment.unlink(missing_ok=True)
+        rollup.unlink(missing_ok=True)
+        raise
+    return {"year": year, **entry}
+
+
+async def restore_years(db: AsyncSession, from_year: int) -> List[dict]:
+    """Move ``from_year`` and every later archived year back into the table, newest first, one commit per year;
+    returns their manifest entries. Raises ``ValueError`` when none of them is archived."""
+    if not is_available():
+        raise RuntimeError("Restoring archived years requires pyarrow (install the analytics extra)")
+    directory = Path(settings.ARCHIVE_DIR)
+    manifest = read_manifest(directory)
+    years = sorted((int(year) for year in manifest["years"] if int(year) >= from_year), reverse=True)
+    if not years:
+        raise ValueError(f"No archived years from {from_year} on")
+
+    entries = []
+    for year in years:
+        entry = manifest["years"][str(year)]
+        await _restore_year(db, directory, manifest, year)
+        entries.append({"year": year, **entry})
+    return entries
+
+
+async def _restore_year(db: AsyncSession, directory: Path, manifest: dict, year: int) -> None:
+    table = Transaction.__table__
+    entry = manifest["years"][str(year)]
+    rows = pq.read_table(directory / entry["segment"]).to_pylist()
+    columns = [column.key for column in table.c]
+    values = []
+    for row in rows:
+        row["type"] = TransactionType(row["type"])
+        values.append({key: row[key] for key in columns})
+
+    try:
+        # Ids freed by archiving may have been handed out again since; those rows get new ones
+        taken = set()
+        ids = [row["id"] for row in values]
+        for offset in range(0, len(ids), BATCH_SIZE):
+            result = await db.execute(select(table.c.id).where(table.c.id.in_(ids[offset : offset + BATCH_SIZE])))
+            taken.update(result.scalars().all())
+        keep = [row for row in values if row["id"] not in taken]
+        renumber = [{key: value for key, value in row.items() if key != "id"} for row in values if row["id"] in taken]
+        kept = [row["id"] for row in keep]
+        # Sync clients still have the rows that get their ids back, as logged when they were archived; rows
+        # archived with a tombstone, or renumbered, are logged as created since clients do not have them
+        logged = [entry for entry in await _change_log_entries(db, kept) if not entry["deleted"]]
+        for batch in (keep, renumber):
+            for offset in range(0, len(batch), BATCH_SIZE):
+                await db.execute(insert(table), batch[offset : offset + BATCH_SIZE])
+        await _put_back_change_log(db, [entry["entity_id"] for entry in logged], logged)
+        del manifest["years"][str(year)]
+        _write_manifest(directory, manifest)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        manifest["years"][str(year)] = entry
+        _write_manifest(directory, manifest)
+        raise
+    (directory / entry["segment"]).unlink(missing_ok=True)
+    (directory / entry["rollup"]).unlink(missing_ok=True)
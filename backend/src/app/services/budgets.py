@@ -0,0 +1,184 @@
+"""Budget-vs-actual evaluation for ``/budgets/status``.
+
+Actual spending for every budget in a month comes from one grouped query: expenses summed per category,
+beneficiary and month. Each budget then adds up the groups it matches, so the cost does not grow with the
+number of budgets. Rollover budgets need every month since they started, which the same query covers by
+widening its date range.
+
+Reports are cached per month and dropped whenever a transaction, budget or exchange rate changes (through the
+event bus, like the reference cache).
+"""
+
+import asyncio
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models import Budget, Transaction, TransactionType
+from ..schemas import BudgetState, BudgetStatus, BudgetStatusReport
+from .archive import archive_catalog
+from .events import event_bus
+from .fx import base_amount
+
+BUDGET_ENTITIES = {"transactions", "budgets", "fx_rates"}
+
+# (category_id, beneficiary_id, "YYYY-MM") -> total expenses
+MonthlySpend = Dict[Tuple[int, int, str], Decimal]
+
+
+def month_key(month: date) -> str:
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+def parse_month(value: str) -> date:
+    """``"2024-03"`` -> ``date(2024, 3, 1)``"""
+    year, month = value.split("-")
+    return date(int(year), int(month), 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def monthly_spend(db: AsyncSession, start: date, end: date) -> MonthlySpend:
+    """Expenses per category, beneficiary and month, in the base currency, for the months ``start`` up to and
+    including ``end``; archived months come from their rollups"""
+    month = func.strftime("%Y-%m", Transaction.transaction_date)
+    result = await db.execute(
+        select(Transaction.category_id, Transaction.beneficiary_id, month, func.sum(base_amount()))
+        .where(
+            Transaction.type == TransactionType.EXPENSE,
+            Transaction.transaction_date >= datetime.combine(start, datetime.min.time()),
+            Transaction.transaction_date < datetime.combine(add_months(end, 1), datetime.min.time()),
+        )
+        .group_by(Transaction.category_id, Transaction.beneficiary_id, month)
+    )
+    spend = {(category_id, beneficiary_id, key): total for category_id, beneficiary_id, key, total in result.all()}
+    if archive_catalog.reaches(datetime.combine(start, datetime.min.time())):
+        for key, total in archive_catalog.monthly_expenses(start, end).items():
+            spend[key] = spend.get(key, 0) + total
+    return spend
+
+
+def _spent_per_month(budget: Budget, spend: MonthlySpend) -> Dict[str, Decimal]:
+    spent: Dict[str, Decimal] = defaultdict(Decimal)
+    for (category_id, beneficiary_id, key), total in spend.items():
+        if budget.category_id is not None and category_id != budget.category_id:
+            continue
+        if budget.beneficiary_id is not None and beneficiary_id != budget.beneficiary_id:
+            continue
+        spent[key] += total
+    return spent
+
+
+def evaluate(budget: Budget, spend: MonthlySpend, month: date) -> BudgetStatus:
+    """
+    Status of ``budget`` in ``month``. With rollover, whatever was left of each earlier month (since
+    ``start_month``) is added to the next one; overspending a month does not reduce the following ones.
+    """
+    spent = _spent_per_month(budget, spend)
+    carried_over = Decimal("0")
+    if budget.rollover:
+        current = budget.start_month
+        while current < month:
+            carried_over = max(Decimal("0"), budget.amount + carried_over - spent[month_key(current)])
+            current = add_months(current, 1)
+
+    available = budget.amount + carried_over
+    spent_now = spent[month_key(month)]
+    percent_used = float(spent_now / available * 100)
+    if spent_now > available:
+        state = BudgetState.OVER
+    elif percent_used >= settings.BUDGET_NEAR_PERCENT:
+        state = BudgetState.NEAR
+    else:
+        state = BudgetState.UNDER
+    return BudgetStatus(
+        budget_id=budget.id,
+        name=budget.name,
+        category_id=budget.category_id,
+        beneficiary_id=budget.beneficiary_id,
+        amount=budget.amount,
+        carried_over=carried_over,
+        available=available,
+        spent=spent_now,
+        remaining=available - spent_now,
+        percent_used=round(percent_used, 1),
+        state=state,
+    )
+
+
+async def get_budget_status(db: AsyncSession, month: date) -> BudgetStatusReport:
+    """Evaluate every budget that applies to ``month`` with two queries: the budgets, then the grouped spend"""
+    result = await db.execute(select(Budget).where(Budget.start_month <= month).order_by(Budget.name, Budget.id))
+    budgets = result.scalars().all()
+
+    statuses: List[BudgetStatus] = []
+    if budgets:
+        start = min([month] + [budget.start_month for budget in budgets if budget.rollover])
+        spend = await monthly_spend(db, start, month)
+        statuses = [evaluate(budget, spend, month) for budget in budgets]
+
+    return BudgetStatusReport(
+        month=month_key(month),
+        start_date=month,
+        end_date=add_months(month, 1) - timedelta(days=1),
+        over_budget=sum(status.state == BudgetState.OVER for status in statuses),
+        budgets=statuses,
+    )
+
+
+class BudgetStatusCache:
+    """Most recently used month reports; any transaction or budget change drops all of them"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._reports: "OrderedDict[date, BudgetStatusReport]" = OrderedDict()
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._reports.clear()
+
+    def on_event(self, message: dict) -> None:
+        if message.get("entity") in BUDGET_ENTITIES:
+            self.invalidate()
+
+    def _cached(self, month: date) -> Optional[BudgetStatusReport]:
+        report = self._reports.get(month)
+        if report is not None:
+            self._reports.move_to_end(month)
+            self.hits += 1
+        return report
+
+    async def get(self, db: AsyncSession, month: date) -> BudgetStatusReport:
+        report = self._cached(month)
+        if report is not None:
+            return report
+
+        async with self._lock:
+            report = self._cached(month)
+            if report is not None:
+                return report
+            self.misses += 1
+            generation = self._generation
+            report = await get_budget_status(db, month)
+            # Only keep the result if nothing was invalidated while it was computed
+            if generation == self._generation:
+                self._reports[month] = report
+                while len(self._reports) > self.size:
+                    self._reports.popitem(last=False)
+            return report
+
+
+budget_status_cache = BudgetStatusCache(settings.BUDGET_STATUS_CACHE_MONTHS)
+event_bus.add_listener(budget_status_cache.on_event)
@@ -0,0 +1,204 @@
+"""Rule-based categorization: pick a category and beneficiary for a description.
+
+Active rules are compiled into one :class:`RuleMatcher`. Substring rules share a single Aho-Corasick automaton,
+which finds every keyword in a description in one pass however many rules there are. Regex rules are joined into
+one alternation that is searched first; only when it matches are the individual patterns checked, so most
+descriptions cost one scan per rule kind. Amount and type conditions are checked on the few rules left.
+
+Each field comes from the best matching rule (lowest ``priority``, then lowest id) that sets it. The compiled
+matcher is cached and dropped on every ``categorization_rules`` event, so edits apply to the next request or
+import batch in every worker that receives the event.
+"""
+
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import CategorizationRule, RuleMatchType, TransactionType
+from ..schemas import CategorizationSuggestion
+from .events import event_bus
+
+RULE_ENTITY = "categorization_rules"
+
+
+def combine_patterns(patterns: Iterable[str]) -> re.Pattern:
+    """The alternation of regex rule patterns searched before the individual ones; raises ``re.error``"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting the value of every keyword that occurs in a text, in one pass"""
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for keyword, value in keywords:
+            state = 0
+            for char in keyword:
+                child = goto[state].get(char)
+                if child is None:
+                    child = goto[state][char] = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                state = child
+            outputs[state].append(value)
+
+        # Breadth-first, so the state a failed match falls back to is always finished first. Each state then gets
+        # the full transition table (its own edges over its fallback's), so matching never walks fallback links;
+        # the tables hold one entry per state and keyword character, small for household-sized rule sets.
+        fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        self._outputs: List[Tuple[int, ...]] = [tuple(values) for values in outputs]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+            # A keyword also reports every shorter keyword it ends with
+            self._outputs[state] += self._outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0)
+                queue.append(child)
+
+    def find(self, text: str) -> List[int]:
+        delta, outputs = self._delta, self._outputs
+        found: List[int] = []
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found += outputs[state]
+        return found
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: int
+    category_id: Optional[int]
+    beneficiary_id: Optional[int]
+    transaction_type: Optional[TransactionType]
+    min_amount: Optional[Decimal]
+    max_amount: Optional[Decimal]
+
+    def accepts(self, amount: Optional[Decimal], transaction_type: Optional[TransactionType]) -> bool:
+        """Whether the amount and type conditions hold; an unknown value fails any condition on it"""
+        if self.transaction_type is not None and transaction_type != self.transaction_type:
+            return False
+        if self.min_amount is not None and (amount is None or amount < self.min_amount):
+            return False
+        if self.max_amount is not None and (amount is None or amount > self.max_amount):
+            return False
+        return True
+
+
+class RuleMatcher:
+    """All active rules compiled for matching; rules are referred to by their rank in priority order"""
+
+    def __init__(self, rules: Sequence[CategorizationRule]):
+        rules = sorted(rules, key=lambda rule: (rule.priority, rule.id))
+        self.rules = [
+            CompiledRule(
+                id=rule.id,
+                category_id=rule.category_id,
+                beneficiary_id=rule.beneficiary_id,
+                transaction_type=rule.transaction_type,
+                min_amount=rule.min_amount,
+                max_amount=rule.max_amount,
+            )
+            for rule in rules
+        ]
+        keywords: List[Tuple[str, int]] = []
+        regexes: List[Tuple[int, str]] = []
+        # Rules without a pattern match every description and only check amount and type
+        self._always: List[int] = []
+        for rank, rule in enumerate(rules):
+            if not rule.pattern:
+                self._always.append(rank)
+            elif rule.match_type == RuleMatchType.REGEX:
+                regexes.append((rank, rule.pattern))
+            else:
+                keywords.append((rule.pattern.casefold(), rank))
+
+        self._keywords = KeywordAutomaton(keywords)
+        self._regexes = [(rank, re.compile(pattern, re.IGNORECASE)) for rank, pattern in regexes]
+        self._any_regex: Optional[re.Pattern] = None
+        if regexes:
+            try:
+                self._any_regex = combine_patterns(pattern for _, pattern in regexes)
+            except re.error:
+                # Rules saved before their patterns were checked together: search each one
+                pass
+
+    def matching_ranks(self, description: str) -> List[int]:
+        """Ranks of the rules whose pattern matches, best first; amount and type are not checked"""
+        ranks = set(self._keywords.find(description.casefold()))
+        if self._regexes and (self._any_regex is None or self._any_regex.search(description)):
+            ranks.update(rank for rank, regex in self._regexes if regex.search(description))
+        ranks.update(self._always)
+        return sorted(ranks)
+
+    def suggest(
+        self,
+        description: str,
+        amount: Optional[Decimal] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> CategorizationSuggestion:
+        category = beneficiary = None
+        for rank in self.matching_ranks(description):
+            rule = self.rules[rank]
+            if not rule.accepts(amount, transaction_type):
+                continue
+            if category is None and rule.category_id is not None:
+                category = rule
+            if beneficiary is None and rule.beneficiary_id is not None:
+                beneficiary = rule
+            if category is not None and beneficiary is not None:
+                break
+        return CategorizationSuggestion(
+            category_id=category and category.category_id,
+            category_rule_id=category and category.id,
+            beneficiary_id=beneficiary and beneficiary.beneficiary_id,
+            beneficiary_rule_id=beneficiary and beneficiary.id,
+        )
+
+
+class RuleMatcherCache:
+    """The compiled matcher for the active rules, rebuilt after any rule changes"""
+
+    def __init__(self):
+        self._generation = 0
+        self._matcher: Optional[RuleMatcher] = None
+        self._lock = asyncio.Lock()
+        self.builds = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._matcher = None
+
+    def on_event(self, message: dict) -> None:
+        if message.get("entity") == RULE_ENTITY:
+            self.invalidate()
+
+    async def get(self, db: AsyncSession) -> RuleMatcher:
+        if self._matcher is not None:
+            return self._matcher
+        async with self._lock:
+            if self._matcher is not None:
+                return self._matcher
+            generation = self._generation
+            result = await db.execute(select(CategorizationRule).where(CategorizationRule.active.is_(True)))
+            matcher = RuleMatcher(result.scalars().all())
+            self.builds += 1
+            # Only keep the result if no rule changed while it was loading
+            if generation == self._generation:
+                self._matcher = matcher
+            return matcher
+
+
+rule_matcher_cache = RuleMatcherCache()
+event_bus.add_listener(rule_matcher_cache.on_event)
@@ -0,0 +1,242 @@
+"""Columnar (Arrow IPC stream / Parquet) transaction export for analytics tooling.
+
+Rows are fetched in cursor partitions and written as record batches of ``COLUMNAR_BATCH_SIZE`` rows.
+Category, beneficiary and user names are dictionary-encoded against a single dictionary per export, so
+every batch shares it and notebooks get categorical columns without a join. Timestamps are typed
+``timestamp[us]`` columns and amounts exact ``decimal128(15, 2)``.
+
+pyarrow is optional; install it with ``uv sync --extra analytics``.
+"""
+
+import io
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Sequence
+
+from sqlalchemy import Engine, Select, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..models import Beneficiary, Category, Transaction, TransactionType, User
+from ..schemas import ExportFormat, TransactionFilters
+from .export import EXPORT_BATCH_SIZE
+from .transactions import apply_transaction_filters
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+COLUMNAR_BATCH_SIZE = 65536
+COLUMNAR_FORMATS = {ExportFormat.ARROW, ExportFormat.PARQUET}
+PARQUET_COMPRESSION = "zstd"
+
+COLUMNAR_COLUMNS = (
+    Transaction.id,
+    Transaction.transaction_date,
+    Transaction.type,
+    Transaction.amount,
+    Transaction.description,
+    Transaction.category_id,
+    Transaction.beneficiary_id,
+    Transaction.created_by_user_id,
+    Transaction.notes,
+    Transaction.tags,
+    Transaction.created_at,
+    Transaction.currency,
+)
+
+
+def is_available() -> bool:
+    """Whether pyarrow is installed"""
+    return pa is not None
+
+
+def transaction_schema() -> "pa.Schema":
+    names = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("transaction_date", pa.timestamp("us")),
+            ("type", pa.dictionary(pa.int8(), pa.string())),
+            ("amount", pa.decimal128(15, 2)),
+            ("description", pa.string()),
+            ("category_id", pa.int32()),
+            ("category", names),
+            ("beneficiary_id", pa.int32()),
+            ("beneficiary", names),
+            ("created_by_user_id", pa.int32()),
+            ("created_by", names),
+            ("notes", pa.string()),
+            ("tags", pa.list_(pa.string())),
+            ("created_at", pa.timestamp("us")),
+            ("currency", pa.string()),
+        ]
+    )
+
+
+class _NameDictionary:
+    """Fixed Arrow dictionary for an id -> name mapping, shared by every batch of one export"""
+
+    def __init__(self, names: Dict[int, str], index_type=None):
+        ids = sorted(names)
+        self.positions = {id_: position for position, id_ in enumerate(ids)}
+        self.dictionary = pa.array([names[id_] for id_ in ids], pa.string())
+        self.index_type = index_type or pa.int32()
+
+    def encode(self, ids: Sequence) -> "pa.DictionaryArray":
+        indices = pa.array([self.positions.get(id_) for id_ in ids], self.index_type)
+        return pa.DictionaryArray.from_arrays(indices, self.dictionary)
+
+
+class TransactionBatchBuilder:
+    """Builds record batches from rows in ``COLUMNAR_COLUMNS`` order"""
+
+    def __init__(self, categories: Dict[int, str], beneficiaries: Dict[int, str], users: Dict[int, str]):
+        self.schema = transaction_schema()
+        self.types = _NameDictionary({t: t.value for t in TransactionType}, pa.int8())
+        self.categories = _NameDictionary(categories)
+        self.beneficiaries = _NameDictionary(beneficiaries)
+        self.users = _NameDictionary(users)
+
+    def build(self, rows: Sequence[Sequence]) -> "pa.RecordBatch":
+        (
+            ids,
+            dates,
+            types,
+            amounts,
+            descriptions,
+            category_ids,
+            beneficiary_ids,
+            user_ids,
+            notes,
+            tags,
+            created,
+            currencies,
+        ) = zip(*rows)
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(ids, pa.int64()),
+                pa.array(dates, pa.timestamp("us")),
+                self.types.encode(types),
+                pa.array(amounts, pa.decimal128(15, 2)),
+                pa.array(descriptions, pa.string()),
+                pa.array(category_ids, pa.int32()),
+                self.categories.encode(category_ids),
+                pa.array(beneficiary_ids, pa.int32()),
+                self.beneficiaries.encode(beneficiary_ids),
+                pa.array(user_ids, pa.int32()),
+                self.users.encode(user_ids),
+                pa.array(notes, pa.string()),
+                pa.array([t or [] for t in tags], pa.list_(pa.string())),
+                pa.array(created, pa.timestamp("us")),
+                pa.array(currencies, pa.string()),
+            ],
+            schema=self.schema,
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only sink that collects bytes until drained, used to stream writer output"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ColumnarWriter:
+    """Writes record batches as an Arrow IPC stream or a Parquet file"""
+
+    def __init__(self, sink: BinaryIO, schema: "pa.Schema", export_format: ExportFormat):
+        if export_format == ExportFormat.ARROW:
+            self._writer = pa.ipc.new_stream(sink, schema)
+        elif export_format == ExportFormat.PARQUET:
+            self._writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+        else:
+            raise ValueError(f"Not a columnar format: {export_format}")
+
+    def write(self, batch: "pa.RecordBatch") -> None:
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _reference_name_queries() -> tuple[Select, Select, Select]:
+    return (
+        select(Category.id, Category.name),
+        select(Beneficiary.id, Beneficiary.name),
+        select(User.id, User.name),
+    )
+
+
+def build_columnar_query(filters: Optional[TransactionFilters] = None) -> Select:
+    """Id-only column query; names come from the per-export dictionaries instead of joins"""
+    query = apply_transaction_filters(select(*COLUMNAR_COLUMNS), filters or TransactionFilters())
+    return query.order_by(Transaction.transaction_date, Transaction.id)
+
+
+async def iter_columnar_export(
+    session_factory: async_sessionmaker,
+    filters: TransactionFilters,
+    export_format: ExportFormat,
+    batch_size: int = COLUMNAR_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield Arrow IPC / Parquet bytes as each record batch is written"""
+    query = build_columnar_query(filters).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    async with session_factory() as db:
+        names = [dict((await db.execute(q)).all()) for q in _reference_name_queries()]
+        builder = TransactionBatchBuilder(*names)
+        sink = _ChunkSink()
+        writer = ColumnarWriter(sink, builder.schema, export_format)
+
+        pending: list = []
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            pending.extend(partition)
+            if len(pending) >= batch_size:
+                writer.write(builder.build(pending))
+                pending = []
+                yield sink.drain()
+
+        if pending:
+            writer.write(builder.build(pending))
+        writer.close()
+        yield sink.drain()
+
+
+def write_columnar_export(
+    engine: Engine,
+    output: BinaryIO,
+    export_format: ExportFormat,
+    filters: Optional[TransactionFilters] = None,
+    batch_size: int = COLUMNAR_BATCH_SIZE,
+) -> int:
+    """Write a columnar export using a synchronous engine (CLI path). Returns the number of rows written."""
+    rows_written = 0
+    with engine.connect() as conn:
+        names = [dict(conn.execute(q).all()) for q in _reference_name_queries()]
+        builder = TransactionBatchBuilder(*names)
+        writer = ColumnarWriter(output, builder.schema, export_format)
+        result = conn.execution_options(yield_per=batch_size).execute(build_columnar_query(filters))
+        for partition in result.partitions():
+            writer.write(builder.build(partition))
+            rows_written += len(partition)
+        writer.close()
+    return rows_written
@@ -0,0 +1,182 @@
+"""Description autocomplete: an in-memory prefix index over the distinct transaction descriptions.
+
+Descriptions are kept case-folded in a sorted list, so every description starting with a prefix is one ``bisect``
+range. Each remembers how many transactions use it and when it was last used; suggestions are ranked by that
+count halved for every ``DESCRIPTION_RECENCY_HALF_LIFE_DAYS`` since the last use. Halving is the same for every
+description as the days pass, so the ranking reduces to a score that only changes when a description is used:
+``log2(count) + last_used_day / half_life``.
+
+The index is loaded on first use (the most used descriptions) and then kept up to date by the write paths
+calling :meth:`DescriptionIndex.record` and :meth:`DescriptionIndex.forget`. It holds at most
+``DESCRIPTION_INDEX_MAX_ENTRIES`` descriptions; when full, the lowest ranked tenth is dropped. Results for short
+prefixes, whose ranges are the longest, are cached until a description under them changes.
+
+The index lives in each worker process and follows the writes that worker handles. Transaction changes published
+on the event bus by other workers drop it, so it is loaded again on next use.
+"""
+
+import asyncio
+import heapq
+import math
+from bisect import bisect_left, insort
+from datetime import date
+from operator import attrgetter
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models import Transaction
+from ..schemas import DescriptionSuggestion
+from .events import WORKER_ID, event_bus
+
+MAX_SUGGESTIONS = 20
+# Results are cached for prefixes up to this long
+CACHED_PREFIX_LENGTH = 3
+
+
+class _Entry:
+    __slots__ = ("description", "count", "last_used", "score")
+
+    def __init__(self, description: str, count: int, last_used: int):
+        self.description = description
+        self.count = count
+        self.last_used = last_used  # Day ordinal
+        self.rescore()
+
+    def rescore(self) -> None:
+        self.score = math.log2(max(self.count, 1)) + self.last_used / settings.DESCRIPTION_RECENCY_HALF_LIFE_DAYS
+
+
+_by_score = attrgetter("score")
+
+
+def _key(description: str) -> str:
+    return description.strip().casefold()
+
+
+class DescriptionIndex:
+    def __init__(self):
+        self._entries: Optional[Dict[str, _Entry]] = None
+        self._keys: List[str] = []
+        self._top: Dict[str, List[_Entry]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._entries is not None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def invalidate(self) -> None:
+        """Drop the index; it is loaded again on next use"""
+        self._entries = None
+        self._keys = []
+        self._top.clear()
+
+    def on_event(self, message: dict) -> None:
+        # This worker's own writes were already applied through record() and forget()
+        if message.get("entity") == "transactions" and message.get("origin") != WORKER_ID:
+            self.invalidate()
+
+    async def load(self, db: AsyncSession) -> None:
+        if self._entries is not None:
+            return
+        async with self._lock:
+            if self._entries is not None:
+                return
+            uses = func.count()
+            result = await db.execute(
+                select(Transaction.description, uses, func.max(Transaction.transaction_date))
+                .group_by(Transaction.description)
+                .order_by(uses.desc())
+                .limit(settings.DESCRIPTION_INDEX_MAX_ENTRIES)
+            )
+            entries: Dict[str, _Entry] = {}
+            for description, count, last_used in result.all():
+                key = _key(description)
+                if not key:
+                    continue
+                entry = entries.get(key)
+                if entry is None:
+                    entries[key] = _Entry(description.strip(), count, last_used.toordinal())
+                else:
+                    # The same description in another case: one entry, spelled as most recently used
+                    entry.count += count
+                    if last_used.toordinal() > entry.last_used:
+                        entry.description, entry.last_used = description.strip(), last_used.toordinal()
+                    entry.rescore()
+            self._entries = entries
+            self._keys = sorted(entries)
+            self._top.clear()
+
+    async def suggest(self, db: AsyncSession, prefix: str, limit: int = 10) -> List[DescriptionSuggestion]:
+        """The best ``limit`` descriptions starting with ``prefix`` (case-insensitive)"""
+        await self.load(db)
+        key = prefix.casefold().lstrip()
+        top = self._top.get(key)
+        if top is None:
+            start = bisect_left(self._keys, key)
+            end = bisect_left(self._keys, key + "\U0010ffff", start)
+            entries = self._entries
+            top = heapq.nlargest(MAX_SUGGESTIONS, (entries[k] for k in self._keys[start:end]), key=_by_score)
+            if len(key) <= CACHED_PREFIX_LENGTH:
+                self._top[key] = top
+        return [
+            DescriptionSuggestion(
+                description=entry.description, count=entry.count, last_used=date.fromordinal(entry.last_used)
+            )
+            for entry in top[:limit]
+        ]
+
+    def record(self, description: str, used_on: date) -> None:
+        """A transaction with this description was created (or moved to this description)"""
+        key = _key(description)
+        if self._entries is None or not key:
+            # Not loaded yet: the load will read it from the database
+            return
+        day = used_on.toordinal()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = _Entry(description.strip(), 1, day)
+            insort(self._keys, key)
+        else:
+            entry.count += 1
+            if day >= entry.last_used:
+                entry.last_used = day
+                entry.description = description.strip()
+            entry.rescore()
+        self._changed(key)
+        if len(self._keys) > settings.DESCRIPTION_INDEX_MAX_ENTRIES:
+            self._evict()
+
+    def forget(self, description: str) -> None:
+        """A transaction with this description was deleted (or moved to another description)"""
+        key = _key(description)
+        entry = self._entries.get(key) if self._entries is not None else None
+        if entry is None:
+            return
+        entry.count -= 1
+        if entry.count <= 0:
+            del self._entries[key]
+            del self._keys[bisect_left(self._keys, key)]
+        else:
+            entry.rescore()
+        self._changed(key)
+
+    def _changed(self, key: str) -> None:
+        for length in range(CACHED_PREFIX_LENGTH + 1):
+            self._top.pop(key[:length], None)
+
+    def _evict(self) -> None:
+        keep = int(settings.DESCRIPTION_INDEX_MAX_ENTRIES * 0.9)
+        kept = heapq.nlargest(keep, self._entries.items(), key=lambda item: item[1].score)
+        self._entries = dict(kept)
+        self._keys = sorted(self._entries)
+        self._top.clear()
+
+
+description_index = DescriptionIndex()
+event_bus.add_listener(description_index.on_event)
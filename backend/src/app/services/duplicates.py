@@ -0,0 +1,219 @@
+"""Duplicate transaction detection.
+
+Two transactions are possible duplicates when they have the same type, amount and currency, dates at most
+``DUPLICATE_DATE_WINDOW_DAYS`` apart, and similar descriptions. Candidates come from the
+``(amount_cents, transaction_date)`` index: new transactions are checked with one query per batch, probing each
+distinct amount over the batch's date range. The full scan reads the index alone, in order, pairing each
+transaction with the same-amount ones from the few days before it; only the transactions in a pair are then read
+from the table and compared, currency included since it is not in the index. Both passes are linear in the number
+of transactions.
+
+Descriptions are compared by the Dice coefficient of their character trigrams after case folding and dropping
+digits and punctuation, so card numbers, references and spacing do not matter. Trigram sets are cached per
+description.
+
+Transactions from the same source (one statement file, or one recurring rule) are never duplicates of each other:
+a statement listing two identical coffees means two coffees.
+"""
+
+import re
+from collections import defaultdict, deque
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, String, func, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models import Transaction
+from ..schemas import DuplicateGroup, DuplicateMatch
+
+SCAN_BATCH_SIZE = 5000
+
+_NOISE = re.compile(r"[\W\d_]+")
+
+
+@lru_cache(maxsize=16384)
+def _trigrams(description: str) -> FrozenSet[str]:
+    text = description.casefold()
+    text = _NOISE.sub(" ", text).strip() or text.strip()
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a: str, b: str) -> float:
+    """Similarity of two descriptions, from 0 (nothing in common) to 1 (the same apart from case and digits)"""
+    if a == b:
+        return 1.0
+    x, y = _trigrams(a), _trigrams(b)
+    return 2 * len(x & y) / (len(x) + len(y))
+
+
+def import_source(import_key: Optional[str]) -> Optional[str]:
+    """The statement file digest or recurring rule an ``import_key`` belongs to"""
+    return import_key.rpartition(":")[0] if import_key else None
+
+
+def _match(id_: int, description: str, transaction_date: datetime, score: float) -> DuplicateMatch:
+    return DuplicateMatch(
+        id=id_, description=description, transaction_date=transaction_date, similarity=round(score, 3)
+    )
+
+
+async def find_duplicates(
+    db: AsyncSession, rows: Sequence[dict], source: Optional[str] = None
+) -> List[List[DuplicateMatch]]:
+    """For each new row (``transactions`` column values), the existing transactions it may duplicate, best first
+
+    Transactions from ``source`` (see :func:`import_source`) are left out.
+    """
+    if not rows:
+        return []
+    window = settings.DUPLICATE_DATE_WINDOW_DAYS
+    days = [row["transaction_date"].toordinal() for row in rows]
+    currencies = [row.get("currency") or settings.BASE_CURRENCY for row in rows]
+    query = select(
+        Transaction.id,
+        Transaction.amount,
+        Transaction.currency,
+        Transaction.type,
+        Transaction.transaction_date,
+        Transaction.description,
+    ).where(
+        Transaction.amount.in_(sorted({row["amount"] for row in rows})),
+        Transaction.currency.in_(sorted(set(currencies))),
+        Transaction.transaction_date >= datetime.combine(date.fromordinal(min(days) - window), datetime.min.time()),
+        Transaction.transaction_date < datetime.combine(date.fromordinal(max(days) + window + 1), datetime.min.time()),
+    )
+    if source is not None:
+        query = query.where(or_(Transaction.import_key.is_(None), Transaction.import_key.not_like(f"{source}:%")))
+
+    by_amount: Dict[tuple, list] = defaultdict(list)
+    for candidate in (await db.execute(query)).all():
+        by_amount[candidate.amount, candidate.currency].append(candidate)
+
+    threshold = settings.DUPLICATE_SIMILARITY_THRESHOLD
+    duplicates = []
+    for row, day, currency in zip(rows, days, currencies):
+        matches = []
+        for candidate in by_amount.get((row["amount"], currency), ()):
+            if candidate.type != row["type"] or abs(candidate.transaction_date.toordinal() - day) > window:
+                continue
+            score = similarity(row["description"], candidate.description)
+            if score >= threshold:
+                matches.append(_match(candidate.id, candidate.description, candidate.transaction_date, score))
+        matches.sort(key=lambda match: -match.similarity)
+        duplicates.append(matches)
+    return duplicates
+
+
+async def scan_duplicates(
+    db: AsyncSession, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+) -> List[DuplicateGroup]:
+    """Groups of possible duplicates among all transactions (or those in a date range), most recent first"""
+    cents = type_coerce(Transaction.amount, Integer)
+    query = select(Transaction.id, cents, func.substr(Transaction.transaction_date, 1, 10)).order_by(
+        cents, Transaction.transaction_date
+    )
+    if start_date is not None:
+        query = query.where(Transaction.transaction_date >= start_date)
+    if end_date is not None:
+        query = query.where(Transaction.transaction_date <= end_date)
+
+    # First pass, over the index alone: pairs with the same amount at most `window` days apart
+    window = settings.DUPLICATE_DATE_WINDOW_DAYS
+    pairs: List[Tuple[int, int]] = []
+    recent: deque = deque()  # (id, day) of the current amount within the window, oldest first
+    current = None
+    days: Dict[str, int] = {}  # ISO date -> ordinal; a few thousand distinct dates at most
+    # Core results and plain date strings: no row processing for a million rows
+    connection = await db.connection()
+    result = await connection.stream(query.execution_options(yield_per=SCAN_BATCH_SIZE))
+    async for partition in result.partitions():
+        for id_, amount, text in partition:
+            day = days.get(text)
+            if day is None:
+                day = days[text] = date.fromisoformat(text).toordinal()
+            if amount != current:
+                current = amount
+                recent.clear()
+            else:
+                while recent and day - recent[0][1] > window:
+                    recent.popleft()
+                for other, _ in recent:
+                    pairs.append((other, id_))
+            recent.append((id_, day))
+    if not pairs:
+        return []
+
+    # Second pass: type, currency, description and source of the transactions in a pair only
+    candidates = sorted({id_ for pair in pairs for id_ in pair})
+    details: Dict[int, tuple] = {}
+    for offset in range(0, len(candidates), SCAN_BATCH_SIZE):
+        result = await connection.execute(
+            select(
+                Transaction.id,
+                type_coerce(Transaction.type, String),
+                Transaction.currency,
+                Transaction.description,
+                Transaction.import_key,
+            ).where(Transaction.id.in_(candidates[offset : offset + SCAN_BATCH_SIZE]))
+        )
+        for id_, transaction_type, currency, description, import_key in result:
+            details[id_] = ((transaction_type, currency), description, import_source(import_key))
+
+    # Union-find over the pairs that are duplicates
+    threshold = settings.DUPLICATE_SIMILARITY_THRESHOLD
+    parent: Dict[int, int] = {}
+
+    def root(id_: int) -> int:
+        while parent[id_] != id_:
+            parent[id_] = parent[parent[id_]]
+            id_ = parent[id_]
+        return id_
+
+    for a, b in pairs:
+        (kind_a, description_a, source_a), (kind_b, description_b, source_b) = details[a], details[b]
+        if kind_a != kind_b or (source_a is not None and source_a == source_b):
+            continue
+        if similarity(description_a, description_b) < threshold:
+            continue
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        parent[root(a)] = root(b)
+
+    # Third pass: the duplicates themselves, for the response
+    members: Dict[int, list] = defaultdict(list)
+    matched = sorted(parent)
+    for offset in range(0, len(matched), SCAN_BATCH_SIZE):
+        result = await connection.execute(
+            select(
+                Transaction.id,
+                Transaction.amount,
+                Transaction.type,
+                Transaction.transaction_date,
+                Transaction.description,
+            ).where(Transaction.id.in_(matched[offset : offset + SCAN_BATCH_SIZE]))
+        )
+        for row in result:
+            members[root(row.id)].append(row)
+
+    groups = []
+    for rows in members.values():
+        rows.sort(key=lambda row: (row.transaction_date, row.id))
+        first = rows[0]
+        groups.append(
+            DuplicateGroup(
+                amount=first.amount,
+                type=first.type,
+                transactions=[
+                    _match(
+                        row.id, row.description, row.transaction_date, similarity(first.description, row.description)
+                    )
+                    for row in rows
+                ],
+            )
+        )
+    groups.sort(key=lambda group: group.transactions[-1].transaction_date, reverse=True)
+    return groups
@@ -0,0 +1,207 @@
+"""In-process pub/sub for pushing data changes to connected clients over Server-Sent Events.
+
+Write handlers publish compact :class:`ChangeEvent` messages after committing; writes of many rows in one commit
+(bulk creates, statement imports, recurring occurrences) publish a single :class:`BulkChangeEvent` per commit
+instead, so they cost one message, one listener call and one round trip. Every open ``/events`` stream
+holds a :class:`Subscription` with a bounded queue; a client too slow to keep up has its queue replaced by a
+single ``resync`` message instead of blocking publishers or growing memory, and should then catch up through
+``/sync``.
+
+Messages travel through an :class:`EventBackend`. The default :class:`LocalEventBackend` only reaches streams in
+the same process; with several workers, configure ``EVENT_BACKEND`` with a ``"package.module:ClassName"`` backend
+that fans messages out to every worker (e.g. over Redis pub/sub or PostgreSQL LISTEN/NOTIFY).
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import secrets
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Set, Tuple, Union
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RESYNC = {"type": "resync"}
+# Identifies this process in bus messages, so listeners can tell changes made by other workers from their own
+WORKER_ID = secrets.token_hex(8)
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A record was created, updated or deleted; ``entity`` is the table name used by ``/sync``"""
+
+    entity: str
+    action: str
+    id: int
+
+    def to_message(self) -> dict:
+        return {"type": "change", **asdict(self), "origin": WORKER_ID}
+
+
+@dataclass(frozen=True)
+class BulkChangeEvent:
+    """Records of one entity written in one commit; ``action`` is ``bulk_created``"""
+
+    entity: str
+    action: str
+    ids: Tuple[int, ...]
+
+    def to_message(self) -> dict:
+        return {
+            "type": "change",
+            "entity": self.entity,
+            "action": self.action,
+            "ids": list(self.ids),
+            "origin": WORKER_ID,
+        }
+
+
+class EventBackend(ABC):
+    """Transport for bus messages. ``publish`` must deliver to every worker, including the publishing one."""
+
+    def bind(self, deliver: Callable[[dict], None]) -> None:
+        """Called by the bus with the callback that hands a message to local subscribers"""
+        self._deliver = deliver
+
+    async def start(self) -> None:
+        """Open connections/listeners (application startup)"""
+
+    async def stop(self) -> None:
+        """Close connections/listeners (application shutdown)"""
+
+    @abstractmethod
+    async def publish(self, message: dict) -> None: ...
+
+
+class LocalEventBackend(EventBackend):
+    """Delivers messages within the current process only"""
+
+    async def publish(self, message: dict) -> None:
+        self._deliver(message)
+
+
+class Subscription:
+    """Bounded per-connection queue; on overflow, pending messages are dropped for a single resync"""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self._resync_pending = False
+
+    def put(self, message: dict) -> None:
+        if self._resync_pending:
+            # The client will refetch everything once it reads the resync, so this message adds nothing
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self._resync_pending = True
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Next message, or None if nothing arrived within ``timeout`` seconds"""
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if message is RESYNC:
+            self._resync_pending = False
+        return message
+
+
+class EventBus:
+    def __init__(self, backend: EventBackend, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self._listeners: List[Callable[[dict], None]] = []
+        backend.bind(self._deliver)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """Call ``listener`` synchronously for every message, e.g. to invalidate in-process caches"""
+        self._listeners.append(listener)
+
+    async def publish(self, event: Union[ChangeEvent, BulkChangeEvent]) -> None:
+        """Publish an event; failures are logged, never raised, so a write never fails because of push"""
+        try:
+            await self.backend.publish(event.to_message())
+        except Exception:
+            logger.exception("Failed to publish %s", event)
+
+    def _deliver(self, message: dict) -> None:
+        for listener in self._listeners:
+            try:
+                listener(message)
+            except Exception:
+                logger.exception("Event listener %r failed", listener)
+        for subscription in list(self._subscriptions):
+            subscription.put(message)
+
+
+def create_backend(name: str) -> EventBackend:
+    """``"local"`` or the dotted ``"package.module:ClassName"`` path of an EventBackend subclass"""
+    if name == "local":
+        return LocalEventBackend()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+event_bus = EventBus(create_backend(settings.EVENT_BACKEND), settings.EVENT_QUEUE_SIZE)
+
+
+async def publish_change(entity: str, action: str, id_: int) -> None:
+    await event_bus.publish(ChangeEvent(entity, action, id_))
+
+
+async def publish_created(entity: str, ids: Sequence[int]) -> None:
+    """Announce the records ``ids`` created in one commit with a single ``bulk_created`` event"""
+    if ids:
+        await event_bus.publish(BulkChangeEvent(entity, "bulk_created", tuple(sorted(ids))))
+
+
+def format_sse(message: dict) -> str:
+    data = {key: value for key, value in message.items() if key != "origin"}
+    return f"event: {message['type']}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def stream_events(
+    bus: EventBus,
+    subscription: Subscription,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat: float,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for a subscription, with a comment heartbeat whenever the stream is idle"""
+    try:
+        yield f"retry: {settings.EVENT_RETRY_MS}\n\n"
+        while not await is_disconnected():
+            message = await subscription.get(heartbeat)
+            # Comment lines keep proxies from closing idle connections and let us notice dropped clients
+            yield format_sse(message) if message is not None else ": heartbeat\n\n"
+    finally:
+        bus.unsubscribe(subscription)
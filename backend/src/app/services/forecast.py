@@ -0,0 +1,213 @@
+"""Cash-flow forecast: project income, expenses and balance over the coming months.
+
+History for the last ``history_months`` complete months is loaded in one grouped query as an integer array of
+month buckets per category and direction. Everything after that is vectorized NumPy over those buckets:
+
+* Recurring patterns: a category and exact amount that occurred exactly once in each of the last
+  ``FORECAST_RECURRING_MONTHS`` months (rent, salary, a subscription) is projected unchanged every month.
+* Everything else becomes per-category seasonal averages: for each category, direction (income or expense) and
+  calendar month, the mean monthly total over the history. Calendar months the history does not cover fall
+  back to the overall monthly mean.
+
+Projected months start after the current one; the balance starts from the all-time net total.
+
+NumPy is optional; install it with ``uv sync --extra analytics``.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List
+
+from sqlalchemy import Integer, case, cast, false, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models import Transaction, TransactionType
+from ..schemas import AggregationFilters, Forecast, ForecastCategory, ForecastMonth, ForecastRecurring
+from .aggregation import get_aggregation_summary
+from .archive import archive_catalog
+from .fx import base_cents
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def is_available() -> bool:
+    """Whether NumPy is installed"""
+    return np is not None
+
+
+def month_index(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _month_start(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _amount(cents) -> Decimal:
+    return Decimal(int(round(float(cents)))) / 100
+
+
+# Columns of the history array
+MONTH, CATEGORY, INCOME, RECURRING, AMOUNT, TOTAL, COUNT = range(7)
+
+
+async def load_history(db: AsyncSession, first: int, last: int, recurring_months: int) -> "np.ndarray":
+    """``(rows, 7)`` int64 array of month buckets for months ``first`` through ``last``: one row per month, category,
+    direction and recurring pattern with its signed cents total (income positive) and transaction count.
+
+    The recurring patterns come from a CTE over the last ``recurring_months`` months, so the database does the
+    per-transaction work and only a few rows per month and category reach NumPy. Archived months come from their
+    rollups, as non-recurring totals.
+    """
+    # Raw integer cents in the base currency: skips converting every row to a Decimal
+    cents = base_cents()
+    signed = case((Transaction.type == TransactionType.INCOME, cents), else_=-cents)
+    # Dates are stored as "YYYY-MM-DD HH:MM:SS"; slicing the text is much cheaper than strftime()
+    year = cast(func.substr(Transaction.transaction_date, 1, 4), Integer)
+    month = cast(func.substr(Transaction.transaction_date, 6, 2), Integer)
+    bucket = year * 12 + month - 1
+
+    window_start = max(first, last - recurring_months + 1)
+    window = (
+        select(Transaction.category_id, signed.label("cents"))
+        .where(
+            Transaction.transaction_date >= _month_start(window_start),
+            Transaction.transaction_date < _month_start(last + 1),
+            # A history shorter than the window has no recurring patterns
+            true() if last - first + 1 >= recurring_months else false(),
+        )
+        .group_by(Transaction.category_id, signed)
+        # Exactly once in each month of the window
+        .having(func.count() == recurring_months, func.count(func.distinct(bucket)) == recurring_months)
+        .cte("recurring")
+    )
+    is_income = Transaction.type == TransactionType.INCOME
+    is_recurring = window.c.cents.isnot(None)
+    result = await db.execute(
+        select(
+            bucket,
+            Transaction.category_id,
+            is_income,
+            is_recurring,
+            func.coalesce(window.c.cents, 0),
+            func.sum(signed),
+            func.count(),
+        )
+        .outerjoin(window, (window.c.category_id == Transaction.category_id) & (window.c.cents == signed))
+        .where(
+            Transaction.transaction_date >= _month_start(first),
+            Transaction.transaction_date < _month_start(last + 1),
+        )
+        .group_by(bucket, Transaction.category_id, is_income, window.c.cents)
+    )
+    rows = result.all()
+    if archive_catalog.reaches(_month_start(first)):
+        rows.extend(archive_catalog.history_rows(first, last))
+    return np.array(rows, dtype=np.int64).reshape(-1, 7)
+
+
+@dataclass
+class Projection:
+    """Projected signed cents per series (category and direction) and future month"""
+
+    categories: "np.ndarray"  # (series,) category id
+    income: "np.ndarray"  # (series,) bool
+    amounts: "np.ndarray"  # (series, months)
+    recurring: "np.ndarray"  # (patterns, 2) category id and signed cents
+
+
+def project(history: "np.ndarray", first: int, last: int, horizon: int) -> Projection:
+    """Project the months ``last + 2`` to ``last + 1 + horizon`` (the month after ``last`` is in progress)"""
+    span = last - first + 1
+    month = history[:, MONTH] - first
+    totals = history[:, TOTAL]
+    recurring_row = history[:, RECURRING].astype(bool)
+
+    # One series per (category, direction)
+    series_keys, series = np.unique(history[:, [CATEGORY, INCOME]], axis=0, return_inverse=True)
+    series = series.reshape(-1)
+
+    # Every recurring pattern occurs exactly once in the last month, so that month holds each series' recurring total
+    latest = recurring_row & (month == span - 1)
+    recurring = np.bincount(series[latest], weights=totals[latest], minlength=len(series_keys))
+    patterns = np.unique(history[latest][:, [CATEGORY, AMOUNT]], axis=0).reshape(-1, 2)
+
+    variable = ~recurring_row
+    monthly = np.bincount(
+        series[variable] * span + month[variable], weights=totals[variable], minlength=len(series_keys) * span
+    ).reshape(-1, span)
+    calendar = np.eye(12)[(first + np.arange(span)) % 12]  # (span, 12) one-hot calendar month
+    covered = calendar.sum(axis=0)
+    seasonal = np.divide(
+        monthly @ calendar,
+        covered,
+        out=np.repeat(monthly.mean(axis=1, keepdims=True), 12, axis=1),
+        where=covered > 0,
+    )
+
+    future = (last + 2 + np.arange(horizon)) % 12
+    return Projection(
+        categories=series_keys[:, 0],
+        income=series_keys[:, 1].astype(bool),
+        amounts=seasonal[:, future] + recurring[:, None],
+        recurring=patterns,
+    )
+
+
+async def build_forecast(db: AsyncSession, months: int, history_months: int, today: date | None = None) -> Forecast:
+    current = month_index(today or date.today())
+    first, last = current - history_months, current - 1
+    history = await load_history(db, first, last, settings.FORECAST_RECURRING_MONTHS)
+    start_balance = (await get_aggregation_summary(db, AggregationFilters())).net_total
+
+    projection = project(history, first, last, months)
+    income = projection.amounts[projection.income].sum(axis=0)
+    expenses = -projection.amounts[~projection.income].sum(axis=0)
+    balance = float(start_balance * 100) + np.cumsum(income - expenses)
+
+    month_rows: List[ForecastMonth] = [
+        ForecastMonth(
+            month=month_label(current + 1 + offset),
+            income=_amount(income[offset]),
+            expenses=_amount(expenses[offset]),
+            net=_amount(income[offset]) - _amount(expenses[offset]),
+            balance=_amount(balance[offset]),
+        )
+        for offset in range(months)
+    ]
+    categories = {}
+    for category_id, is_income, amounts in zip(projection.categories, projection.income, projection.amounts):
+        entry = categories.setdefault(
+            int(category_id), ForecastCategory(category_id=int(category_id), income=[0] * months, expenses=[0] * months)
+        )
+        if is_income:
+            entry.income = [_amount(value) for value in amounts]
+        else:
+            entry.expenses = [_amount(-value) for value in amounts]
+    recurring = [
+        ForecastRecurring(
+            category_id=int(category_id),
+            type=TransactionType.INCOME if cents > 0 else TransactionType.EXPENSE,
+            amount=_amount(abs(cents)),
+        )
+        for category_id, cents in projection.recurring
+    ]
+
+    return Forecast(
+        start_balance=start_balance,
+        history_start=month_label(first),
+        history_end=month_label(last),
+        transactions_analyzed=int(history[:, COUNT].sum()),
+        months=month_rows,
+        categories=list(categories.values()),
+        recurring=recurring,
+    )
@@ -0,0 +1,275 @@
+"""Exchange rates and conversion to the base currency.
+
+Rates live in ``fx_rates``, one row per currency and day, as base currency units per unit of the currency. They are
+imported from CSV files in either of two layouts:
+
+- long: ``date,currency,rate`` columns, ``rate`` in base currency units per unit (any column order);
+- wide, like the ECB's ``eurofxref-hist.csv``: a date column followed by one column per currency, each quoting
+  units of that currency per unit of the base currency (``N/A`` or empty cells are skipped).
+
+Each currency's days between its first and last rate in the file are filled in with the previous rate, so every
+day in that range has a row. SQL aggregations convert per transaction inside the query (:func:`base_amount`),
+looking up the row for the transaction's day; days before or after the imported range use the nearest rate.
+Lookups from Python go through :class:`FxRateCache`, an LRU cache of ``(currency, day)`` rates, chosen the same
+way, that is dropped whenever rates are imported.
+"""
+
+import asyncio
+import csv
+import io
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from dateutil import parser as date_parser
+from sqlalchemy import Integer, and_, case, cast, exists, func, select, type_coerce
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models import FxRate, Transaction
+from ..models.money import Cents
+from .events import event_bus
+
+FX_RATE_ENTITY = "fx_rates"
+STORE_BATCH_SIZE = 5000
+
+# currency -> day -> base currency units per unit
+Rates = Dict[str, Dict[date, float]]
+
+
+def parse_rates_csv(stream: TextIO) -> Rates:
+    """Read a long or wide rates file (see the module docstring); raises ``ValueError`` for unusable files"""
+    reader = csv.reader(stream)
+    header = [name.strip() for name in next(reader, [])]
+    lowered = [name.lower() for name in header]
+    rates: Rates = {}
+    if {"date", "currency", "rate"} <= set(lowered):
+        date_at, currency_at, rate_at = (lowered.index(name) for name in ("date", "currency", "rate"))
+        for line, record in enumerate(reader, 2):
+            if not any(cell.strip() for cell in record):
+                continue
+            currency = record[currency_at].strip().upper()
+            rate = _parse_rate(record[rate_at], line)
+            if rate is not None:
+                rates.setdefault(_check_currency(currency, line), {})[_parse_day(record[date_at], line)] = rate
+    elif len(header) > 1:
+        currencies = [_check_currency(name.upper(), 1) if name else None for name in header[1:]]
+        for line, record in enumerate(reader, 2):
+            if not any(cell.strip() for cell in record):
+                continue
+            day = _parse_day(record[0], line)
+            for currency, cell in zip(currencies, record[1:]):
+                quote = _parse_rate(cell, line) if currency else None
+                if quote is not None:
+                    # Quoted as units of the currency per base unit
+                    rates.setdefault(currency, {})[day] = 1 / quote
+    else:
+        raise ValueError("Expected date,currency,rate columns or a date column followed by currency columns")
+    rates.pop(settings.BASE_CURRENCY, None)
+    if not rates:
+        raise ValueError("No exchange rates found")
+    return rates
+
+
+def _check_currency(code: str, line: int) -> str:
+    if len(code) != 3 or not code.isalpha():
+        raise ValueError(f"Line {line}: {code!r} is not a currency code")
+    return code
+
+
+def _parse_day(raw: str, line: int) -> date:
+    try:
+        return date_parser.isoparse(raw.strip()).date()
+    except ValueError:
+        raise ValueError(f"Line {line}: invalid date {raw!r}")
+
+
+def _parse_rate(raw: str, line: int) -> Optional[float]:
+    raw = raw.strip()
+    if not raw or raw.upper() == "N/A":
+        return None
+    try:
+        rate = float(raw)
+    except ValueError:
+        raise ValueError(f"Line {line}: invalid rate {raw!r}")
+    if not rate > 0:
+        raise ValueError(f"Line {line}: rates must be positive")
+    return rate
+
+
+def daily_rows(rates: Rates) -> Iterator[dict]:
+    """``fx_rates`` rows for every day from each currency's first to last rate, gaps repeating the previous rate"""
+    for currency, by_day in rates.items():
+        day, last = min(by_day), max(by_day)
+        rate = by_day[day]
+        while day <= last:
+            rate = by_day.get(day, rate)
+            yield {"currency": currency, "rate_date": day, "rate": rate}
+            day += timedelta(days=1)
+
+
+def upsert_statement():
+    """Insert rates, replacing stored ones for the same currency and day"""
+    stmt = sqlite_insert(FxRate.__table__)
+    return stmt.on_conflict_do_update(index_elements=["currency", "rate_date"], set_={"rate": stmt.excluded.rate})
+
+
+def _batches(rows: Iterable[dict]) -> Iterator[List[dict]]:
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= STORE_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def store_rates(db: AsyncSession, rates: Rates) -> int:
+    """Upsert the daily rows for ``rates`` in one commit; returns the number of rows"""
+    count = 0
+    for batch in _batches(daily_rows(rates)):
+        await db.execute(upsert_statement(), batch)
+        count += len(batch)
+    await db.commit()
+    return count
+
+
+def to_base_cents(cents: int, rate: float) -> int:
+    """Convert integer cents with ``rate``, rounding half up like SQLite's ``round()``"""
+    return int(cents * rate + 0.5)
+
+
+def _day_rate():
+    """Rate for a transaction's day from the daily table: the day's own row, else the latest earlier one, else
+    the currency's first rate"""
+    rates = FxRate.__table__
+    # Dates are stored as "YYYY-MM-DD HH:MM:SS"; the prefix is the day
+    day = func.substr(Transaction.transaction_date, 1, 10)
+    on_or_before = (
+        select(rates.c.rate)
+        .where(rates.c.currency == Transaction.currency, rates.c.rate_date <= day)
+        .order_by(rates.c.rate_date.desc())
+        .limit(1)
+        .correlate(Transaction)
+        .scalar_subquery()
+    )
+    first = (
+        select(rates.c.rate)
+        .where(rates.c.currency == Transaction.currency)
+        .order_by(rates.c.rate_date)
+        .limit(1)
+        .correlate(Transaction)
+        .scalar_subquery()
+    )
+    return func.coalesce(on_or_before, first)
+
+
+def base_cents():
+    """A transaction's amount in integer cents of the base currency, as a SQL expression.
+
+    Only transactions in another currency look up a rate (one primary key seek), so totals over base currency
+    transactions only pay for the currency check. An outer join on the rate table would probe it for every row.
+    The amount is NULL for a currency without any rate, which ``SUM`` leaves out; see :func:`without_rate`.
+    """
+    cents = type_coerce(Transaction.amount, Integer)
+    converted = cast(func.round(cents * _day_rate()), Integer)
+    return case((Transaction.currency == settings.BASE_CURRENCY, cents), else_=converted)
+
+
+def without_rate():
+    """SQL condition: the transaction's currency has no rate, so :func:`base_cents` is NULL"""
+    return and_(
+        Transaction.currency != settings.BASE_CURRENCY,
+        ~exists().where(FxRate.currency == Transaction.currency).correlate(Transaction),
+    )
+
+
+def base_amount():
+    """:func:`base_cents` as a money (``Decimal``) expression"""
+    return type_coerce(base_cents(), Cents)
+
+
+class FxRateCache:
+    """Least recently used ``(currency, day)`` rate lookups; importing rates drops all of them"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._rates: "OrderedDict[Tuple[str, date], Optional[float]]" = OrderedDict()
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._rates.clear()
+
+    def on_event(self, message: dict) -> None:
+        if message.get("entity") == FX_RATE_ENTITY:
+            self.invalidate()
+
+    def _cached(self, key: Tuple[str, date]) -> Optional[float]:
+        self._rates.move_to_end(key)
+        self.hits += 1
+        return self._rates[key]
+
+    async def rate(self, db: AsyncSession, currency: str, day: date) -> Optional[float]:
+        """Base currency units per unit of ``currency`` on ``day``, chosen like the SQL conversion does, or
+        ``None`` when the currency has no rates"""
+        if currency == settings.BASE_CURRENCY:
+            return 1.0
+        key = (currency, day)
+        if key in self._rates:
+            return self._cached(key)
+
+        async with self._lock:
+            if key in self._rates:
+                return self._cached(key)
+            self.misses += 1
+            generation = self._generation
+            rate = await db.scalar(
+                select(FxRate.rate)
+                .where(FxRate.currency == currency, FxRate.rate_date <= day)
+                .order_by(FxRate.rate_date.desc())
+                .limit(1)
+            )
+            if rate is None:
+                rate = await db.scalar(
+                    select(FxRate.rate).where(FxRate.currency == currency).order_by(FxRate.rate_date).limit(1)
+                )
+            # Only keep the result if no rates were imported while it was loading
+            if generation == self._generation:
+                self._rates[key] = rate
+                while len(self._rates) > self.size:
+                    self._rates.popitem(last=False)
+            return rate
+
+
+fx_rate_cache = FxRateCache(settings.FX_RATE_CACHE_SIZE)
+event_bus.add_listener(fx_rate_cache.on_event)
+
+
+async def list_currencies(db: AsyncSession) -> List[tuple]:
+    """``(currency, first_date, last_date, latest_rate)`` for every currency with rates"""
+    ranges = (
+        select(
+            FxRate.currency,
+            func.min(FxRate.rate_date).label("first_date"),
+            func.max(FxRate.rate_date).label("last_date"),
+        )
+        .group_by(FxRate.currency)
+        .subquery()
+    )
+    result = await db.execute(
+        select(ranges.c.currency, ranges.c.first_date, ranges.c.last_date, FxRate.rate)
+        .join(FxRate, and_(FxRate.currency == ranges.c.currency, FxRate.rate_date == ranges.c.last_date))
+        .order_by(ranges.c.currency)
+    )
+    return result.all()
+
+
+def read_rates_file(content: bytes) -> Rates:
+    """Decode an uploaded rates file (UTF-8, with or without BOM) and parse it"""
+    return parse_rates_csv(io.StringIO(content.decode("utf-8-sig")))
@@ -0,0 +1,195 @@
+"""Liveness and readiness checks.
+
+Readiness probes the things a request needs: a timed query against the database (reading ``sqlite_master``,
+which fails while another connection holds an exclusive lock), the SQLite file and its WAL size, and that the
+upload directory is writable with enough free space. Liveness only covers the process itself: the event loop
+answers, and no watched background task has died or stopped beating.
+
+Results are cached for ``HEALTH_CACHE_SECONDS`` and concurrent probes share one run, so orchestrator probes
+from several replicas or a tight probe interval do not add database load.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..config.settings import settings
+from ..schemas import HealthCheck, HealthReport, HealthStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _worst(statuses) -> HealthStatus:
+    statuses = set(statuses)
+    for status in (HealthStatus.FAIL, HealthStatus.WARN):
+        if status in statuses:
+            return status
+    return HealthStatus.PASS
+
+
+@dataclass
+class _Watched:
+    task: Optional[asyncio.Task]
+    interval: Optional[float]
+    last_beat: float = field(default_factory=time.monotonic)
+
+
+class BackgroundMonitor:
+    """Background loops register here and call ``beat`` every iteration; liveness fails if one stalls or dies"""
+
+    def __init__(self):
+        self._watched: Dict[str, _Watched] = {}
+
+    def watch(self, name: str, task: Optional[asyncio.Task] = None, interval: Optional[float] = None) -> None:
+        """Watch ``task`` for crashes and, given ``interval`` (seconds), for missing heartbeats"""
+        self._watched[name] = _Watched(task=task, interval=interval)
+
+    def unwatch(self, name: str) -> None:
+        self._watched.pop(name, None)
+
+    def beat(self, name: str) -> None:
+        watched = self._watched.get(name)
+        if watched is not None:
+            watched.last_beat = time.monotonic()
+
+    def check(self) -> HealthCheck:
+        problems = []
+        for name, watched in self._watched.items():
+            if watched.task is not None and watched.task.done():
+                error = None if watched.task.cancelled() else watched.task.exception()
+                problems.append(f"{name} stopped" + (f": {error!r}" if error else ""))
+                continue
+            if watched.interval is not None:
+                silent = time.monotonic() - watched.last_beat
+                if silent > watched.interval * settings.HEALTH_MISSED_BEATS:
+                    problems.append(f"{name} has not run for {silent:.0f}s")
+        detail = "; ".join(problems) or f"{len(self._watched)} background task(s) running"
+        return HealthCheck(
+            name="background", status=HealthStatus.FAIL if problems else HealthStatus.PASS, detail=detail
+        )
+
+
+background_monitor = BackgroundMonitor()
+
+
+async def _timed(name: str, check: Callable[[], Awaitable[HealthCheck]]) -> HealthCheck:
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(check(), settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        result = HealthCheck(
+            name=name, status=HealthStatus.FAIL, detail=f"timed out after {settings.HEALTH_CHECK_TIMEOUT_SECONDS}s"
+        )
+    except Exception as exc:
+        logger.warning(f"Health check {name} failed: {exc!r}")
+        result = HealthCheck(name=name, status=HealthStatus.FAIL, detail=str(exc) or repr(exc))
+    result.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+async def check_database(session_factory: async_sessionmaker) -> List[HealthCheck]:
+    """Timed query, plus file and WAL checks for SQLite databases"""
+    database_path: Optional[str] = None
+
+    async def query() -> HealthCheck:
+        nonlocal database_path
+        async with session_factory() as db:
+            url = db.get_bind().url
+            if url.get_backend_name() == "sqlite":
+                database_path = url.database if url.database not in (None, "", ":memory:") else None
+                if database_path and not os.path.exists(database_path):
+                    # SQLite would silently create an empty database here
+                    return HealthCheck(name="database", status=HealthStatus.FAIL, detail=f"{database_path} is missing")
+                await db.execute(text("SELECT count(*) FROM sqlite_master"))
+            else:
+                await db.execute(text("SELECT 1"))
+        return HealthCheck(name="database", status=HealthStatus.PASS)
+
+    result = await _timed("database", query)
+    if result.status == HealthStatus.PASS and result.latency_ms > settings.HEALTH_DB_SLOW_MS:
+        result.status = HealthStatus.WARN
+        result.detail = f"query took longer than {settings.HEALTH_DB_SLOW_MS} ms"
+    checks = [result]
+
+    if database_path and result.status != HealthStatus.FAIL:
+        wal = Path(f"{database_path}-wal")
+        wal_bytes = wal.stat().st_size if wal.exists() else 0
+        # A WAL that keeps growing means checkpoints cannot keep up (usually a long-lived reader)
+        lagging = wal_bytes > settings.HEALTH_WAL_WARN_BYTES
+        checks.append(
+            HealthCheck(
+                name="wal",
+                status=HealthStatus.WARN if lagging else HealthStatus.PASS,
+                detail=f"{wal_bytes} bytes not yet checkpointed" if wal.exists() else "not in WAL mode",
+            )
+        )
+    return checks
+
+
+async def check_uploads() -> List[HealthCheck]:
+    """Upload directory is writable and its filesystem has room"""
+
+    async def writable() -> HealthCheck:
+        directory = Path(settings.upload_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".health-"):
+            pass
+        return HealthCheck(name="uploads", status=HealthStatus.PASS, detail=str(directory.resolve()))
+
+    result = await _timed("uploads", writable)
+    checks = [result]
+    if result.status == HealthStatus.PASS:
+        free = shutil.disk_usage(settings.upload_dir).free
+        low = free < settings.HEALTH_MIN_FREE_MB * 1024 * 1024
+        checks.append(
+            HealthCheck(
+                name="disk",
+                status=HealthStatus.FAIL if low else HealthStatus.PASS,
+                detail=f"{free // (1024 * 1024)} MB free",
+            )
+        )
+    return checks
+
+
+async def check_live() -> List[HealthCheck]:
+    return [background_monitor.check()]
+
+
+async def check_ready(session_factory: async_sessionmaker) -> List[HealthCheck]:
+    database, uploads = await asyncio.gather(check_database(session_factory), check_uploads())
+    return [*database, *uploads, background_monitor.check()]
+
+
+class CachedProbe:
+    """Run a probe at most once per ``HEALTH_CACHE_SECONDS``; concurrent callers wait for the same run"""
+
+    def __init__(self):
+        self._report: Optional[HealthReport] = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, run: Callable[[], Awaitable[List[HealthCheck]]]) -> HealthReport:
+        if self._report is not None and time.monotonic() < self._expires:
+            return self._report
+        async with self._lock:
+            if self._report is None or time.monotonic() >= self._expires:
+                checks = await run()
+                self._report = HealthReport(status=_worst(c.status for c in checks), checks=checks)
+                self._expires = time.monotonic() + settings.HEALTH_CACHE_SECONDS
+            return self._report
+
+    def clear(self) -> None:
+        self._report = None
+
+
+live_probe = CachedProbe()
+ready_probe = CachedProbe()
@@ -0,0 +1,30 @@
+"""Fast JSON responses for large lists.
+
+When an endpoint returns ORM rows, FastAPI validates them against ``response_model``, dumps the models to
+Python dicts and encodes those with the stdlib ``json`` module. :func:`json_list_response` still validates
+every row against the same schema, but serializes straight to bytes with pydantic-core's Rust encoder. Endpoints
+keep their ``response_model``, so the OpenAPI schema is unchanged; returning a ``Response`` just skips FastAPI's
+second validation and encoding pass.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def json_list_response(schema: type, rows: Iterable[Any], status_code: int = 200) -> Response:
+    """Validate ``rows`` (ORM objects or models) as ``List[schema]`` and serialize them in one pass"""
+    adapter = _list_adapter(schema)
+    content = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+
+def json_model_response(model: BaseModel, status_code: int = 200) -> Response:
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
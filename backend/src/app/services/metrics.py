@@ -0,0 +1,346 @@
+"""Prometheus text-format metrics from a small in-process registry.
+
+Request metrics are recorded by :class:`MetricsMiddleware`, a plain ASGI middleware, and labelled with the route
+template (``/api/transactions/{transaction_id}``) so label cardinality stays bounded; requests matching no route
+are counted under ``route="unmatched"``. Latency is measured until the response headers are sent, so streamed
+exports and SSE connections do not count their whole lifetime. Database pool, statement, cache and SSE numbers
+are read from their owners whenever a snapshot is taken.
+
+Each worker process only sees its own requests. With ``METRICS_DIR`` set, every worker writes its snapshot to
+``<METRICS_DIR>/<pid>.json`` every ``METRICS_FLUSH_SECONDS`` and on shutdown, and ``/metrics`` (served by any
+worker) merges all of them: counters and histograms are summed over every file, including workers that have
+exited so totals never go backwards, and gauges over live workers only. Empty the directory on deploy.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config.settings import settings
+from ..database import async_engine, query_log
+from .events import event_bus
+from .health import background_monitor
+from .reference_cache import reference_cache
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[str, ...]
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self) -> Dict[Labels, float]:
+        return dict(self.values)
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self.values[labels] = value
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    """Per label set: one count per bucket (the last one is +Inf), then the sum of observed values"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets or LATENCY_BUCKETS)
+        self.values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        row = self.values.get(labels)
+        if row is None:
+            row = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def samples(self) -> Dict[Labels, List[float]]:
+        return {labels: list(row) for labels, row in self.values.items()}
+
+
+class CallbackMetric:
+    """Counter or gauge whose samples are read from their owner when a snapshot is taken"""
+
+    def __init__(
+        self, name: str, help: str, type: str, labelnames: Sequence[str], read: Callable[[], Dict[Labels, float]]
+    ):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.read = read
+
+    def samples(self) -> Dict[Labels, float]:
+        return self.read()
+
+
+class MetricsRegistry:
+    def __init__(self, directory: Optional[Path] = None, flush_seconds: float = 5.0):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._metrics: Dict[str, object] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = ()
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def callback(
+        self, name: str, help: str, type: str, read: Callable[[], Dict[Labels, float]], labelnames: Sequence[str] = ()
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, type, labelnames, read))
+
+    def snapshot(self) -> dict:
+        metrics = []
+        for metric in self._metrics.values():
+            try:
+                samples = metric.samples()
+            except Exception:
+                logger.exception(f"Reading metric {metric.name} failed")
+                continue
+            family = {
+                "name": metric.name,
+                "help": metric.help,
+                "type": metric.type,
+                "labelnames": list(metric.labelnames),
+                "samples": [[list(labels), value] for labels, value in samples.items()],
+            }
+            if isinstance(metric, Histogram):
+                family["buckets"] = list(metric.buckets)
+            metrics.append(family)
+        return {"pid": os.getpid(), "metrics": metrics}
+
+    def write_snapshot(self) -> None:
+        """Atomically replace this worker's snapshot file"""
+        path = self.directory / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+    def collect(self) -> List[dict]:
+        """This worker's snapshot, plus every other worker's when ``directory`` is set"""
+        own = self.snapshot()
+        if self.directory is None:
+            return [own]
+        self.write_snapshot()
+        snapshots = [own]
+        for path in self.directory.glob("*.json"):
+            if path.stem == str(own["pid"]):
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                logger.warning(f"Skipping unreadable metrics snapshot {path}")
+        return snapshots
+
+    def render(self) -> str:
+        return render(merge(self.collect()))
+
+    async def start(self) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._task = asyncio.create_task(self._flush_periodically())
+        background_monitor.watch("metrics_flush", self._task, self.flush_seconds)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        background_monitor.unwatch("metrics_flush")
+        self._task.cancel()
+        self._task = None
+        self.write_snapshot()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                self.write_snapshot()
+            except OSError:
+                logger.exception("Writing metrics snapshot failed")
+            background_monitor.beat("metrics_flush")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge(snapshots: Iterable[dict]) -> Dict[str, dict]:
+    """Sum samples of the same metric across worker snapshots; gauges only count live workers"""
+    families: Dict[str, dict] = {}
+    own_pid = os.getpid()
+    for snapshot in snapshots:
+        alive = snapshot["pid"] == own_pid or _pid_alive(snapshot["pid"])
+        for metric in snapshot["metrics"]:
+            if metric["type"] == "gauge" and not alive:
+                continue
+            family = families.setdefault(metric["name"], {**metric, "samples": {}})
+            samples = family["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                if key not in samples:
+                    samples[key] = value
+                elif isinstance(value, list):
+                    samples[key] = [a + b for a, b in zip(samples[key], value)]
+                else:
+                    samples[key] += value
+    return families
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(families: Dict[str, dict]) -> str:
+    """Prometheus text exposition format 0.0.4"""
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        names = family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, value in sorted(family["samples"].items()):
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(names, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*family["buckets"], float("inf")], value[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{name}_bucket{_format_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(names, labels)} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS)
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+http_latency = registry.histogram(
+    "http_request_duration_seconds", "Time until response headers were sent", ("method", "route")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+
+class MetricsMiddleware:
+    """Count requests, in-flight requests and latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        latency = None
+
+        async def send_with_metrics(message):
+            nonlocal status, latency
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                latency = time.perf_counter() - start
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_requests.inc((method, path, str(status)))
+            http_latency.observe(latency if latency is not None else time.perf_counter() - start, (method, path))
+
+
+def _pool_connections() -> Dict[Labels, float]:
+    pool = async_engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {("checked_out",): pool.checkedout(), ("idle",): pool.checkedin()}
+
+
+registry.callback("db_pool_connections", "Database pool connections by state", "gauge", _pool_connections, ("state",))
+registry.callback("db_statements_total", "SQL statements executed", "counter", lambda: {(): query_log.statement_count})
+registry.callback(
+    "db_statement_seconds_total",
+    "Time spent executing SQL statements",
+    "counter",
+    lambda: {(): query_log.statement_seconds},
+)
+registry.callback(
+    "db_slow_statements_total",
+    "SQL statements slower than SLOW_QUERY_MS",
+    "counter",
+    lambda: {(): query_log.slow_count},
+)
+registry.callback(
+    "cache_requests_total",
+    "In-process cache lookups by result",
+    "counter",
+    lambda: {("reference", "hit"): reference_cache.hits, ("reference", "miss"): reference_cache.misses},
+    ("cache", "result"),
+)
+registry.callback("sse_subscribers", "Open /events connections", "gauge", lambda: {(): event_bus.subscriber_count})
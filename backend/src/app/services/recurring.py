@@ -0,0 +1,195 @@
+"""Recurring transaction rules: schedules, previews and the background scheduler.
+
+Schedules are expanded with ``dateutil.rrule``; a monthly rule on day 31 falls on the last day of shorter months.
+Each occurrence becomes a transaction whose ``import_key`` is ``recurring:<rule id>:<date>``, and inserts skip
+keys that already exist, so materializing the same dates twice (after a crash, from several workers, or by hand)
+never creates a duplicate. Every rule remembers the date it has been materialized through; each run creates
+everything from there up to today, which also catches up on the days the server was down. Occurrences in archived
+years are skipped, as those years are read-only.
+"""
+
+import asyncio
+import itertools
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, YEARLY, rrule
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config.settings import settings
+from ..models import RecurrenceFrequency, RecurringRule, Transaction
+from ..schemas import RecurringOccurrence, RecurringRunResult
+from .archive import archive_catalog
+from .descriptions import description_index
+from .events import publish_created
+from .health import background_monitor
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_NAME = "recurring_scheduler"
+FREQUENCIES = {
+    RecurrenceFrequency.DAILY: DAILY,
+    RecurrenceFrequency.WEEKLY: WEEKLY,
+    RecurrenceFrequency.MONTHLY: MONTHLY,
+    RecurrenceFrequency.YEARLY: YEARLY,
+}
+
+
+def _schedule(rule: RecurringRule) -> rrule:
+    options = {}
+    if rule.frequency == RecurrenceFrequency.WEEKLY:
+        options["byweekday"] = rule.weekday if rule.weekday is not None else rule.start_date.weekday()
+    elif rule.frequency in (RecurrenceFrequency.MONTHLY, RecurrenceFrequency.YEARLY):
+        day = rule.day_of_month or rule.start_date.day
+        if day > 28:
+            # The last of days 28..day that the month has: day 31 is Feb 28/29, Apr 30 and so on
+            options.update(bymonthday=tuple(range(28, day + 1)), bysetpos=-1)
+        else:
+            options["bymonthday"] = day
+        if rule.frequency == RecurrenceFrequency.YEARLY:
+            options["bymonth"] = rule.start_date.month
+    until = datetime.combine(rule.end_date, time()) if rule.end_date else None
+    return rrule(
+        FREQUENCIES[rule.frequency],
+        dtstart=datetime.combine(rule.start_date, time()),
+        interval=rule.interval,
+        until=until,
+        **options,
+    )
+
+
+def _first_pending(rule: RecurringRule) -> date:
+    if rule.materialized_through is None:
+        return rule.start_date
+    return max(rule.start_date, rule.materialized_through + timedelta(days=1))
+
+
+def pending_occurrences(rule: RecurringRule, through: date, limit: Optional[int] = None) -> List[date]:
+    """Occurrences not materialized yet, up to and including ``through`` (at most ``limit``)"""
+    start = datetime.combine(_first_pending(rule), time())
+    end = datetime.combine(through, time())
+    if start > end:
+        return []
+    dates = (occurrence.date() for occurrence in _schedule(rule).xafter(start, inc=True))
+    return list(itertools.islice(itertools.takewhile(lambda day: day <= through, dates), limit))
+
+
+def occurrence_key(rule_id: int, day: date) -> str:
+    return f"recurring:{rule_id}:{day.isoformat()}"
+
+
+def to_occurrence(rule: RecurringRule, day: date) -> RecurringOccurrence:
+    return RecurringOccurrence(
+        rule_id=rule.id,
+        occurrence_date=day,
+        type=rule.type,
+        amount=rule.amount,
+        description=rule.description,
+        category_id=rule.category_id,
+        beneficiary_id=rule.beneficiary_id,
+    )
+
+
+def _transaction_values(rule: RecurringRule, day: date) -> dict:
+    return {
+        "type": rule.type,
+        "amount": rule.amount,
+        "description": rule.description,
+        "notes": rule.notes,
+        "tags": list(rule.tags or []),
+        "transaction_date": datetime.combine(day, time()),
+        "category_id": rule.category_id,
+        "beneficiary_id": rule.beneficiary_id,
+        "created_by_user_id": rule.created_by_user_id,
+        "import_key": occurrence_key(rule.id, day),
+    }
+
+
+async def _insert_batch(db: AsyncSession, batch: List[dict]) -> List[int]:
+    """Insert a batch, skipping occurrences that already exist, commit it with the rules' progress and announce it"""
+    inserted = []
+    if batch:
+        columns = Transaction.__table__.c
+        stmt = (
+            sqlite_insert(Transaction.__table__)
+            .on_conflict_do_nothing(index_elements=["import_key"])
+            .returning(columns.id, columns.description, columns.transaction_date)
+        )
+        inserted = (await db.execute(stmt, batch)).all()
+    await db.commit()
+    for _, description, transaction_date in inserted:
+        description_index.record(description, transaction_date)
+    ids = [id_ for id_, _, _ in inserted]
+    await publish_created("transactions", ids)
+    return ids
+
+
+async def materialize_due(db: AsyncSession, today: Optional[date] = None) -> RecurringRunResult:
+    """Create the transactions for every occurrence of every active rule up to and including ``today``"""
+    today = today or date.today()
+    result = await db.execute(
+        select(RecurringRule)
+        .where(RecurringRule.active.is_(True), RecurringRule.start_date <= today)
+        .order_by(RecurringRule.id)
+    )
+    rules = result.scalars().all()
+    cutoff = archive_catalog.cutoff
+
+    rows: List[dict] = []
+    # (rows up to and including this rule's last occurrence, rule, date it will be materialized through)
+    progress = []
+    for rule in rules:
+        through = min(today, rule.end_date) if rule.end_date else today
+        for day in pending_occurrences(rule, through):
+            values = _transaction_values(rule, day)
+            if cutoff is None or values["transaction_date"] >= cutoff:
+                rows.append(values)
+        progress.append((len(rows), rule, max(through, rule.materialized_through or through)))
+
+    batch_size = max(settings.RECURRING_BATCH_SIZE, 1)
+    created: List[int] = []
+    for start in range(0, max(len(rows), 1), batch_size):
+        end = start + batch_size
+        # A rule's progress is committed with the batch holding its last occurrence, never before
+        while progress and progress[0][0] <= end:
+            _, rule, through = progress.pop(0)
+            rule.materialized_through = through
+        created += await _insert_batch(db, rows[start:end])
+    return RecurringRunResult(rules=len(rules), created=len(created))
+
+
+class RecurringScheduler:
+    """Materializes due occurrences at startup, then every ``interval`` seconds"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, session_factory: async_sessionmaker, interval: float) -> None:
+        self._task = asyncio.create_task(self._run(session_factory, interval))
+        background_monitor.watch(SCHEDULER_NAME, self._task, interval)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        background_monitor.unwatch(SCHEDULER_NAME)
+        self._task.cancel()
+        self._task = None
+
+    async def _run(self, session_factory: async_sessionmaker, interval: float) -> None:
+        while True:
+            try:
+                async with session_factory() as db:
+                    result = await materialize_due(db)
+                if result.created:
+                    logger.info(f"Created {result.created} recurring transactions from {result.rules} rules")
+            except Exception:
+                # A failing database shows up in readiness; the loop itself keeps going
+                logger.exception("Materializing recurring transactions failed")
+            background_monitor.beat(SCHEDULER_NAME)
+            await asyncio.sleep(interval)
+
+
+recurring_scheduler = RecurringScheduler()
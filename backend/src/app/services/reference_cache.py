@@ -0,0 +1,101 @@
+"""In-process cache of reference data (users, categories, beneficiaries) for ``/bootstrap`` and compact lists.
+
+The cache listens on the event bus, so every published change to a reference entity drops it, whether it came
+from a router, a statement import, or (with a cross-worker event backend) another worker. ``version`` changes on
+every invalidation and includes a per-process id, so ETags from before a restart or from another worker never
+match stale data.
+"""
+
+import asyncio
+import secrets
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Beneficiary, Category, User
+from ..schemas import Beneficiary as BeneficiarySchema
+from ..schemas import Category as CategorySchema
+from ..schemas import User as UserSchema
+from .events import event_bus
+
+REFERENCE_ENTITIES = {"users", "categories", "beneficiaries"}
+
+
+@dataclass
+class ReferenceData:
+    users: List[UserSchema]
+    categories: List[CategorySchema]
+    beneficiaries: List[BeneficiarySchema]
+    users_by_id: Dict[int, UserSchema] = field(init=False)
+    categories_by_id: Dict[int, CategorySchema] = field(init=False)
+    beneficiaries_by_id: Dict[int, BeneficiarySchema] = field(init=False)
+
+    def __post_init__(self):
+        self.users_by_id = {user.id: user for user in self.users}
+        self.categories_by_id = {category.id: category for category in self.categories}
+        self.beneficiaries_by_id = {beneficiary.id: beneficiary for beneficiary in self.beneficiaries}
+
+    def covers(self, category_ids: Iterable[int], beneficiary_ids: Iterable[int], user_ids: Iterable[int]) -> bool:
+        return (
+            self.categories_by_id.keys() >= set(category_ids)
+            and self.beneficiaries_by_id.keys() >= set(beneficiary_ids)
+            and self.users_by_id.keys() >= set(user_ids)
+        )
+
+
+class ReferenceCache:
+    def __init__(self):
+        self._instance = secrets.token_hex(4)
+        self._generation = 0
+        self._data: Optional[ReferenceData] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> str:
+        return f"{self._instance}.{self._generation}"
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._data = None
+
+    def on_event(self, message: dict) -> None:
+        if message.get("entity") in REFERENCE_ENTITIES:
+            self.invalidate()
+
+    async def get(self, db: AsyncSession) -> tuple[str, ReferenceData]:
+        """Return ``(version, data)``, loading the reference lists on a miss"""
+        data, version = self._data, self.version
+        if data is not None:
+            self.hits += 1
+            return version, data
+
+        async with self._lock:
+            if self._data is not None:
+                self.hits += 1
+                return self.version, self._data
+            self.misses += 1
+            generation, version = self._generation, self.version
+            data = await self._load(db)
+            # Only keep the result if nothing was invalidated while it was loading
+            if generation == self._generation:
+                self._data = data
+            return version, data
+
+    @staticmethod
+    async def _load(db: AsyncSession) -> ReferenceData:
+        users = await db.execute(select(User).order_by(User.name))
+        categories = await db.execute(select(Category).order_by(Category.name))
+        beneficiaries = await db.execute(select(Beneficiary).order_by(Beneficiary.name))
+        return ReferenceData(
+            users=[UserSchema.model_validate(u) for u in users.scalars()],
+            categories=[CategorySchema.model_validate(c) for c in categories.scalars()],
+            beneficiaries=[BeneficiarySchema.model_validate(b) for b in beneficiaries.scalars()],
+        )
+
+
+reference_cache = ReferenceCache()
+event_bus.add_listener(reference_cache.on_event)
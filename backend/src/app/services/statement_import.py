@@ -0,0 +1,612 @@
+"""Streaming bank statement import (CSV, OFX and QIF).
+
+Files are parsed row by row from disk and inserted in batched commits, so memory use is bounded by the
+batch size rather than the file size. Every inserted row carries an ``import_key`` derived from the file
+digest and row number; together with the job's committed ``rows_processed`` counter this makes re-running
+an interrupted import resume where it stopped without duplicating rows.
+"""
+
+import csv
+import hashlib
+import io
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+from dateutil import parser as date_parser
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config.settings import settings
+from ..models import (
+    Beneficiary,
+    Category,
+    CategoryType,
+    ImportFormat,
+    ImportJob,
+    ImportStatus,
+    Transaction,
+    TransactionType,
+)
+from ..schemas import ImportColumnMapping
+from ..transactions.service import DEFAULT_BENEFICIARY_NAME
+from .archive import archive_catalog
+from .categorization import RuleMatcher, rule_matcher_cache
+from .descriptions import description_index
+from .duplicates import find_duplicates
+from .events import publish_created
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY_NAME = "Uncategorized"
+MAX_STORED_ERRORS = 20
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+FORMAT_BY_EXTENSION = {
+    ".csv": ImportFormat.CSV,
+    ".txt": ImportFormat.CSV,
+    ".ofx": ImportFormat.OFX,
+    ".qfx": ImportFormat.OFX,
+    ".qif": ImportFormat.QIF,
+}
+
+# Header names recognised when no explicit column mapping is given, in order of preference
+CSV_HEADER_ALIASES = {
+    "transaction_date": ("date", "transaction date", "booking date", "posted date", "posting date", "value date"),
+    "amount": ("amount", "transaction amount", "value"),
+    "debit": ("debit", "withdrawal", "money out"),
+    "credit": ("credit", "deposit", "money in"),
+    "description": ("description", "payee", "name", "details", "memo"),
+    "type": ("type", "transaction type", "direction"),
+    "category": ("category",),
+    "beneficiary": ("beneficiary", "counterparty"),
+    "notes": ("notes", "note", "memo"),
+}
+
+INCOME_TYPE_VALUES = {"income", "credit", "cr", "deposit", "in"}
+EXPENSE_TYPE_VALUES = {"expense", "debit", "dr", "withdrawal", "payment", "out"}
+
+
+@dataclass
+class StatementRow:
+    """A single parsed statement line. ``amount`` is signed: negative amounts are expenses."""
+
+    row_number: int
+    transaction_date: datetime
+    amount: Decimal
+    description: str
+    type: Optional[TransactionType] = None
+    category: Optional[str] = None
+    beneficiary: Optional[str] = None
+    notes: Optional[str] = None
+
+
+@dataclass
+class RowError:
+    """A statement line that could not be parsed."""
+
+    row_number: int
+    message: str
+
+
+ParsedItem = Union[StatementRow, RowError]
+
+
+# ============== Field Parsing ==============
+
+
+_AMOUNT_CLEAN_RE = re.compile(r"[^\d,.\-()]")
+
+
+def parse_amount(raw: str) -> Decimal:
+    """Parse a bank-formatted amount such as ``-1,234.56``, ``1.234,56``, ``(12.00)`` or ``12.00-``."""
+    text = _AMOUNT_CLEAN_RE.sub("", raw.strip())
+    negative = False
+    if text.startswith("(") and text.endswith(")"):
+        negative = True
+        text = text[1:-1]
+    if text.endswith("-"):
+        negative = True
+        text = text[:-1]
+    if text.startswith("-"):
+        negative = not negative
+        text = text[1:]
+
+    if "," in text and "." in text:
+        # The right-most separator is the decimal separator
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        # "1,234" is a thousands separator, "12,34" a decimal comma
+        decimals = text.rsplit(",", 1)[1]
+        text = text.replace(",", "") if len(decimals) == 3 else text.replace(",", ".")
+
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {raw!r}") from None
+    return -value if negative else value
+
+
+def parse_date(raw: str, date_format: Optional[str] = None, day_first: bool = False) -> datetime:
+    """Parse a statement date, using ``date_format`` when given and a lenient parser otherwise."""
+    text = raw.strip()
+    if not text:
+        raise ValueError("Missing date")
+    if date_format:
+        return datetime.strptime(text, date_format)
+    return date_parser.parse(text, dayfirst=day_first)
+
+
+def parse_type(raw: Optional[str]) -> Optional[TransactionType]:
+    """Map a free-form type column value to a TransactionType."""
+    if not raw:
+        return None
+    value = raw.strip().lower()
+    if value in INCOME_TYPE_VALUES:
+        return TransactionType.INCOME
+    if value in EXPENSE_TYPE_VALUES:
+        return TransactionType.EXPENSE
+    return None
+
+
+# ============== Parsers ==============
+
+
+def _resolve_csv_columns(fieldnames: List[str], mapping: ImportColumnMapping) -> Dict[str, str]:
+    """Resolve transaction fields to CSV columns from the explicit mapping and common header aliases."""
+    by_lower = {name.strip().lower(): name for name in fieldnames if name}
+    columns: Dict[str, str] = {}
+    for field, column in mapping.model_dump(exclude_none=True).items():
+        if column.strip().lower() not in by_lower:
+            raise ValueError(f"Column '{column}' mapped to '{field}' not found in CSV header")
+        columns[field] = by_lower[column.strip().lower()]
+
+    used = set(columns.values())
+    for field, aliases in CSV_HEADER_ALIASES.items():
+        if field in columns:
+            continue
+        for alias in aliases:
+            column = by_lower.get(alias)
+            if column and column not in used:
+                columns[field] = column
+                used.add(column)
+                break
+
+    if "transaction_date" not in columns:
+        raise ValueError("Could not find a date column in CSV header")
+    if "amount" not in columns and not ({"debit", "credit"} & columns.keys()):
+        raise ValueError("Could not find an amount (or debit/credit) column in CSV header")
+    return columns
+
+
+def iter_csv_rows(stream: io.TextIOBase, options: dict) -> Iterator[ParsedItem]:
+    """Parse CSV statement rows one at a time."""
+    sample = stream.read(4096)
+    stream.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.DictReader(stream, dialect=dialect)
+    columns = _resolve_csv_columns(reader.fieldnames or [], ImportColumnMapping(**options.get("mapping", {})))
+    date_format = options.get("date_format")
+    day_first = options.get("day_first", False)
+
+    def cell(record: dict, field: str) -> str:
+        column = columns.get(field)
+        return (record.get(column) or "").strip() if column else ""
+
+    for row_number, record in enumerate(reader, 1):
+        try:
+            if "amount" in columns:
+                amount = parse_amount(cell(record, "amount"))
+            else:
+                credit = cell(record, "credit")
+                debit = cell(record, "debit")
+                amount = (parse_amount(credit) if credit else 0) - (abs(parse_amount(debit)) if debit else 0)
+            yield StatementRow(
+                row_number=row_number,
+                transaction_date=parse_date(cell(record, "transaction_date"), date_format, day_first),
+                amount=amount,
+                description=cell(record, "description"),
+                type=parse_type(cell(record, "type")),
+                category=cell(record, "category") or None,
+                beneficiary=cell(record, "beneficiary") or None,
+                notes=cell(record, "notes") or None,
+            )
+        except (ValueError, OverflowError) as exc:
+            yield RowError(row_number, f"Row {row_number}: {exc}")
+
+
+_OFX_TAG_RE = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_DATE_RE = re.compile(r"^(\d{8})(\d{6})?")
+
+
+def _iter_ofx_tokens(stream: io.TextIOBase, chunk_size: int = 64 * 1024) -> Iterator[tuple]:
+    """Yield ``(is_closing, TAG, value)`` tokens from SGML (v1) or XML (v2) OFX, reading in chunks."""
+    buffer = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        # Only tokenize up to the last '<' so a tag split across chunks is completed by the next read
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        for match in _OFX_TAG_RE.finditer(buffer, 0, cut):
+            yield match.group(1) == "/", match.group(2).upper(), match.group(3).strip()
+        buffer = buffer[cut:]
+    for match in _OFX_TAG_RE.finditer(buffer):
+        yield match.group(1) == "/", match.group(2).upper(), match.group(3).strip()
+
+
+def _ofx_row(row_number: int, fields: Dict[str, str]) -> ParsedItem:
+    try:
+        date_match = _OFX_DATE_RE.match(fields.get("DTPOSTED", ""))
+        if not date_match:
+            raise ValueError(f"Invalid DTPOSTED: {fields.get('DTPOSTED')!r}")
+        stamp = date_match.group(1) + (date_match.group(2) or "000000")
+        description = fields.get("NAME") or fields.get("PAYEE") or fields.get("MEMO") or ""
+        memo = fields.get("MEMO")
+        return StatementRow(
+            row_number=row_number,
+            transaction_date=datetime.strptime(stamp, "%Y%m%d%H%M%S"),
+            amount=parse_amount(fields.get("TRNAMT", "")),
+            description=description,
+            notes=memo if memo and memo != description else None,
+        )
+    except ValueError as exc:
+        return RowError(row_number, f"Row {row_number}: {exc}")
+
+
+def iter_ofx_rows(stream: io.TextIOBase, options: dict) -> Iterator[ParsedItem]:
+    """Parse OFX/QFX ``<STMTTRN>`` records one at a time."""
+    row_number = 0
+    current: Optional[Dict[str, str]] = None
+    for is_closing, tag, value in _iter_ofx_tokens(stream):
+        if tag == "STMTTRN":
+            if current is not None:
+                row_number += 1
+                yield _ofx_row(row_number, current)
+            current = None if is_closing else {}
+        elif current is not None and not is_closing and value:
+            current[tag] = value
+    if current:
+        row_number += 1
+        yield _ofx_row(row_number, current)
+
+
+def _qif_row(row_number: int, fields: Dict[str, str], options: dict) -> ParsedItem:
+    try:
+        category = fields.get("L")
+        if category and category.startswith("["):
+            category = None  # Transfer to another account, not a category
+        elif category:
+            category = category.split("/", 1)[0]
+        payee = fields.get("P", "")
+        memo = fields.get("M")
+        return StatementRow(
+            row_number=row_number,
+            transaction_date=parse_date(
+                fields.get("D", "").replace("'", "/"), options.get("date_format"), options.get("day_first", False)
+            ),
+            amount=parse_amount(fields.get("T") or fields.get("U", "")),
+            description=payee or memo or "",
+            category=category or None,
+            notes=memo if memo and payee else None,
+        )
+    except (ValueError, OverflowError) as exc:
+        return RowError(row_number, f"Row {row_number}: {exc}")
+
+
+def iter_qif_rows(stream: io.TextIOBase, options: dict) -> Iterator[ParsedItem]:
+    """Parse QIF records (terminated by ``^``) one at a time."""
+    row_number = 0
+    fields: Dict[str, str] = {}
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        if line.startswith("^"):
+            if fields:
+                row_number += 1
+                yield _qif_row(row_number, fields, options)
+            fields = {}
+            continue
+        # Split lines (S/E/$) describe splits; keep the first value of each code only
+        fields.setdefault(line[0], line[1:].strip())
+    if fields:
+        row_number += 1
+        yield _qif_row(row_number, fields, options)
+
+
+PARSERS = {
+    ImportFormat.CSV: iter_csv_rows,
+    ImportFormat.OFX: iter_ofx_rows,
+    ImportFormat.QIF: iter_qif_rows,
+}
+
+
+def iter_statement_rows(fh: BinaryIO, file_format: ImportFormat, options: dict) -> Iterator[ParsedItem]:
+    """Stream parsed rows from a binary file handle."""
+    stream = io.TextIOWrapper(fh, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        yield from PARSERS[file_format](stream, options)
+    finally:
+        stream.detach()
+
+
+# ============== Upload Handling ==============
+
+
+def detect_format(filename: Optional[str]) -> Optional[ImportFormat]:
+    """Guess the statement format from the file extension."""
+    if not filename:
+        return None
+    return FORMAT_BY_EXTENSION.get(Path(filename).suffix.lower())
+
+
+async def store_upload(file: UploadFile) -> tuple[Path, str, int]:
+    """Stream an uploaded statement to disk, returning ``(path, sha256, size)``.
+
+    Files are stored under their digest so uploading the same statement again maps to the same job.
+    """
+    import_dir = settings.upload_dir / "imports"
+    import_dir.mkdir(parents=True, exist_ok=True)
+    suffix = Path(file.filename).suffix.lower() if file.filename else ""
+
+    digest = hashlib.sha256()
+    size = 0
+    tmp_path = import_dir / f".upload-{id(file)}-{datetime.utcnow().timestamp()}{suffix}"
+    try:
+        with open(tmp_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.IMPORT_MAX_FILE_SIZE:
+                    raise ValueError("File too large")
+                digest.update(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        path = import_dir / f"{sha256}{suffix}"
+        tmp_path.replace(path)
+        return path, sha256, size
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+# ============== Import Runner ==============
+
+
+class ReferenceLookup:
+    """In-memory case-insensitive name -> id lookup for categories and beneficiaries.
+
+    Names not yet in the database are created on first use and cached.
+    """
+
+    def __init__(self, categories: Dict[str, int], beneficiaries: Dict[str, int]):
+        self.categories = categories
+        self.beneficiaries = beneficiaries
+        self.created: List[tuple[str, int]] = []
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "ReferenceLookup":
+        categories = await db.execute(select(Category.name, Category.id))
+        beneficiaries = await db.execute(select(Beneficiary.name, Beneficiary.id))
+        return cls(
+            {name.strip().lower(): id_ for name, id_ in categories.all()},
+            {name.strip().lower(): id_ for name, id_ in beneficiaries.all()},
+        )
+
+    async def category_id(self, db: AsyncSession, name: str, category_type: CategoryType) -> int:
+        key = name.strip().lower()
+        if key not in self.categories:
+            category = Category(name=name.strip(), type=category_type)
+            db.add(category)
+            await db.flush()
+            self.categories[key] = category.id
+            self.created.append(("categories", category.id))
+        return self.categories[key]
+
+    async def beneficiary_id(self, db: AsyncSession, name: str) -> int:
+        key = name.strip().lower()
+        if key not in self.beneficiaries:
+            beneficiary = Beneficiary(name=name.strip())
+            db.add(beneficiary)
+            await db.flush()
+            self.beneficiaries[key] = beneficiary.id
+            self.created.append(("beneficiaries", beneficiary.id))
+        return self.beneficiaries[key]
+
+    async def publish_created(self) -> None:
+        """Announce names created since the last call; call after they have been committed."""
+        for entity in sorted({entity for entity, _ in self.created}):
+            await publish_created(entity, [id_ for created, id_ in self.created if created == entity])
+        self.created.clear()
+
+
+async def _row_values(
+    db: AsyncSession, row: StatementRow, job: ImportJob, lookup: ReferenceLookup, matcher: RuleMatcher
+) -> dict:
+    """Map a parsed statement row to ``transactions`` column values.
+
+    Category and beneficiary come from the statement's own columns, then the categorization rules, then the
+    job's defaults.
+    """
+    options = job.options or {}
+    transaction_type = row.type or (TransactionType.EXPENSE if row.amount < 0 else TransactionType.INCOME)
+    description = row.description or row.notes or "Imported transaction"
+    suggestion = None
+    if not (row.category and row.beneficiary):
+        suggestion = matcher.suggest(description, abs(row.amount), transaction_type)
+
+    if row.category:
+        category_type = CategoryType.INCOME if transaction_type == TransactionType.INCOME else CategoryType.EXPENSE
+        category_id = await lookup.category_id(db, row.category, category_type)
+    elif suggestion.category_id is not None:
+        category_id = suggestion.category_id
+    elif options.get("default_category_id"):
+        category_id = options["default_category_id"]
+    else:
+        category_id = await lookup.category_id(db, DEFAULT_CATEGORY_NAME, CategoryType.BOTH)
+
+    if row.beneficiary:
+        beneficiary_id = await lookup.beneficiary_id(db, row.beneficiary)
+    elif suggestion.beneficiary_id is not None:
+        beneficiary_id = suggestion.beneficiary_id
+    elif options.get("default_beneficiary_id"):
+        beneficiary_id = options["default_beneficiary_id"]
+    else:
+        beneficiary_id = await lookup.beneficiary_id(db, DEFAULT_BENEFICIARY_NAME)
+
+    return {
+        "amount": abs(row.amount),
+        "transaction_date": row.transaction_date,
+        "description": description,
+        "type": transaction_type,
+        "notes": row.notes,
+        "tags": [],
+        "category_id": category_id,
+        "beneficiary_id": beneficiary_id,
+        "created_by_user_id": job.created_by_user_id,
+        "import_key": f"{job.file_sha256[:32]}:{row.row_number}",
+    }
+
+
+async def _commit_batch(db: AsyncSession, job: ImportJob, batch: List[dict], last_row: int, position: int) -> None:
+    """Insert a batch and advance the job's progress in the same commit."""
+    if batch and (job.options or {}).get("skip_duplicates", True):
+        # Rows of this same statement are not compared with each other
+        duplicates = await find_duplicates(db, batch, source=job.file_sha256[:32])
+        job.rows_duplicate += sum(1 for matches in duplicates if matches)
+        batch = [row for row, matches in zip(batch, duplicates) if not matches]
+    inserted = []
+    if batch:
+        columns = Transaction.__table__.c
+        stmt = (
+            sqlite_insert(Transaction.__table__)
+            .on_conflict_do_nothing(index_elements=["import_key"])
+            .returning(columns.id, columns.description, columns.transaction_date)
+        )
+        inserted = (await db.execute(stmt, batch)).all()
+    job.rows_imported += len(inserted)
+    job.rows_processed = last_row
+    job.bytes_processed = position
+    await db.commit()
+    # Announced like a bulk create through the API, so caches in every worker and SSE clients see them
+    for _, description, transaction_date in inserted:
+        description_index.record(description, transaction_date)
+    await publish_created("transactions", [id_ for id_, _, _ in inserted])
+
+
+async def process_import_job(db: AsyncSession, job: ImportJob) -> ImportJob:
+    """Run an import job to completion, resuming after ``job.rows_processed``."""
+    options = job.options or {}
+    batch_size = max(settings.IMPORT_BATCH_SIZE, 1)
+    lookup = await ReferenceLookup.load(db)
+    matcher = await rule_matcher_cache.get(db)
+
+    job.status = ImportStatus.RUNNING
+    await db.commit()
+
+    resume_after = job.rows_processed
+    errors = list(job.errors or [])
+    batch: List[dict] = []
+    skipped = 0
+    last_row = resume_after
+
+    with open(job.file_path, "rb") as fh:
+        for item in iter_statement_rows(fh, job.file_format, options):
+            if item.row_number <= resume_after:
+                continue
+            last_row = item.row_number
+            if isinstance(item, RowError):
+                skipped += 1
+                if len(errors) < MAX_STORED_ERRORS:
+                    errors.append(item.message)
+            elif item.amount == 0:
+                skipped += 1
+            elif archive_catalog.is_archived(item.transaction_date):
+                skipped += 1
+                if len(errors) < MAX_STORED_ERRORS:
+                    errors.append(f"Row {item.row_number}: {item.transaction_date.year} is archived")
+            else:
+                batch.append(await _row_values(db, item, job, lookup, matcher))
+
+            if len(batch) >= batch_size:
+                job.rows_skipped += skipped
+                job.errors = list(errors)
+                await _commit_batch(db, job, batch, last_row, fh.tell())
+                await lookup.publish_created()
+                batch, skipped = [], 0
+                # Rules edited during a long import apply from the next batch
+                matcher = await rule_matcher_cache.get(db)
+
+        job.rows_skipped += skipped
+        job.errors = list(errors)
+        job.total_bytes = max(job.total_bytes, fh.tell())
+        await _commit_batch(db, job, batch, last_row, fh.tell())
+        await lookup.publish_created()
+
+    job.status = ImportStatus.COMPLETED
+    job.completed_at = datetime.utcnow()
+    await db.commit()
+    logger.info(
+        f"Import job {job.id} completed: {job.rows_imported} imported, {job.rows_skipped} skipped, "
+        f"{job.rows_duplicate} duplicates of {job.rows_processed} rows"
+    )
+    return job
+
+
+_active_jobs: set[int] = set()
+
+
+def is_job_active(job_id: int) -> bool:
+    """Whether an import job is currently being processed by this worker."""
+    return job_id in _active_jobs
+
+
+def is_job_running(job: ImportJob) -> bool:
+    """Whether an import job is being processed by any worker.
+
+    Every committed batch bumps ``updated_at``; a ``RUNNING`` job that has not committed one for
+    ``IMPORT_STALE_SECONDS`` was left behind by a crashed worker and can be resumed or re-uploaded.
+    """
+    if is_job_active(job.id):
+        return True
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.IMPORT_STALE_SECONDS)
+    return job.status == ImportStatus.RUNNING and job.updated_at > stale_before
+
+
+async def run_import_job(session_factory: async_sessionmaker, job_id: int) -> None:
+    """Process an import job in its own session (background task entry point)."""
+    if job_id in _active_jobs:
+        return
+    _active_jobs.add(job_id)
+    try:
+        async with session_factory() as db:
+            job = await db.get(ImportJob, job_id)
+            if job is None:
+                logger.warning(f"Import job {job_id} not found")
+                return
+            try:
+                await process_import_job(db, job)
+            except Exception as exc:
+                logger.exception(f"Import job {job_id} failed")
+                await db.rollback()
+                job = await db.get(ImportJob, job_id)
+                job.status = ImportStatus.FAILED
+                job.errors = [*(job.errors or [])[: MAX_STORED_ERRORS - 1], f"Import failed: {exc}"]
+                await db.commit()
+    finally:
+        _active_jobs.discard(job_id)
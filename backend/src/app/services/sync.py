@@ -0,0 +1,56 @@
+"""Delta sync over the trigger-maintained change log (see models.change_log)."""
+
+from collections import defaultdict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..models import Beneficiary, Budget, Category, ChangeLog, GiftEntry, GiftOccasion, GiftPurchase, Transaction
+from ..schemas import SyncChanges
+
+SYNC_ENTITIES = {
+    "categories": (Category, ()),
+    "beneficiaries": (Beneficiary, ()),
+    "transactions": (
+        Transaction,
+        (Transaction.category, Transaction.beneficiary, Transaction.created_by_user),
+    ),
+    "gift_occasions": (GiftOccasion, (GiftOccasion.person, GiftOccasion.created_by_user)),
+    "gift_entries": (GiftEntry, (GiftEntry.person, GiftEntry.transaction, GiftEntry.created_by_user)),
+    "gift_purchases": (GiftPurchase, (GiftPurchase.transaction, GiftPurchase.created_by_user)),
+    "budgets": (Budget, ()),
+}
+
+
+async def get_changes(db: AsyncSession, since: int, limit: int) -> SyncChanges:
+    """
+    Return up to ``limit`` changes with a sequence number greater than ``since``, oldest first
+    """
+    result = await db.execute(
+        select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.deleted)
+        .where(ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit + 1)
+    )
+    changes = result.all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    if not changes:
+        latest = await db.scalar(select(func.max(ChangeLog.seq))) or 0
+        # A cursor ahead of the log means the database was replaced; the client must start over
+        return SyncChanges(cursor=since, reset=since > latest)
+
+    updated: dict[str, list[int]] = defaultdict(list)
+    deleted: dict[str, list[int]] = defaultdict(list)
+    for change in changes:
+        (deleted if change.deleted else updated)[change.entity].append(change.entity_id)
+
+    entities = {}
+    for entity, ids in updated.items():
+        model, relationships = SYNC_ENTITIES[entity]
+        query = select(model).where(model.id.in_(ids)).options(*(selectinload(r) for r in relationships))
+        entities[entity] = (await db.execute(query)).scalars().all()
+
+    return SyncChanges(cursor=changes[-1].seq, has_more=has_more, deleted=dict(deleted), **entities)
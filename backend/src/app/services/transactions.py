@@ -0,0 +1,95 @@
+import html
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import Integer, Select, column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Transaction, TransactionTag
+from ..schemas import CompactTransactionPage, IncludedReferences, TagFilters, TagMatch, TransactionFilters
+from .reference_cache import reference_cache
+
+# FTS5 index maintained by triggers (see models.transaction); rowid is the transaction id
+transactions_fts = table("transactions_fts", column("rowid", Integer))
+_FTS = literal_column("transactions_fts")
+# bm25 column weights: description, notes, tags
+FTS_WEIGHTS = (10.0, 2.0, 5.0)
+# Control characters around hits in snippets; they become <mark> tags once the text is escaped
+HIT_START, HIT_END = "\x02", "\x03"
+
+
+def apply_transaction_filters(query: Select, filters: TransactionFilters) -> Select:
+    """Apply list/export filters to a query selecting from transactions"""
+    if filters.start_date:
+        query = query.where(Transaction.transaction_date >= filters.start_date)
+    if filters.end_date:
+        query = query.where(Transaction.transaction_date <= filters.end_date)
+    if filters.transaction_type:
+        query = query.where(Transaction.type == filters.transaction_type)
+    if filters.category_id:
+        query = query.where(Transaction.category_id == filters.category_id)
+    if filters.beneficiary_id:
+        query = query.where(Transaction.beneficiary_id == filters.beneficiary_id)
+    if filters.created_by_user_id:
+        query = query.where(Transaction.created_by_user_id == filters.created_by_user_id)
+    return apply_tag_filter(query, filters)
+
+
+def apply_tag_filter(query: Select, filters: TagFilters) -> Select:
+    """Restrict to transactions carrying any (or all) of the requested tags, via the transaction_tags index"""
+    tags = set(filters.tag_list)
+    if not tags:
+        return query
+    tagged = select(TransactionTag.transaction_id).where(TransactionTag.tag.in_(tags))
+    if filters.tag_match == TagMatch.ALL and len(tags) > 1:
+        tagged = tagged.group_by(TransactionTag.transaction_id).having(func.count() == len(tags))
+    return query.where(Transaction.id.in_(tagged))
+
+
+def build_fts_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, as a prefix, in any column.
+
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def apply_transaction_search(query: Select, fts_query: str) -> Select:
+    """Restrict a transactions query to full-text matches, best first, with a ``highlight`` snippet column"""
+    snippet = func.snippet(_FTS, -1, HIT_START, HIT_END, "…", 16)
+    return (
+        query.add_columns(snippet.label("highlight"))
+        .join(transactions_fts, transactions_fts.c.rowid == Transaction.id)
+        .where(_FTS.op("MATCH")(fts_query))
+        .order_by(func.bm25(_FTS, *FTS_WEIGHTS))
+    )
+
+
+def mark_hits(snippet: str) -> str:
+    """HTML-escape a search snippet and wrap its hits in ``<mark>`` tags, so the text cannot inject markup"""
+    return html.escape(snippet).replace(HIT_START, "<mark>").replace(HIT_END, "</mark>")
+
+
+async def build_compact_page(db: AsyncSession, transactions: Sequence[Transaction]) -> CompactTransactionPage:
+    """Side-load the categories, beneficiaries and users referenced by ``transactions`` from the reference cache"""
+    category_ids = {t.category_id for t in transactions}
+    beneficiary_ids = {t.beneficiary_id for t in transactions}
+    user_ids = {t.created_by_user_id for t in transactions}
+
+    _, references = await reference_cache.get(db)
+    if not references.covers(category_ids, beneficiary_ids, user_ids):
+        # Rows written outside the API never invalidated the cache; reload once
+        reference_cache.invalidate()
+        _, references = await reference_cache.get(db)
+
+    included = IncludedReferences(
+        categories={i: references.categories_by_id[i] for i in category_ids if i in references.categories_by_id},
+        beneficiaries={
+            i: references.beneficiaries_by_id[i] for i in beneficiary_ids if i in references.beneficiaries_by_id
+        },
+        users={i: references.users_by_id[i] for i in user_ids if i in references.users_by_id},
+    )
+    return CompactTransactionPage(transactions=transactions, included=included)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Generate a deterministic synthetic household into a fresh SQLite database.
+
+Produces N years of data with realistic shapes: monthly salaries and fixed
+costs, weekly groceries, log-normally distributed day-to-day spending with a
+December peak, occasional large purchases, tags, birthdays and holidays with
+gifts given and received, and gift purchases booked as "gifts" transactions.
+The same seed always produces the same rows.
+
+Rows are written with sqlite3 executemany in one transaction after the schema
+(including the FTS, tag and change-log triggers) is created, so loading tens of
+thousands of rows takes seconds. A user is created to log in with, e.g. for
+benchmarks/load_test.py.
+
+Usage:
+    cd backend
+    uv run python test_data/generate_synthetic_data.py --database data/synthetic.db --years 10
+    DATABASE_URL=sqlite:///./data/synthetic.db uv run uvicorn app.main:app --app-dir src
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app import models  # noqa: E402, F401
+from app.auth.security import get_password_hash  # noqa: E402
+from app.database.session import Base  # noqa: E402
+
+DEFAULT_EMAIL = "loadtest@example.com"
+DEFAULT_PASSWORD = "LoadTest123"
+
+BENEFICIARIES = ("Household", "Anna", "Ben", "Tom", "Sally", "Freddy", "Grandma", "Uncle Joe")
+FAMILY = ("Anna", "Ben", "Tom", "Sally", "Freddy")
+CHILDREN = ("Tom", "Sally", "Freddy")
+
+# name: (type, description pool)
+CATEGORIES = {
+    "salary": ("INCOME", ("Monthly Salary",)),
+    "freelance": ("INCOME", ("Freelance invoice", "Consulting fee", "Side project payment")),
+    "rent": ("EXPENSE", ("Monthly rent",)),
+    "utilities": ("EXPENSE", ("Electricity bill", "Water bill", "Internet subscription", "Mobile phone plan")),
+    "insurance": ("EXPENSE", ("Health insurance", "Car insurance", "Home insurance")),
+    "groceries": ("EXPENSE", ("Grocery Shopping - Weekly", "Supermarket", "Bakery", "Butcher", "Farmers market")),
+    "dining": ("EXPENSE", ("Restaurant dinner", "Lunch out", "Coffee shop", "Takeaway pizza", "Sushi delivery")),
+    "transport": ("EXPENSE", ("Fuel", "Train tickets", "Bus pass", "Parking", "Taxi", "Car service")),
+    "health": ("EXPENSE", ("Pharmacy", "Dentist", "Doctor visit", "Optician")),
+    "clothes": ("EXPENSE", ("New Winter Jacket", "Shoes", "Kids clothes", "Sportswear", "Summer dress")),
+    "kids": ("EXPENSE", ("School trip", "Daycare", "Swimming lessons", "School books", "Toys")),
+    "entertainment": ("EXPENSE", ("Cinema", "Concert tickets", "Streaming subscription", "Museum", "Zoo")),
+    "gaming": ("EXPENSE", ("Video game", "Console accessories", "Game subscription")),
+    "books": ("EXPENSE", ("Novel", "Cookbook", "E-book", "Comics")),
+    "travel": ("EXPENSE", ("Summer holiday", "Weekend trip", "Flight tickets", "Hotel stay")),
+    "gifts": ("BOTH", ("Birthday present", "Christmas present", "Gift card", "Flowers")),
+}
+
+# category: (expected occurrences per month, median amount, log-normal sigma, tag pool)
+VARIABLE_SPENDING = {
+    "groceries": (12.0, 55.0, 0.5, ("home",)),
+    "dining": (6.0, 32.0, 0.6, ("work", "holiday")),
+    "transport": (8.0, 28.0, 0.7, ("car", "work")),
+    "health": (1.2, 45.0, 0.8, ("health",)),
+    "clothes": (1.5, 60.0, 0.7, ("kids",)),
+    "kids": (2.5, 35.0, 0.8, ("kids", "school")),
+    "entertainment": (3.0, 25.0, 0.6, ("subscription", "holiday")),
+    "gaming": (0.8, 40.0, 0.5, ()),
+    "books": (1.0, 18.0, 0.5, ("school",)),
+    "freelance": (0.4, 900.0, 0.6, ("work",)),
+    "travel": (0.25, 650.0, 0.8, ("holiday",)),
+}
+# December spending is higher, summer brings travel
+SEASONALITY = {12: 1.35, 11: 1.1, 7: 1.15, 8: 1.15, 1: 0.85, 2: 0.9}
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    """Knuth's method for small means, the normal approximation for large (scaled-up) ones"""
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def scale_for(transactions: int, years: int) -> float:
+    """``--scale`` giving roughly ``transactions`` rows over ``years``: fixed monthly rows plus scaled spending"""
+    fixed_per_month = 2 + 1 + len(CATEGORIES["utilities"][1]) + 1 / 3
+    variable_per_month = sum(per_month for per_month, *_ in VARIABLE_SPENDING.values())
+    return max(1.0, (transactions / (years * 12) - fixed_per_month) / variable_per_month)
+
+
+def cents(amount: float) -> int:
+    return max(1, round(amount * 100))
+
+
+def month_starts(start: date, end: date):
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        yield current
+        current = date(current.year + (current.month == 12), current.month % 12 + 1, 1)
+
+
+class Generator:
+    """Builds rows with explicit ids, so gift purchases can reference their transactions"""
+
+    def __init__(self, seed: int, start: date, end: date, scale: float):
+        self.rng = random.Random(seed)
+        self.start = start
+        self.end = end
+        self.scale = scale
+        self.category_ids = {name: i for i, name in enumerate(CATEGORIES, 1)}
+        self.beneficiary_ids = {name: i for i, name in enumerate(BENEFICIARIES, 1)}
+        self.user_ids = (1, 2)
+        self.transactions = []
+        self.occasions = []
+        self.entries = []
+        self.purchases = []
+
+    def add_transaction(self, category, beneficiary, amount_cents, when: datetime, description=None, tags=()):
+        kind, descriptions = CATEGORIES[category]
+        if kind == "BOTH":
+            kind = "EXPENSE"
+        created = when + timedelta(minutes=self.rng.randrange(5, 600))
+        self.transactions.append(
+            [
+                None,  # id, assigned in date order once everything is generated
+                amount_cents,
+                when,
+                description or self.rng.choice(descriptions),
+                kind,
+                self.rng.choice(("Paid by card", "Split with friends", "Receipt in drawer"))
+                if self.rng.random() < 0.1
+                else None,
+                json.dumps(sorted(set(tags))),
+                created,
+                created,
+                self.category_ids[category],
+                self.beneficiary_ids[beneficiary],
+                self.rng.choice(self.user_ids),
+            ]
+        )
+        return self.transactions[-1]
+
+    def random_time(self, day: date) -> datetime:
+        return datetime(day.year, day.month, day.day, self.rng.randint(7, 21), self.rng.randrange(60))
+
+    def random_day(self, month: date) -> date:
+        next_month = date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+        day = month + timedelta(days=self.rng.randrange((next_month - month).days))
+        return min(max(day, self.start), self.end)
+
+    def generate_month(self, month: date) -> None:
+        rng = self.rng
+        # Fixed income and costs
+        for beneficiary, salary in (("Anna", 3400), ("Ben", 2900)):
+            pay_day = month.replace(day=25)
+            if self.start <= pay_day <= self.end:
+                self.add_transaction(
+                    "salary",
+                    beneficiary,
+                    cents(salary * rng.uniform(0.98, 1.04)),
+                    self.random_time(pay_day),
+                    tags=("work",),
+                )
+        if self.start <= month <= self.end:
+            self.add_transaction(
+                "rent",
+                "Household",
+                cents(1350 + 15 * (month.year - self.start.year)),
+                self.random_time(month),
+                tags=("home",),
+            )
+        for description in CATEGORIES["utilities"][1]:
+            self.add_transaction(
+                "utilities",
+                "Household",
+                cents(rng.lognormvariate(math.log(60), 0.3)),
+                self.random_time(self.random_day(month)),
+                description,
+                ("home", "subscription"),
+            )
+        if month.month in (1, 4, 7, 10):
+            self.add_transaction(
+                "insurance",
+                "Household",
+                cents(rng.lognormvariate(math.log(240), 0.2)),
+                self.random_time(self.random_day(month)),
+            )
+
+        # Day-to-day spending
+        for category, (per_month, median, sigma, tag_pool) in VARIABLE_SPENDING.items():
+            if category == "travel":
+                season = 3.0 if month.month in (7, 8) else 0.6
+            else:
+                season = SEASONALITY.get(month.month, 1.0)
+            for _ in range(poisson(rng, per_month * season * self.scale)):
+                beneficiary = rng.choice(CHILDREN) if category == "kids" else rng.choice(BENEFICIARIES[:6])
+                tags = [tag for tag in tag_pool if rng.random() < 0.35]
+                amount = cents(rng.lognormvariate(math.log(median), sigma))
+                self.add_transaction(category, beneficiary, amount, self.random_time(self.random_day(month)), tags=tags)
+
+    def generate_occasion(self, name, occasion_type, when: date, person, pool: bool, givers, receivers) -> None:
+        rng = self.rng
+        occasion_id = len(self.occasions) + 1
+        created = datetime(when.year, when.month, 1) - timedelta(days=rng.randrange(5, 40))
+        self.occasions.append(
+            (
+                occasion_id,
+                name,
+                occasion_type,
+                when,
+                self.beneficiary_ids[person] if person else None,
+                None,
+                pool,
+                rng.choice(self.user_ids),
+                created,
+                created,
+            )
+        )
+        for direction, people, median in (("GIVEN", givers, 30.0), ("RECEIVED", receivers, 25.0)):
+            for giver in people:
+                amount = cents(rng.lognormvariate(math.log(median), 0.5))
+                self.entries.append(
+                    (
+                        occasion_id,
+                        direction,
+                        self.beneficiary_ids[giver],
+                        amount,
+                        when - timedelta(days=rng.randrange(0, 10)),
+                        rng.choice(("Gift card", "Cash", "Toy", "Book", "Flowers")) if rng.random() < 0.7 else None,
+                        rng.choice(self.user_ids),
+                        created,
+                        created,
+                    )
+                )
+        for _ in range(rng.randint(1, 4) if pool or givers else 0):
+            day = when - timedelta(days=rng.randrange(0, 21))
+            if not self.start <= day <= self.end:
+                continue
+            amount = cents(rng.lognormvariate(math.log(35), 0.7))
+            description = rng.choice(CATEGORIES["gifts"][1])
+            # Most purchases are booked as an expense in the "gifts" category too
+            transaction = None
+            if rng.random() < 0.8:
+                transaction = self.add_transaction(
+                    "gifts", person or "Household", amount, self.random_time(day), description, ("gift",)
+                )
+            self.purchases.append(
+                [occasion_id, amount, day, description, transaction, rng.choice(self.user_ids), created, created]
+            )
+
+    def generate_occasions(self) -> None:
+        rng = self.rng
+        birthdays = {name: (rng.randint(1, 12), rng.randint(1, 28)) for name in FAMILY}
+        for year in range(self.start.year, self.end.year + 1):
+            for person, (month, day) in birthdays.items():
+                when = date(year, month, day)
+                if self.start <= when <= self.end:
+                    others = [p for p in BENEFICIARIES[1:] if p != person]
+                    pool = person in CHILDREN and rng.random() < 0.3
+                    self.generate_occasion(
+                        f"{person}'s birthday {year}",
+                        "BIRTHDAY",
+                        when,
+                        person,
+                        pool,
+                        rng.sample(others, rng.randint(1, 3)),
+                        rng.sample(others, rng.randint(0, 2)),
+                    )
+            christmas = date(year, 12, 25)
+            if self.start <= christmas <= self.end:
+                self.generate_occasion(
+                    f"Christmas {year}",
+                    "HOLIDAY",
+                    christmas,
+                    None,
+                    True,
+                    rng.sample(BENEFICIARIES[1:], 4),
+                    rng.sample(BENEFICIARIES[1:], 3),
+                )
+            if rng.random() < 0.4:
+                when = date(year, rng.randint(4, 9), rng.randint(1, 28))
+                if self.start <= when <= self.end:
+                    self.generate_occasion(
+                        f"Wedding {year}", "CELEBRATION", when, None, False, rng.sample(FAMILY, 2), []
+                    )
+
+    def generate(self) -> None:
+        for month in month_starts(self.start, self.end):
+            self.generate_month(month)
+        self.generate_occasions()
+        # Ids follow transaction dates, like rows entered as they happen
+        self.transactions.sort(key=lambda row: row[2])
+        for transaction_id, row in enumerate(self.transactions, 1):
+            row[0] = transaction_id
+        for purchase in self.purchases:
+            purchase[4] = purchase[4][0] if purchase[4] is not None else None
+
+
+def _sql_rows(rows):
+    """Dates as ISO strings, the way SQLAlchemy stores them in SQLite"""
+    return [[str(value) if isinstance(value, date) else value for value in row] for row in rows]
+
+
+def load(path: Path, generator: Generator, email: str, password: str) -> dict:
+    """Create the schema and bulk insert every row; returns row counts"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    created = datetime.combine(generator.start, datetime.min.time())
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(
+            "INSERT INTO users (id, name, email, hashed_password, is_active, created_at) VALUES (?, ?, ?, ?, 1, ?)",
+            (1, "Load Test", email, get_password_hash(password), str(created)),
+        )
+        conn.execute("INSERT INTO users (id, name, is_active, created_at) VALUES (2, 'Partner', 1, ?)", (str(created),))
+        conn.executemany(
+            "INSERT INTO categories (id, name, type, updated_at) VALUES (?, ?, ?, ?)",
+            [(generator.category_ids[name], name, kind, str(created)) for name, (kind, _) in CATEGORIES.items()],
+        )
+        conn.executemany(
+            "INSERT INTO beneficiaries (id, name, updated_at) VALUES (?, ?, ?)",
+            [(i, name, str(created)) for name, i in generator.beneficiary_ids.items()],
+        )
+        conn.executemany(
+            "INSERT INTO transactions (id, amount_cents, transaction_date, description, type, notes, tags, created_at, "
+            "updated_at, category_id, beneficiary_id, created_by_user_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _sql_rows(generator.transactions),
+        )
+        conn.executemany(
+            "INSERT INTO gift_occasions (id, name, occasion_type, occasion_date, person_id, notes, is_pool_account, "
+            "created_by_user_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _sql_rows(generator.occasions),
+        )
+        conn.executemany(
+            "INSERT INTO gift_entries (occasion_id, direction, person_id, amount_cents, gift_date, description, "
+            "created_by_user_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _sql_rows(generator.entries),
+        )
+        conn.executemany(
+            "INSERT INTO gift_purchases (occasion_id, amount_cents, purchase_date, description, transaction_id, "
+            "created_by_user_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            _sql_rows(generator.purchases),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        "transactions": len(generator.transactions),
+        "gift_occasions": len(generator.occasions),
+        "gift_entries": len(generator.entries),
+        "gift_purchases": len(generator.purchases),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic database")
+    parser.add_argument("--database", type=Path, default=Path("data/synthetic.db"), help="SQLite file to create")
+    parser.add_argument("--years", type=int, default=5, help="Years of history, ending at --end")
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2025, 12, 31), help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for day-to-day spending frequency")
+    parser.add_argument("--transactions", type=int, help="Approximate transaction count (overrides --scale)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same data")
+    parser.add_argument("--email", default=DEFAULT_EMAIL, help="Login for the generated user")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password for the generated user")
+    parser.add_argument("--overwrite", action="store_true", help="Replace --database if it exists")
+    args = parser.parse_args()
+
+    if args.database.exists():
+        if not args.overwrite:
+            print(f"Error: {args.database} exists (use --overwrite to replace it)")
+            sys.exit(1)
+        args.database.unlink()
+    args.database.parent.mkdir(parents=True, exist_ok=True)
+
+    start = date(args.end.year - args.years, args.end.month, args.end.day) + timedelta(days=1)
+    scale = scale_for(args.transactions, args.years) if args.transactions else args.scale
+    generator = Generator(args.seed, start, args.end, scale)
+    started = time.perf_counter()
+    generator.generate()
+    generated = time.perf_counter()
+    counts = load(args.database, generator, args.email, args.password)
+    loaded = time.perf_counter()
+
+    print(f"Generated {start} .. {args.end} in {generated - started:.1f}s, loaded in {loaded - generated:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:<16}{count:>10}")
+    print(f"Database: {args.database}  login: {args.email} / {args.password}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,45 @@
 """
-Script to insert test transactions from a JSONL file into the database via the API.
+Load transactions from a JSONL file, over the API or straight into the database.
 
-This script will:
-1. Create the required categories (food, clothes, gifts, gaming, books)
-2. Create the required beneficiaries (Tom, Sally, Freddy)
-3. Insert all transactions from the JSONL file
+Over HTTP (the default) the loader:
+1. Logs in (registering the user first if needed)
+2. Creates the required categories (food, clothes, gifts, gaming, books) and
+   beneficiaries (Tom, Sally, Freddy), and maps the file's ids to the server's
+3. Inserts the transactions through POST /api/transactions/bulk in batches,
+   falling back to one POST per transaction on servers without the bulk
+   endpoint; a bounded number of requests run concurrently over one
+   connection pool, and failed requests are retried with backoff
+
+With --direct-db it bypasses HTTP and writes into a SQLite file with
+executemany (the database triggers still maintain search, tags and sync).
+Either way progress and throughput are reported as rows go in.
 
 Usage:
     cd backend
-    python test_data/insert_test_transactions.py
+    python test_data/insert_test_transactions.py --email me@example.com --password Secret123
 
-Or with a custom file:
-    python test_data/insert_test_transactions.py --file path/to/transactions.jsonl
+Or with a custom file, API URL or concurrency:
+    python test_data/insert_test_transactions.py --file path/to/transactions.jsonl --email ... --password ...
+    python test_data/insert_test_transactions.py --api-url http://localhost:8000/api --concurrency 16 ...
 
-Or with a custom API URL:
-    python test_data/insert_test_transactions.py --api-url http://localhost:8000/api
+Or straight into a database file:
+    python test_data/insert_test_transactions.py --direct-db budget_tracker.db
 """
 
 import argparse
+import asyncio
 import json
+import sqlite3
 import sys
 import time
-import traceback
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
 from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
 
 import httpx
 
-# Predefined categories and beneficiaries
+# Predefined categories and beneficiaries; the ids are the ones used in the JSONL file
 CATEGORIES = [
     {"id": 1, "name": "food", "type": "expense"},
     {"id": 2, "name": "clothes", "type": "expense"},
@@ -41,9 +54,7 @@ BENEFICIARIES = [
     {"id": 3, "name": "Freddy"},
 ]
 
-USERS = [
-    {"id": 1, "name": "Test User"},
-]
+RETRY_STATUSES = {429, 502, 503, 504}
 
 
 def load_transactions(jsonl_file: Path) -> list[dict]:
@@ -60,164 +71,262 @@ def load_transactions(jsonl_file: Path) -> list[dict]:
     return transactions
 
 
-def register_user(client: httpx.Client, api_url: str, name: str, email: str, password: str) -> dict | None:
-    """Register a new user via auth/register. If the user exists, returns the response or None.
+def chunked(items: list, size: int) -> List[list]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
 
-    Returns the JSON response if successful or None on fatal error. If user already exists (400), the response JSON
-    will be returned.
-    """
-    url = f"{api_url}/auth/register"
-    payload = {"name": name, "email": email, "password": password}
-    try:
-        response = client.post(url, json=payload)
-        # If already exists, backend may return 400 with message; we'll let caller handle login attempt.
-        response.raise_for_status()
-        print(f"Registered user: {email}")
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        # If user already exists, print and continue; return the response JSON if available
-        status = e.response.status_code
-        text = e.response.text
-        if status == 400:
-            print(f"Register returned 400 (possibly already registered): {text}")
-            try:
-                return e.response.json()
-            except Exception:
-                return None
-        print(f"HTTP error registering user: {status} - {text}")
-        return None
-    except httpx.RequestError as e:
-        print(f"Request error registering user: {e}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error registering user: {e}")
-        traceback.print_exc()
-        return None
-
-
-def login_user(client: httpx.Client, api_url: str, email: str, password: str) -> str | None:
-    """Login and return the access token (string) or None on failure."""
-    url = f"{api_url}/auth/login"
-    payload = {"email": email, "password": password}
-    try:
-        response = client.post(url, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        token = data.get("access_token")
-        if not token:
-            print("Login succeeded but no access_token in response")
-            return None
-        print(f"Logged in as {email}")
-        return token
-    except httpx.HTTPStatusError as e:
-        print(f"HTTP error logging in: {e.response.status_code} - {e.response.text}")
-        return None
-    except httpx.RequestError as e:
-        print(f"Request error logging in: {e}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error logging in: {e}")
-        traceback.print_exc()
-        return None
-
-
-def insert_category(client: httpx.Client, api_url: str, category: dict) -> dict | None:
-    """Insert a single category via the API."""
-    url = f"{api_url}/categories"
-    try:
-        response = client.post(url, json={"name": category["name"], "type": category["type"]})
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 400 or e.response.status_code == 409:
-            # Category might already exist
-            print(f"  Category '{category['name']}' may already exist: {e.response.text}")
-            return None
-        print(f"HTTP error inserting category: {e.response.status_code} - {e.response.text}")
-        return None
-    except httpx.RequestError as e:
-        print(f"Request error inserting category: {e}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error inserting category: {e}")
-        traceback.print_exc()
-
-
-def insert_beneficiary(client: httpx.Client, api_url: str, beneficiary: dict) -> dict | None:
-    """Insert a single beneficiary via the API."""
-    url = f"{api_url}/beneficiaries"
-    try:
-        response = client.post(url, json={"name": beneficiary["name"]})
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code in (400, 409, 500):
-            # Beneficiary might already exist (500 = unique constraint violation)
-            print(f"  Beneficiary '{beneficiary['name']}' may already exist (status {e.response.status_code})")
-            return {"skipped": True}  # Return non-None to indicate it's OK to continue
-        print(f"HTTP error inserting beneficiary: {e.response.status_code} - {e.response.text}")
-        return None
-    except httpx.RequestError as e:
-        print(f"Request error inserting beneficiary: {e}")
-        return {"skipped": True}  # Connection error after 500 is expected, continue
-    except Exception as e:
-        print(f"Unexpected error inserting beneficiary: {e}")
-        traceback.print_exc()
-        return None
-
-
-def insert_user(client: httpx.Client, api_url: str, user: dict) -> dict | None:
-    """Insert a single user via the API."""
-    url = f"{api_url}/users"
-    try:
-        response = client.post(url, json={"name": user["name"]})
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code in (400, 409, 500):
-            # User might already exist (500 = unique constraint violation)
-            print(f"  User '{user['name']}' may already exist (status {e.response.status_code})")
-            return {"skipped": True}  # Return non-None to indicate it's OK to continue
-        print(f"HTTP error inserting user: {e.response.status_code} - {e.response.text}")
-        return None
-    except httpx.RequestError as e:
-        print(f"Request error inserting user: {e}")
-        return {"skipped": True}  # Connection error after 500 is expected, continue
-    except Exception as e:
-        print(f"Unexpected error inserting user: {e}")
-        traceback.print_exc()
-        return None
-
-
-def insert_transaction(client: httpx.Client, api_url: str, transaction: dict, max_retries: int = 3) -> dict | None:
-    """Insert a single transaction via the API with retry logic."""
-    url = f"{api_url}/transactions"
 
+class Progress:
+    """Prints inserted/failed counts and rows per second at most every ``interval`` seconds"""
+
+    def __init__(self, total: int, interval: float = 1.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._last_print = 0.0
+
+    def advance(self, done: int = 0, failed: int = 0) -> None:
+        self.done += done
+        self.failed += failed
+        now = time.perf_counter()
+        if now - self._last_print >= self.interval or self.done + self.failed >= self.total:
+            self._last_print = now
+            self.print()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def print(self) -> None:
+        finished = self.done + self.failed
+        percent = finished / self.total * 100 if self.total else 100.0
+        rate = self.done / self.elapsed if self.elapsed else 0.0
+        print(
+            f"  [{finished:>{len(str(self.total))}}/{self.total}] {percent:5.1f}%  "
+            f"{self.done} inserted, {self.failed} failed, {rate:,.0f} rows/s"
+        )
+
+    def summary(self) -> str:
+        rate = self.done / self.elapsed if self.elapsed else 0.0
+        return f"Inserted {self.done} transactions, {self.failed} errors in {self.elapsed:.2f}s ({rate:,.0f} rows/s)"
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient, method: str, url: str, max_retries: int = 3, **kwargs
+) -> httpx.Response:
+    """Retry connection errors and overload responses with exponential backoff; other errors are returned as-is"""
     for attempt in range(max_retries):
+        last = attempt == max_retries - 1
         try:
-            response = client.post(url, json=transaction)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error inserting transaction: {e.response.status_code} - {e.response.text}")
-            return None
-        except httpx.RequestError as e:
-            if attempt < max_retries - 1:
-                print(f"  Connection error (attempt {attempt + 1}/{max_retries}), retrying...")
-                time.sleep(0.5)  # Brief pause before retry
-                continue
-            print(f"Request error inserting transaction: {e}")
-            return None
-        except Exception as e:
-            print(f"Unexpected error inserting transaction: {e}")
-            traceback.print_exc()
-            return None
-
-    return None
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if last:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or last:
+                return response
+        await asyncio.sleep(0.25 * 2**attempt)
+
+
+async def authenticate(client: httpx.AsyncClient, name: str, email: str, password: str) -> int:
+    """Log in, registering first if the login fails; sets the Authorization header and returns the user's id"""
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    if response.status_code != 200:
+        print(f"Login failed ({response.status_code}); registering {email}...")
+        registered = await client.post("/auth/register", json={"name": name, "email": email, "password": password})
+        if registered.status_code not in (201, 400):
+            raise SystemExit(f"Registration failed: {registered.status_code} {registered.text}")
+        if registered.status_code == 400:
+            print(f"  Register returned 400: {registered.json().get('detail')}")
+        response = await client.post("/auth/login", json={"email": email, "password": password})
+    if response.status_code != 200:
+        raise SystemExit(f"Could not log in as {email}: {response.status_code} {response.text}")
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    me = (await client.get("/auth/me")).raise_for_status().json()
+    print(f"Logged in as {email}")
+    return me["id"]
+
+
+async def ensure_named(client: httpx.AsyncClient, path: str, label: str, items: List[dict]) -> Dict[int, int]:
+    """Create the missing entities by name and map the file's ids to the server's"""
+    existing = {entity["name"].lower(): entity["id"] for entity in (await client.get(path)).raise_for_status().json()}
+
+    async def create(item: dict) -> None:
+        body = {key: value for key, value in item.items() if key != "id"}
+        response = await request_with_retry(client, "POST", path, json=body)
+        if response.status_code == 201:
+            existing[item["name"].lower()] = response.json()["id"]
+            print(f"  ✓ Created {label}: {item['name']}")
+        else:
+            print(f"  Could not create '{item['name']}': {response.status_code} {response.text}")
+
+    await asyncio.gather(*(create(item) for item in items if item["name"].lower() not in existing))
+    return {item["id"]: existing[item["name"].lower()] for item in items if item["name"].lower() in existing}
+
+
+def remap(transactions: List[dict], categories: Dict[int, int], beneficiaries: Dict[int, int], user_id: int):
+    """Point the file's category and beneficiary ids at the target's; every row is created by ``user_id``"""
+    return [
+        {
+            **transaction,
+            "category_id": categories.get(transaction["category_id"], transaction["category_id"]),
+            "beneficiary_id": beneficiaries.get(transaction["beneficiary_id"], transaction["beneficiary_id"]),
+            "created_by_user_id": user_id,
+        }
+        for transaction in transactions
+    ]
+
+
+async def run_bounded(jobs: List[Callable[[], Awaitable[None]]], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            await job()
+
+    await asyncio.gather(*(run(job) for job in jobs))
+
+
+async def insert_over_http(client: httpx.AsyncClient, transactions: List[dict], args) -> Progress:
+    progress = Progress(len(transactions))
+    batches = chunked(transactions, args.batch_size)
+
+    # Servers without the bulk endpoint answer 404/405; fall back to one request per transaction
+    probe = await request_with_retry(client, "POST", "/transactions/bulk", json={"transactions": batches[0]})
+    bulk = probe.status_code not in (404, 405)
+
+    async def send_batch(batch: List[dict], response: Optional[httpx.Response] = None) -> None:
+        try:
+            response = response or await request_with_retry(
+                client, "POST", "/transactions/bulk", json={"transactions": batch}
+            )
+        except httpx.TransportError as e:
+            print(f"  Request error inserting batch: {e}")
+            progress.advance(failed=len(batch))
+            return
+        if response.status_code == 201:
+            progress.advance(done=response.json()["created"])
+        else:
+            print(f"  Batch failed: {response.status_code} - {response.text[:300]}")
+            progress.advance(failed=len(batch))
+
+    async def send_one(transaction: dict) -> None:
+        try:
+            response = await request_with_retry(client, "POST", "/transactions", json=transaction)
+        except httpx.TransportError as e:
+            print(f"  Request error inserting '{transaction['description']}': {e}")
+            progress.advance(failed=1)
+            return
+        if response.status_code == 201:
+            progress.advance(done=1)
+        else:
+            print(f"  Failed '{transaction['description']}': {response.status_code} - {response.text[:300]}")
+            progress.advance(failed=1)
+
+    if bulk:
+        print(f"Using the bulk endpoint: {len(batches)} batches of up to {args.batch_size}")
+        jobs = [lambda batch=batch: send_batch(batch) for batch in batches[1:]]
+        await send_batch(batches[0], probe)
+    else:
+        print("Bulk endpoint not available; creating transactions one request at a time")
+        jobs = [lambda transaction=transaction: send_one(transaction) for transaction in transactions]
+    await run_bounded(jobs, args.concurrency)
+    return progress
+
+
+async def load_over_http(transactions: List[dict], args) -> Progress:
+    if not (args.email and args.password):
+        raise SystemExit("Error: --email and --password are required (or use --direct-db)")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.api_url, timeout=30.0, limits=limits) as client:
+        print(f"\n{'=' * 60}")
+        print(f"Authenticating against {args.api_url}...")
+        user_id = await authenticate(client, args.name, args.email, args.password)
+
+        categories: Dict[int, int] = {}
+        beneficiaries: Dict[int, int] = {}
+        if not args.skip_setup:
+            print(f"\n{'=' * 60}")
+            print("Creating categories and beneficiaries...")
+            categories, beneficiaries = await asyncio.gather(
+                ensure_named(client, "/categories", "category", CATEGORIES),
+                ensure_named(client, "/beneficiaries", "beneficiary", BENEFICIARIES),
+            )
+
+        print(f"\n{'=' * 60}")
+        print(f"Inserting {len(transactions)} transactions (concurrency {args.concurrency})...")
+        return await insert_over_http(client, remap(transactions, categories, beneficiaries, user_id), args)
+
+
+def _sql_ids(conn: sqlite3.Connection, table: str, items: List[dict], columns: str, values) -> Dict[int, int]:
+    """Insert the names that are missing and map the file's ids to the database's"""
+    rows = [values(item) for item in items]
+    placeholders = ", ".join("?" * len(rows[0]))
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})", rows)
+    ids = {name.lower(): id_ for id_, name in conn.execute(f"SELECT id, name FROM {table}")}
+    return {item["id"]: ids[item["name"].lower()] for item in items}
+
+
+def load_direct(transactions: List[dict], args) -> Progress:
+    """executemany straight into SQLite, one transaction per batch"""
+    if not args.direct_db.exists():
+        raise SystemExit(f"Error: database not found: {args.direct_db} (start the app once to create it)")
+    now = datetime.utcnow().isoformat(" ")
+    conn = sqlite3.connect(args.direct_db)
+    try:
+        with conn:
+            categories = _sql_ids(
+                conn, "categories", CATEGORIES, "name, type, updated_at", lambda c: (c["name"], c["type"].upper(), now)
+            )
+            beneficiaries = _sql_ids(
+                conn, "beneficiaries", BENEFICIARIES, "name, updated_at", lambda b: (b["name"], now)
+            )
+            row = conn.execute("SELECT id FROM users ORDER BY id LIMIT 1").fetchone()
+            user_id = (
+                row[0]
+                if row
+                else conn.execute(
+                    "INSERT INTO users (name, is_active, created_at) VALUES ('Test User', 1, ?)", (now,)
+                ).lastrowid
+            )
+
+        rows = [
+            (
+                # Exact cents, as the Cents column type stores them
+                int((Decimal(str(t["amount"])) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)),
+                datetime.fromisoformat(t["transaction_date"]).isoformat(" "),
+                t["description"],
+                t["type"].upper(),
+                t.get("notes"),
+                json.dumps(t.get("tags") or []),
+                now,
+                now,
+                t["category_id"],
+                t["beneficiary_id"],
+                t["created_by_user_id"],
+            )
+            for t in remap(transactions, categories, beneficiaries, user_id)
+        ]
+        progress = Progress(len(rows))
+        print(f"\n{'=' * 60}")
+        print(f"Inserting {len(rows)} transactions into {args.direct_db}...")
+        for batch in chunked(rows, args.batch_size):
+            with conn:
+                conn.executemany(
+                    "INSERT INTO transactions (amount_cents, transaction_date, description, type, notes, tags, "
+                    "created_at, updated_at, category_id, beneficiary_id, created_by_user_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+            progress.advance(done=len(batch))
+        return progress
+    finally:
+        conn.close()
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Insert test data (categories, beneficiaries, transactions) via API")
+    parser = argparse.ArgumentParser(description="Insert test data (categories, beneficiaries, transactions)")
     parser.add_argument(
         "--file",
         type=Path,
@@ -230,6 +339,16 @@ def main():
         default="http://localhost:8000/api",
         help="Base API URL (default: http://localhost:8000/api)",
     )
+    parser.add_argument("--email", help="User to log in (or register) as")
+    parser.add_argument("--password", help="Password for --email")
+    parser.add_argument("--name", default="Test User", help="Name used when registering --email")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests (default: 8)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Transactions per bulk request or DB commit")
+    parser.add_argument(
+        "--direct-db",
+        type=Path,
+        help="Write straight into this SQLite database with executemany instead of using the API",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -239,7 +358,7 @@ def main():
         "--skip-setup",
         action="store_true",
         default=False,
-        help="Skip creating categories and beneficiaries (use if they already exist)",
+        help="Skip creating categories and beneficiaries (use if they already exist with the file's ids)",
     )
 
     args = parser.parse_args()
@@ -267,127 +386,19 @@ def main():
             print(f"  {i}. {t['description']} - ${t['amount']:.2f} ({t['type']})")
         print(f"\nTotal: {len(transactions)} transactions")
         return
+    if not transactions:
+        return
 
-    # Credentials to register/login
-    TEST_USER_NAME = "<change me>"
-    TEST_USER_EMAIL = "<change me>"
-    TEST_USER_PASSWORD = "<change me>"
-
-    if "<change me>" in (TEST_USER_NAME, TEST_USER_EMAIL, TEST_USER_PASSWORD):
-        print("Error: Please set TEST_USER_NAME, TEST_USER_EMAIL, and TEST_USER_PASSWORD in the script before running.")
-        sys.exit(1)
-
-    def _adjust_password(pwd: str) -> str:
-        """Make a minimal modification to satisfy password rules: length>=8, has digit, has uppercase."""
-        new_pwd = pwd
-        if len(new_pwd) < 8:
-            new_pwd = (new_pwd + "A1") * ((8 // (len(new_pwd) + 2)) + 1)
-            new_pwd = new_pwd[: max(8, len(new_pwd))]
-        # Ensure at least one digit
-        if not any(ch.isdigit() for ch in new_pwd):
-            new_pwd = new_pwd + "1"
-        # Ensure at least one uppercase
-        if not any(ch.isupper() for ch in new_pwd):
-            # capitalize first letter of local-part (before @) if an email, else just uppercase first char
-            if "@" in new_pwd:
-                local, _, domain = new_pwd.partition("@")
-                if local:
-                    local = local[0].upper() + local[1:]
-                    new_pwd = local + ("@" + domain if domain else "")
-                else:
-                    new_pwd = new_pwd.capitalize()
-            else:
-                new_pwd = new_pwd[0].upper() + new_pwd[1:]
-        return new_pwd
-
-    with httpx.Client(timeout=30.0) as client:
-        # Try login first. If login fails, attempt register, and if that fails due to password policy,
-        # make a minimal adjusted password and retry registration/login.
-        print(f"\n{'=' * 60}")
-        print("Authentication: attempting to login/register test user...")
-        print(f"Using email: {TEST_USER_EMAIL}")
-
-        token = login_user(client, args.api_url, TEST_USER_EMAIL, TEST_USER_PASSWORD)
-        used_password = TEST_USER_PASSWORD
-
-        if not token:
-            print("Initial login failed; attempting to register user with provided password...")
-            reg = register_user(client, args.api_url, TEST_USER_NAME, TEST_USER_EMAIL, TEST_USER_PASSWORD)
-
-            # If registration likely failed due to password strength, adjust and retry
-            reg_failed_due_to_password = False
-            if isinstance(reg, dict) and reg.get("detail") and isinstance(reg.get("detail"), str):
-                detail = reg.get("detail")
-                if "Password" in detail or "password" in detail or "uppercase" in detail or "number" in detail:
-                    reg_failed_due_to_password = True
-
-            if reg_failed_due_to_password or reg is None:
-                adjusted = _adjust_password(TEST_USER_PASSWORD)
-                if adjusted != TEST_USER_PASSWORD:
-                    print(f"Registration failed due to password policy; retrying with adjusted password: {adjusted}")
-                    reg2 = register_user(client, args.api_url, TEST_USER_NAME, TEST_USER_EMAIL, adjusted)
-                    if reg2 is not None:
-                        used_password = adjusted
-                    else:
-                        print("Registration retry failed; continuing to attempt login with adjusted password")
-                        used_password = adjusted
-                else:
-                    print("Could not auto-adjust password; registration failed")
-
-            # Attempt login with the password that we used (either original or adjusted)
-            token = login_user(client, args.api_url, TEST_USER_EMAIL, used_password)
-
-        if not token:
-            print("Failed to obtain access token. Exiting.")
-            sys.exit(1)
-
-        # Set Authorization header for subsequent requests
-        client.headers.update({"Authorization": f"Bearer {token}"})
-
-        # Step 1: Create categories
-        if not args.skip_setup:
-            print(f"\n{'=' * 60}")
-            print("Step 1: Creating categories...")
-            print("=" * 60)
-            for category in CATEGORIES:
-                result = insert_category(client, args.api_url, category)
-                if result:
-                    print(f"  ✓ Created category: {category['name']}")
-
-            # Step 2: Create beneficiaries
-            print(f"\n{'=' * 60}")
-            print("Step 2: Creating beneficiaries...")
-            print("=" * 60)
-            for beneficiary in BENEFICIARIES:
-                result = insert_beneficiary(client, args.api_url, beneficiary)
-                if result and "skipped" not in result:
-                    print(f"  ✓ Created beneficiary: {beneficiary['name']}")
-
-            # Brief pause to let backend recover from any 500 errors
-            time.sleep(1.0)
-
-        # Step 3: Insert transactions
-        print(f"\n{'=' * 60}")
-        print("Step 3: Inserting transactions...")
-        print("=" * 60)
-
-        success_count = 0
-        error_count = 0
-
-        for i, transaction in enumerate(transactions, 1):
-            result = insert_transaction(client, args.api_url, transaction)
-            if result:
-                success_count += 1
-                desc = transaction["description"]
-                amt = transaction["amount"]
-                print(f"[{i}/{len(transactions)}] ✓ Created: {desc} - ${amt:.2f}")
-            else:
-                error_count += 1
-                print(f"[{i}/{len(transactions)}] ✗ Failed: {transaction['description']}")
+    if args.direct_db:
+        progress = load_direct(transactions, args)
+    else:
+        progress = asyncio.run(load_over_http(transactions, args))
 
     print(f"\n{'=' * 60}")
-    print(f"Done! Inserted {success_count} transactions, {error_count} errors")
+    print(f"Done! {progress.summary()}")
     print("=" * 60)
+    if progress.failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
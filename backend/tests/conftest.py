@@ -1,3 +1,4 @@
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 
 import pytest
@@ -6,7 +7,8 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.auth.security import create_access_token, get_password_hash
-from app.database import Base, get_db
+from app.config.settings import settings
+from app.database import Base, get_db, get_session_factory, instrument_engine, track_queries
 from app.database import async_engine as production_engine
 from app.main import app
 from app.models import (
@@ -17,6 +19,11 @@ from app.models import (
     TransactionType,
     User,
 )
+from app.services.budgets import budget_status_cache
+from app.services.categorization import rule_matcher_cache
+from app.services.descriptions import description_index
+from app.services.fx import fx_rate_cache
+from app.services.reference_cache import reference_cache
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -40,15 +47,29 @@ def cleanup_production_engine():
         asyncio.run(production_engine.dispose())
 
 
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    """Archived years go to a directory of the test's own, never the working directory's data/archive"""
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", tmp_path / "archive")
+    return tmp_path / "archive"
+
+
 @pytest_asyncio.fixture(scope="function")
 async def db():
     """Create a fresh database for each test"""
     # Create a new engine for each test to ensure isolation
     test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    instrument_engine(test_engine)
     TestingSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
 
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # In-process caches must not leak data from the previous test's database
+    reference_cache.invalidate()
+    budget_status_cache.invalidate()
+    rule_matcher_cache.invalidate()
+    description_index.invalidate()
+    fx_rate_cache.invalidate()
 
     async with TestingSessionLocal() as session:
         yield session
@@ -60,6 +81,20 @@ async def db():
     await test_engine.dispose()
 
 
+@pytest.fixture
+def max_queries():
+    """Assert a query budget: ``with max_queries(3): await authenticated_client.get(...)``"""
+
+    @contextmanager
+    def check(limit: int):
+        with track_queries() as stats:
+            yield stats
+        issued = "\n".join(f"  {n}x {sql}" for sql, n in stats.statements.most_common())
+        assert stats.count <= limit, f"{stats.count} queries issued, expected at most {limit}:\n{issued}"
+
+    return check
+
+
 @pytest_asyncio.fixture(scope="function")
 async def authenticated_user(db):
     """Create an authenticated user for testing"""
@@ -97,6 +132,8 @@ async def client(db):
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    # Background work (imports, streamed exports) shares the test session
+    app.dependency_overrides[get_session_factory] = lambda: lambda: nullcontext(db)
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as test_client:
@@ -113,6 +150,8 @@ async def authenticated_client(db, auth_headers):
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    # Background work (imports, streamed exports) shares the test session
+    app.dependency_overrides[get_session_factory] = lambda: lambda: nullcontext(db)
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test", headers=auth_headers) as test_client:
@@ -40,3 +40,36 @@ async def test_get_summary_by_date_range(authenticated_client, sample_data):
     data = response.json()
     assert data["total_income"] == 3000.0
     assert data["total_expenses"] == 100.0  # Only groceries from January
+
+
+@pytest.mark.asyncio
+async def test_get_summary_by_tag_filter(authenticated_client, sample_data):
+    """Test filtering the summary by tag"""
+    groceries = sample_data["transactions"][0]
+    await authenticated_client.put(f"/api/transactions/{groceries.id}", json={"tags": ["kids"]})
+
+    response = await authenticated_client.get("/api/aggregations/summary?tags=kids")
+    data = response.json()
+    assert data["total_expenses"] == 100.0
+    assert data["transaction_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_aggregation_by_tag(authenticated_client, sample_data):
+    """Test per-tag totals"""
+    groceries, salary, gas = sample_data["transactions"]
+    await authenticated_client.put(f"/api/transactions/{groceries.id}", json={"tags": ["kids", "food"]})
+    await authenticated_client.put(f"/api/transactions/{salary.id}", json={"tags": ["kids"]})
+    await authenticated_client.put(f"/api/transactions/{gas.id}", json={"tags": ["car"]})
+
+    response = await authenticated_client.get("/api/aggregations/by-tag")
+    assert response.status_code == 200
+    data = {row["tag"]: row for row in response.json()}
+    assert [row["tag"] for row in response.json()] == ["food", "kids", "car"]
+    assert data["kids"]["total_income"] == 3000.0
+    assert data["kids"]["total_expenses"] == 100.0
+    assert data["kids"]["net_total"] == 2900.0
+    assert data["kids"]["transaction_count"] == 2
+
+    response = await authenticated_client.get("/api/aggregations/by-tag?transaction_type=expense&start_date=2024-02-01")
+    assert [(row["tag"], row["total_expenses"]) for row in response.json()] == [("car", 50.0)]
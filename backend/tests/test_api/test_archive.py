@@ -0,0 +1,184 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.models import GiftEntry, GiftOccasion, Transaction
+from app.schemas import GiftDirection
+from app.services.archive import MANIFEST, archive_years, restore_years
+from app.services.budgets import budget_status_cache
+from app.services.recurring import materialize_due
+
+pytest.importorskip("pyarrow")
+
+# Transactions of 2021 and 2022 are archived; the last ones stay in the table
+TRANSACTIONS = [
+    ("2021-03-10T09:00:00", "expense", 12.5, "Books", ["kids"]),
+    ("2021-11-30T23:59:59", "income", 100, "Refund", []),
+    ("2022-06-01T00:00:00", "expense", 40, "Shoes", ["kids", "clothes"]),
+    ("2022-06-15T12:00:00", "expense", 10.01, "Lunch", []),
+    ("2022-06-20T08:00:00", "expense", 20, "Jacket", ["clothes"]),
+    ("2022-12-31T18:00:00", "income", 1000, "Bonus", ["work"]),
+    ("2023-01-05T10:00:00", "expense", 30, "Groceries", ["kids"]),
+    ("2024-02-01T10:00:00", "expense", 5, "Coffee", []),
+]
+
+REQUESTS = [
+    ("/api/aggregations/summary", {}),
+    ("/api/aggregations/summary", {"start_date": "2022-06-10T00:00:00", "end_date": "2023-12-31T00:00:00"}),
+    ("/api/aggregations/summary", {"start_date": "2022-06-01T00:00:00", "end_date": "2022-06-30T23:59:59.999999"}),
+    ("/api/aggregations/summary", {"tags": "kids,clothes", "tag_match": "all"}),
+    ("/api/aggregations/summary", {"transaction_type": "income"}),
+    ("/api/aggregations/by-tag", {}),
+    ("/api/aggregations/by-tag", {"end_date": "2022-06-30T00:00:00"}),
+    ("/api/budgets/status", {"month": "2023-01"}),
+    ("/api/transactions", {}),
+    ("/api/transactions", {"tags": "kids"}),
+    ("/api/transactions", {"compact": True, "end_date": "2022-12-31T00:00:00"}),
+] + [("/api/transactions", {"limit": 3, "skip": skip}) for skip in range(0, 10, 3)]
+
+
+@pytest.fixture
+async def transactions(db, authenticated_client, sample_user, sample_category, sample_beneficiary):
+    rows = [
+        {
+            "transaction_date": when,
+            "type": transaction_type,
+            "amount": amount,
+            "description": description,
+            "tags": tags,
+            "category_id": sample_category.id,
+            "beneficiary_id": sample_beneficiary.id,
+            "created_by_user_id": sample_user.id,
+        }
+        for when, transaction_type, amount, description, tags in TRANSACTIONS
+    ]
+    response = await authenticated_client.post("/api/transactions/bulk", json={"transactions": rows})
+    ids = response.json()["ids"]
+    budget = {
+        "name": "Everything",
+        "amount": 50,
+        "start_month": "2022-05-01",
+        "rollover": True,
+        "created_by_user_id": sample_user.id,
+    }
+    await authenticated_client.post("/api/budgets", json=budget)
+    return ids
+
+
+async def _responses(client):
+    budget_status_cache.invalidate()
+    return [(await client.get(path, params=params)).json() for path, params in REQUESTS]
+
+
+async def _live_ids(db):
+    return set((await db.scalars(Transaction.__table__.select().with_only_columns(Transaction.id))).all())
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore(
+    authenticated_client, db, transactions, archive_dir, sample_user, sample_beneficiary
+):
+    """Test that archived years still count in totals and lists, and come back unchanged on restore"""
+    occasion = GiftOccasion(name="Birthday", created_by_user_id=sample_user.id)
+    db.add(occasion)
+    await db.flush()
+    pinned = transactions[3]
+    db.add(
+        GiftEntry(
+            occasion_id=occasion.id,
+            direction=GiftDirection.GIVEN,
+            person_id=sample_beneficiary.id,
+            amount=10.01,
+            gift_date=date(2022, 6, 15),
+            transaction_id=pinned,
+            created_by_user_id=sample_user.id,
+        )
+    )
+    await db.commit()
+    before = await _responses(authenticated_client)
+
+    with pytest.raises(ValueError):
+        await archive_years(db, 2024, today=date(2024, 6, 1))
+    entries = await archive_years(db, 2022, today=date(2024, 6, 1))
+    assert [(entry["year"], entry["rows"]) for entry in entries] == [(2021, 2), (2022, 3)]
+    assert await _live_ids(db) == {pinned, *transactions[6:]}
+    assert {path.name for path in archive_dir.iterdir()} == {
+        MANIFEST,
+        "transactions-2021.parquet",
+        "rollups-2021.parquet",
+        "transactions-2022.parquet",
+        "rollups-2022.parquet",
+    }
+
+    assert await _responses(authenticated_client) == before
+    assert await archive_years(db, 2022, today=date(2024, 6, 1)) == []
+
+    restored = await restore_years(db, 2021)
+    assert [entry["year"] for entry in restored] == [2022, 2021]
+    assert await _live_ids(db) == set(transactions)
+    assert {path.name for path in archive_dir.iterdir()} == {MANIFEST}
+    assert await _responses(authenticated_client) == before
+    with pytest.raises(ValueError):
+        await restore_years(db, 2021)
+
+
+@pytest.mark.asyncio
+async def test_archived_years_are_read_only(authenticated_client, db, transactions):
+    """Test that transactions cannot be created in or moved into an archived year"""
+    await archive_years(db, 2021, today=date(2024, 6, 1))
+    body = (await authenticated_client.get(f"/api/transactions/{transactions[-1]}")).json()
+
+    response = await authenticated_client.post("/api/transactions", json={**body, "transaction_date": "2021-05-01"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "2021 is archived; restore it first"
+    rows = [{**body, "transaction_date": when} for when in ("2022-05-01T00:00:00", "2020-01-01T00:00:00")]
+    response = await authenticated_client.post("/api/transactions/bulk", json={"transactions": rows})
+    assert response.status_code == 400
+
+    path = f"/api/transactions/{transactions[-1]}"
+    assert (await authenticated_client.put(path, json={"transaction_date": "2021-12-31T00:00:00"})).status_code == 400
+    assert (await authenticated_client.put(path, json={"transaction_date": "2022-01-01T00:00:00"})).status_code == 200
+    assert (await authenticated_client.put(path, json={"amount": 6})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_recurring_rules_skip_archived_years(authenticated_client, db, transactions):
+    """Test that rules cannot start in an archived year and skip the occurrences that fall in one"""
+    body = (await authenticated_client.get(f"/api/transactions/{transactions[-1]}")).json()
+    rule = {key: body[key] for key in ("type", "amount", "category_id", "beneficiary_id", "created_by_user_id")} | {
+        "description": "Rent",
+        "frequency": "monthly",
+        "start_date": "2022-12-01",
+    }
+    rule_id = (await authenticated_client.post("/api/recurring-rules", json=rule)).json()["id"]
+    await archive_years(db, 2022, today=date(2024, 6, 1))
+
+    response = await authenticated_client.post("/api/recurring-rules", json=rule)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "2022 is archived; restore it first"
+    path = f"/api/recurring-rules/{rule_id}"
+    assert (await authenticated_client.put(path, json={"start_date": "2022-06-01"})).status_code == 400
+    assert (await authenticated_client.put(path, json={"amount": 900})).status_code == 200
+
+    assert (await materialize_due(db, today=date(2023, 2, 15))).created == 2
+    result = await db.scalars(select(Transaction.transaction_date).where(Transaction.description == "Rent"))
+    assert sorted(when.date() for when in result) == [date(2023, 1, 1), date(2023, 2, 1)]
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore_are_not_synced(authenticated_client, db, transactions):
+    """Test that sync clients see no tombstones for archived transactions and no changes after a restore"""
+    cursor = (await authenticated_client.get("/api/sync")).json()["cursor"]
+
+    unchanged = {"cursor": cursor, "reset": False, "deleted": {}, "transactions": []}
+
+    await archive_years(db, 2022, today=date(2024, 6, 1))
+    data = (await authenticated_client.get("/api/sync", params={"since": cursor})).json()
+    assert {key: data[key] for key in unchanged} == unchanged
+
+    await restore_years(db, 2021)
+    data = (await authenticated_client.get("/api/sync", params={"since": cursor})).json()
+    assert {key: data[key] for key in unchanged} == unchanged
+    synced = (await authenticated_client.get("/api/sync")).json()["transactions"]
+    assert sorted(transaction["id"] for transaction in synced) == sorted(transactions)
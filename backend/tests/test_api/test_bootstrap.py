@@ -0,0 +1,53 @@
+import pytest
+
+from app.services.reference_cache import ReferenceCache
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_unauthenticated(client):
+    """Test that unauthenticated bootstrap requests fail"""
+    response = await client.get("/api/bootstrap")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_bootstrap(authenticated_client, authenticated_user, sample_data):
+    """Test that bootstrap returns the current user and all reference lists"""
+    response = await authenticated_client.get("/api/bootstrap")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user"]["email"] == authenticated_user.email
+    assert [c["name"] for c in data["categories"]] == ["Food", "Salary", "Transport"]
+    assert len(data["beneficiaries"]) == 3
+    assert len(data["users"]) == 3
+    assert response.headers["etag"] == f'"{data["version"]}-{authenticated_user.id}"'
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_etag_and_cache(authenticated_client, sample_data, monkeypatch):
+    """Test 304 responses, cache hits and invalidation by the reference routers"""
+    loads = 0
+    original_load = ReferenceCache._load
+
+    async def counting_load(db):
+        nonlocal loads
+        loads += 1
+        return await original_load(db)
+
+    monkeypatch.setattr(ReferenceCache, "_load", staticmethod(counting_load))
+
+    first = await authenticated_client.get("/api/bootstrap")
+    etag = first.headers["etag"]
+
+    response = await authenticated_client.get("/api/bootstrap", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert (await authenticated_client.get("/api/bootstrap")).status_code == 200
+    assert loads == 1
+
+    await authenticated_client.post("/api/categories", json={"name": "Books", "type": "expense"})
+    response = await authenticated_client.get("/api/bootstrap", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Books" in [c["name"] for c in response.json()["categories"]]
+    assert loads == 2
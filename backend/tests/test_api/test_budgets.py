@@ -0,0 +1,159 @@
+from datetime import datetime
+
+import pytest
+
+from app.config.settings import settings
+from app.models import Transaction, TransactionType
+
+
+def _budget(sample_data, **fields):
+    return {
+        "name": "Food",
+        "amount": 200.0,
+        "start_month": "2024-01-01",
+        "created_by_user_id": sample_data["users"][0].id,
+        **fields,
+    }
+
+
+@pytest.mark.asyncio
+async def test_budgets_unauthenticated(client):
+    """Test that unauthenticated requests to budgets fail"""
+    assert (await client.get("/api/budgets")).status_code == 401
+    assert (await client.get("/api/budgets/status")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_budget_crud(authenticated_client, sample_data):
+    """Test creating, reading, updating and deleting a budget"""
+    food = sample_data["categories"][0]
+    response = await authenticated_client.post(
+        "/api/budgets", json=_budget(sample_data, category_id=food.id, start_month="2024-01-17")
+    )
+    assert response.status_code == 201
+    budget = response.json()
+    assert budget["start_month"] == "2024-01-01"
+    assert budget["beneficiary_id"] is None
+    assert budget["rollover"] is False
+
+    response = await authenticated_client.put(f"/api/budgets/{budget['id']}", json={"amount": 250.5, "rollover": True})
+    assert response.status_code == 200
+    assert response.json()["amount"] == 250.5
+    assert response.json()["category_id"] == food.id
+
+    assert len((await authenticated_client.get("/api/budgets")).json()) == 1
+    assert (await authenticated_client.delete(f"/api/budgets/{budget['id']}")).status_code == 204
+    assert (await authenticated_client.get(f"/api/budgets/{budget['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_budget_status(authenticated_client, sample_data):
+    """Test spending per budget: matching category/beneficiary, expenses only, one month only"""
+    food, _, transport = sample_data["categories"]
+    supermarket = sample_data["beneficiaries"][0]
+    await authenticated_client.post("/api/budgets", json=_budget(sample_data, category_id=food.id, amount=90))
+    await authenticated_client.post(
+        "/api/budgets",
+        json=_budget(sample_data, name="Supermarket", category_id=food.id, beneficiary_id=supermarket.id, amount=105),
+    )
+    await authenticated_client.post("/api/budgets", json=_budget(sample_data, name="Everything", amount=1000))
+    await authenticated_client.post(
+        "/api/budgets", json=_budget(sample_data, name="Transport", category_id=transport.id)
+    )
+    await authenticated_client.post("/api/budgets", json=_budget(sample_data, name="Later", start_month="2024-03-01"))
+
+    response = await authenticated_client.get("/api/budgets/status", params={"month": "2024-01"})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["start_date"], report["end_date"]) == ("2024-01-01", "2024-01-31")
+    statuses = {status["name"]: status for status in report["budgets"]}
+    assert set(statuses) == {"Food", "Supermarket", "Everything", "Transport"}
+    assert (statuses["Food"]["spent"], statuses["Food"]["remaining"], statuses["Food"]["state"]) == (100, -10, "over")
+    assert (statuses["Supermarket"]["percent_used"], statuses["Supermarket"]["state"]) == (95.2, "near")
+    # The January salary is income and the gas was bought in February
+    assert (statuses["Everything"]["spent"], statuses["Everything"]["state"]) == (100, "under")
+    assert statuses["Transport"]["spent"] == 0
+    assert report["over_budget"] == 1
+
+    response = await authenticated_client.get("/api/budgets/status", params={"month": "2024-13"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_budget_status_rollover(authenticated_client, db, sample_data):
+    """Test that unused amounts carry over, and overspending does not reduce later months"""
+    food = sample_data["categories"][0]
+    supermarket = sample_data["beneficiaries"][0]
+    db.add(
+        Transaction(
+            amount=250.0,
+            transaction_date=datetime(2024, 3, 20),
+            description="Party",
+            type=TransactionType.EXPENSE,
+            category_id=food.id,
+            beneficiary_id=supermarket.id,
+            created_by_user_id=sample_data["users"][0].id,
+        )
+    )
+    await db.commit()
+    await authenticated_client.post("/api/budgets", json=_budget(sample_data, category_id=food.id, rollover=True))
+
+    async def status(month):
+        response = await authenticated_client.get("/api/budgets/status", params={"month": month})
+        return response.json()["budgets"][0]
+
+    # January: 200 - 100 spent leaves 100; February: nothing spent, 300 available
+    assert (await status("2024-02"))["carried_over"] == 100
+    march = await status("2024-03")
+    assert (march["carried_over"], march["available"], march["spent"], march["state"]) == (300, 500, 250, "under")
+    # 250 left over from March
+    assert (await status("2024-04"))["carried_over"] == 250
+
+
+@pytest.mark.asyncio
+async def test_budget_status_query_count_and_cache(authenticated_client, sample_data, max_queries):
+    """Test that status runs one grouped spend query for all budgets, is cached, and sees new transactions"""
+    food = sample_data["categories"][0]
+    for i in range(10):
+        await authenticated_client.post(
+            "/api/budgets", json=_budget(sample_data, name=f"Budget {i}", category_id=food.id, rollover=i % 2 == 0)
+        )
+
+    # Auth (2) + budgets + grouped spend
+    with max_queries(4):
+        first = await authenticated_client.get("/api/budgets/status", params={"month": "2024-01"})
+    with max_queries(2):
+        cached = await authenticated_client.get("/api/budgets/status", params={"month": "2024-01"})
+    assert cached.json() == first.json()
+
+    response = await authenticated_client.post(
+        "/api/transactions",
+        json={
+            "type": "expense",
+            "amount": 25.0,
+            "description": "Snacks",
+            "transaction_date": "2024-01-20T00:00:00",
+            "category_id": food.id,
+            "beneficiary_id": sample_data["beneficiaries"][0].id,
+            "created_by_user_id": sample_data["users"][0].id,
+        },
+    )
+    assert response.status_code == 201
+    refreshed = await authenticated_client.get("/api/budgets/status", params={"month": "2024-01"})
+    assert refreshed.json()["budgets"][0]["spent"] == 125
+
+
+@pytest.mark.asyncio
+async def test_budget_status_sees_imported_transactions(authenticated_client, sample_data, tmp_path, monkeypatch):
+    """Test that a statement import drops cached budget status"""
+    monkeypatch.setattr(settings, "upload_dir", tmp_path)
+    await authenticated_client.post("/api/budgets", json=_budget(sample_data, name="Everything"))
+    before = await authenticated_client.get("/api/budgets/status", params={"month": "2024-01"})
+    assert before.json()["budgets"][0]["spent"] == 100
+
+    statement = "Date,Payee,Amount,Category\n2024-01-05,Supermarket,-45.20,Food\n"
+    files = {"file": ("statement.csv", statement.encode(), "text/csv")}
+    assert (await authenticated_client.post("/api/imports", files=files)).status_code == 202
+
+    after = await authenticated_client.get("/api/budgets/status", params={"month": "2024-01"})
+    assert after.json()["budgets"][0]["spent"] == 145.2
@@ -0,0 +1,150 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.config.settings import settings
+from app.models import Category, CategoryType, Transaction
+from app.schemas import RuleMatchType, TransactionType
+from app.services.categorization import KeywordAutomaton, RuleMatcher
+
+
+def _rule(id, pattern, match_type=RuleMatchType.SUBSTRING, priority=100, **fields):
+    values = {
+        "transaction_type": None,
+        "min_amount": None,
+        "max_amount": None,
+        "category_id": None,
+        "beneficiary_id": None,
+        **fields,
+    }
+    return SimpleNamespace(id=id, pattern=pattern, match_type=match_type, priority=priority, **values)
+
+
+def test_keyword_automaton_finds_overlapping_keywords():
+    """Test that every keyword is reported, including ones inside or overlapping others"""
+    automaton = KeywordAutomaton([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    assert sorted(automaton.find("ushers")) == [1, 2, 4]
+    assert list(automaton.find("nothing here")) == [1]
+    assert list(KeywordAutomaton([]).find("anything")) == []
+
+
+def test_rule_matcher_priorities_and_conditions():
+    """Test substring, regex and amount-range rules, and that each field comes from the best rule setting it"""
+    matcher = RuleMatcher(
+        [
+            _rule(1, "albert heijn", category_id=10, beneficiary_id=20),
+            _rule(2, "heijn to go", priority=10, category_id=11),
+            _rule(3, r"^NS\b.*\d{4}", RuleMatchType.REGEX, category_id=12),
+            _rule(4, None, priority=500, category_id=13, min_amount=Decimal("1000")),
+            _rule(5, "salary", category_id=14, transaction_type=TransactionType.INCOME),
+        ]
+    )
+    suggestion = matcher.suggest("ALBERT HEIJN TO GO 1234", Decimal("4.50"))
+    assert (suggestion.category_id, suggestion.category_rule_id) == (11, 2)
+    assert (suggestion.beneficiary_id, suggestion.beneficiary_rule_id) == (20, 1)
+
+    assert matcher.suggest("NS Groep 2024 ticket").category_id == 12
+    assert matcher.suggest("Groep NS 2024").category_id is None
+    # Amount and type conditions only hold once the amount or type is known
+    assert matcher.suggest("Laptop", Decimal("1200")).category_id == 13
+    assert matcher.suggest("Laptop").category_id is None
+    assert matcher.suggest("Salary March", Decimal("3000"), TransactionType.EXPENSE).category_id == 13
+    assert matcher.suggest("Salary March", Decimal("3000"), TransactionType.INCOME).category_id == 14
+
+
+def test_rule_matcher_with_patterns_that_do_not_combine():
+    """Test that rules saved with clashing group names still match, one pattern at a time"""
+    matcher = RuleMatcher(
+        [
+            _rule(1, r"(?P<shop>jumbo)\b", RuleMatchType.REGEX, category_id=10),
+            _rule(2, r"(?P<shop>lidl)\b", RuleMatchType.REGEX, category_id=11),
+        ]
+    )
+    assert matcher.suggest("LIDL 0042").category_id == 11
+    assert matcher.suggest("Aldi").category_id is None
+
+
+@pytest.mark.asyncio
+async def test_categorization_rules_unauthenticated(client):
+    """Test that unauthenticated requests to categorization rules fail"""
+    assert (await client.get("/api/categorization-rules")).status_code == 401
+    assert (await client.get("/api/transactions/suggest", params={"description": "x"})).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_rule_validation(authenticated_client, sample_category):
+    """Test that rules without a target or condition, and unusable regexes, are rejected"""
+    base = {"name": "Rule", "pattern": "shop", "category_id": sample_category.id}
+    for invalid in (
+        {"category_id": None},
+        {"pattern": None},
+        {"match_type": "regex", "pattern": "("},
+        {"match_type": "regex", "pattern": r"(a)\1"},
+        {"match_type": "regex", "pattern": r"(?P<shop>jumbo|lidl) \d+"},
+        {"pattern": None, "min_amount": 10, "max_amount": 5},
+    ):
+        response = await authenticated_client.post("/api/categorization-rules", json={**base, **invalid})
+        assert response.status_code == 422, invalid
+
+    rule = (await authenticated_client.post("/api/categorization-rules", json=base)).json()
+    response = await authenticated_client.put(f"/api/categorization-rules/{rule['id']}", json={"match_type": "regex"})
+    assert response.status_code == 200
+    response = await authenticated_client.put(f"/api/categorization-rules/{rule['id']}", json={"pattern": "[a-"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_suggest_reloads_after_rule_edits(authenticated_client, db, sample_category, sample_beneficiary):
+    """Test that suggestions pick up created, edited and deleted rules immediately"""
+    params = {"description": "Weekly grocery shopping", "amount": "45.20", "type": "expense"}
+    response = await authenticated_client.get("/api/transactions/suggest", params=params)
+    assert response.json() == {
+        "category_id": None,
+        "beneficiary_id": None,
+        "category_rule_id": None,
+        "beneficiary_rule_id": None,
+    }
+
+    body = {"name": "Groceries", "pattern": "GROCERY", "category_id": sample_category.id}
+    rule = (await authenticated_client.post("/api/categorization-rules", json=body)).json()
+    response = await authenticated_client.get("/api/transactions/suggest", params=params)
+    assert (response.json()["category_id"], response.json()["category_rule_id"]) == (sample_category.id, rule["id"])
+
+    other = Category(name="Household", type=CategoryType.EXPENSE)
+    db.add(other)
+    await db.commit()
+    await authenticated_client.put(
+        f"/api/categorization-rules/{rule['id']}",
+        json={"category_id": other.id, "beneficiary_id": sample_beneficiary.id},
+    )
+    response = await authenticated_client.get("/api/transactions/suggest", params=params)
+    assert (response.json()["category_id"], response.json()["beneficiary_id"]) == (other.id, sample_beneficiary.id)
+
+    await authenticated_client.delete(f"/api/categorization-rules/{rule['id']}")
+    response = await authenticated_client.get("/api/transactions/suggest", params=params)
+    assert response.json()["category_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_import_applies_rules(
+    authenticated_client, db, sample_category, sample_beneficiary, tmp_path, monkeypatch
+):
+    """Test that imported rows without a category or beneficiary column are categorized by the rules"""
+    monkeypatch.setattr(settings, "upload_dir", tmp_path)
+    rule = {
+        "name": "Bakery",
+        "pattern": "bakery",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+    }
+    await authenticated_client.post("/api/categorization-rules", json=rule)
+    statement = "Date,Payee,Amount,Category\n2024-01-06,Employer,3000.00,Salary\n2024-01-07,Village Bakery,-3.50,\n"
+    files = {"file": ("statement.csv", statement.encode(), "text/csv")}
+    assert (await authenticated_client.post("/api/imports", files=files)).status_code == 202
+
+    transactions = (await db.execute(select(Transaction).order_by(Transaction.transaction_date))).scalars().all()
+    salary, bakery = transactions
+    assert salary.category_id != sample_category.id
+    assert (bakery.category_id, bakery.beneficiary_id) == (sample_category.id, sample_beneficiary.id)
@@ -0,0 +1,119 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.config.settings import settings
+from app.models import Transaction, TransactionType
+from app.services.descriptions import DescriptionIndex, description_index
+from app.services.events import ChangeEvent, event_bus
+
+
+@pytest.fixture
+async def history(db, sample_user, sample_category, sample_beneficiary):
+    """Descriptions used often long ago, once recently, and in different cases"""
+    today = datetime.combine(date.today(), datetime.min.time())
+    uses = [
+        ("Weekly grocery shopping", 8, 60),
+        ("Weekly swimming lesson", 3, 200),
+        ("Weekly magazine", 1, 1),
+        ("weekly MAGAZINE", 1, 30),
+        ("Water bill", 1, 10),
+    ]
+    for description, count, days_ago in uses:
+        for _ in range(count):
+            db.add(
+                Transaction(
+                    amount=10,
+                    transaction_date=today - timedelta(days=days_ago),
+                    description=description,
+                    type=TransactionType.EXPENSE,
+                    category_id=sample_category.id,
+                    beneficiary_id=sample_beneficiary.id,
+                    created_by_user_id=sample_user.id,
+                )
+            )
+    await db.commit()
+
+
+async def _suggest(client, prefix, **params):
+    response = await client.get("/api/transactions/descriptions/suggest", params={"prefix": prefix, **params})
+    assert response.status_code == 200
+    return [suggestion["description"] for suggestion in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_suggest_descriptions_unauthenticated(client):
+    """Test that unauthenticated autocomplete requests fail"""
+    response = await client.get("/api/transactions/descriptions/suggest", params={"prefix": "we"})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_suggestions_ranked_by_frequency_and_recency(authenticated_client, history, max_queries):
+    """Test case-insensitive prefix matching, ranking, limits and serving from memory once loaded"""
+    # Eight uses two months ago outweigh two recent ones, which outweigh three old ones
+    assert await _suggest(authenticated_client, "WEEK") == [
+        "Weekly grocery shopping",
+        "Weekly magazine",
+        "Weekly swimming lesson",
+    ]
+    with max_queries(2):  # Authentication only
+        assert await _suggest(authenticated_client, "w", limit=1) == ["Weekly grocery shopping"]
+    assert await _suggest(authenticated_client, "weekly s") == ["Weekly swimming lesson"]
+    assert await _suggest(authenticated_client, "x") == []
+
+    response = await authenticated_client.get("/api/transactions/descriptions/suggest", params={"prefix": "weekly m"})
+    # Both spellings are one description, shown as most recently used
+    assert response.json() == [
+        {"description": "Weekly magazine", "count": 2, "last_used": (date.today() - timedelta(days=1)).isoformat()}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_writes(authenticated_client, history, sample_user, sample_category, sample_beneficiary):
+    """Test that creating, renaming and deleting transactions update suggestions without reloading"""
+    await _suggest(authenticated_client, "")
+    body = {
+        "amount": 5,
+        "transaction_date": datetime.now().isoformat(),
+        "description": "Window cleaner",
+        "type": "expense",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+    }
+    created = (await authenticated_client.post("/api/transactions", json=body)).json()
+    assert await _suggest(authenticated_client, "wi") == ["Window cleaner"]
+
+    await authenticated_client.put(f"/api/transactions/{created['id']}", json={"description": "Water softener"})
+    assert await _suggest(authenticated_client, "wi") == []
+    assert await _suggest(authenticated_client, "wa") == ["Water softener", "Water bill"]
+
+    await authenticated_client.delete(f"/api/transactions/{created['id']}")
+    assert await _suggest(authenticated_client, "wa") == ["Water bill"]
+
+
+@pytest.mark.asyncio
+async def test_index_dropped_on_other_workers_changes(authenticated_client, history):
+    """Test that a transaction change published by another worker drops the index and this worker's do not"""
+    await _suggest(authenticated_client, "w")
+    own = ChangeEvent("transactions", "created", 1).to_message()
+    await event_bus.backend.publish(own)
+    assert description_index.loaded
+
+    await event_bus.backend.publish({**own, "origin": "another-worker"})
+    assert not description_index.loaded
+    assert await _suggest(authenticated_client, "wa") == ["Water bill"]
+
+
+@pytest.mark.asyncio
+async def test_index_is_bounded(db, history, monkeypatch):
+    """Test that the least used descriptions are dropped once the index is full"""
+    monkeypatch.setattr(settings, "DESCRIPTION_INDEX_MAX_ENTRIES", 10)
+    index = DescriptionIndex()
+    await index.load(db)
+    assert len(index) == 4
+    for number in range(7):
+        index.record(f"One-off purchase {number}", date(2020, 1, 1))
+    assert len(index) == 9
+    assert [s.description for s in await index.suggest(db, "weekly g")] == ["Weekly grocery shopping"]
@@ -0,0 +1,141 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.config.settings import settings
+from app.models import FxRate, ImportJob, Transaction, TransactionType
+from app.services.duplicates import similarity
+
+
+@pytest.fixture
+def body(sample_user, sample_category, sample_beneficiary):
+    return {
+        "amount": 42.5,
+        "transaction_date": "2024-03-10T00:00:00",
+        "description": "Albert Heijn",
+        "type": "expense",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+    }
+
+
+def test_description_similarity():
+    """Test that case, digits and punctuation are ignored and unrelated descriptions score low"""
+    assert similarity("ALBERT HEIJN 1234", "Albert Heijn") == 1.0
+    assert similarity("Albert Heijn to go", "albert heijn") >= settings.DUPLICATE_SIMILARITY_THRESHOLD
+    assert similarity("Albert Heijn", "Shell station") < settings.DUPLICATE_SIMILARITY_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_duplicates_unauthenticated(client):
+    """Test that unauthenticated duplicate scans fail"""
+    assert (await client.get("/api/transactions/duplicates")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_create_warns_about_duplicates(authenticated_client, db, body):
+    """Test that creating a transaction lists likely duplicates but still creates it"""
+    db.add(FxRate(currency="USD", rate_date=date(2024, 3, 1), rate=0.9))
+    await db.commit()
+    first = (await authenticated_client.post("/api/transactions", json=body)).json()
+    assert first["possible_duplicates"] == []
+
+    response = await authenticated_client.post(
+        "/api/transactions",
+        json={**body, "transaction_date": "2024-03-12T09:30:00", "description": "ALBERT HEIJN 1234 AMSTERDAM"},
+    )
+    assert response.status_code == 201
+    [match] = response.json()["possible_duplicates"]
+    assert match["id"] == first["id"]
+    assert 0.5 <= match["similarity"] < 1
+
+    for other in (
+        {"amount": 42.51},
+        {"type": "income"},
+        {"currency": "USD"},
+        {"transaction_date": "2024-03-20T00:00:00"},
+        {"description": "Shell station"},
+    ):
+        response = await authenticated_client.post("/api/transactions", json={**body, **other})
+        assert response.json()["possible_duplicates"] == [], other
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_skips_duplicates(authenticated_client, body):
+    """Test that bulk creation leaves out rows matching existing transactions when asked"""
+    await authenticated_client.post("/api/transactions", json=body)
+    rows = [{**body, "description": "Albert Heijn 0042"}, {**body, "description": "Bakery"}]
+    response = await authenticated_client.post(
+        "/api/transactions/bulk", params={"skip_duplicates": True}, json={"transactions": rows}
+    )
+    data = response.json()
+    assert (data["created"], data["skipped_duplicates"]) == (1, [0])
+
+    response = await authenticated_client.post("/api/transactions/bulk", json={"transactions": rows})
+    assert (response.json()["created"], response.json()["skipped_duplicates"]) == (2, [])
+
+
+@pytest.mark.asyncio
+async def test_scan_groups_duplicates(authenticated_client, db, sample_user, sample_category, sample_beneficiary):
+    """Test that the scan groups chains of copies and leaves rows from one statement or currency apart"""
+    day = datetime(2024, 5, 1)
+    rows = [
+        # A manual entry, the same purchase imported two days later and once more by hand
+        (10, "EUR", "Coffee corner", 0, None),
+        (10, "EUR", "COFFEE CORNER 5521", 2, "a" * 32 + ":1"),
+        (10, "EUR", "coffee corner", 4, None),
+        # Two identical lines from one statement are two purchases
+        (7, "EUR", "Lunch", 0, "b" * 32 + ":1"),
+        (7, "EUR", "Lunch", 0, "b" * 32 + ":2"),
+        # Same amount, but too far apart, described differently or in another currency
+        (20, "EUR", "Gym", 0, None),
+        (20, "EUR", "Gym", 10, None),
+        (20, "EUR", "Bookshop", 1, None),
+        (10, "USD", "Coffee corner", 1, None),
+    ]
+    for amount, currency, description, offset, import_key in rows:
+        db.add(
+            Transaction(
+                amount=amount,
+                currency=currency,
+                transaction_date=day + timedelta(days=offset),
+                description=description,
+                type=TransactionType.EXPENSE,
+                category_id=sample_category.id,
+                beneficiary_id=sample_beneficiary.id,
+                created_by_user_id=sample_user.id,
+                import_key=import_key,
+            )
+        )
+    await db.commit()
+
+    response = await authenticated_client.get("/api/transactions/duplicates")
+    assert response.status_code == 200
+    [group] = response.json()
+    assert (group["amount"], group["type"]) == (10.0, "expense")
+    assert [t["description"] for t in group["transactions"]] == [
+        "Coffee corner",
+        "COFFEE CORNER 5521",
+        "coffee corner",
+    ]
+    assert [t["similarity"] for t in group["transactions"]] == [1.0, 1.0, 1.0]
+
+    response = await authenticated_client.get("/api/transactions/duplicates", params={"end_date": "2024-05-02"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_import_skips_duplicates(authenticated_client, db, body, tmp_path, monkeypatch):
+    """Test that imported rows matching a manually entered transaction are left out and counted"""
+    monkeypatch.setattr(settings, "upload_dir", tmp_path)
+    await authenticated_client.post("/api/transactions", json=body)
+    statement = "Date,Payee,Amount\n2024-03-11,ALBERT HEIJN 1234,-42.50\n2024-03-11,Bakery,-3.50\n"
+    files = {"file": ("statement.csv", statement.encode(), "text/csv")}
+    job = (await authenticated_client.post("/api/imports", files=files)).json()
+
+    job = await db.get(ImportJob, job["id"])
+    await db.refresh(job)
+    assert (job.rows_imported, job.rows_duplicate) == (1, 1)
+    assert await db.scalar(select(func.count()).select_from(Transaction)) == 2
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from app.services.events import RESYNC, ChangeEvent, EventBus, LocalEventBackend, event_bus, stream_events
+
+
+@pytest.mark.asyncio
+async def test_events_unauthenticated(client):
+    """Test that unauthenticated event streams are rejected"""
+    response = await client.get("/api/events")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_write_handlers_publish_changes(authenticated_client, sample_user, sample_category, sample_beneficiary):
+    """Test that creating, updating and deleting a transaction publishes change events, and a bulk create one"""
+    body = {
+        "type": "expense",
+        "amount": 10.0,
+        "description": "Coffee",
+        "transaction_date": "2024-01-15T00:00:00",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+    }
+    subscription = event_bus.subscribe()
+    try:
+        response = await authenticated_client.post("/api/transactions", json=body)
+        transaction_id = response.json()["id"]
+        await authenticated_client.put(f"/api/transactions/{transaction_id}", json={"amount": 12.0})
+        await authenticated_client.delete(f"/api/transactions/{transaction_id}")
+        await authenticated_client.post("/api/categories", json={"name": "Books", "type": "expense"})
+        response = await authenticated_client.post("/api/transactions/bulk", json={"transactions": [body] * 3})
+
+        messages = [await subscription.get(timeout=1) for _ in range(5)]
+        assert await subscription.get(timeout=0.1) is None
+    finally:
+        event_bus.unsubscribe(subscription)
+
+    assert [(m["entity"], m["action"]) for m in messages] == [
+        ("transactions", "created"),
+        ("transactions", "updated"),
+        ("transactions", "deleted"),
+        ("categories", "created"),
+        ("transactions", "bulk_created"),
+    ]
+    assert messages[0]["id"] == transaction_id
+    assert messages[-1]["ids"] == response.json()["ids"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_told_to_resync():
+    """Test that a full queue is replaced by a single resync message instead of blocking"""
+    bus = EventBus(LocalEventBackend(), queue_size=2)
+    slow = bus.subscribe()
+    for i in range(5):
+        await bus.publish(ChangeEvent("transactions", "created", i))
+
+    assert await slow.get(timeout=0.1) == RESYNC
+    assert await slow.get(timeout=0.1) is None
+    assert slow.dropped == 5
+
+    # Delivery resumes once the client has seen the resync
+    await bus.publish(ChangeEvent("transactions", "created", 6))
+    assert (await slow.get(timeout=0.1))["id"] == 6
+
+
+@pytest.mark.asyncio
+async def test_stream_events_heartbeat_and_frames():
+    """Test the SSE framing, idle heartbeats and unsubscribe on close"""
+    bus = EventBus(LocalEventBackend(), queue_size=10)
+    subscription = bus.subscribe()
+
+    async def connected():
+        return False
+
+    stream = stream_events(bus, subscription, connected, heartbeat=0.01)
+    assert (await anext(stream)).startswith("retry: ")
+    assert await anext(stream) == ": heartbeat\n\n"
+
+    await bus.publish(ChangeEvent("categories", "deleted", 7))
+    frame = await anext(stream)
+    event_line, data_line = frame.strip().split("\n")
+    assert event_line == "event: change"
+    assert json.loads(data_line.removeprefix("data: ")) == {
+        "type": "change",
+        "entity": "categories",
+        "action": "deleted",
+        "id": 7,
+    }
+
+    await stream.aclose()
+    assert bus.subscriber_count == 0
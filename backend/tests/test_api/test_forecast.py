@@ -0,0 +1,104 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.models import Category, CategoryType, Transaction, TransactionType
+from app.services.forecast import build_forecast
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+async def household(db, sample_user, sample_beneficiary):
+    """Two years of history up to June 2024: rent, salary, and groceries that triple every December"""
+    rent = Category(name="Rent", type=CategoryType.EXPENSE)
+    salary = Category(name="Salary", type=CategoryType.INCOME)
+    groceries = Category(name="Groceries", type=CategoryType.EXPENSE)
+    db.add_all([rent, salary, groceries])
+    await db.commit()
+
+    def transaction(category, transaction_type, amount, day):
+        return Transaction(
+            amount=amount,
+            transaction_date=day,
+            description=category.name,
+            type=transaction_type,
+            category_id=category.id,
+            beneficiary_id=sample_beneficiary.id,
+            created_by_user_id=sample_user.id,
+        )
+
+    for index in range(2022 * 12 + 6, 2024 * 12 + 6):
+        year, month = divmod(index, 12)
+        month += 1
+        db.add(transaction(rent, TransactionType.EXPENSE, 950, datetime(year, month, 1)))
+        db.add(transaction(salary, TransactionType.INCOME, 3000, datetime(year, month, 25)))
+        weekly = 150 if month == 12 else 50
+        # Amounts change every month (the total does not), so groceries are not mistaken for a fixed amount
+        for day, change in ((3, month / 100), (10, -2 * month / 100), (17, month / 100)):
+            db.add(transaction(groceries, TransactionType.EXPENSE, weekly + change, datetime(year, month, day)))
+    await db.commit()
+    return {"rent": rent, "salary": salary, "groceries": groceries}
+
+
+@pytest.mark.asyncio
+async def test_forecast_unauthenticated(client):
+    """Test that unauthenticated forecast requests fail"""
+    response = await client.get("/api/forecast")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_forecast_recurring_and_seasonal(db, household):
+    """Test that fixed amounts are projected as is and variable spending follows the calendar month"""
+    forecast = await build_forecast(db, months=12, history_months=24, today=date(2024, 7, 15))
+
+    assert (forecast.history_start, forecast.history_end) == ("2022-07", "2024-06")
+    assert forecast.transactions_analyzed == 24 * 5
+    recurring = {(item.category_id, item.type.value, item.amount) for item in forecast.recurring}
+    assert recurring == {(household["rent"].id, "expense", 950), (household["salary"].id, "income", 3000)}
+
+    months = {month.month: month for month in forecast.months}
+    assert list(months)[0] == "2024-08"
+    assert len(months) == 12
+    assert months["2024-08"].income == 3000
+    assert months["2024-08"].expenses == 950 + 150
+    assert months["2024-12"].expenses == 950 + 450
+
+    # 24 months of 3000 - 950 - groceries
+    assert forecast.start_balance == 24 * 2050 - 22 * 150 - 2 * 450
+    assert months["2024-08"].balance == forecast.start_balance + months["2024-08"].net
+    assert months["2025-07"].balance == forecast.start_balance + sum(month.net for month in forecast.months)
+
+    groceries = next(c for c in forecast.categories if c.category_id == household["groceries"].id)
+    assert groceries.expenses[4] == 450
+    assert groceries.income == [0] * 12
+
+
+@pytest.mark.asyncio
+async def test_forecast_short_history(db, household):
+    """Test that calendar months missing from the history fall back to the overall average"""
+    forecast = await build_forecast(db, months=3, history_months=3, today=date(2024, 7, 15))
+    assert [month.expenses for month in forecast.months] == [950 + 150] * 3
+    assert len(forecast.recurring) == 2
+
+
+@pytest.mark.asyncio
+async def test_forecast_without_history(db):
+    """Test that an empty database projects zeros"""
+    forecast = await build_forecast(db, months=2, history_months=12, today=date(2024, 7, 15))
+    assert [(m.income, m.expenses, m.balance) for m in forecast.months] == [(0, 0, 0), (0, 0, 0)]
+    assert forecast.recurring == []
+
+
+@pytest.mark.asyncio
+async def test_forecast_endpoint(authenticated_client, household, max_queries):
+    """Test the endpoint's parameters and query count"""
+    # Auth (2) + history + starting balance
+    with max_queries(4):
+        response = await authenticated_client.get("/api/forecast", params={"months": 6})
+    assert response.status_code == 200
+    assert len(response.json()["months"]) == 6
+
+    response = await authenticated_client.get("/api/forecast", params={"months": 61})
+    assert response.status_code == 422
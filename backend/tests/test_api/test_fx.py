@@ -0,0 +1,156 @@
+import io
+from datetime import date, datetime
+
+import pytest
+
+from app.models import Transaction, TransactionType
+from app.services.fx import daily_rows, parse_rates_csv
+
+# ECB layout: units per euro, a trailing empty column, N/A for missing quotes; 2024-03-05 is missing
+ECB_RATES = "Date,USD,JPY,\n2024-03-04,1.25,160,\n2024-03-06,2.0,N/A,\n"
+
+
+@pytest.fixture
+def body(sample_user, sample_category, sample_beneficiary):
+    return {
+        "amount": 100,
+        "transaction_date": "2024-03-05T12:00:00",
+        "description": "Hotel",
+        "type": "expense",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+    }
+
+
+async def _import(client, content):
+    files = {"file": ("rates.csv", content.encode(), "text/csv")}
+    return await client.post("/api/fx-rates/import", files=files)
+
+
+def test_parse_rate_files():
+    """Test that wide files are inverted to base units per unit and gaps repeat the previous rate"""
+    rates = parse_rates_csv(io.StringIO(ECB_RATES))
+    assert rates == {"USD": {date(2024, 3, 4): 0.8, date(2024, 3, 6): 0.5}, "JPY": {date(2024, 3, 4): 1 / 160}}
+    assert [(row["rate_date"].day, row["rate"]) for row in daily_rows(rates) if row["currency"] == "USD"] == [
+        (4, 0.8),
+        (5, 0.8),
+        (6, 0.5),
+    ]
+    long = parse_rates_csv(io.StringIO("currency,rate,date\nusd,0.9,2024-01-02\nEUR,1,2024-01-02\n"))
+    assert long == {"USD": {date(2024, 1, 2): 0.9}}
+
+    for content in ("date,currency,rate\n2024-01-02,USD,-1\n", "date,currency,rate\n", "Date\n2024-01-02\n"):
+        with pytest.raises(ValueError):
+            parse_rates_csv(io.StringIO(content))
+
+
+@pytest.mark.asyncio
+async def test_fx_rates_unauthenticated(client):
+    """Test that unauthenticated exchange rate requests fail"""
+    assert (await client.get("/api/fx-rates")).status_code == 401
+    assert (await client.get("/api/fx-rates/convert", params={"amount": 1, "currency": "USD"})).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_import_and_convert(authenticated_client, max_queries):
+    """Test importing a rates file, listing currencies, and converting through the rate cache"""
+    response = await _import(authenticated_client, ECB_RATES)
+    assert response.status_code == 200
+    assert response.json() == {"rows": 4, "currencies": ["JPY", "USD"]}
+
+    response = await authenticated_client.get("/api/fx-rates")
+    assert [(c["currency"], c["first_date"], c["last_date"], c["latest_rate"]) for c in response.json()] == [
+        ("JPY", "2024-03-04", "2024-03-04", 0.00625),
+        ("USD", "2024-03-04", "2024-03-06", 0.5),
+    ]
+
+    params = {"amount": "33.33", "currency": "USD", "on": "2024-03-06"}
+    response = await authenticated_client.get("/api/fx-rates/convert", params=params)
+    assert response.json() == {
+        "amount": 33.33,
+        "currency": "USD",
+        "on": "2024-03-06",
+        "rate": 0.5,
+        "base_amount": 16.67,
+        "base_currency": "EUR",
+    }
+    with max_queries(2):  # Authentication only
+        assert (await authenticated_client.get("/api/fx-rates/convert", params=params)).json()["rate"] == 0.5
+
+    # A new import replaces the day's rate and drops cached lookups
+    await _import(authenticated_client, "date,currency,rate\n2024-03-06,USD,0.6\n")
+    assert (await authenticated_client.get("/api/fx-rates/convert", params=params)).json()["base_amount"] == 20.0
+
+    response = await authenticated_client.get("/api/fx-rates/convert", params={**params, "currency": "GBP"})
+    assert response.status_code == 400
+    assert (await _import(authenticated_client, "not,a rates\nfile,at all\n")).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_totals_in_base_currency(authenticated_client, body):
+    """Test that aggregations and budgets convert each transaction with its day's (or the nearest) rate"""
+    await _import(authenticated_client, ECB_RATES)
+    budget = {
+        "name": "All",
+        "amount": 500,
+        "start_month": "2024-03-01",
+        "created_by_user_id": body["created_by_user_id"],
+    }
+    await authenticated_client.post("/api/budgets", json=budget)
+
+    created = (await authenticated_client.post("/api/transactions", json=body)).json()
+    assert created["currency"] == "EUR"
+    for transaction in (
+        # 0.8 carried over from March 4th
+        {"currency": "USD"},
+        # After and before the imported days: the nearest rate
+        {"currency": "USD", "amount": 10, "transaction_date": "2024-03-10T00:00:00"},
+        {"currency": "USD", "amount": 10, "transaction_date": "2024-02-01T00:00:00"},
+        {"currency": "USD", "amount": 33.33, "type": "income", "transaction_date": "2024-03-06T00:00:00"},
+    ):
+        response = await authenticated_client.post("/api/transactions", json={**body, **transaction})
+        assert response.status_code == 201
+        assert response.json()["currency"] == "USD"
+
+    response = await authenticated_client.post("/api/transactions", json={**body, "currency": "GBP"})
+    assert response.status_code == 400
+    response = await authenticated_client.post("/api/transactions", json={**body, "currency": "usd"})
+    assert response.status_code == 422
+
+    summary = (await authenticated_client.get("/api/aggregations/summary")).json()
+    # 100 + 100 * 0.8 + 10 * 0.5 + 10 * 0.8; 33.33 * 0.5 rounds half up
+    assert (summary["total_expenses"], summary["total_income"], summary["currency"]) == (193, 16.67, "EUR")
+    assert summary["unconverted_currencies"] == []
+    assert summary["transaction_count"] == 5
+    status = (await authenticated_client.get("/api/budgets/status", params={"month": "2024-03"})).json()
+    assert status["budgets"][0]["spent"] == 185
+
+    # New rates reach cached budget reports as well
+    await _import(authenticated_client, "date,currency,rate\n2024-03-06,USD,0.6\n")
+    status = (await authenticated_client.get("/api/budgets/status", params={"month": "2024-03"})).json()
+    assert status["budgets"][0]["spent"] == 186
+
+    response = await authenticated_client.put(f"/api/transactions/{created['id']}", json={"currency": "JPY"})
+    assert response.json()["currency"] == "JPY"
+    summary = (await authenticated_client.get("/api/aggregations/summary")).json()
+    assert summary["total_expenses"] == 94.63  # 100 yen is 0.63 euro
+
+
+@pytest.mark.asyncio
+async def test_summary_reports_currencies_without_rates(authenticated_client, db, body):
+    """Test that transactions in a currency without rates are reported instead of silently left out"""
+    await authenticated_client.post("/api/transactions", json=body)
+    # Written around the API, which refuses currencies without rates
+    db.add(
+        Transaction(
+            **{**body, "transaction_date": datetime(2024, 3, 5), "type": TransactionType.EXPENSE, "currency": "GBP"}
+        )
+    )
+    await db.commit()
+
+    summary = (await authenticated_client.get("/api/aggregations/summary")).json()
+    assert (summary["total_expenses"], summary["transaction_count"]) == (100, 2)
+    assert summary["unconverted_currencies"] == ["GBP"]
+    summary = (await authenticated_client.get("/api/aggregations/summary", params={"end_date": "2024-03-01"})).json()
+    assert summary["unconverted_currencies"] == []
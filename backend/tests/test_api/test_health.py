@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config.settings import settings
+from app.services.health import background_monitor, check_database, live_probe, ready_probe
+
+
+@pytest.fixture(autouse=True)
+def fresh_probes(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "upload_dir", tmp_path / "uploads")
+    live_probe.clear()
+    ready_probe.clear()
+    yield
+    live_probe.clear()
+    ready_probe.clear()
+
+
+@pytest.mark.asyncio
+async def test_health(client):
+    """Test that the plain health endpoint keeps answering"""
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy"}
+
+
+@pytest.mark.asyncio
+async def test_ready_checks_and_caches(client, max_queries):
+    """Test that readiness runs every check once and serves the cached report afterwards"""
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    report = response.json()
+    assert report["status"] == "pass"
+    assert [c["name"] for c in report["checks"]] == ["database", "uploads", "disk", "background"]
+    assert all(c["status"] == "pass" for c in report["checks"])
+    assert (settings.upload_dir).is_dir()
+    assert list(settings.upload_dir.iterdir()) == []
+
+    with max_queries(0):
+        assert (await client.get("/health/ready")).json() == report
+
+
+@pytest.mark.asyncio
+async def test_ready_fails_when_uploads_unwritable(client, tmp_path, monkeypatch):
+    """Test that readiness returns 503 when the upload directory cannot be created"""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(settings, "upload_dir", blocker / "uploads")
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    checks = {c["name"]: c for c in response.json()["checks"]}
+    assert response.json()["status"] == "fail"
+    assert checks["uploads"]["status"] == "fail"
+    assert "disk" not in checks
+    assert checks["database"]["status"] == "pass"
+
+
+@pytest.mark.asyncio
+async def test_live_fails_on_crashed_or_stalled_task(client):
+    """Test that liveness fails once a watched background task dies or stops beating"""
+
+    async def crash():
+        raise RuntimeError("boom")
+
+    task = asyncio.create_task(crash())
+    await asyncio.gather(task, return_exceptions=True)
+    background_monitor.watch("crasher", task)
+    background_monitor.watch("stalled", interval=0.0)
+    try:
+        response = await client.get("/health/live")
+        assert response.status_code == 503
+        detail = response.json()["checks"][0]["detail"]
+        assert "crasher stopped: RuntimeError('boom')" in detail
+        assert "stalled has not run" in detail
+    finally:
+        background_monitor.unwatch("crasher")
+        background_monitor.unwatch("stalled")
+
+    live_probe.clear()
+    response = await client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "pass"
+
+
+@pytest.mark.asyncio
+async def test_database_check_reports_missing_file(tmp_path):
+    """Test that a missing SQLite file fails instead of being created empty"""
+    path = tmp_path / "missing.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        (check,) = await check_database(async_sessionmaker(engine))
+    finally:
+        await engine.dispose()
+    assert check.status == "fail"
+    assert "missing" in check.detail
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_database_check_reports_wal_size(tmp_path):
+    """Test that file-backed databases also report how much WAL is waiting for a checkpoint"""
+    path = tmp_path / "app.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("CREATE TABLE t (x)")
+        database, wal = await check_database(async_sessionmaker(engine))
+        assert (database.status, wal.status, wal.detail) == ("pass", "pass", "not in WAL mode")
+
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        _, wal = await check_database(async_sessionmaker(engine))
+        assert wal.status == "pass"
+        assert "bytes not yet checkpointed" in wal.detail
+    finally:
+        await engine.dispose()
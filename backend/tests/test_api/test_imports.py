@@ -0,0 +1,245 @@
+import io
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.config.settings import settings
+from app.models import ImportJob, Transaction
+from app.routers import imports
+from app.schemas import ImportFormat, ImportStatus
+from app.services.events import event_bus
+from app.services.statement_import import iter_statement_rows, parse_amount, process_import_job
+
+CSV_STATEMENT = (
+    "Date,Payee,Amount,Category\n"
+    "2024-01-05,Supermarket,-45.20,Food\n"
+    '2024-01-06,Employer,"3,000.00",Salary\n'
+    "not-a-date,Broken,-1.00,Food\n"
+    "2024-01-07,Bakery,-3.50,\n"
+)
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240105120000<TRNAMT>-45.20<FITID>1<NAME>Supermarket<MEMO>Weekly shop
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240106<TRNAMT>3000.00<FITID>2<NAME>Employer
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF_STATEMENT = """!Type:Bank
+D01/05/2024
+T-45.20
+PSupermarket
+LFood
+^
+D01/06'2024
+T3,000.00
+PEmployer
+LSalary
+^
+"""
+
+
+@pytest.fixture(autouse=True)
+def import_dir(tmp_path, monkeypatch):
+    """Store uploaded statements in a temporary directory"""
+    monkeypatch.setattr(settings, "upload_dir", tmp_path)
+    return tmp_path
+
+
+def _rows(content: str, file_format: ImportFormat, options: dict | None = None):
+    return list(iter_statement_rows(io.BytesIO(content.encode()), file_format, options or {}))
+
+
+def test_parse_amount_formats():
+    """Test parsing the amount formats banks commonly export"""
+    assert parse_amount("-1,234.56") == Decimal("-1234.56")
+    assert parse_amount("1.234,56") == Decimal("1234.56")
+    assert parse_amount("12,50") == Decimal("12.5")
+    assert parse_amount("(12.00)") == -12
+    assert parse_amount("12.00-") == -12
+    assert parse_amount("€ 3,000") == 3000
+
+
+def test_parse_csv_statement():
+    """Test that CSV rows are streamed with detected columns and per-row errors"""
+    rows = _rows(CSV_STATEMENT, ImportFormat.CSV)
+    assert [r.row_number for r in rows] == [1, 2, 3, 4]
+    assert rows[0].amount == Decimal("-45.20") and rows[0].description == "Supermarket" and rows[0].category == "Food"
+    assert rows[1].amount == 3000.0
+    assert hasattr(rows[2], "message")
+
+
+def test_parse_ofx_statement():
+    """Test parsing SGML-style OFX transactions"""
+    rows = _rows(OFX_STATEMENT, ImportFormat.OFX)
+    assert len(rows) == 2
+    assert rows[0].amount == Decimal("-45.20")
+    assert rows[0].notes == "Weekly shop"
+    assert rows[1].transaction_date.day == 6
+
+
+def test_parse_qif_statement():
+    """Test parsing QIF records"""
+    rows = _rows(QIF_STATEMENT, ImportFormat.QIF)
+    assert [(r.amount, r.category) for r in rows] == [(Decimal("-45.20"), "Food"), (3000, "Salary")]
+
+
+@pytest.mark.asyncio
+async def test_import_unauthenticated(client):
+    """Test that unauthenticated imports fail"""
+    files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+    response = await client.post("/api/imports", files=files)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_import_csv(authenticated_client, db, sample_category):
+    """Test importing a CSV statement end to end"""
+    files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+    response = await authenticated_client.post("/api/imports", files=files)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    response = await authenticated_client.get(f"/api/imports/{job_id}")
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["progress"] == 1.0
+    assert data["rows_processed"] == 4
+    assert data["rows_imported"] == 3
+    assert data["rows_skipped"] == 1
+    assert len(data["errors"]) == 1
+
+    transactions = (await db.execute(select(Transaction).order_by(Transaction.transaction_date))).scalars().all()
+    assert [t.type.value for t in transactions] == ["expense", "income", "expense"]
+    # Existing categories are matched case-insensitively
+    assert transactions[0].category_id == sample_category.id
+
+
+@pytest.mark.asyncio
+async def test_import_publishes_changes(authenticated_client, db):
+    """Test that imported rows are announced on the event bus like rows created through the API"""
+    subscription = event_bus.subscribe()
+    try:
+        files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+        await authenticated_client.post("/api/imports", files=files)
+        messages = []
+        while (message := await subscription.get(timeout=0.1)) is not None:
+            messages.append(message)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+    # One event per committed batch, not one per row
+    ids = (await db.scalars(select(Transaction.id).order_by(Transaction.id))).all()
+    [message] = [m for m in messages if m["entity"] == "transactions"]
+    assert (message["action"], message["ids"]) == ("bulk_created", ids)
+
+
+@pytest.mark.asyncio
+async def test_reimport_same_file_does_not_duplicate(authenticated_client, db):
+    """Test that uploading the same statement twice reuses the job"""
+    files = {"file": ("statement.qif", QIF_STATEMENT.encode(), "application/octet-stream")}
+    first = await authenticated_client.post("/api/imports", files=files)
+    second = await authenticated_client.post("/api/imports", files=files)
+    assert first.json()["id"] == second.json()["id"]
+
+    count = await db.scalar(select(func.count(Transaction.id)))
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_reimport_with_new_options(authenticated_client, db):
+    """Test that re-uploading a failed import with other options retries it with those options"""
+    files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+    failed = await authenticated_client.post("/api/imports", files=files, data={"mapping": '{"amount": "Sum"}'})
+    job_id = failed.json()["id"]
+    assert (await authenticated_client.get(f"/api/imports/{job_id}")).json()["status"] == "failed"
+
+    retried = await authenticated_client.post("/api/imports", files=files, data={"mapping": '{"amount": "Amount"}'})
+    assert retried.json()["id"] == job_id
+    job = (await authenticated_client.get(f"/api/imports/{job_id}")).json()
+    assert (job["status"], job["rows_imported"]) == ("completed", 3)
+
+    # Completed rows were imported with the old options
+    response = await authenticated_client.post("/api/imports", files=files, data={"day_first": "true"})
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_resume_interrupted_import(authenticated_client, db, monkeypatch):
+    """Test that an interrupted import resumes from the last committed batch"""
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 1)
+    files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+    job_id = (await authenticated_client.post("/api/imports", files=files)).json()["id"]
+
+    # Simulate a crash after the first batch had been committed
+    job = await db.get(ImportJob, job_id)
+    first_key = (await db.execute(select(Transaction.import_key).order_by(Transaction.id).limit(1))).scalar_one()
+    await db.execute(Transaction.__table__.delete().where(Transaction.import_key != first_key))
+    job.rows_processed = 1
+    job.rows_imported = 1
+    job.rows_skipped = 0
+    await db.commit()
+
+    job = await process_import_job(db, job)
+    assert job.rows_imported == 3
+    assert await db.scalar(select(func.count(Transaction.id))) == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_running_job_is_taken_over(authenticated_client, db, monkeypatch):
+    """Test that a job left running by a crashed worker can be resumed or re-uploaded once it goes stale"""
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 1)
+    files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+    job_id = (await authenticated_client.post("/api/imports", files=files)).json()["id"]
+
+    # The worker died after committing the first batch
+    first_key = (await db.execute(select(Transaction.import_key).order_by(Transaction.id).limit(1))).scalar_one()
+    await db.execute(Transaction.__table__.delete().where(Transaction.import_key != first_key))
+    job = await db.get(ImportJob, job_id)
+    job.status, job.rows_processed, job.rows_imported, job.rows_skipped = ImportStatus.RUNNING, 1, 1, 0
+    job.updated_at = datetime.utcnow()
+    await db.commit()
+    assert (await authenticated_client.post(f"/api/imports/{job_id}/resume")).status_code == 409
+    response = await authenticated_client.post("/api/imports", files=files, data={"skip_duplicates": "false"})
+    assert response.status_code == 409
+
+    job.updated_at = datetime.utcnow() - timedelta(seconds=settings.IMPORT_STALE_SECONDS + 1)
+    await db.commit()
+    response = await authenticated_client.post("/api/imports", files=files, data={"skip_duplicates": "false"})
+    assert response.status_code == 202
+    await db.refresh(job)
+    assert (job.status, job.rows_imported, job.options["skip_duplicates"]) == (ImportStatus.COMPLETED, 3, False)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads_share_the_job(authenticated_client, db, monkeypatch):
+    """Test that an upload losing the race to create the job gets the existing job instead of an error"""
+    files = {"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")}
+    job_id = (await authenticated_client.post("/api/imports", files=files)).json()["id"]
+
+    lookup = imports._job_for_file
+    calls = []
+
+    async def lost_race(db, sha256):
+        # The first lookup runs before the other upload commits its job
+        calls.append(sha256)
+        return None if len(calls) == 1 else await lookup(db, sha256)
+
+    monkeypatch.setattr(imports, "_job_for_file", lost_race)
+    response = await authenticated_client.post("/api/imports", files=files)
+    assert (response.status_code, response.json()["id"]) == (202, job_id)
+    assert len(calls) == 2
+    assert await db.scalar(select(func.count(ImportJob.id))) == 1
+
+
+@pytest.mark.asyncio
+async def test_import_unknown_format(authenticated_client):
+    """Test that files with an unknown extension are rejected"""
+    files = {"file": ("statement.pdf", b"%PDF", "application/pdf")}
+    response = await authenticated_client.post("/api/imports", files=files)
+    assert response.status_code == 400
@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+
+from app.services.metrics import MetricsRegistry, merge, render
+
+
+def _sample(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_per_route_template(authenticated_client, sample_data):
+    """Test that requests are counted per route template, not per raw path"""
+    before = (await authenticated_client.get("/metrics")).text
+    route = 'method="GET",route="/api/transactions/{transaction_id}"'
+    for transaction in sample_data["transactions"]:
+        await authenticated_client.get(f"/api/transactions/{transaction.id}")
+    await authenticated_client.get("/api/transactions/999999")
+    await authenticated_client.get("/no/such/path")
+
+    response = await authenticated_client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    ok = f'http_requests_total{{{route},status="200"}}'
+    missing = f'http_requests_total{{{route},status="404"}}'
+    assert _sample(text, ok) - _sample(before, ok) == 3
+    assert _sample(text, missing) - _sample(before, missing) == 1
+    assert '/api/transactions/1"' not in text
+    assert 'route="unmatched",status="404"' in text
+
+    count = f"http_request_duration_seconds_count{{{route}}}"
+    inf_bucket = f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}'
+    assert _sample(text, count) == _sample(text, inf_bucket) >= 4
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    # The scrape itself is in flight while the page is rendered
+    assert _sample(text, "http_requests_in_flight") >= 1
+    assert _sample(text, "db_statements_total") > 0
+
+
+def test_merge_worker_snapshots(tmp_path):
+    """Test that counters and histograms sum across workers and gauges skip exited ones"""
+    worker = MetricsRegistry(tmp_path)
+    requests = worker.counter("requests_total", "Requests", ("route",))
+    latency = worker.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    in_flight = worker.gauge("in_flight", "In flight")
+    requests.inc(("/a",), 2)
+    latency.observe(0.05)
+    latency.observe(3.0)
+    in_flight.set(1)
+
+    exited = worker.snapshot()
+    exited["pid"] = 2**22 + 12345  # above the default pid_max, so never a live process
+    (tmp_path / f"{exited['pid']}.json").write_text(json.dumps(exited))
+
+    text = worker.render()
+    assert 'requests_total{route="/a"} 4' in text
+    assert 'latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_sum 6.1" in text
+    assert "in_flight 1" in text
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+
+def test_render_escapes_label_values():
+    """Test label escaping in the exposition format"""
+    metric = {"name": "x_total", "help": "X", "type": "counter", "labelnames": ["v"], "samples": [[['a"b\\c'], 1]]}
+    families = merge([{"pid": os.getpid(), "metrics": [metric]}])
+    assert 'x_total{v="a\\"b\\\\c"} 1' in render(families)
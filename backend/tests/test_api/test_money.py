@@ -0,0 +1,79 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from sqlalchemy import delete, text
+
+from app.models import Transaction, TransactionType
+from app.models.money import from_cents, to_cents
+from app.schemas import AggregationFilters, AggregationSummary
+from app.services.aggregation import get_aggregation_summary, get_tag_aggregations
+
+amounts = st.decimals(min_value=Decimal("0.01"), max_value=Decimal("99999999.99"), places=2)
+transactions = st.lists(
+    st.tuples(st.sampled_from(TransactionType), amounts, st.lists(st.sampled_from(["a", "b", "c"]), unique=True)),
+    max_size=40,
+)
+
+
+def test_cents_conversion():
+    """Test that amounts convert to integer cents exactly, with floats taken at their shortest decimal form"""
+    assert to_cents(Decimal("150.50")) == 15050
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(1.005) == 101
+    assert to_cents("-2.675") == -268
+    assert from_cents(15050) == Decimal("150.50")
+    assert str(from_cents(5)) == "0.05"
+
+
+@pytest.mark.asyncio
+async def test_amount_stored_as_integer_cents(db, sample_transaction):
+    """Test that amounts are stored as integers and read back as Decimals"""
+    row = (await db.execute(text("SELECT amount_cents, typeof(amount_cents) FROM transactions"))).one()
+    assert tuple(row) == (5000, "integer")
+    await db.refresh(sample_transaction)
+    assert sample_transaction.amount == Decimal("50.00")
+
+
+@pytest.mark.asyncio
+@settings(max_examples=30, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(rows=transactions)
+async def test_aggregations_match_decimal_reference(db, sample_user, sample_category, sample_beneficiary, rows):
+    """Property: SQL totals equal the same totals computed with Decimal arithmetic"""
+    await db.execute(delete(Transaction))
+    db.add_all(
+        Transaction(
+            type=transaction_type,
+            amount=amount,
+            description="t",
+            transaction_date=datetime(2024, 1, 1),
+            tags=tags,
+            category_id=sample_category.id,
+            beneficiary_id=sample_beneficiary.id,
+            created_by_user_id=sample_user.id,
+        )
+        for transaction_type, amount, tags in rows
+    )
+    await db.commit()
+
+    income = sum((a for t, a, _ in rows if t == TransactionType.INCOME), Decimal(0))
+    expenses = sum((a for t, a, _ in rows if t == TransactionType.EXPENSE), Decimal(0))
+    summary = await get_aggregation_summary(db, AggregationFilters())
+    assert (summary.total_income, summary.total_expenses, summary.net_total) == (income, expenses, income - expenses)
+    assert summary.transaction_count == len(rows)
+    # JSON numbers still carry the exact two-place value
+    assert Decimal(str(AggregationSummary.model_validate_json(summary.model_dump_json()).net_total)) == (
+        income - expenses
+    )
+
+    by_tag = {agg.tag: agg for agg in await get_tag_aggregations(db, AggregationFilters())}
+    for tag in ("a", "b", "c"):
+        tagged = [(t, a) for t, a, tags in rows if tag in tags]
+        if not tagged:
+            assert tag not in by_tag
+            continue
+        assert by_tag[tag].total_income == sum((a for t, a in tagged if t == TransactionType.INCOME), Decimal(0))
+        assert by_tag[tag].total_expenses == sum((a for t, a in tagged if t == TransactionType.EXPENSE), Decimal(0))
+        assert by_tag[tag].transaction_count == len(tagged)
@@ -0,0 +1,107 @@
+import logging
+from datetime import datetime
+
+import pytest
+
+from app.config.settings import settings
+from app.database import query_log
+from app.database.instrumentation import normalize_sql
+from app.models import Transaction, TransactionType
+
+# Auth costs two statements per request (token blocklist + user lookup)
+QUERY_BUDGETS = {
+    "/api/transactions": 6,
+    "/api/transactions?compact=true": 6,
+    "/api/categories": 3,
+    "/api/beneficiaries": 3,
+    "/api/aggregations/summary": 3,
+    "/api/aggregations/by-tag": 3,
+    "/api/bootstrap": 5,
+    "/api/sync": 9,
+    "/api/gift-occasions": 3,
+    "/api/budgets": 3,
+    "/api/budgets/status": 3,
+    "/api/transactions/suggest?description=Supermarket": 3,
+}
+
+
+def test_normalize_sql():
+    """Test that literals, placeholder lists and whitespace are collapsed"""
+    sql = "SELECT  x.id\n FROM x WHERE x.name = 'it''s' AND x.n > 10 AND x.id IN (?, ?, ?) LIMIT ? OFFSET 2.5"
+    assert normalize_sql(sql) == "SELECT x.id FROM x WHERE x.name = ? AND x.n > ? AND x.id IN (?, ...) LIMIT ? OFFSET ?"
+    assert normalize_sql("SELECT bm25(transactions_fts, ?) AS anon_1") == "SELECT bm25(transactions_fts, ?) AS anon_1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", QUERY_BUDGETS)
+async def test_endpoint_query_budgets(authenticated_client, sample_data, max_queries, url):
+    """Test that list endpoints stay within their query budget"""
+    with max_queries(QUERY_BUDGETS[url]):
+        response = await authenticated_client.get(url)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_query_count_independent_of_rows(authenticated_client, db, sample_data, max_queries):
+    """Test that listing more transactions does not issue more statements (no N+1 loads)"""
+    with max_queries(100) as few:
+        await authenticated_client.get("/api/transactions")
+
+    template = sample_data["transactions"][0]
+    db.add_all(
+        Transaction(
+            amount=i + 1,
+            transaction_date=datetime(2024, 3, 1),
+            description=f"Extra {i}",
+            type=TransactionType.EXPENSE,
+            category_id=template.category_id,
+            beneficiary_id=template.beneficiary_id,
+            created_by_user_id=template.created_by_user_id,
+        )
+        for i in range(50)
+    )
+    await db.commit()
+
+    with max_queries(few.count) as many:
+        response = await authenticated_client.get("/api/transactions")
+    assert len(response.json()) == 53
+    assert many.count == few.count
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(authenticated_client, sample_data):
+    """Test that responses report statement count and database time"""
+    response = await authenticated_client.get("/api/categories")
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert timing.endswith('desc="3 queries"')
+
+
+@pytest.mark.asyncio
+async def test_query_report_and_threshold_logging(authenticated_client, sample_data, monkeypatch, caplog):
+    """Test slow-statement capture, the over-budget log line and the debug report"""
+    query_log.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.0)
+    monkeypatch.setattr(settings, "QUERY_COUNT_WARN", 2)
+
+    with caplog.at_level(logging.WARNING, logger="app.database.instrumentation"):
+        await authenticated_client.get(f"/api/transactions/{sample_data['transactions'][0].id}")
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(m.startswith("Slow query") for m in messages)
+    assert any(m.startswith("GET /api/transactions/{transaction_id} issued 6 queries") for m in messages)
+
+    report = (await authenticated_client.get("/api/debug/queries")).json()
+    assert report["slow_query_ms"] == 0.0
+    # The report request itself is recorded after its response is built
+    request = report["requests"][0]
+    assert (request["path"], request["count"], request["status_code"]) == ("/api/transactions/{transaction_id}", 6, 200)
+    assert report["slow_queries"][0]["path"] == "/api/transactions/{transaction_id}"
+    assert "?" in report["slow_queries"][0]["sql"]
+    assert report["top_statements"][0]["count"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_query_report_unauthenticated(client):
+    """Test that the debug report requires authentication"""
+    response = await client.get("/api/debug/queries")
+    assert response.status_code == 401
@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.config.settings import settings
+from app.models import RecurrenceFrequency, RecurringRule, Transaction, TransactionType
+from app.schemas import HealthStatus
+from app.services.health import background_monitor
+from app.services.recurring import SCHEDULER_NAME, RecurringScheduler, materialize_due
+
+
+def _rule(sample_user, sample_category, sample_beneficiary, **fields):
+    return {
+        "type": "expense",
+        "amount": 950.0,
+        "description": "Rent",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+        "frequency": "monthly",
+        "start_date": "2024-01-31",
+        **fields,
+    }
+
+
+async def _transaction_dates(db):
+    result = await db.execute(select(Transaction.transaction_date).order_by(Transaction.transaction_date))
+    return [value.date().isoformat() for value in result.scalars()]
+
+
+@pytest.mark.asyncio
+async def test_recurring_rules_unauthenticated(client):
+    """Test that unauthenticated requests to recurring rules fail"""
+    assert (await client.get("/api/recurring-rules")).status_code == 401
+    assert (await client.post("/api/recurring-rules/materialize")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_recurring_rule_crud(authenticated_client, sample_user, sample_category, sample_beneficiary):
+    """Test creating, updating and deleting a rule, and date validation"""
+    body = _rule(sample_user, sample_category, sample_beneficiary)
+    response = await authenticated_client.post("/api/recurring-rules", json=body)
+    assert response.status_code == 201
+    rule = response.json()
+    assert (rule["interval"], rule["active"], rule["materialized_through"]) == (1, True, None)
+
+    response = await authenticated_client.post("/api/recurring-rules", json={**body, "end_date": "2023-12-31"})
+    assert response.status_code == 422
+    response = await authenticated_client.put(f"/api/recurring-rules/{rule['id']}", json={"end_date": "2023-12-31"})
+    assert response.status_code == 400
+
+    response = await authenticated_client.put(
+        f"/api/recurring-rules/{rule['id']}", json={"amount": 975, "active": False}
+    )
+    assert (response.json()["amount"], response.json()["active"]) == (975, False)
+    assert len((await authenticated_client.get("/api/recurring-rules")).json()) == 1
+    assert (await authenticated_client.delete(f"/api/recurring-rules/{rule['id']}")).status_code == 204
+    assert (await authenticated_client.get(f"/api/recurring-rules/{rule['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_materialize_is_idempotent_and_catches_up(
+    authenticated_client, db, sample_user, sample_category, sample_beneficiary, monkeypatch
+):
+    """Test batched materializing, month-end clamping, catching up after downtime and rerunning safely"""
+    monkeypatch.setattr(settings, "RECURRING_BATCH_SIZE", 2)
+    body = _rule(sample_user, sample_category, sample_beneficiary)
+    await authenticated_client.post("/api/recurring-rules", json=body)
+    weekly = _rule(
+        sample_user, sample_category, sample_beneficiary, description="Allowance", frequency="weekly", weekday=5
+    )
+    await authenticated_client.post("/api/recurring-rules", json={**weekly, "start_date": "2024-03-25"})
+
+    result = await materialize_due(db, today=date(2024, 4, 10))
+    assert (result.rules, result.created) == (2, 5)
+    assert await _transaction_dates(db) == ["2024-01-31", "2024-02-29", "2024-03-30", "2024-03-31", "2024-04-06"]
+
+    # Two months of downtime later
+    result = await materialize_due(db, today=date(2024, 6, 1))
+    assert result.created == 10
+    assert (await _transaction_dates(db))[-1] == "2024-06-01"
+    assert "2024-04-30" in await _transaction_dates(db)
+
+    # Even without the progress marker, existing occurrences are never inserted twice
+    for rule in (await db.execute(select(RecurringRule))).scalars():
+        rule.materialized_through = None
+    await db.commit()
+    result = await materialize_due(db, today=date(2024, 6, 1))
+    assert result.created == 0
+    assert await db.scalar(select(func.count(Transaction.id))) == 15
+
+
+@pytest.mark.asyncio
+async def test_preview_and_upcoming_do_not_write(
+    authenticated_client, db, sample_user, sample_category, sample_beneficiary
+):
+    """Test that previews list future occurrences without creating transactions"""
+    start = date.today() + timedelta(days=1)
+    body = _rule(
+        sample_user, sample_category, sample_beneficiary, frequency="daily", interval=2, start_date=start.isoformat()
+    )
+    rule = (await authenticated_client.post("/api/recurring-rules", json=body)).json()
+
+    response = await authenticated_client.get(f"/api/recurring-rules/{rule['id']}/preview", params={"count": 3})
+    assert [o["occurrence_date"] for o in response.json()] == [
+        (start + timedelta(days=offset)).isoformat() for offset in (0, 2, 4)
+    ]
+    response = await authenticated_client.get("/api/recurring-rules/upcoming", params={"days": 10})
+    assert len(response.json()) == 5
+    assert response.json()[0]["amount"] == 950
+    assert await db.scalar(select(func.count(Transaction.id))) == 0
+
+
+@pytest.mark.asyncio
+async def test_materialize_endpoint(authenticated_client, db, sample_user, sample_category, sample_beneficiary):
+    """Test materializing due occurrences on request"""
+    start = date.today() - timedelta(days=2)
+    body = _rule(sample_user, sample_category, sample_beneficiary, frequency="daily", start_date=start.isoformat())
+    await authenticated_client.post("/api/recurring-rules", json=body)
+
+    response = await authenticated_client.post("/api/recurring-rules/materialize")
+    assert response.json() == {"rules": 1, "created": 3}
+    response = await authenticated_client.post("/api/recurring-rules/materialize")
+    assert response.json()["created"] == 0
+    rules = (await authenticated_client.get("/api/recurring-rules")).json()
+    assert rules[0]["materialized_through"] == date.today().isoformat()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_and_beats(db, sample_user, sample_category, sample_beneficiary):
+    """Test that the scheduler materializes at startup and reports to the background monitor"""
+    db.add(
+        RecurringRule(
+            type=TransactionType.EXPENSE,
+            amount=950,
+            description="Rent",
+            category_id=sample_category.id,
+            beneficiary_id=sample_beneficiary.id,
+            created_by_user_id=sample_user.id,
+            frequency=RecurrenceFrequency.DAILY,
+            start_date=date.today() - timedelta(days=1),
+        )
+    )
+    await db.commit()
+
+    finished = asyncio.Event()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+        finished.set()
+
+    scheduler = RecurringScheduler()
+    await scheduler.start(session_factory, interval=60)
+    try:
+        await asyncio.wait_for(finished.wait(), 5)
+        assert await db.scalar(select(func.count(Transaction.id))) == 2
+        assert background_monitor.check().status == HealthStatus.PASS
+    finally:
+        await scheduler.stop()
+    assert SCHEDULER_NAME not in background_monitor.check().detail
@@ -0,0 +1,72 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_sync_unauthenticated(client):
+    """Test that unauthenticated sync requests fail"""
+    response = await client.get("/api/sync")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_full_sync(authenticated_client, sample_data):
+    """Test that since=0 returns every synced entity"""
+    response = await authenticated_client.get("/api/sync")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["categories"]) == 3
+    assert len(data["beneficiaries"]) == 3
+    assert len(data["transactions"]) == 3
+    assert data["transactions"][0]["category"]["name"]
+    assert data["has_more"] is False
+    assert data["deleted"] == {}
+    assert data["cursor"] > 0
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_with_tombstones(authenticated_client, sample_data):
+    """Test that only changes after the cursor are returned, including deletions"""
+    cursor = (await authenticated_client.get("/api/sync")).json()["cursor"]
+    groceries, salary, _ = sample_data["transactions"]
+
+    await authenticated_client.put(f"/api/transactions/{groceries.id}", json={"amount": 12.5})
+    await authenticated_client.delete(f"/api/transactions/{salary.id}")
+    await authenticated_client.post("/api/categories", json={"name": "Books", "type": "expense"})
+
+    response = await authenticated_client.get("/api/sync", params={"since": cursor})
+    data = response.json()
+    assert [t["id"] for t in data["transactions"]] == [groceries.id]
+    assert data["transactions"][0]["amount"] == 12.5
+    assert data["transactions"][0]["updated_at"]
+    assert [c["name"] for c in data["categories"]] == ["Books"]
+    assert data["beneficiaries"] == []
+    assert data["deleted"] == {"transactions": [salary.id]}
+
+    # Nothing changed since the new cursor
+    cursor = data["cursor"]
+    data = (await authenticated_client.get("/api/sync", params={"since": cursor})).json()
+    assert data["cursor"] == cursor
+    assert data["transactions"] == [] and data["categories"] == [] and data["deleted"] == {}
+    assert data["reset"] is False
+
+
+@pytest.mark.asyncio
+async def test_sync_paging(authenticated_client, sample_data):
+    """Test paging through changes with limit and has_more"""
+    seen = 0
+    cursor = 0
+    while True:
+        data = (await authenticated_client.get("/api/sync", params={"since": cursor, "limit": 4})).json()
+        assert data["cursor"] >= cursor
+        cursor = data["cursor"]
+        seen += len(data["categories"]) + len(data["beneficiaries"]) + len(data["transactions"])
+        if not data["has_more"]:
+            break
+    assert seen == 9
+
+
+@pytest.mark.asyncio
+async def test_sync_unknown_cursor_requests_reset(authenticated_client, sample_data):
+    """Test that a cursor ahead of the server tells the client to resync"""
+    response = await authenticated_client.get("/api/sync", params={"since": 10_000})
+    assert response.json()["reset"] is True
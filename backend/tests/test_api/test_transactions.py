@@ -1,5 +1,9 @@
+import json
+
 import pytest
 
+from app.config.settings import settings
+
 
 # Tests for unauthenticated access (should fail with 401)
 @pytest.mark.asyncio
@@ -75,6 +79,62 @@ async def test_create_transaction(authenticated_client, sample_user, sample_cate
     assert data["type"] == "expense"
 
 
+@pytest.mark.asyncio
+async def test_create_transactions_bulk(
+    authenticated_client, sample_user, sample_category, sample_beneficiary, max_queries
+):
+    """Test that a bulk create inserts every row in one statement and returns ids in request order"""
+    rows = [
+        {
+            "amount": 10 + i,
+            "transaction_date": f"2024-01-{i + 1:02d}T00:00:00",
+            "description": f"Bulk {i}",
+            "type": "expense",
+            "category_id": sample_category.id,
+            "beneficiary_id": sample_beneficiary.id,
+            "created_by_user_id": sample_user.id,
+            "tags": ["bulk"] if i % 2 else [],
+        }
+        for i in range(25)
+    ]
+    with max_queries(4) as stats:
+        response = await authenticated_client.post("/api/transactions/bulk", json={"transactions": rows})
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created"] == 25
+    assert sum("INSERT INTO transactions" in sql for sql in stats.statements) == 1
+
+    for i in (0, 24):
+        created = (await authenticated_client.get(f"/api/transactions/{data['ids'][i]}")).json()
+        assert (created["description"], created["amount"]) == (f"Bulk {i}", 10.0 + i)
+    tagged = await authenticated_client.get("/api/transactions", params={"tags": "bulk"})
+    assert len(tagged.json()) == 12
+
+
+@pytest.mark.asyncio
+async def test_create_transactions_bulk_is_all_or_nothing(
+    authenticated_client, sample_user, sample_category, sample_beneficiary, monkeypatch
+):
+    """Test that an invalid row or an oversized batch creates nothing"""
+    row = {
+        "amount": 5,
+        "transaction_date": "2024-01-01T00:00:00",
+        "description": "Bulk",
+        "type": "expense",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+    }
+    invalid = {"transactions": [row, {**row, "amount": -1}]}
+    response = await authenticated_client.post("/api/transactions/bulk", json=invalid)
+    assert response.status_code == 422
+
+    monkeypatch.setattr(settings, "BULK_CREATE_MAX", 2)
+    response = await authenticated_client.post("/api/transactions/bulk", json={"transactions": [row] * 3})
+    assert response.status_code == 400
+    assert (await authenticated_client.get("/api/transactions")).json() == []
+
+
 @pytest.mark.asyncio
 async def test_get_transaction(authenticated_client, sample_transaction):
     """Test getting a specific transaction"""
@@ -114,3 +174,165 @@ async def test_filter_transactions_by_date_range(authenticated_client, sample_da
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 2  # Only January transactions
+
+
+@pytest.mark.asyncio
+async def test_filter_transactions_by_tags(authenticated_client, sample_data):
+    """Test any/all tag filters, which follow tag updates"""
+    groceries, _, gas = sample_data["transactions"]
+    await authenticated_client.put(f"/api/transactions/{groceries.id}", json={"tags": ["kids", "food"]})
+    await authenticated_client.put(f"/api/transactions/{gas.id}", json={"tags": ["kids", "car"]})
+
+    response = await authenticated_client.get("/api/transactions", params={"tags": "kids"})
+    assert {t["id"] for t in response.json()} == {groceries.id, gas.id}
+
+    response = await authenticated_client.get("/api/transactions", params={"tags": "food, car"})
+    assert {t["id"] for t in response.json()} == {groceries.id, gas.id}
+
+    response = await authenticated_client.get("/api/transactions", params={"tags": "kids,car", "tag_match": "all"})
+    assert [t["id"] for t in response.json()] == [gas.id]
+
+    await authenticated_client.put(f"/api/transactions/{gas.id}", json={"tags": []})
+    response = await authenticated_client.get("/api/transactions", params={"tags": "car"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_compact(authenticated_client, sample_data):
+    """Test the compact list mode with side-loaded references"""
+    response = await authenticated_client.get("/api/transactions", params={"compact": "true"})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["transactions"]) == 3
+    assert "category" not in data["transactions"][0]
+    assert data["transactions"][0]["category_id"] == sample_data["categories"][2].id
+
+    included = data["included"]
+    assert {c["name"] for c in included["categories"].values()} == {"Food", "Salary", "Transport"}
+    assert len(included["beneficiaries"]) == 3
+    # All three transactions were created by the same user, which is included once
+    assert [u["name"] for u in included["users"].values()] == ["User One"]
+
+    full = (await authenticated_client.get("/api/transactions")).json()
+    for compact_row, full_row in zip(data["transactions"], full):
+        assert included["categories"][str(compact_row["category_id"])] == full_row["category"]
+
+
+@pytest.mark.asyncio
+async def test_search_transactions(authenticated_client, sample_user, sample_category, sample_beneficiary):
+    """Test full-text search over description, notes and tags with ranking and highlights"""
+    base = {
+        "type": "expense",
+        "amount": 10.0,
+        "transaction_date": "2024-01-15T00:00:00",
+        "category_id": sample_category.id,
+        "beneficiary_id": sample_beneficiary.id,
+        "created_by_user_id": sample_user.id,
+    }
+    payloads = [
+        {"description": "Dentist bill", "notes": "Check-up and cleaning"},
+        {"description": "Pharmacy", "notes": "Painkillers after the dentist"},
+        {"description": "Supermarket", "tags": ["dental", "kids"]},
+        {"description": "<img src=x onerror=alert(1)> Orthodontist & co"},
+    ]
+    for payload in payloads:
+        response = await authenticated_client.post("/api/transactions", json={**base, **payload})
+        assert response.status_code == 201
+
+    response = await authenticated_client.get("/api/transactions", params={"q": "dentist"})
+    data = response.json()
+    # A match in the description ranks above a match in the notes
+    assert [t["description"] for t in data] == ["Dentist bill", "Pharmacy"]
+    assert data[0]["highlight"] == "<mark>Dentist</mark> bill"
+
+    # Stored text is escaped; only the hit markers are markup
+    response = await authenticated_client.get("/api/transactions", params={"q": "orthodontist"})
+    assert response.json()[0]["highlight"] == ("&lt;img src=x onerror=alert(1)&gt; <mark>Orthodontist</mark> &amp; co")
+
+    # Prefix matching, tags are indexed, and punctuation is not parsed as query syntax
+    response = await authenticated_client.get("/api/transactions", params={"q": 'dent "kids'})
+    assert [t["description"] for t in response.json()] == ["Supermarket"]
+
+    response = await authenticated_client.get("/api/transactions")
+    assert all(t["highlight"] is None for t in response.json())
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates_and_deletes(authenticated_client, sample_transaction):
+    """Test that the search index is kept in sync by triggers"""
+    await authenticated_client.put(f"/api/transactions/{sample_transaction.id}", json={"notes": "Orthodontist"})
+    response = await authenticated_client.get("/api/transactions", params={"q": "orthodontist"})
+    assert [t["id"] for t in response.json()] == [sample_transaction.id]
+
+    await authenticated_client.delete(f"/api/transactions/{sample_transaction.id}")
+    response = await authenticated_client.get("/api/transactions", params={"q": "orthodontist"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_unauthenticated(client):
+    """Test that unauthenticated requests to export transactions fail"""
+    response = await client.get("/api/transactions/export")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_csv(authenticated_client, sample_data):
+    """Test streaming all transactions as CSV"""
+    response = await authenticated_client.get("/api/transactions/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0].startswith("id,transaction_date,type,amount,description")
+    assert len(lines) == 4
+    # Ordered like the list endpoint: newest first
+    assert "Gas" in lines[1]
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_ndjson_with_filters(authenticated_client, sample_data):
+    """Test streaming filtered transactions as NDJSON"""
+    response = await authenticated_client.get(
+        "/api/transactions/export?format=ndjson&transaction_type=expense&end_date=2024-01-31T23:59:59"
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["description"] == "Groceries"
+    assert rows[0]["category"] == "Food"
+    assert rows[0]["beneficiary"] == "Supermarket"
+    assert rows[0]["type"] == "expense"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["arrow", "parquet"])
+async def test_export_transactions_columnar(authenticated_client, sample_data, export_format):
+    """Test exporting transactions as dictionary-encoded Arrow IPC / Parquet"""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    response = await authenticated_client.get(f"/api/transactions/export?format={export_format}")
+    assert response.status_code == 200
+
+    source = pa.BufferReader(response.content)
+    table = pa.ipc.open_stream(source).read_all() if export_format == "arrow" else pq.read_table(source)
+    assert table.num_rows == 3
+    assert pa.types.is_dictionary(table.schema.field("category").type)
+    assert pa.types.is_timestamp(table.schema.field("transaction_date").type)
+    assert table.column("category").to_pylist() == ["Food", "Salary", "Transport"]
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_fast_json_matches_schema(authenticated_client, sample_data):
+    """Test that the fast JSON list path keeps the documented response schema"""
+    schema = (await authenticated_client.get("/openapi.json")).json()
+    responses = schema["paths"]["/api/transactions"]["get"]["responses"]["200"]["content"]["application/json"]
+    refs = {variant.get("items", variant).get("$ref") for variant in responses["schema"]["anyOf"]}
+    assert refs == {"#/components/schemas/Transaction", "#/components/schemas/CompactTransactionPage"}
+
+    response = await authenticated_client.get("/api/transactions")
+    assert response.headers["content-type"] == "application/json"
+    row = response.json()[0]
+    assert row["transaction_date"] == "2024-02-05T00:00:00"
+    assert row["category"]["name"] == "Transport"
+    assert row["highlight"] is None